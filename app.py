@@ -1,6 +1,11 @@
-from flask import Flask
+import hmac
+import os
+from flask import Flask, Response, request
 from flask_cors import CORS
 from config import Config
+from utils.issue_replica import issue_replica
+from utils import request_memo, upstream_metrics
+from services.mining_owner_service import tpl_travel_time_queue
 from controllers import (
     auth_bp, mining_owner_bp, gsmb_officer_bp, 
     police_officer_bp, general_public_bp, 
@@ -39,11 +44,49 @@ def create_app():
     app.register_blueprint(police_officer_bp, url_prefix='/police-officer')
     app.register_blueprint(general_public_bp, url_prefix='/general-public')
     app.register_blueprint(gsmb_management_bp, url_prefix='/gsmb-management')
-    
+
+    if app.config['REDMINE_REQUEST_MEMO_ENABLED']:
+        @app.before_request
+        def start_request_memo():
+            request_memo.begin()
+
+    if app.config['METRICS_ENABLED']:
+        @app.before_request
+        def start_upstream_stats():
+            upstream_metrics.begin_request(request.url_rule.rule if request.url_rule else "unmatched")
+
+        @app.after_request
+        def finish_upstream_stats(response):
+            stats = upstream_metrics.end_request()
+            if stats is not None and app.config['SERVER_TIMING_ENABLED']:
+                response.headers['Server-Timing'] = stats.server_timing()
+            return response
+
+        @app.route('/metrics', methods=['GET'])
+        def metrics():
+            token = app.config['METRICS_TOKEN']
+            if not token:
+                return Response(status=404)
+            if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+                return Response(status=401, headers={'WWW-Authenticate': 'Bearer'})
+            return Response(upstream_metrics.upstream_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    @app.cli.command("resync-issues")
+    def resync_issues():
+        """Rebuild the local issue replica from Redmine."""
+        error = issue_replica.resync()
+        print(error or "Issue replica resynced")
+
+    if app.config['ISSUE_REPLICA_ENABLED']:
+        issue_replica.start()
+    if app.config['TPL_DEFER_TRAVEL_TIME']:
+        # Picks up travel-time jobs queued before a restart.
+        tpl_travel_time_queue.start()
     
     return app
 
 if __name__ == '__main__':
     app = create_app()
     print("Server is running on port 5000")
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Development server only; production runs wsgi:app under gunicorn (see gunicorn.conf.py).
+    app.run(host='0.0.0.0', port=5000, debug=os.getenv('FLASK_DEBUG') == '1')
\ No newline at end of file
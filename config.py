@@ -1,4 +1,5 @@
 import os
+from tempfile import gettempdir
 from dotenv import load_dotenv
 
 load_dotenv()  # Load environment variables from .env
@@ -11,3 +12,96 @@ class Config:
     PROJECT_ID = 1
     MINING_LICENSE_TRACKER_ID = 4
     ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', '')
+
+    # Shared Redmine HTTP client (connection pool, timeouts, retries)
+    REDMINE_POOL_SIZE = int(os.getenv('REDMINE_POOL_SIZE', 20))
+    REDMINE_CONNECT_TIMEOUT = float(os.getenv('REDMINE_CONNECT_TIMEOUT', 5))
+    REDMINE_READ_TIMEOUT = float(os.getenv('REDMINE_READ_TIMEOUT', 30))
+    REDMINE_MAX_RETRIES = int(os.getenv('REDMINE_MAX_RETRIES', 3))
+    REDMINE_RETRY_BACKOFF = float(os.getenv('REDMINE_RETRY_BACKOFF', 0.3))
+    REDMINE_PAGE_WORKERS = int(os.getenv('REDMINE_PAGE_WORKERS', 8))
+
+    # Identical Redmine GETs within one inbound request are answered once (utils/request_memo.py)
+    REDMINE_REQUEST_MEMO_ENABLED = os.getenv('REDMINE_REQUEST_MEMO_ENABLED', 'true').lower() == 'true'
+
+    # Per-user Redmine API key cache used by JWTUtils.get_api_key_from_token
+    API_KEY_CACHE_SIZE = int(os.getenv('API_KEY_CACHE_SIZE', 1024))
+    API_KEY_CACHE_TTL = int(os.getenv('API_KEY_CACHE_TTL', 300))
+
+    # Redmine user records (UserUtils.get_user), per user and requesting API key
+    USER_PROFILE_CACHE_SIZE = int(os.getenv('USER_PROFILE_CACHE_SIZE', 2048))
+    USER_PROFILE_CACHE_TTL = int(os.getenv('USER_PROFILE_CACHE_TTL', 300))
+
+    # Per-user generation counters (utils/user_generations.py) that invalidate both caches above in every worker
+    USER_GENERATIONS_DIR = os.getenv('USER_GENERATIONS_DIR', os.path.join(gettempdir(), 'mmpro_user_generations'))
+
+    # GSMB management dashboard aggregates, served stale while a refresh runs
+    DASHBOARD_CACHE_SIZE = int(os.getenv('DASHBOARD_CACHE_SIZE', 256))
+    DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 300))
+    DASHBOARD_CACHE_STALE_TTL = int(os.getenv('DASHBOARD_CACHE_STALE_TTL', 1800))
+
+    # Redmine issue status name -> id lookup used by the count-only dashboard queries
+    ISSUE_STATUS_CACHE_TTL = int(os.getenv('ISSUE_STATUS_CACHE_TTL', 3600))
+
+    # In-process tracker indexes (utils/issue_index.py), polled by updated_on
+    TPL_INDEX_REFRESH_SECONDS = int(os.getenv('TPL_INDEX_REFRESH_SECONDS', 30))
+    LICENSE_INDEX_REFRESH_SECONDS = int(os.getenv('LICENSE_INDEX_REFRESH_SECONDS', 60))
+    ISSUE_INDEX_FULL_SYNC_SECONDS = int(os.getenv('ISSUE_INDEX_FULL_SYNC_SECONDS', 3600))
+
+    # Attachment content_url lookups (utils/attachment_cache.py); attachments are immutable
+    ATTACHMENT_CACHE_SIZE = int(os.getenv('ATTACHMENT_CACHE_SIZE', 10000))
+    ATTACHMENT_CACHE_TTL = int(os.getenv('ATTACHMENT_CACHE_TTL', 86400))
+
+    # Geocode / route-distance cache for TPL travel times (utils/geo_cache.py)
+    GEO_CACHE_DIR = os.getenv('GEO_CACHE_DIR', os.path.join(gettempdir(), 'geo_cache'))
+    GEO_CACHE_TTL = int(os.getenv('GEO_CACHE_TTL', 30 * 86400))
+    GAZETTEER_PATH = os.getenv('GAZETTEER_PATH')  # extra town -> [lon, lat] JSON merged over the bundled one
+
+    # ETag revalidation of single Redmine resources (utils/http_cache.py), kept in memory and on disk
+    REDMINE_HTTP_CACHE_ENABLED = os.getenv('REDMINE_HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+    REDMINE_HTTP_CACHE_DIR = os.getenv('REDMINE_HTTP_CACHE_DIR', os.path.join(gettempdir(), 'redmine_http_cache'))
+    REDMINE_HTTP_CACHE_MEMORY_ENTRIES = int(os.getenv('REDMINE_HTTP_CACHE_MEMORY_ENTRIES', 1024))
+    REDMINE_HTTP_CACHE_DISK_BYTES = int(os.getenv('REDMINE_HTTP_CACHE_DISK_BYTES', 256 * 2**20))
+    REDMINE_HTTP_CACHE_MAX_BODY_BYTES = int(os.getenv('REDMINE_HTTP_CACHE_MAX_BODY_BYTES', 2**20))
+
+    # Deferred TPL travel time: issue TPLs with a default validity, patch estimated_hours later
+    TPL_DEFER_TRAVEL_TIME = os.getenv('TPL_DEFER_TRAVEL_TIME', 'false').lower() == 'true'
+    TPL_DEFAULT_VALIDITY_HOURS = int(os.getenv('TPL_DEFAULT_VALIDITY_HOURS', 16))  # longest island route at 30 km/h + 2h
+    # Queued jobs must outlive the container: default under DISKCACHE_DIR (the /app/otp_cache volume in the Dockerfile)
+    TPL_TRAVEL_TIME_QUEUE_DIR = os.getenv(
+        'TPL_TRAVEL_TIME_QUEUE_DIR',
+        os.path.join(os.getenv('DISKCACHE_DIR', gettempdir()), 'tpl_travel_time_queue'),
+    )
+    TPL_TRAVEL_TIME_MAX_ATTEMPTS = int(os.getenv('TPL_TRAVEL_TIME_MAX_ATTEMPTS', 5))
+    TPL_TRAVEL_TIME_RETRY_SECONDS = int(os.getenv('TPL_TRAVEL_TIME_RETRY_SECONDS', 30))
+
+    # Local SQLite replica of the ML/TPL/complaint/appointment trackers (utils/issue_replica.py).
+    # It is synced with the admin key and ignores per-user Redmine visibility, so only the
+    # GSMBManagement dashboards (services/gsmb_managemnt_service.py) read it.
+    ISSUE_REPLICA_ENABLED = os.getenv('ISSUE_REPLICA_ENABLED', 'false').lower() == 'true'
+    ISSUE_REPLICA_PATH = os.getenv('ISSUE_REPLICA_PATH', os.path.join(gettempdir(), 'mmpro_issue_replica.sqlite3'))
+    ISSUE_REPLICA_POLL_SECONDS = int(os.getenv('ISSUE_REPLICA_POLL_SECONDS', 60))
+    ISSUE_REPLICA_FULL_SYNC_SECONDS = int(os.getenv('ISSUE_REPLICA_FULL_SYNC_SECONDS', 3600))
+    ISSUE_REPLICA_MAX_AGE = int(os.getenv('ISSUE_REPLICA_MAX_AGE', 300))
+
+    # Production serving (gunicorn.conf.py): gthread workers, each handling SERVER_THREADS requests at once
+    SERVER_BIND = os.getenv('SERVER_BIND', '0.0.0.0:5000')
+    SERVER_WORKERS = int(os.getenv('WEB_CONCURRENCY', 4))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 8))
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 120))
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', 5))
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', 2000))
+    SERVER_MAX_REQUESTS_JITTER = int(os.getenv('SERVER_MAX_REQUESTS_JITTER', 200))
+    READINESS_CACHE_SECONDS = int(os.getenv('READINESS_CACHE_SECONDS', 5))
+
+    # Client-facing limit/cursor paging on officer list endpoints (utils/pagination.py)
+    LIST_PAGE_DEFAULT_LIMIT = int(os.getenv('LIST_PAGE_DEFAULT_LIMIT', 25))  # Redmine's own default page size
+    LIST_PAGE_MAX_LIMIT = int(os.getenv('LIST_PAGE_MAX_LIMIT', 100))  # Redmine's max per page
+
+    # Upstream Redmine instrumentation (utils/upstream_metrics.py): /metrics and Server-Timing headers
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(gettempdir(), 'mmpro_metrics'))  # shared by the workers
+    METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', 5))
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')  # Bearer token scrapers send to /metrics; unset keeps /metrics off
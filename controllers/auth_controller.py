@@ -709,6 +709,15 @@ def ping():
     print("✅ /ping endpoint hit")
     return jsonify({ "message": "Ping successfuy 🎯" })
 
+
+@auth_bp.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once this worker can serve traffic, 503 otherwise."""
+    is_ready, reason = AuthService.check_readiness()
+    if not is_ready:
+        return jsonify({"status": "unavailable", "error": reason}), 503
+    return jsonify({"status": "ready"}), 200
+
     
 
 
@@ -1,5 +1,6 @@
 from flask import Blueprint, current_app, jsonify, request
 from middleware.auth_middleware import role_required,check_token
+from middleware.conditional_get import conditional_response
 from services.gsmb_managemnt_service import GsmbManagmentService
 from utils.jwt_utils import JWTUtils
 import requests
@@ -14,6 +15,7 @@ gsmb_management_bp = Blueprint('gsmb_management', __name__)
 @gsmb_management_bp.route('/monthly-total-sand', methods=['GET']) 
 @check_token                     
 @role_required(['GSMBManagement'])         
+@conditional_response
 def monthly_total_sand_cubes():
     token = request.headers.get("Authorization")
     if not token:
@@ -31,6 +33,7 @@ def monthly_total_sand_cubes():
 @gsmb_management_bp.route('/fetch-top-mining-holders', methods=['GET'])    
 @check_token               
 @role_required(['GSMBManagement'])         
+@conditional_response
 def fetch_top_mining_holders():
     token = request.headers.get("Authorization")
     if not token:
@@ -48,6 +51,7 @@ def fetch_top_mining_holders():
 @gsmb_management_bp.route('/fetch-royalty-counts', methods=['GET'])
 @check_token                 
 @role_required(['GSMBManagement'])
+@conditional_response
 def fetch_royalty_counts():
     token = request.headers.get("Authorization")
     if not token:
@@ -66,6 +70,7 @@ def fetch_royalty_counts():
 @gsmb_management_bp.route('/monthly-mining-license-count', methods=['GET'])  
 @check_token                 
 @role_required(['GSMBManagement'])         
+@conditional_response
 def monthly_mining_license_count():
     token = request.headers.get("Authorization")
     if not token:
@@ -82,6 +87,7 @@ def monthly_mining_license_count():
 @gsmb_management_bp.route('/transport-license-destination', methods=['GET'])
 @check_token
 @role_required(['GSMBManagement'])
+@conditional_response
 def transport_license_destination():
     token = request.headers.get("Authorization")
     if not token:
@@ -99,6 +105,7 @@ def transport_license_destination():
 @gsmb_management_bp.route('/total-location-ml', methods=['GET'])
 @check_token
 @role_required(['GSMBManagement'])
+@conditional_response
 def total_location_ml():
     token = request.headers.get("Authorization")
     if not token:
@@ -116,6 +123,7 @@ def total_location_ml():
 @gsmb_management_bp.route('/complaint-counts', methods=['GET'])
 @check_token
 @role_required(['GSMBManagement'])
+@conditional_response
 def complaint_counts():
     token = request.headers.get("Authorization")
     if not token:
@@ -133,6 +141,7 @@ def complaint_counts():
 @gsmb_management_bp.route('/role-counts', methods=['GET'])
 @check_token
 @role_required(['GSMBManagement'])
+@conditional_response
 def role_counts():
     token = request.headers.get("Authorization")
     if not token:
@@ -151,6 +160,7 @@ def role_counts():
 @gsmb_management_bp.route('/mining-license-count', methods=['GET'])
 @check_token
 @role_required(['GSMBManagement'])
+@conditional_response
 def mining_license_count():
     token = request.headers.get("Authorization")
     if not token:
@@ -164,6 +174,24 @@ def mining_license_count():
     return jsonify({"issues": issues})  
 
 
+#All dashboard metrics in one response
+@gsmb_management_bp.route('/dashboard-snapshot', methods=['GET'])
+@check_token
+@role_required(['GSMBManagement'])
+@conditional_response
+def dashboard_snapshot():
+    token = request.headers.get("Authorization")
+    if not token:
+        return jsonify({"error": AUTH_TOKEN_MISSING_ERROR}), 401
+
+    snapshot, error = GsmbManagmentService.dashboard_snapshot(token)
+
+    if error:
+        return jsonify({"error": error}), 500
+
+    return jsonify(snapshot)
+
+
 @gsmb_management_bp.route('/unactive-gsmb-officers', methods=['GET'])
 @check_token
 @role_required(['GSMBManagement'])
@@ -2,16 +2,18 @@
 from tabnanny import check
 from flask import Blueprint, jsonify, request
 from middleware.auth_middleware import role_required, check_token
+from middleware.conditional_get import conditional_response
 from services.gsmb_officer_service import GsmbOfficerService
 import os
 from werkzeug.utils import secure_filename
 import tempfile
 from utils.user_utils import UserUtils
-import requests  # For making HTTP requests to Redmine
+from utils import redmine_client
 from flask import Response  # For streaming file responses in Flask
 from utils.jwt_utils import JWTUtils
 from werkzeug.http import parse_options_header
 from utils.constants import AUTH_TOKEN_MISSING_ERROR
+from utils.pagination import PageRequest
 
 
 # Define the Blueprint for gsmb_officer
@@ -185,12 +187,20 @@ def get_mlowners():
         if not token:
             return jsonify({"error": AUTH_TOKEN_MISSING_ERROR}), 400
 
+        page, error = PageRequest.from_args(request.args)
+        if error:
+            return jsonify({"error": error}), 400
+
         mlowners_details, error = GsmbOfficerService.get_mlowners(token)
 
         if error:
             return jsonify({"error": error}), 500
 
-        return jsonify(mlowners_details)
+        # Without limit/cursor the full list is returned as before
+        if 'limit' not in request.args and 'cursor' not in request.args:
+            return jsonify(mlowners_details)
+
+        return jsonify({"success": True, **page.slice(mlowners_details)}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -293,6 +303,7 @@ def get_company_mlowners():
 @gsmb_officer_bp.route('/get-tpls', methods=['GET'])
 @check_token
 @role_required(['GSMBOfficer'])
+@conditional_response
 def get_tpls():
     try:
         token = request.headers.get('Authorization')
@@ -300,13 +311,17 @@ def get_tpls():
         if not token:
             return jsonify({"error": AUTH_TOKEN_MISSING_ERROR}), 400
 
+        page, error = PageRequest.from_args(request.args)
+        if error:
+            return jsonify({"error": error}), 400
+
         # Fetch TPLs from the service
-        tpls, error = GsmbOfficerService.get_tpls(token)
+        tpls, error = GsmbOfficerService.get_tpls(token, page)
 
         if error:
             return jsonify({"error": error}), 500
 
-        return jsonify({"success": True, "data": tpls}), 200
+        return jsonify({"success": True, **tpls}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -315,6 +330,7 @@ def get_tpls():
 @gsmb_officer_bp.route('/get-mining-licenses', methods=['GET'])
 @check_token
 @role_required(['GSMBOfficer'])
+@conditional_response
 def get_mining_licenses():
     try:
         token = request.headers.get('Authorization')
@@ -322,13 +338,17 @@ def get_mining_licenses():
         if not token:
             return jsonify({"error": AUTH_TOKEN_MISSING_ERROR}), 400
 
+        page, error = PageRequest.from_args(request.args)
+        if error:
+            return jsonify({"error": error}), 400
+
         # Fetch Mining Licenses from the service
-        mining_licenses, error = GsmbOfficerService.get_mining_licenses(token)
+        mining_licenses, error = GsmbOfficerService.get_mining_licenses(token, page)
 
         if error:
             return jsonify({"error": error}), 500
 
-        return jsonify({"success": True, "data": mining_licenses}), 200
+        return jsonify({"success": True, **mining_licenses}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -365,7 +385,7 @@ def download_attachment(attachment_id):
         REDMINE_URL = os.getenv("REDMINE_URL")
         attachment_url = f"{REDMINE_URL}/attachments/download/{attachment_id}"
 
-        response = requests.get(
+        response = redmine_client.get(
             attachment_url,
             headers={"X-Redmine-API-Key": api_key},
             stream=True
@@ -399,10 +419,13 @@ def download_attachment(attachment_id):
 @role_required(['GSMBOfficer'])
 def get_complaints():
     token = request.headers.get('Authorization')
-    complaints, error = GsmbOfficerService.get_complaints(token)
+    page, error = PageRequest.from_args(request.args)
+    if error:
+        return {"success": False, "message": error}, 400
+    complaints, error = GsmbOfficerService.get_complaints(token, page)
     if error:
         return {"success": False, "message": error}
-    return {"success": True, "data": complaints}
+    return {"success": True, **complaints}
 
 
 
@@ -595,13 +618,17 @@ def get_appointments():
         if not token:
             return jsonify({"error": AUTH_TOKEN_MISSING_ERROR}), 400
 
+        page, error = PageRequest.from_args(request.args)
+        if error:
+            return jsonify({"error": error}), 400
+
         # Fetch appointments from the service
-        appointments, error = GsmbOfficerService.get_appointments(token)
+        appointments, error = GsmbOfficerService.get_appointments(token, page)
 
         if error:
             return jsonify({"error": error}), 500
 
-        return jsonify({"success": True, "data": appointments}), 200
+        return jsonify({"success": True, **appointments}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -2,6 +2,7 @@ import os
 import tempfile
 from flask import Blueprint, jsonify, request
 from middleware.auth_middleware import role_required,check_token
+from middleware.conditional_get import conditional_response
 from services.auth_service import AuthService
 from services.mining_engineer_service import MiningEnginerService
 import requests 
@@ -300,6 +301,7 @@ def get_me_meeting_schedule_licenses():
 @mining_enginer_bp.route('/me-appointments', methods=['GET'])
 @check_token
 @role_required(['miningEngineer'])
+@conditional_response
 def get_me_appointments():
     try:
         token = request.headers.get('Authorization')
@@ -7,7 +7,7 @@ from utils.jwt_utils import JWTUtils
 from utils.user_utils import UserUtils
 from hashlib import sha256
 import time
-import requests
+from utils import redmine_client
 from utils.constants import AUTH_TOKEN_MISSING_ERROR, INTERNAL_SERVER_ERROR
 from dotenv import load_dotenv
 
@@ -60,6 +60,22 @@ def create_tpl():
     except Exception as e:
         return jsonify({"error": str(e)}), 500  # Return server error message
     
+@mining_owner_bp.route('/tpl/<int:tpl_id>/travel-time', methods=['GET'])
+@check_token
+@role_required(['MLOwner'])
+def get_tpl_travel_time(tpl_id):
+    try:
+        token = request.headers.get('Authorization')
+
+        status, error = MLOwnerService.get_tpl_travel_time(token, tpl_id)
+        if error:
+            return jsonify({"error": error}), 404
+
+        return jsonify({"success": True, "data": status}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # View tpl route
 # GET route for /view-tpls    http://127.0.0.1:5000/mining-owner/view-tpls?mining_license_number=LLL/100/100
 @mining_owner_bp.route('/view-tpls', methods=['GET'])
@@ -384,7 +400,7 @@ def _get_current_royalty(redmine_url, api_key, issue_id):
         "X-Redmine-API-Key": api_key,
         "Content-Type": "application/json"
     }
-    resp = requests.get(url, headers=headers)
+    resp = redmine_client.get(url, headers=headers)
     if resp.status_code != 200:
         return None
     for field in resp.json().get('issue', {}).get('custom_fields', []):
@@ -402,7 +418,7 @@ def _update_redmine_royalty(redmine_url, api_key, issue_id, amount):
         "X-Redmine-API-Key": api_key,
         "Content-Type": "application/json"
     }
-    response = requests.put(
+    response = redmine_client.put(
         url,
         headers=headers,
         json={"issue": {"custom_fields": [{"id": 18, "value": str(amount)}]}}
@@ -0,0 +1,29 @@
+# Gunicorn settings for production, driven by Config (see the "Production serving" block).
+# Run with: gunicorn -c gunicorn.conf.py wsgi:app
+from config import Config
+
+bind = Config.SERVER_BIND
+workers = Config.SERVER_WORKERS
+
+# Requests spend most of their time waiting on Redmine, so each worker serves
+# several at once on threads instead of one at a time.
+worker_class = "gthread"
+threads = Config.SERVER_THREADS
+
+timeout = Config.SERVER_TIMEOUT
+graceful_timeout = Config.SERVER_GRACEFUL_TIMEOUT
+keepalive = Config.SERVER_KEEPALIVE
+max_requests = Config.SERVER_MAX_REQUESTS
+max_requests_jitter = Config.SERVER_MAX_REQUESTS_JITTER
+
+# Not preloaded: background pollers and HTTP pools are started per worker.
+preload_app = False
+
+accesslog = "-"
+errorlog = "-"
+
+
+def worker_exit(server, worker):
+    # Fold the exiting worker's last counts into the /metrics totals it shares with the others.
+    from utils.upstream_metrics import upstream_metrics
+    upstream_metrics.flush()
@@ -0,0 +1,149 @@
+"""End-to-end benchmark of every scenario in ``loadtest.scenarios``.
+
+Seeds a ``StubRedmine`` with ``seed_dataset``, boots the app once under the
+chosen serving profile and, per endpoint, records:
+
+    cold     upstream Redmine calls made by the very first request
+    calls/r  upstream calls per request once caches and indexes are warm
+    p50/p95/p99 latency and errors over ``--requests`` requests
+
+The busiest upstream paths of each endpoint are listed with ``--verbose``.
+Results can be written with ``--output`` and compared against an earlier
+run with ``--baseline``; the run exits non-zero when an endpoint's p95 or
+calls per request regress by more than ``--max-regression``.
+
+    python -m loadtest.bench --requests 50 --concurrency 8 --latency-ms 50
+    python -m loadtest.bench --only gsmb-management --output bench.json
+    python -m loadtest.bench --baseline bench.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from loadtest.run import PROFILES, app_env, hammer, make_token, serve
+from loadtest.scenarios import SCENARIOS, fill, fixtures
+from loadtest.stub_redmine import TOWNS, StubRedmine, seed_dataset
+
+# Latency noise below this many milliseconds is never reported as a regression.
+P95_SLACK_MS = 5
+
+
+def seed_route_cache(directory):
+    """Pre-compute road distances between the stub's towns so create-tpl never calls the live router."""
+    from utils.geo_cache import GeoCache
+
+    cache = GeoCache(directory)
+    for origin in TOWNS:
+        for destination in TOWNS:
+            cache.set_distance_km(origin, destination, 0 if origin == destination else 120.0)
+
+
+def run_scenario(base_url, stub, scenario, fx, args):
+    values = fx["values"]
+    headers = {}
+    if scenario.role:
+        token = make_token(fx["users"][scenario.user], scenario.role)
+        headers["Authorization"] = f"Bearer {token}"
+    url = f"{base_url}{fill(scenario.path, values)}"
+    body = fill(scenario.body, values)
+
+    stub.reset_counts()
+    hammer(url, headers, 1, 1, scenario.method, body)
+    cold = sum(stub.reset_counts().values())
+
+    result = hammer(url, headers, args.requests, args.concurrency, scenario.method, body)
+    calls = stub.reset_counts()
+    result.update({
+        "cold_calls": cold,
+        "calls_per_request": sum(calls.values()) / args.requests,
+        "upstream": dict(calls.most_common()),
+    })
+    return result
+
+
+def regressions(results, baseline, max_regression):
+    found = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if result["p95"] > before["p95"] * (1 + max_regression) + P95_SLACK_MS:
+            found.append(f"{name}: p95 {before['p95']:.0f} -> {result['p95']:.0f} ms")
+        if result["calls_per_request"] > before["calls_per_request"] * (1 + max_regression) + 0.5:
+            found.append(f"{name}: calls/request {before['calls_per_request']:.1f} -> "
+                         f"{result['calls_per_request']:.1f}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default="gunicorn", choices=sorted(PROFILES))
+    parser.add_argument("--only", default="", help="comma-separated substrings of endpoint paths to run")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=int, default=50)
+    parser.add_argument("--jitter-ms", type=int, default=10)
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--ml", type=int, default=200)
+    parser.add_argument("--tpl", type=int, default=600)
+    parser.add_argument("--complaints", type=int, default=100)
+    parser.add_argument("--appointments", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON from an earlier --output run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument("--verbose", action="store_true", help="list upstream calls per endpoint")
+    args = parser.parse_args()
+
+    filters = [f.strip() for f in args.only.split(",") if f.strip()]
+    scenarios = [s for s in SCENARIOS if not filters or any(f in s.name for f in filters)]
+    dataset = seed_dataset(args.users, args.ml, args.tpl, args.complaints, args.appointments,
+                           args.appointments, seed=args.seed)
+    fx = fixtures(dataset)
+    stub = StubRedmine(latency_ms=args.latency_ms, dataset=dataset, jitter_ms=args.jitter_ms, seed=args.seed).start()
+    print(f"stub Redmine {stub.url}: {len(dataset['users'])} users, {len(dataset['issues'])} issues, "
+          f"{args.latency_ms}+{args.jitter_ms} ms/request; profile {args.profile}, "
+          f"{args.requests} requests per endpoint at concurrency {args.concurrency}\n")
+    print(f"{'endpoint':<58}{'cold':>6}{'calls/r':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            geo_dir = os.path.join(scratch, "geo_cache")
+            seed_route_cache(geo_dir)
+            env = app_env(
+                stub,
+                GEO_CACHE_DIR=geo_dir,
+                TPL_TRAVEL_TIME_QUEUE_DIR=os.path.join(scratch, "tpl_queue"),
+                ISSUE_REPLICA_PATH=os.path.join(scratch, "replica.sqlite3"),
+            )
+            with serve(args.profile, env) as base_url:
+                for scenario in scenarios:
+                    result = results[scenario.name] = run_scenario(base_url, stub, scenario, fx, args)
+                    print(f"{scenario.name:<58}{result['cold_calls']:>6}{result['calls_per_request']:>9.1f}"
+                          f"{result['p50']:>9.0f}{result['p95']:>9.0f}{result['p99']:>9.0f}{result['errors']:>8}")
+                    if args.verbose:
+                        for call, count in list(result["upstream"].items())[:5]:
+                            print(f"    {count / args.requests:>6.1f}/r  {call}")
+    finally:
+        stub.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            found = regressions(results, json.load(f), args.max_regression)
+        if found:
+            print("\nRegressions against baseline:")
+            for line in found:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
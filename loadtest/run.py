@@ -0,0 +1,168 @@
+"""Throughput comparison of serving profiles against a local stub Redmine.
+
+Starts ``loadtest.stub_redmine`` in-process, then for each profile boots the
+app on a free port, fires ``--requests`` authenticated requests at ``--path``
+from ``--concurrency`` client threads and prints requests/second and latency
+percentiles. Profiles:
+
+    flask          the development server (``flask run``, threaded)
+    gunicorn-sync  gunicorn sync workers, one request per worker at a time
+    gunicorn       gunicorn.conf.py as shipped (gthread workers)
+
+    python -m loadtest.run --profiles gunicorn-sync,gunicorn --concurrency 32
+"""
+import argparse
+import datetime
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import jwt
+import requests
+
+from loadtest.stub_redmine import STUB_API_KEY, StubRedmine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET_KEY = "loadtest-secret-key-not-for-production"
+
+PROFILES = {
+    "flask": lambda port: [sys.executable, "-m", "flask", "--app", "wsgi:app", "run",
+                           "--host", "127.0.0.1", "--port", str(port), "--no-reload", "--no-debugger"],
+    "gunicorn-sync": lambda port: [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+                                   "--worker-class", "sync", "--threads", "1",
+                                   "--bind", f"127.0.0.1:{port}", "wsgi:app"],
+    "gunicorn": lambda port: [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+                              "--bind", f"127.0.0.1:{port}", "wsgi:app"],
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_token(user_id, role):
+    exp = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+    return jwt.encode({"user_id": user_id, "role": role, "exp": exp}, SECRET_KEY, algorithm="HS256")
+
+
+def wait_until_up(base_url, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/auth/ping", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not come up in time")
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+def hammer(url, headers, total, concurrency, method="GET", body=None):
+    local = threading.local()
+
+    def one(_):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        started = time.perf_counter()
+        try:
+            ok = session.request(method, url, headers=headers, json=body, timeout=120).status_code < 400
+        except requests.RequestException:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    return {
+        "errors": sum(1 for ok, _ in results if not ok),
+        "rps": total / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def app_env(stub, **overrides):
+    return {
+        **os.environ,
+        "REDMINE_URL": stub.url,
+        "REDMINE_ADMIN_API_KEY": STUB_API_KEY,
+        "SECRET_KEY": SECRET_KEY,
+        "FLASK_DEBUG": "0",
+        **overrides,
+    }
+
+
+@contextmanager
+def serve(profile, env):
+    """Boot the app under ``profile`` on a free port and yield its base URL."""
+    port = free_port()
+    process = subprocess.Popen(PROFILES[profile](port), cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_up(base_url, process)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_profile(name, stub, args):
+    with serve(name, app_env(stub)) as base_url:
+        headers = {"Authorization": f"Bearer {make_token(args.user_id, args.role)}"}
+        url = f"{base_url}{args.path}"
+        hammer(url, headers, min(args.concurrency, args.requests), args.concurrency)  # warm-up
+        return hammer(url, headers, args.requests, args.concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="flask,gunicorn-sync,gunicorn")
+    parser.add_argument("--path", default="/mining-owner/mining-licenses")
+    parser.add_argument("--role", default="MLOwner")
+    parser.add_argument("--user-id", type=int, default=2)  # first ML owner in the seeded stub
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=int, default=150)
+    args = parser.parse_args()
+
+    stub = StubRedmine(latency_ms=args.latency_ms).start()
+    print(f"stub Redmine {stub.url}, {args.latency_ms} ms/request; "
+          f"{args.requests} x GET {args.path} at concurrency {args.concurrency}\n")
+    print(f"{'profile':<15}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    try:
+        for name in args.profiles.split(","):
+            result = run_profile(name.strip(), stub, args)
+            print(f"{name:<15}{result['rps']:>10.1f}{result['p50']:>10.0f}{result['p95']:>10.0f}"
+                  f"{result['p99']:>10.0f}{result['errors']:>8}")
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
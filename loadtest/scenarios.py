@@ -0,0 +1,117 @@
+"""Endpoint scenarios driven by ``loadtest.bench``.
+
+Each scenario is one route called as a user of the matching role. Paths and
+bodies are templates filled from ``fixtures(dataset)`` so they always point
+at records the stub actually holds. Only reads and ``create-tpl`` are
+benchmarked; the other writes change workflow state and are left out.
+"""
+from collections import namedtuple
+
+from loadtest.stub_redmine import ML_TRACKER, TOWNS, lorry_number_for
+
+Scenario = namedtuple("Scenario", ["name", "method", "path", "role", "user", "body"])
+
+
+def _get(path, role, user):
+    return Scenario(path.split("?")[0], "GET", path, role, user, None)
+
+
+SCENARIOS = [
+    # GSMB management dashboard
+    _get("/gsmb-management/monthly-total-sand", "GSMBManagement", "admin"),
+    _get("/gsmb-management/fetch-top-mining-holders", "GSMBManagement", "admin"),
+    _get("/gsmb-management/fetch-royalty-counts", "GSMBManagement", "admin"),
+    _get("/gsmb-management/monthly-mining-license-count", "GSMBManagement", "admin"),
+    _get("/gsmb-management/transport-license-destination", "GSMBManagement", "admin"),
+    _get("/gsmb-management/total-location-ml", "GSMBManagement", "admin"),
+    _get("/gsmb-management/complaint-counts", "GSMBManagement", "admin"),
+    _get("/gsmb-management/role-counts", "GSMBManagement", "admin"),
+    _get("/gsmb-management/mining-license-count", "GSMBManagement", "admin"),
+    _get("/gsmb-management/dashboard-snapshot", "GSMBManagement", "admin"),
+    _get("/gsmb-management/unactive-gsmb-officers", "GSMBManagement", "admin"),
+    _get("/gsmb-management/users/police", "GSMBManagement", "admin"),
+    _get("/gsmb-management/users/gsmb-officer", "GSMBManagement", "admin"),
+    _get("/gsmb-management/users/mining-engineer", "GSMBManagement", "admin"),
+    _get("/gsmb-management/users/ml-owner", "GSMBManagement", "admin"),
+    # Lorry checks
+    _get("/police-officer/check-lorry-number?lorry_number={lorry_number}", "PoliceOfficer", "police"),
+    _get("/general-public/validate-lorry-number?lorry_number={lorry_number}", None, None),
+    # Mining license owner
+    _get("/mining-owner/mining-licenses", "MLOwner", "owner"),
+    _get("/mining-owner/mining-homeLicenses", "MLOwner", "owner"),
+    _get("/mining-owner/view-tpls?mining_license_number={ml_number}", "MLOwner", "owner"),
+    _get("/mining-owner/ml-detail?l_number={ml_number}", "MLOwner", "owner"),
+    _get("/mining-owner/user-detail/{owner_id}", "MLOwner", "owner"),
+    _get("/mining-owner/get-mining-license-requests", "MLOwner", "owner"),
+    _get("/mining-owner/get-pending-license-details", "MLOwner", "owner"),
+    _get("/mining-owner/get-mining-license/{ml_id}", "MLOwner", "owner"),
+    Scenario("/mining-owner/create-tpl", "POST", "/mining-owner/create-tpl", "MLOwner", "owner", {
+        "mining_license_number": "{ml_number}",
+        "lorry_number": "{lorry_number}",
+        "driver_contact": "0760000000",
+        "route_01": "{origin}",
+        "destination": "{destination}",
+        "cubes": "1",
+    }),
+    # GSMB officer
+    _get("/gsmb-officer/user-detail/{owner_id}", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-license/{ml_id}", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/view-tpls", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mlowners", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mlowners/individual", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mlowners/company", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-tpls", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mining-licenses", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mining-license/{ml_id}", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-complaints", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mining-license-counts", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mlownersWithNic", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-appointments", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-mining-license-request", "GSMBOfficer", "officer"),
+    _get("/gsmb-officer/get-miningRequest-view-button/{ml_id}", "GSMBOfficer", "officer"),
+    # Mining engineer
+    _get("/mining-engineer/me-pending-licenses", "miningEngineer", "engineer"),
+    _get("/mining-engineer/meetingScheduledLicenses", "miningEngineer", "engineer"),
+    _get("/mining-engineer/me-appointments", "miningEngineer", "engineer"),
+    _get("/mining-engineer/view-mining-license/{ml_id}", "miningEngineer", "engineer"),
+    _get("/mining-engineer/me-approve-license", "miningEngineer", "engineer"),
+    _get("/mining-engineer/me-approve-single-license/{ml_id}", "miningEngineer", "engineer"),
+    _get("/mining-engineer/me-licenses-count", "miningEngineer", "engineer"),
+    _get("/mining-engineer/me-hold-licenses", "miningEngineer", "engineer"),
+    _get("/mining-engineer/me-reject-licenses", "miningEngineer", "engineer"),
+]
+
+
+def fixtures(dataset):
+    """Values for the scenario templates, plus the user id to sign in as for each ``Scenario.user``."""
+    def user_of_type(user_type):
+        return next(u["id"] for u in dataset["users"].values()
+                    if u["custom_fields"][0]["value"] == user_type and u["status"] == 1)
+
+    ml = next(i for i in dataset["issues"].values()
+              if i["tracker"]["id"] == ML_TRACKER and i["status"]["id"] == 7)
+    return {
+        "users": {
+            "admin": 1,
+            "owner": ml["assigned_to"]["id"],
+            "officer": user_of_type("gsmbOfficer"),
+            "police": user_of_type("police"),
+            "engineer": user_of_type("miningEngineer"),
+        },
+        "values": {
+            "ml_id": ml["id"],
+            "ml_number": ml["subject"],
+            "owner_id": ml["assigned_to"]["id"],
+            "lorry_number": lorry_number_for(0),
+            "origin": TOWNS[0],
+            "destination": TOWNS[1],
+        },
+    }
+
+
+def fill(template, values):
+    if isinstance(template, dict):
+        return {key: fill(value, values) for key, value in template.items()}
+    if isinstance(template, str):
+        return template.format(**values)
+    return template
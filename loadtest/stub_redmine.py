@@ -0,0 +1,661 @@
+"""Seedable stand-in for Redmine's REST API, for load tests and benchmarks.
+
+The stub holds an in-memory dataset (users, project memberships, ML / TPL /
+complaint / appointment issues and their attachments) built by
+``seed_dataset`` and serves it through the subset of the REST API the
+middleware uses: issue and user listings with Redmine's filters and
+``offset``/``limit``/``total_count`` paging, single issues and users,
+memberships, attachments, uploads, and issue creates/updates. Every
+request is delayed by ``latency_ms`` (plus up to ``jitter_ms``) to mimic a
+real Redmine round trip, and counted per method and path so callers can
+see how many upstream calls an endpoint makes.
+
+    python -m loadtest.stub_redmine --port 8081 --latency-ms 150 --ml 500 --tpl 2000
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+STUB_API_KEY = "stub-api-key"
+ADMIN_USER_ID = 1
+MAX_PAGE_SIZE = 100
+NUMERIC_SEGMENT = re.compile(r"/\d+")
+
+ML_TRACKER = 4
+TPL_TRACKER = 5
+COMPLAINT_TRACKER = 6
+APPOINTMENT_TRACKER = 11
+ME_APPOINTMENT_TRACKER = 12
+
+TRACKERS = {
+    ML_TRACKER: "ML",
+    TPL_TRACKER: "TPL",
+    COMPLAINT_TRACKER: "Complaints",
+    APPOINTMENT_TRACKER: "Appointment",
+    ME_APPOINTMENT_TRACKER: "MeAppointment",
+}
+
+# status_id -> (name, is_closed)
+STATUSES = {
+    1: ("New", False),
+    2: ("In Progress", False),
+    3: ("Executed", False),
+    5: ("Closed", True),
+    6: ("Rejected", True),
+    7: ("Valid", False),
+    8: ("Active", False),
+    26: ("Awaiting ME Scheduling", False),
+    31: ("ME Appointment Scheduled", False),
+    34: ("Appointment Scheduled", False),
+}
+
+CUSTOM_FIELDS = {
+    18: "Royalty",
+    19: "Exploration Licence No",
+    28: "Land Name(Licence Details)",
+    29: "Land owner name",
+    30: "Name of village",
+    31: "Grama Niladhari Division",
+    32: "Divisional Secretary Division",
+    33: "Administrative District",
+    34: "Capacity",
+    53: "Lorry Number",
+    54: "Driver Contact",
+    55: "Route 01",
+    56: "Route 02",
+    57: "Route 03",
+    58: "Cubes",
+    59: "Mining License Number",
+    63: "Used",
+    64: "Remaining",
+    66: "Mobile Number",
+    67: "Role",
+    68: "Destination",
+    72: "Detailed Mine Restoration Plan",
+    80: "Payment Receipt",
+    90: "Deed and Survey Plan",
+    92: "Google location ",
+    99: "Month Capacity",
+    100: "Economic Viability Report",
+    101: "Mining License Number",
+    105: "License Boundary Survey",
+}
+ML_FILE_FIELDS = (100, 72, 90, 80, 105)
+
+# "User Type" custom field value -> project role name
+USER_TYPES = {
+    "mlOwner": "MLOwner",
+    "gsmbOfficer": "GSMBOfficer",
+    "police": "PoliceOfficer",
+    "miningEngineer": "miningEngineer",
+}
+ROLE_IDS = {"GSMBManagement": 2, "MLOwner": 3, "GSMBOfficer": 4, "PoliceOfficer": 5, "miningEngineer": 6}
+
+DISTRICTS = ("Colombo", "Gampaha", "Kalutara", "Kandy", "Matale", "Galle", "Matara",
+             "Kurunegala", "Puttalam", "Anuradhapura", "Polonnaruwa", "Badulla",
+             "Ratnapura", "Kegalle", "Trincomalee", "Batticaloa", "Jaffna")
+TOWNS = ("Colombo", "Kandy", "Galle", "Matara", "Kurunegala", "Ratnapura",
+         "Anuradhapura", "Badulla", "Negombo", "Jaffna")
+
+
+def api_key_for(user_id):
+    return STUB_API_KEY if user_id == ADMIN_USER_ID else f"stub-key-{user_id}"
+
+
+def lorry_number_for(n):
+    return f"WP-CAB-{n:04d}"
+
+
+def _timestamp(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _ref(entity_id, name):
+    return {"id": entity_id, "name": name}
+
+
+def _custom_fields(values):
+    return [{"id": field_id, "name": CUSTOM_FIELDS[field_id], "value": value} for field_id, value in values.items()]
+
+
+def seed_dataset(users=40, mls=200, tpls=600, complaints=100, appointments=40, me_appointments=40,
+                 now=None, seed=0):
+    """Build a deterministic dataset for ``StubRedmine``.
+
+    User 1 is the GSMB management account holding ``STUB_API_KEY``; the rest
+    cycle through ML owners, GSMB officers, police officers and mining
+    engineers, with every tenth one locked. TPLs are spread over
+    ``tpls // 3`` lorry numbers (see ``lorry_number_for``) and stay valid
+    for 16 hours from ``now``.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc).replace(microsecond=0)
+    dataset = {"users": {}, "issues": {}, "attachments": {}, "memberships": []}
+
+    def user(user_id, user_type, locked=False):
+        firstname = "Admin" if user_type is None else user_type
+        record = {
+            "id": user_id,
+            "login": f"user{user_id}",
+            "firstname": firstname,
+            "lastname": f"User{user_id}",
+            "mail": f"user{user_id}@example.com",
+            "status": 3 if locked else 1,
+            "admin": user_id == ADMIN_USER_ID,
+            "api_key": api_key_for(user_id),
+            "created_on": _timestamp(now - timedelta(days=365)),
+            "last_login_on": _timestamp(now - timedelta(days=1)),
+            "custom_fields": [
+                {"id": 41, "name": "User Type", "value": user_type or "gsmbManagement"},
+                {"id": 42, "name": "Mobile Number", "value": f"0771{user_id:06d}"},
+                {"id": 43, "name": "National Identity Card", "value": f"{199000000000 + user_id}"},
+                {"id": 44, "name": "Designation", "value": firstname},
+                {"id": 45, "name": "work ID", "value": f"W{user_id:05d}"},
+                {"id": 46, "name": "NIC front image", "value": ""},
+                {"id": 47, "name": "NIC back image", "value": ""},
+            ],
+        }
+        dataset["users"][user_id] = record
+        role = "GSMBManagement" if user_type is None else USER_TYPES[user_type]
+        dataset["memberships"].append({
+            "id": len(dataset["memberships"]) + 1,
+            "project": _ref(1, "GSMB"),
+            "user": _ref(user_id, f"{firstname} User{user_id}"),
+            "roles": [_ref(ROLE_IDS[role], role)],
+        })
+
+    user(ADMIN_USER_ID, None)
+    user_types = list(USER_TYPES)
+    for user_id in range(2, users + 1):
+        user(user_id, user_types[(user_id - 2) % len(user_types)], locked=user_id % 10 == 0)
+
+    def ids_of(user_type):
+        return [u["id"] for u in dataset["users"].values()
+                if u["custom_fields"][0]["value"] == user_type and u["status"] == 1] or [ADMIN_USER_ID]
+
+    owners, officers, engineers = ids_of("mlOwner"), ids_of("gsmbOfficer"), ids_of("miningEngineer")
+    next_id = iter(range(1, 10 ** 9))
+
+    def issue(tracker_id, status_id, assigned_to_id, custom_fields, created_on, estimated_hours=None, **extra):
+        issue_id = next(next_id)
+        assignee = dataset["users"][assigned_to_id]
+        record = {
+            "id": issue_id,
+            "project": _ref(1, "GSMB"),
+            "tracker": _ref(tracker_id, TRACKERS[tracker_id]),
+            "status": {"id": status_id, "name": STATUSES[status_id][0], "is_closed": STATUSES[status_id][1]},
+            "priority": _ref(2, "Normal"),
+            "author": _ref(ADMIN_USER_ID, "Admin User1"),
+            "assigned_to": _ref(assigned_to_id, f"{assignee['firstname']} {assignee['lastname']}"),
+            "subject": f"{TRACKERS[tracker_id]} {issue_id}",
+            "description": "",
+            "start_date": created_on.date().isoformat(),
+            "due_date": (created_on + timedelta(days=365)).date().isoformat(),
+            "done_ratio": 0,
+            "estimated_hours": estimated_hours,
+            "custom_fields": _custom_fields(custom_fields),
+            "created_on": _timestamp(created_on),
+            "updated_on": _timestamp(created_on),
+            "closed_on": _timestamp(created_on) if STATUSES[status_id][1] else None,
+            **extra,
+        }
+        dataset["issues"][issue_id] = record
+        return record
+
+    license_numbers = []
+    for n in range(mls):
+        created_on = now - timedelta(days=rng.randint(1, 700))
+        values = {
+            18: str(rng.randint(10, 1000) * 100000),
+            19: f"EXP/{n:04d}",
+            28: f"Land {n}",
+            29: f"Owner {n}",
+            30: f"Village {n % 50}",
+            31: f"GN {n % 30}",
+            32: f"DS {n % 20}",
+            33: rng.choice(DISTRICTS),
+            34: str(rng.randint(1000, 10000)),
+            63: str(rng.randint(0, 500)),
+            64: str(rng.randint(500, 10000)),
+            66: f"0712{n:06d}",
+            92: f"https://maps.example.com/?q={n}",
+            99: str(rng.randint(50, 500)),
+            101: "",
+        }
+        for field_id in ML_FILE_FIELDS:
+            attachment_id = 100000 + len(dataset["attachments"]) + 1
+            filename = f"{CUSTOM_FIELDS[field_id].lower().replace(' ', '_')}_{n}.pdf"
+            dataset["attachments"][attachment_id] = {
+                "id": attachment_id,
+                "filename": filename,
+                "filesize": 2048,
+                "content_type": "application/pdf",
+                "description": "",
+                "author": _ref(ADMIN_USER_ID, "Admin User1"),
+                "created_on": _timestamp(created_on),
+            }
+            values[field_id] = str(attachment_id)
+        status_id = rng.choice((7, 7, 7, 26, 31, 34, 6))
+        record = issue(ML_TRACKER, status_id, owners[n % len(owners)], values, created_on)
+        license_number = f"LLL/100/{record['id']}"
+        next(f for f in record["custom_fields"] if f["id"] == 101)["value"] = license_number
+        record["subject"] = license_number
+        if status_id == 7:
+            license_numbers.append((license_number, record["assigned_to"]["id"]))
+    license_numbers = license_numbers or [("LLL/100/0", owners[0])]
+
+    lorry_count = max(1, tpls // 3)
+    for n in range(tpls):
+        license_number, owner_id = license_numbers[n % len(license_numbers)]
+        # Most TPLs were issued long ago and have expired; the newest one per lorry is live.
+        live = n >= tpls - lorry_count
+        created_on = now - (timedelta(hours=1) if live else timedelta(days=rng.randint(2, 365)))
+        values = {
+            53: lorry_number_for(n % lorry_count),
+            54: f"0763{n:06d}",
+            55: rng.choice(TOWNS),
+            56: "",
+            57: "",
+            58: str(rng.randint(1, 10)),
+            59: license_number,
+            68: rng.choice(TOWNS),
+        }
+        issue(TPL_TRACKER, 8, owner_id, values, created_on, estimated_hours=16)
+
+    for n in range(complaints):
+        created_on = now - timedelta(days=rng.randint(0, 365))
+        values = {66: f"0701{n:06d}", 53: lorry_number_for(rng.randrange(lorry_count)), 67: "Public"}
+        issue(COMPLAINT_TRACKER, rng.choice((1, 2, 3, 6)), officers[n % len(officers)], values, created_on)
+
+    for tracker_id, count, status_id, assignees in (
+        (APPOINTMENT_TRACKER, appointments, 34, officers),
+        (ME_APPOINTMENT_TRACKER, me_appointments, 31, engineers),
+    ):
+        for n in range(count):
+            license_number, _ = license_numbers[n % len(license_numbers)]
+            created_on = now - timedelta(days=rng.randint(0, 60))
+            values = {101: license_number, 92: f"https://maps.example.com/?q=a{n}"}
+            issue(tracker_id, status_id, assignees[n % len(assignees)], values, created_on)
+
+    dataset["next_issue_id"] = next(next_id)
+    return dataset
+
+
+def _int_param(query, name, default):
+    value = query.get(name, [""])[0]
+    return int(value) if value.isdigit() else default
+
+
+def _status_matches(status_filter, status):
+    """Redmine's status_id filter: open (default), closed, *, ids joined by | and negation with !."""
+    if status_filter in (None, "", "open"):
+        return not status["is_closed"]
+    if status_filter == "closed":
+        return status["is_closed"]
+    if status_filter == "*":
+        return True
+    negate = status_filter.startswith("!")
+    wanted = {int(s) for s in status_filter.lstrip("!").split("|") if s.isdigit()}
+    return (status["id"] in wanted) != negate
+
+
+def _date_matches(date_filter, value):
+    """``>=t``, ``<=t`` or ``><a|b`` on an ISO timestamp, compared as strings like Redmine's API does."""
+    if not date_filter:
+        return True
+    if value is None:
+        return False
+    if date_filter.startswith(">="):
+        return value >= date_filter[2:]
+    if date_filter.startswith("<="):
+        return value <= date_filter[2:]
+    if date_filter.startswith("><"):
+        low, _, high = date_filter[2:].partition("|")
+        return low <= value[:len(low)] and value[:len(high)] <= high
+    return value.startswith(date_filter)
+
+
+def _value_matches(value_filter, value):
+    value = "" if value is None else str(value)
+    if value_filter.startswith("~"):
+        return value_filter[1:].lower() in value.lower()
+    if value_filter.startswith("!"):
+        return value != value_filter[1:]
+    return value in value_filter.split("|")
+
+
+def _page(items, query, key):
+    offset = _int_param(query, "offset", 0)
+    limit = min(_int_param(query, "limit", 25), MAX_PAGE_SIZE)
+    return {key: items[offset:offset + limit], "total_count": len(items), "offset": offset, "limit": limit}
+
+
+class StubRedmine:
+    """Threaded HTTP server over a ``seed_dataset`` dataset, with injected latency.
+
+    ``requests`` counts every request served and ``calls`` breaks that down
+    by ``"METHOD /path"`` with numeric path segments folded to ``:id``.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=150, dataset=None, jitter_ms=0, seed=0):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.data = dataset if dataset is not None else seed_dataset(seed=seed)
+        self.requests = 0
+        self.calls = Counter()
+        self._count_lock = threading.Lock()
+        self._data_lock = threading.RLock()
+        self._random = random.Random(seed)
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_counts(self):
+        """Zero the counters and return the calls recorded since the last reset."""
+        with self._count_lock:
+            calls, self.calls = self.calls, Counter()
+            self.requests = 0
+        return calls
+
+    def record(self, method, path):
+        with self._count_lock:
+            self.requests += 1
+            self.calls[f"{method} {NUMERIC_SEGMENT.sub('/:id', path)}"] += 1
+
+    def delay(self):
+        if self.jitter:
+            with self._count_lock:
+                extra = self._random.uniform(0, self.jitter)
+        else:
+            extra = 0.0
+        time.sleep(self.latency + extra)
+
+    def user_for_key(self, api_key):
+        if not api_key:
+            return None
+        match = re.fullmatch(r"stub-key-(\d+)", api_key)
+        user_id = ADMIN_USER_ID if api_key == STUB_API_KEY else int(match.group(1)) if match else None
+        return self.data["users"].get(user_id)
+
+    def route(self, method, path, query, body=None, api_key=STUB_API_KEY):
+        """Return ``(status, body)`` for a request; ``body`` may be a dict, bytes or None."""
+        current_user = self.user_for_key(api_key)
+        if current_user is None:
+            return 401, None
+
+        with self._data_lock:
+            if method == "GET":
+                return self._get(path, query, current_user)
+            if method == "POST":
+                return self._post(path, body or {}, current_user)
+            if method == "PUT":
+                return self._put(path, body or {})
+            if method == "DELETE":
+                return 204, None
+        return 405, None
+
+    def _get(self, path, query, current_user):
+        match = re.fullmatch(r"/users/(\d+|current)\.json", path)
+        if match:
+            user = current_user if match.group(1) == "current" else self.data["users"].get(int(match.group(1)))
+            return (200, {"user": user}) if user else (404, None)
+
+        if path == "/users.json":
+            return 200, _page(self._users(query), query, "users")
+
+        match = re.fullmatch(r"/issues/(\d+)\.json", path)
+        if match:
+            issue = self.data["issues"].get(int(match.group(1)))
+            if issue is None:
+                return 404, None
+            if "attachments" in query.get("include", [""])[0]:
+                issue = {**issue, "attachments": self._attachments_of(issue)}
+            return 200, {"issue": issue}
+
+        if re.fullmatch(r"(/projects/[\w-]+)?/issues\.json", path):
+            return 200, _page(self._issues(query, current_user), query, "issues")
+
+        if re.fullmatch(r"/projects/[\w-]+/memberships\.json", path):
+            return 200, _page(self.data["memberships"], query, "memberships")
+
+        if path == "/issue_statuses.json":
+            return 200, {"issue_statuses": [{"id": status_id, "name": name, "is_closed": is_closed}
+                                            for status_id, (name, is_closed) in STATUSES.items()]}
+
+        match = re.fullmatch(r"/attachments/(\d+)\.json", path)
+        if match:
+            attachment = self.data["attachments"].get(int(match.group(1)))
+            return (200, {"attachment": self._attachment_view(attachment)}) if attachment else (404, None)
+
+        match = re.fullmatch(r"/attachments/download/(\d+)/.*", path)
+        if match:
+            attachment = self.data["attachments"].get(int(match.group(1)))
+            return (200, b"%PDF-1.4 stub\n" * 64) if attachment else (404, None)
+
+        return 200, {}
+
+    def _post(self, path, body, current_user):
+        if path == "/uploads.json":
+            token = f"{self.data['next_issue_id']}.stub"
+            self.data["next_issue_id"] += 1
+            return 201, {"upload": {"id": self.data["next_issue_id"], "token": token}}
+
+        if re.fullmatch(r"(/projects/[\w-]+)?/issues\.json", path):
+            fields = body.get("issue", {})
+            tracker_id = int(fields.get("tracker_id") or ML_TRACKER)
+            status_id = int(fields.get("status_id") or 1)
+            if tracker_id not in TRACKERS or status_id not in STATUSES:
+                return 422, {"errors": ["Tracker or status is invalid"]}
+            assigned_to_id = int(fields.get("assigned_to_id") or current_user["id"])
+            assignee = self.data["users"].get(assigned_to_id, current_user)
+            now = _timestamp(datetime.now(timezone.utc))
+            issue_id = self.data["next_issue_id"]
+            self.data["next_issue_id"] += 1
+            issue = {
+                "id": issue_id,
+                "project": _ref(1, "GSMB"),
+                "tracker": _ref(tracker_id, TRACKERS[tracker_id]),
+                "status": {"id": status_id, "name": STATUSES[status_id][0], "is_closed": STATUSES[status_id][1]},
+                "priority": _ref(2, "Normal"),
+                "author": _ref(current_user["id"], f"{current_user['firstname']} {current_user['lastname']}"),
+                "assigned_to": _ref(assignee["id"], f"{assignee['firstname']} {assignee['lastname']}"),
+                "subject": fields.get("subject", ""),
+                "description": fields.get("description", ""),
+                "start_date": fields.get("start_date"),
+                "due_date": fields.get("due_date"),
+                "done_ratio": 0,
+                "estimated_hours": fields.get("estimated_hours"),
+                "custom_fields": [
+                    {"id": cf["id"], "name": CUSTOM_FIELDS.get(cf["id"], cf.get("name", "")), "value": cf.get("value")}
+                    for cf in fields.get("custom_fields", [])
+                ],
+                "created_on": now,
+                "updated_on": now,
+                "closed_on": None,
+            }
+            self.data["issues"][issue_id] = issue
+            return 201, {"issue": issue}
+
+        return 201, {}
+
+    def _put(self, path, body):
+        match = re.fullmatch(r"/issues/(\d+)\.json", path)
+        if not match:
+            return 204, None
+        issue = self.data["issues"].get(int(match.group(1)))
+        if issue is None:
+            return 404, None
+
+        fields = body.get("issue", {})
+        updated = dict(issue)
+        if "status_id" in fields:
+            status_id = int(fields["status_id"])
+            if status_id not in STATUSES:
+                return 422, {"errors": ["Status is invalid"]}
+            name, is_closed = STATUSES[status_id]
+            updated["status"] = {"id": status_id, "name": name, "is_closed": is_closed}
+        if "estimated_hours" in fields:
+            updated["estimated_hours"] = fields["estimated_hours"]
+        if fields.get("assigned_to_id") in self.data["users"]:
+            assignee = self.data["users"][fields["assigned_to_id"]]
+            updated["assigned_to"] = _ref(assignee["id"], f"{assignee['firstname']} {assignee['lastname']}")
+        if fields.get("custom_fields"):
+            values = {cf["id"]: cf.get("value") for cf in fields["custom_fields"]}
+            updated["custom_fields"] = [
+                {**cf, "value": values[cf["id"]]} if cf["id"] in values else cf for cf in issue["custom_fields"]
+            ]
+        updated["updated_on"] = _timestamp(datetime.now(timezone.utc))
+        self.data["issues"][issue["id"]] = updated
+        return 204, None
+
+    def _users(self, query):
+        status = query.get("status", ["1"])[0]
+        name = query.get("name", [""])[0].lower()
+        users = [
+            user for user in self.data["users"].values()
+            if (not status or str(user["status"]) == status)
+            and (not name or name in f"{user['login']} {user['firstname']} {user['lastname']} {user['mail']}".lower())
+        ]
+        return sorted(users, key=lambda u: u["id"])
+
+    def _issues(self, query, current_user):
+        def param(name):
+            return query.get(name, [None])[0]
+
+        tracker_id = param("tracker_id")
+        assigned_to_id = param("assigned_to_id")
+        if assigned_to_id == "me":
+            assigned_to_id = str(current_user["id"])
+        issue_ids = {int(i) for i in (param("issue_id") or "").split(",") if i.isdigit()}
+        cf_filters = {int(k[3:]): v[0] for k, v in query.items() if re.fullmatch(r"cf_\d+", k)}
+
+        issues = []
+        for issue in self.data["issues"].values():
+            if tracker_id and str(issue["tracker"]["id"]) not in tracker_id.split("|"):
+                continue
+            if not _status_matches(param("status_id"), issue["status"]):
+                continue
+            if assigned_to_id and not _value_matches(assigned_to_id, (issue.get("assigned_to") or {}).get("id")):
+                continue
+            if param("author_id") and not _value_matches(param("author_id"), issue["author"]["id"]):
+                continue
+            if issue_ids and issue["id"] not in issue_ids:
+                continue
+            if param("subject") and not _value_matches(param("subject"), issue["subject"]):
+                continue
+            if not _date_matches(param("updated_on"), issue["updated_on"]):
+                continue
+            if not _date_matches(param("created_on"), issue["created_on"]):
+                continue
+            if not _date_matches(param("due_date"), issue["due_date"]):
+                continue
+            values = {cf["id"]: cf.get("value") for cf in issue["custom_fields"]}
+            if any(not _value_matches(v, values.get(field_id)) for field_id, v in cf_filters.items()):
+                continue
+            issues.append(issue)
+
+        for sort_key in reversed((param("sort") or "id:desc").split(",")):
+            column, _, direction = sort_key.partition(":")
+            issues.sort(key=lambda i: (i.get(column) is None, i.get(column) or 0), reverse=direction == "desc")
+        return issues
+
+    def _attachment_view(self, attachment):
+        return {
+            **attachment,
+            "content_url": f"{self.url}/attachments/download/{attachment['id']}/{attachment['filename']}",
+        }
+
+    def _attachments_of(self, issue):
+        ids = [int(cf["value"]) for cf in issue["custom_fields"] if str(cf.get("value") or "").isdigit()]
+        return [self._attachment_view(self.data["attachments"][i]) for i in ids if i in self.data["attachments"]]
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self):
+                parsed = urlparse(self.path)
+                stub.record(self.command, parsed.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                stub.delay()
+
+                try:
+                    body = json.loads(raw) if raw and "json" in (self.headers.get("Content-Type") or "") else None
+                except ValueError:
+                    body = None
+                api_key = self.headers.get("X-Redmine-API-Key") or parse_qs(parsed.query).get("key", [None])[0]
+                if api_key is None and self.headers.get("Authorization", "").startswith("Basic "):
+                    # Basic-auth logins are answered as the admin account.
+                    api_key = STUB_API_KEY
+                status, payload = stub.route(self.command, parsed.path, parse_qs(parsed.query), body, api_key)
+
+                if isinstance(payload, bytes):
+                    content_type = "application/octet-stream"
+                else:
+                    content_type = "application/json"
+                    payload = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _serve
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=int, default=150)
+    parser.add_argument("--jitter-ms", type=int, default=0)
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--ml", type=int, default=200)
+    parser.add_argument("--tpl", type=int, default=600)
+    parser.add_argument("--complaints", type=int, default=100)
+    parser.add_argument("--appointments", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = seed_dataset(args.users, args.ml, args.tpl, args.complaints, args.appointments,
+                           args.appointments, seed=args.seed)
+    stub = StubRedmine(args.host, args.port, args.latency_ms, dataset, args.jitter_ms, args.seed)
+    print(f"Stub Redmine listening on {stub.url} ({args.latency_ms} ms per request, "
+          f"{len(dataset['users'])} users, {len(dataset['issues'])} issues)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from functools import wraps
+
+from flask import make_response, request
+
+
+def conditional_response(f):
+    """Decorator that tags a successful GET response with a strong ETag and answers 304 on a match.
+
+    The ETag is a digest of the response body, so it changes exactly when the
+    data does. Clients polling an unchanged list get ``304 Not Modified`` with
+    no body. Responses are marked private and must be revalidated, and vary on
+    the Authorization header because each user sees different data.
+    Put it under ``check_token``/``role_required`` so a 304 is only sent to an
+    authorized caller.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = make_response(f(*args, **kwargs))
+        if request.method != 'GET' or response.status_code != 200:
+            return response
+
+        response.add_etag()
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.vary.add('Authorization')
+        return response.make_conditional(request)
+
+    return decorated_function
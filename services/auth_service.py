@@ -1,4 +1,5 @@
 import requests
+from utils import redmine_client
 from dotenv import load_dotenv
 import os
 from google.auth.transport import requests as google_requests
@@ -12,6 +13,8 @@ from email.mime.text import MIMEText
 from services.cache import cache  
 import logging
 from utils.constants import CONTENT_TYPE_JSON
+from utils.jwt_utils import JWTUtils
+from utils.ttl_cache import TTLCache
 
 
 
@@ -25,12 +28,37 @@ REDMINE_ADMIN_API_KEY = os.getenv("REDMINE_ADMIN_API_KEY")
 class AuthService:
     ENCRYPTION_KEY = Fernet.generate_key()  # Generate only once and store safely
     cipher = Fernet(ENCRYPTION_KEY)
+
+    # Readiness result, held briefly so probes don't each hit Redmine
+    _readiness_cache = TTLCache(maxsize=1, ttl=Config.READINESS_CACHE_SECONDS)
+
+    @staticmethod
+    def check_readiness():
+        """Return ``(ready, reason)``: configuration is present and Redmine answers the admin key."""
+        def probe():
+            redmine_url = os.getenv("REDMINE_URL")
+            admin_key = os.getenv("REDMINE_ADMIN_API_KEY")
+            if not redmine_url or not admin_key or not Config.SECRET_KEY:
+                return False, "Missing REDMINE_URL, REDMINE_ADMIN_API_KEY or SECRET_KEY"
+            try:
+                response = redmine_client.get(
+                    f"{redmine_url}/users/current.json",
+                    headers={"X-Redmine-API-Key": admin_key},
+                    timeout=(Config.REDMINE_CONNECT_TIMEOUT, 5)
+                )
+            except requests.exceptions.RequestException as e:
+                return False, f"Redmine unreachable: {e}"
+            if response.status_code != 200:
+                return False, f"Redmine returned {response.status_code}"
+            return True, None
+
+        return AuthService._readiness_cache.get_or_load("readiness", probe, should_cache=lambda result: True)
     
     @staticmethod
     def authenticate_user(username, password):
         try:
             # Authenticate user and get current user info
-            response = requests.get(
+            response = redmine_client.get(
                 f"{REDMINE_URL}/users/current.json?include=memberships,groups",
                 auth=(username, password)
             )
@@ -82,7 +110,7 @@ class AuthService:
                 return None, "Email not found in Google token"
 
             # Get User ID from Redmine
-            users_response = requests.get(
+            users_response = redmine_client.get(
                 f"{REDMINE_URL}/users.json",
                 params={"mail": email},
                 headers={"X-Redmine-API-Key": REDMINE_API_KEY}
@@ -96,7 +124,7 @@ class AuthService:
             user_data = users_response.json()['users'][0] 
 
             # Get User Role from Redmine Memberships
-            memberships_response = requests.get(
+            memberships_response = redmine_client.get(
               
                 f"{REDMINE_URL}/projects/mmpro-gsmb/memberships.json",
                 headers={"X-Redmine-API-Key": REDMINE_API_KEY}
@@ -146,7 +174,7 @@ class AuthService:
                 return None, "Email not found in access token"
 
             # Proceed with the same logic for fetching user info from Redmine
-            users_response = requests.get(
+            users_response = redmine_client.get(
                 f"{REDMINE_URL}/users.json",
                 params={"mail": email},
                 headers={"X-Redmine-API-Key": REDMINE_API_KEY}
@@ -171,7 +199,7 @@ class AuthService:
             
             
 
-            memberships_response = requests.get(
+            memberships_response = redmine_client.get(
               
                 f"{REDMINE_URL}/projects/GSMB/memberships.json",
                 headers={"X-Redmine-API-Key": REDMINE_API_KEY}
@@ -245,7 +273,7 @@ class AuthService:
         
         try:
             # Make a GET request to the Redmine API
-            response = requests.get(url, params=params)
+            response = redmine_client.get(url, params=params)
             response.raise_for_status()  # Raise an exception for HTTP errors
             
             # Parse the JSON response
@@ -296,7 +324,7 @@ class AuthService:
             return {'error': 'Invalid or expired token'}
         
         try:
-            users_response = requests.get(
+            users_response = redmine_client.get(
                 f"{REDMINE_URL}/users.json",
                 params={"mail": email},
                 headers={"X-Redmine-API-Key": REDMINE_API_KEY}
@@ -325,8 +353,9 @@ class AuthService:
         }
 
         try:
-            response = requests.put(update_url, headers=headers, json=payload)
+            response = redmine_client.put(update_url, headers=headers, json=payload)
             response.raise_for_status()  # Raise an exception for HTTP errors
+            JWTUtils.invalidate_api_key(user_id)
             print(f"Password updated successfully for user {email}")
             return {'success': True}
         except requests.exceptions.RequestException as e:
@@ -383,7 +412,7 @@ class AuthService:
             }
         }
 
-        response = requests.post(url, headers=headers, json=payload)
+        response = redmine_client.post(url, headers=headers, json=payload)
 
         if response.status_code in [200, 201]:
             return response.json(), None
@@ -416,7 +445,7 @@ class AuthService:
             }
 
             # Make the API call to add the user to the project with the role
-            response = requests.post(
+            response = redmine_client.post(
                 f"{REDMINE_URL}/projects/1/memberships.json",  # Ensure the project ID is correct
                 headers={"X-Redmine-API-Key": REDMINE_API_KEY},
                 json=membership_data
@@ -425,6 +454,7 @@ class AuthService:
             if response.status_code != 201:
                 return None, f"Failed to create membership: {response.text}"
 
+            JWTUtils.invalidate_api_key(user_id)
             return response.json(), None
 
         except Exception as e:
@@ -447,7 +477,7 @@ class AuthService:
             }
             
             # Call Redmine API to create user
-            response = requests.post(f"{REDMINE_URL}/users.json", json={"user": user_payload}, headers={"X-Redmine-API-Key": API_KEY})
+            response = redmine_client.post(f"{REDMINE_URL}/users.json", json={"user": user_payload}, headers={"X-Redmine-API-Key": API_KEY})
             
             if response.status_code != 201:
                 return None, response.json()
@@ -457,12 +487,12 @@ class AuthService:
             # Upload file attachments if available
             if attachments:
                 for custom_field_id, file_path in attachments.items():
-                    upload_response = requests.post(f"{REDMINE_URL}/uploads.json", files={"file": open(file_path, "rb")}, headers={"X-Redmine-API-Key": API_KEY})
+                    upload_response = redmine_client.post(f"{REDMINE_URL}/uploads.json", files={"file": open(file_path, "rb")}, headers={"X-Redmine-API-Key": API_KEY})
                     
                     if upload_response.status_code == 201:
                         token = upload_response.json()["upload"]["token"]
                         update_payload = {"user": {"custom_fields": [{"id": custom_field_id, "value": token}]}}
-                        requests.put(f"{REDMINE_URL}/users/{user_id}.json", json=update_payload, headers={"X-Redmine-API-Key": API_KEY})
+                        redmine_client.put(f"{REDMINE_URL}/users/{user_id}.json", json=update_payload, headers={"X-Redmine-API-Key": API_KEY})
             
             return response.json(), None
         
@@ -486,7 +516,7 @@ class AuthService:
         }
 
 
-        response = requests.post(url, headers=headers, data=file.stream)
+        response = redmine_client.post(url, headers=headers, data=file.stream)
 
         if response.status_code == 201:
              return response.json().get("upload", {}).get("id")   # Attachment ID
@@ -502,7 +532,7 @@ class AuthService:
             return {'success': False, 'error': 'Email is required'}
 
         try:
-            users_response = requests.get(
+            users_response = redmine_client.get(
                 f"{REDMINE_URL}/users.json",
                 params={"mail": email},
                 headers={"X-Redmine-API-Key": REDMINE_API_KEY}
@@ -531,8 +561,9 @@ class AuthService:
         }
 
         try:
-            response = requests.put(update_url, headers=headers, json=payload)
+            response = redmine_client.put(update_url, headers=headers, json=payload)
             response.raise_for_status()  # Raise an exception for HTTP errors
+            JWTUtils.invalidate_api_key(user_id)
             print(f"Password updated successfully for user {email}")
             return {'success': True}
         except requests.exceptions.RequestException as e:
@@ -1,8 +1,10 @@
 import os
 import requests
+from utils import redmine_client
 from dotenv import load_dotenv
 from twilio.rest import Client
 from services.cache import cache
+from utils.tpl_index import tpl_index
 from datetime import datetime, timedelta, timezone
 import secrets
 from utils.constants import REDMINE_API_ERROR_MSG,CONTENT_TYPE_JSON
@@ -28,42 +30,7 @@ class GeneralPublicService:
             if not REDMINE_URL or not api_key:
                 return None, REDMINE_API_ERROR_MSG
             
-            headers = {"X-Redmine-API-Key": api_key}
-            tpl_params = {"tracker_id": 5}
-            tpl_response = requests.get(f"{REDMINE_URL}/issues.json", params=tpl_params, headers=headers)
-            
-            if tpl_response.status_code != 200:
-                return None, f"Failed to fetch TPL issues: {tpl_response.status_code} - {tpl_response.text}"
-            
-            tpl_issues = tpl_response.json().get("issues", [])
-            lorry_number_lower = lorry_number.lower()
-            current_time = datetime.now(timezone.utc)
-
-            def issue_has_lorry_number(issue):
-                return any(
-                    cf["id"] == 53 and cf.get("value") and cf["value"].lower() == lorry_number_lower
-                    for cf in issue.get("custom_fields", [])
-                )
-
-            def license_is_valid(issue):
-                created_on_str = issue.get("created_on")
-                if not created_on_str:
-                    return False
-                
-                try:
-                    created_on = datetime.strptime(created_on_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                    estimated_hours = issue.get("estimated_hours", 0)
-                    expiration_time = created_on + timedelta(hours=estimated_hours)
-                    return current_time < expiration_time
-                except Exception as e:
-                    print(f"Error processing issue {issue.get('id')}: {str(e)}")
-                    return False
-
-            for issue in tpl_issues:
-                if issue_has_lorry_number(issue) and license_is_valid(issue):
-                    return True, None
-            
-            return False, None
+            return tpl_index.has_valid(lorry_number, datetime.now(timezone.utc))
         except Exception as e:
             return None, f"Server error: {str(e)}"
 
@@ -128,7 +95,7 @@ class GeneralPublicService:
         
         api_key = API_KEY
 
-        response = requests.post(
+        response = redmine_client.post(
             f'{REDMINE_URL}/issues.json',
             json=issue_data,
             headers={'X-Redmine-API-Key': api_key, 'Content-Type': CONTENT_TYPE_JSON}
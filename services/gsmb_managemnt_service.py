@@ -1,9 +1,16 @@
+import heapq
 import requests
+from utils import redmine_client
 import os
 from dotenv import load_dotenv
 from utils.jwt_utils import JWTUtils
 from flask import jsonify
 from utils.limit_utils import LimitUtils    
+from utils.dashboard_cache import dashboard_cached
+from utils.issue_replica import issue_replica
+from utils.issue_model import Issue, parse_issues
+from utils.ttl_cache import TTLCache
+from config import Config
 from utils.constants import REDMINE_API_ERROR_MSG,API_KEY_MISSING_ERROR,CONTENT_TYPE_JSON
 
 
@@ -16,27 +23,118 @@ USER_TYPE_FIELD = "User Type"
 WORK_ID_FIELD = "work ID"
 
 class GsmbManagmentService:
+    ML_PARAMS = {"project_id": 1, "tracker_id": 4}
+    TPL_PARAMS = {"project_id": 1, "tracker_id": 5}
+    COMPLAINT_PARAMS = {"project_id": 1, "tracker_id": 6}
+
+    # Issue status name -> id, per Redmine instance; statuses change only through admin config
+    _status_ids_cache = TTLCache(maxsize=8, ttl=Config.ISSUE_STATUS_CACHE_TTL)
+
+    @staticmethod
+    def _replica_ready(tracker_id):
+        """True when tracker reads should come from the local replica.
+
+        The replica is synced with the admin key, so it shows every issue
+        regardless of the caller's Redmine permissions. That is only right
+        here: every route of this service sits behind
+        ``role_required(['GSMBManagement'])``, and management sees the whole
+        tracker anyway. Do not read the replica from other services.
+        """
+        return Config.ISSUE_REPLICA_ENABLED and tracker_id is not None and issue_replica.is_ready(tracker_id)
+
+    @staticmethod
+    def _fetch_all(redmine_url, headers, path, key="issues", params=None):
+        # Tracker reads come from the local replica when it is enabled and current.
+        if key == "issues" and GsmbManagmentService._replica_ready((params or {}).get("tracker_id")):
+            return issue_replica.issues(**params), None
+
+        items, response = redmine_client.get_all_pages(
+            f"{redmine_url}/{path}", key=key, params=params, headers=headers
+        )
+        if response is not None:
+            return None, f"Failed to fetch {key}: {response.status_code} - {response.text}"
+        return items, None
+
+    @staticmethod
+    def _summarize_tracker(redmine_url, headers, params, summarize):
+        """Run ``summarize`` over every issue of a tracker as its pages arrive.
+
+        Only the pages in flight are held in memory, never the whole tracker.
+        """
+        if GsmbManagmentService._replica_ready(params["tracker_id"]):
+            return summarize(issue_replica.issues(**params)), None
+
+        issues, response = redmine_client.stream_pages(f"{redmine_url}/issues.json", params=params, headers=headers)
+        if response is None:
+            try:
+                return summarize(issues), None
+            except redmine_client.PageFetchError as e:
+                response = e.response
+        return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
+
     @staticmethod
-    def _fetch_issues_page(redmine_url, headers, params):
-        response = requests.get(f"{redmine_url}/issues.json", headers=headers, params=params)
-        if response.status_code != 200:
-            raise RuntimeError(f"Failed to fetch issues: {response.status_code} - {response.text}")
-        return response.json().get("issues", [])
+    def _status_ids(redmine_url, headers):
+        def load():
+            response = redmine_client.get(f"{redmine_url}/issue_statuses.json", headers=headers)
+            if response.status_code != 200:
+                return None
+            return {s["name"]: s["id"] for s in response.json().get("issue_statuses", [])}
+
+        return GsmbManagmentService._status_ids_cache.get_or_load(redmine_url, load)
+
+    @staticmethod
+    def _count_by_status(redmine_url, headers, params, status_names):
+        """Issue counts per status name plus ``total``, open and closed alike.
+
+        Each status is one ``limit=1`` request reading ``total_count``, run
+        concurrently; the replica answers instead when it is current.
+        """
+        if GsmbManagmentService._replica_ready(params["tracker_id"]):
+            issues = issue_replica.issues(**params, include_closed=True)
+            counts = {name: 0 for name in status_names}
+            for issue in issues:
+                name = issue.get("status", {}).get("name")
+                if name in counts:
+                    counts[name] += 1
+            counts["total"] = len(issues)
+            return counts, None
+
+        status_ids = GsmbManagmentService._status_ids(redmine_url, headers)
+        if status_ids is None:
+            return None, "Failed to fetch issue statuses"
+
+        # Statuses this Redmine does not define have no issues to count.
+        buckets = {name: {**params, "status_id": status_ids[name]}
+                   for name in status_names if name in status_ids}
+        buckets["total"] = {**params, "status_id": "*"}
+        counts, response = redmine_client.count_buckets(f"{redmine_url}/issues.json", buckets, headers=headers)
+        if response is not None:
+            return None, f"Failed to count issues: {response.status_code} - {response.text}"
+        return {**{name: 0 for name in status_names}, **counts}, None
 
     @staticmethod
     def _process_issue(issue, monthly_data):
-        custom_fields = issue.get("custom_fields", [])
-        cube_field = next((f for f in custom_fields if f.get("id") == 58 and f.get("name") == "Cubes"), None)
-        if not cube_field or not cube_field.get("value"):
+        issue = Issue.parse(issue)
+        cubes = issue.cubes if issue.has_field(58) else None
+        if not cubes:
             return
-        issue_date = issue.get("created_on")
+        issue_date = issue.created_on
         if not issue_date:
             return
         month_index = int(issue_date[5:7]) - 1
         month_name = list(monthly_data.keys())[month_index]
-        monthly_data[month_name] += float(cube_field["value"])
+        monthly_data[month_name] += cubes
+
+    @staticmethod
+    def summarize_monthly_sand_cubes(tpl_issues):
+        monthly_data = {m: 0 for m in ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                                      "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]}
+        for issue in tpl_issues:
+            GsmbManagmentService._process_issue(issue, monthly_data)
+        return [{"month": month, "totalCubes": monthly_data[month]} for month in monthly_data]
 
     @staticmethod
+    @dashboard_cached
     def monthly_total_sand_cubes(token):
         try:
             REDMINE_URL = os.getenv("REDMINE_URL")
@@ -46,34 +144,14 @@ class GsmbManagmentService:
             if not api_key:
                 return None, API_KEY_MISSING_ERROR
 
-            params = {"project_id": 1, "tracker_id": 5}  # TPL
             headers = {"X-Redmine-API-Key": api_key, "Content-Type": CONTENT_TYPE_JSON}
-            monthly_data = {m: 0 for m in ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-                                          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]}
-            offset = 0
-
-            while True:
-                params["offset"] = offset
-                issues = GsmbManagmentService._fetch_issues_page(REDMINE_URL, headers, params)
-                if not issues:
-                    break
-                for issue in issues:
-                    GsmbManagmentService._process_issue(issue, monthly_data)
-                offset += len(issues)
-
-            ordered_months = list(monthly_data.keys())
-            formatted_data = [{"month": month, "totalCubes": monthly_data[month]} for month in ordered_months]
-            return formatted_data, None
+            return GsmbManagmentService._summarize_tracker(
+                REDMINE_URL, headers, GsmbManagmentService.TPL_PARAMS,
+                GsmbManagmentService.summarize_monthly_sand_cubes
+            )
         except Exception as e:
             return None, f"Server error: {str(e)}"
 
-    @staticmethod
-    def safe_float(value):
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return 0
-
     @staticmethod
     def get_redmine_url_and_api_key(token):
         redmine_url = os.getenv("REDMINE_URL")
@@ -86,35 +164,21 @@ class GsmbManagmentService:
 
     @staticmethod
     def fetch_all_issues(redmine_url, headers, params):
-        all_issues = []
-        offset = 0
-        while True:
-            paged_params = {**params, "offset": offset}
-            response = requests.get(f"{redmine_url}/issues.json", headers=headers, params=paged_params)
-            if response.status_code != 200:
-                return None, f"Issue fetch failed: {response.status_code} - {response.text}"
-            batch = response.json().get("issues", [])
-            if not batch:
-                break
-            all_issues.extend(batch)
-            offset += len(batch)
+        all_issues, response = redmine_client.get_all_pages(
+            f"{redmine_url}/issues.json", params=params, headers=headers
+        )
+        if response is not None:
+            return None, f"Issue fetch failed: {response.status_code} - {response.text}"
         return all_issues, None
 
-    @staticmethod
-    def get_field_value(fields, name):
-        return GsmbManagmentService.safe_float(next((f.get("value") for f in fields if f.get("name") == name), None))
-
     @staticmethod
     def build_holder_entry(issue):
-        assigned = issue.get("assigned_to")
-        if assigned is None:
-            return None
-        owner = assigned.get("name")
+        issue = Issue.parse(issue)
+        owner = issue.assigned_to_name
         if not owner:
             return None
-        fields = issue.get("custom_fields", [])
-        capacity = GsmbManagmentService.get_field_value(fields, "Capacity")
-        used = GsmbManagmentService.get_field_value(fields, "Used")
+        capacity = issue.capacity or 0
+        used = issue.used or 0
         if capacity <= 0:
             return None
         percentage_used = round((used / capacity) * 100, 2)
@@ -125,6 +189,12 @@ class GsmbManagmentService:
         }
 
     @staticmethod
+    def summarize_top_mining_holders(ml_issues):
+        holders = filter(None, map(GsmbManagmentService.build_holder_entry, ml_issues))
+        return heapq.nlargest(10, holders, key=lambda x: x["capacity"])
+
+    @staticmethod
+    @dashboard_cached
     def fetch_top_mining_holders(token):
         try:
             redmine_url, api_key, error = GsmbManagmentService.get_redmine_url_and_api_key(token)
@@ -135,45 +205,15 @@ class GsmbManagmentService:
                 "X-Redmine-API-Key": api_key,
                 "Content-Type": CONTENT_TYPE_JSON
             }
-            params = {
-                "project_id": 1,
-                "tracker_id": 4
-            }
 
-            issues, fetch_error = GsmbManagmentService.fetch_all_issues(redmine_url, headers, params)
-            if fetch_error:
-                return None, fetch_error
-
-            holders = filter(None, map(GsmbManagmentService.build_holder_entry, issues))
-            top_holders = sorted(holders, key=lambda x: x["capacity"], reverse=True)[:10]
-
-            return top_holders, None
+            return GsmbManagmentService._summarize_tracker(
+                redmine_url, headers, GsmbManagmentService.ML_PARAMS,
+                GsmbManagmentService.summarize_top_mining_holders
+            )
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
 
-    @staticmethod
-    def safe_float_strict(value):
-        if isinstance(value, (int, float)):
-            # Accept numeric types directly
-            return float(value)
-        if isinstance(value, str):
-            value = value.strip()
-            # Optional: reject empty strings or non-numeric strings strictly
-            if value == '':
-                return None
-            try:
-                val = float(value)
-                # Reject NaN and Inf values
-                if val != val or val == float('inf') or val == float('-inf'):
-                    return None
-                return val
-            except ValueError:
-                return None
-        # Reject other types strictly
-        return None
-
-
     @staticmethod
     def is_valid_issue(issue):
         tracker = issue.get("tracker", {})
@@ -182,23 +222,42 @@ class GsmbManagmentService:
 
     @staticmethod
     def extract_royalty(issue):
-        royalty_field = next(
-            (f for f in issue.get("custom_fields", []) if f.get("name") == "Royalty"), None
-        )
-        return GsmbManagmentService.safe_float_strict(royalty_field.get("value", "0") or "0") if royalty_field else 0
+        return Issue.parse(issue).royalty or 0
 
     @staticmethod
-    def fetch_issues(redmine_url, headers, params):
-        try:
-            response = requests.get(f"{redmine_url}/issues.json", headers=headers, params=params)
-            if response.status_code != 200:
-                return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
-            return response.json().get("issues", []), None
-        except Exception as e:
-            return None, str(e)
+    def summarize_royalty(ml_issues):
+        total_royalty = 0
+        fetched_orders = []
+
+        for issue in ml_issues:
+            if not GsmbManagmentService.is_valid_issue(issue):
+                continue
+
+            royalty_value = GsmbManagmentService.extract_royalty(issue)
+            if royalty_value is None or royalty_value <= 0:
+                continue
+
+            total_royalty += royalty_value
+            fetched_orders.append({
+                "title": issue.get("assigned_to", {}).get("name", "Unknown"),
+                "description": f"Royalty: {royalty_value}",
+                "avatar": "https://via.placeholder.com/40",
+                "royalty_value": royalty_value,
+            })
+
+        fetched_orders.sort(key=lambda x: x["royalty_value"], reverse=True)
+        return {"total_royalty": total_royalty, "orders": fetched_orders[:5]}
 
     @staticmethod
     def fetch_royalty_counts(token):
+        summary, error = GsmbManagmentService.royalty_summary(token)
+        if error:
+            return None, error
+        return jsonify(summary), None
+
+    @staticmethod
+    @dashboard_cached
+    def royalty_summary(token):
         redmine_url = os.getenv("REDMINE_URL")
         if not redmine_url:
             return None, REDMINE_API_ERROR_MSG
@@ -211,42 +270,10 @@ class GsmbManagmentService:
             "X-Redmine-API-Key": api_key,
             "Content-Type": CONTENT_TYPE_JSON,
         }
-        params = {"project_id": 1, "tracker_id": 4, "offset": 0}
-
-        total_royalty = 0
-        fetched_orders = []
-
-        while True:
-            issues, error = GsmbManagmentService.fetch_issues(redmine_url, headers, params)
-            if error:
-                return None, error
-            if not issues:
-                break
-
-            for issue in issues:
-                if not GsmbManagmentService.is_valid_issue(issue):
-                    continue
-
-                royalty_value = GsmbManagmentService.extract_royalty(issue)
-                if royalty_value <= 0:
-                    continue
-
-                total_royalty += royalty_value
-                fetched_orders.append({
-                    "title": issue.get("assigned_to", {}).get("name", "Unknown"),
-                    "description": f"Royalty: {royalty_value}",
-                    "avatar": "https://via.placeholder.com/40",
-                    "royalty_value": royalty_value,
-                })
-
-            params["offset"] += len(issues)
-
-        fetched_orders.sort(key=lambda x: x["royalty_value"], reverse=True)
-        top_5_orders = fetched_orders[:5]
-
-        return jsonify({"total_royalty": total_royalty, "orders": top_5_orders}), None
-
-
+        return GsmbManagmentService._summarize_tracker(
+            redmine_url, headers, GsmbManagmentService.ML_PARAMS,
+            GsmbManagmentService.summarize_royalty
+        )
 
     @staticmethod
     def _get_headers(api_key):
@@ -255,13 +282,6 @@ class GsmbManagmentService:
             "X-Redmine-API-Key": api_key
         }
 
-    @staticmethod
-    def _fetch_issues(url, headers, offset):
-        response = requests.get(f"{url}/issues.json?offset={offset}", headers=headers)
-        if response.status_code != 200:
-            raise RuntimeError(f"Failed to fetch data from Redmine: {response.status_code}")
-        return response.json().get("issues", [])
-
     @staticmethod
     def _process_issues(issues, license_counts):
         for issue in issues:
@@ -275,6 +295,23 @@ class GsmbManagmentService:
             license_counts[month] = license_counts.get(month, 0) + 1
 
     @staticmethod
+    def summarize_monthly_license_count(ml_issues):
+        license_counts = {}
+        GsmbManagmentService._process_issues(ml_issues, license_counts)
+
+        month_map = {
+            "01": "Jan", "02": "Feb", "03": "Mar", "04": "Apr",
+            "05": "May", "06": "Jun", "07": "Jul", "08": "Aug",
+            "09": "Sep", "10": "Oct", "11": "Nov", "12": "Dec",
+        }
+
+        return [
+            {"month": month_map[m], "miningLicense": license_counts.get(m, 0)}
+            for m in sorted(month_map.keys())
+        ]
+
+    @staticmethod
+    @dashboard_cached
     def monthly_mining_license_count(token):
         try:
             REDMINE_URL = os.getenv("REDMINE_URL")
@@ -286,34 +323,30 @@ class GsmbManagmentService:
                 return None, API_KEY_MISSING_ERROR
 
             headers = GsmbManagmentService._get_headers(api_key)
-            license_counts = {}
-            offset = 0
-
-            while True:
-                issues = GsmbManagmentService._fetch_issues(REDMINE_URL, headers, offset)
-                if not issues:
-                    break
-                GsmbManagmentService._process_issues(issues, license_counts)
-                offset += len(issues)
-
-            month_map = {
-                "01": "Jan", "02": "Feb", "03": "Mar", "04": "Apr",
-                "05": "May", "06": "Jun", "07": "Jul", "08": "Aug",
-                "09": "Sep", "10": "Oct", "11": "Nov", "12": "Dec",
-            }
-
-            formatted_data = [
-                {"month": month_map[m], "miningLicense": license_counts.get(m, 0)}
-                for m in sorted(month_map.keys())
-            ]
-
-            return formatted_data, None
+            return GsmbManagmentService._summarize_tracker(
+                REDMINE_URL, headers, GsmbManagmentService.ML_PARAMS,
+                GsmbManagmentService.summarize_monthly_license_count
+            )
 
         except Exception as e:
             return None, str(e)
 
+    @staticmethod
+    def _count_by_custom_field(issues, field_name):
+        counts = {}
+        for issue in issues:
+            value = Issue.parse(issue).field(field_name)
+            if value:
+                counts[value] = counts.get(value, 0) + 1
+
+        return [{"name": name, "value": count} for name, count in counts.items()]
 
     @staticmethod
+    def summarize_transport_destinations(tpl_issues):
+        return GsmbManagmentService._count_by_custom_field(tpl_issues, "Destination")
+
+    @staticmethod
+    @dashboard_cached
     def transport_license_destination(token):
         try:
             REDMINE_URL = os.getenv("REDMINE_URL")
@@ -325,61 +358,25 @@ class GsmbManagmentService:
             if not api_key:
                 return None, API_KEY_MISSING_ERROR
 
-            params = {
-                "project_id": 1,
-                "tracker_id": 5
-            }
-
             headers = {
                 "X-Redmine-API-Key": api_key,
                 "Content-Type": CONTENT_TYPE_JSON
             }
 
-            destination_counts = {}
-            offset = 0
-            has_more_issues = True
-
-            while has_more_issues:
-                params["offset"] = offset
-                response = requests.get(
-                    f"{REDMINE_URL}/issues.json",
-                    headers=headers,
-                    params=params
-                )
-
-                if response.status_code != 200:
-                    return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
-
-                data = response.json()
-                issues = data.get("issues", [])
-
-                if not issues:
-                    has_more_issues = False
-                    break
-
-                for issue in issues:
-                    custom_fields = issue.get("custom_fields", [])
-                    location_field = next(
-                        (field for field in custom_fields if field.get("name") == "Destination"), None
-                    )
-
-                    if location_field and location_field.get("value"):
-                        destination = location_field["value"]
-                        destination_counts[destination] = destination_counts.get(destination, 0) + 1
-
-                offset += len(issues)
-
-            formatted_data = [
-                {"name": destination, "value": count}
-                for destination, count in destination_counts.items()
-            ]
-
-            return formatted_data, None
+            return GsmbManagmentService._summarize_tracker(
+                REDMINE_URL, headers, GsmbManagmentService.TPL_PARAMS,
+                GsmbManagmentService.summarize_transport_destinations
+            )
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
 
     @staticmethod
+    def summarize_ml_locations(ml_issues):
+        return GsmbManagmentService._count_by_custom_field(ml_issues, "Administrative District")
+
+    @staticmethod
+    @dashboard_cached
     def total_location_ml(token):
         try:
             REDMINE_URL = os.getenv("REDMINE_URL")
@@ -391,61 +388,38 @@ class GsmbManagmentService:
             if not api_key:
                 return None, API_KEY_MISSING_ERROR
 
-            params = {
-                "project_id": 1,
-                "tracker_id": 4
-            }
-
             headers = {
                 "X-Redmine-API-Key": api_key,
                 "Content-Type": CONTENT_TYPE_JSON
             }
 
-            location_counts = {}
-            offset = 0
-            has_more_issues = True
-
-            while has_more_issues:
-                params["offset"] = offset
-                response = requests.get(
-                    f"{REDMINE_URL}/issues.json",
-                    headers=headers,
-                    params=params
-                )
-
-                if response.status_code != 200:
-                    return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
-
-                data = response.json()
-                issues = data.get("issues", [])
-
-                if not issues:
-                    has_more_issues = False
-                    break
-
-                for issue in issues:
-                    custom_fields = issue.get("custom_fields", [])
-                    location_field = next(
-                        (field for field in custom_fields if field.get("name") == "Administrative District"), None
-                    )
-
-                    if location_field and location_field.get("value"):
-                        location = location_field["value"]
-                        location_counts[location] = location_counts.get(location, 0) + 1
-
-                offset += len(issues)
-
-            formatted_data = [
-                {"name": location, "value": count}
-                for location, count in location_counts.items()
-            ]
-
-            return formatted_data, None
+            return GsmbManagmentService._summarize_tracker(
+                REDMINE_URL, headers, GsmbManagmentService.ML_PARAMS,
+                GsmbManagmentService.summarize_ml_locations
+            )
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
 
     @staticmethod
+    def _complaint_status_counts(redmine_url, headers):
+        """Complaints per status, open and closed alike; shared by the chart and the snapshot."""
+        counts, error = GsmbManagmentService._count_by_status(
+            redmine_url, headers, GsmbManagmentService.COMPLAINT_PARAMS,
+            ["New", "Rejected", "In Progress", "Executed"]
+        )
+        if error:
+            return None, error
+        return {
+            "New": counts["New"],
+            "Rejected": counts["Rejected"],
+            "InProgress": counts["In Progress"],
+            "Executed": counts["Executed"],
+            "total": counts["total"]
+        }, None
+
+    @staticmethod
+    @dashboard_cached
     def complaint_counts(token):
         try:
             REDMINE_URL = os.getenv("REDMINE_URL")
@@ -454,56 +428,41 @@ class GsmbManagmentService:
                 return None, REDMINE_API_ERROR_MSG
             if not api_key:
                 return None, API_KEY_MISSING_ERROR
-            params = {
-                "project_id": 1,
-                "tracker_id": 6
-            }
             headers = {
                 "X-Redmine-API-Key": api_key,
                 "Content-Type": CONTENT_TYPE_JSON
             }
-            counts = {
-                "New": 0,
-                "Rejected": 0,
-                "InProgress": 0,
-                "Executed": 0,
-                "total": 0
-            }
-            # Map statuses to keys in counts dictionary
-            status_map = {
-                "New": "New",
-                "Rejected": "Rejected",
-                "In Progress": "InProgress",
-                "Executed": "Executed"
-            }
-            offset = 0
-            has_more_issues = True
-            while has_more_issues:
-                params["offset"] = offset
-                response = requests.get(
-                    f"{REDMINE_URL}/issues.json",
-                    headers=headers,
-                    params=params
-                )
-                if response.status_code != 200:
-                    return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
-                data = response.json()
-                issues = data.get("issues", [])
-                if not issues:
-                    has_more_issues = False
-                    break
-                for issue in issues:
-                    status = issue.get("status", {}).get("name", "")
-                    key = status_map.get(status)
-                    if key:
-                        counts[key] += 1
-                counts["total"] += len(issues)
-                offset += len(issues)
-            return counts, None
+            return GsmbManagmentService._complaint_status_counts(REDMINE_URL, headers)
         except Exception as e:
             return None, f"Server error: {str(e)}"
 
     @staticmethod
+    def summarize_roles(memberships):
+        counts = {
+            "licenceOwner": 0,
+            "activeGSMBOfficers": 0,
+            "policeOfficers": 0,
+            "miningEngineer": 0
+        }
+        role_map = {
+            "MLOwner": "licenceOwner",
+            "GSMBOfficer": "activeGSMBOfficers",
+            "PoliceOfficer": "policeOfficers",
+            "miningEngineer": "miningEngineer"
+        }
+
+        for membership in memberships:
+            roles = membership.get("roles", [])
+            if roles:
+                key = role_map.get(roles[0].get("name", ""))
+                if key:
+                    counts[key] += 1
+
+        counts["total_count"] = sum(counts.values())
+        return counts
+
+    @staticmethod
+    @dashboard_cached
     def role_counts(token):
         try:
             REDMINE_URL = os.getenv("REDMINE_URL")
@@ -519,50 +478,34 @@ class GsmbManagmentService:
                 "Content-Type": CONTENT_TYPE_JSON
             }
 
-            counts = {
-                "licenceOwner": 0,
-                "activeGSMBOfficers": 0,
-                "policeOfficers": 0,
-                "miningEngineer": 0
-            }
-
-            def increment_role_count(role_name):
-                role_map = {
-                    "MLOwner": "licenceOwner",
-                    "GSMBOfficer": "activeGSMBOfficers",
-                    "PoliceOfficer": "policeOfficers",
-                    "miningEngineer": "miningEngineer"
-                }
-                key = role_map.get(role_name)
-                if key:
-                    counts[key] += 1
-
-            offset = 0
-            while True:
-                url = f"{REDMINE_URL}/projects/mmpro-gsmb/memberships.json?offset={offset}"
-                response = requests.get(url, headers=headers)
-                if response.status_code != 200:
-                    return None, f"Failed to fetch memberships: {response.status_code} - {response.text}"
-
-                memberships = response.json().get("memberships", [])
-                if not memberships:
-                    break
-
-                for membership in memberships:
-                    roles = membership.get("roles", [])
-                    if roles:
-                        role_name = roles[0].get("name", "")
-                        increment_role_count(role_name)
-
-                offset += len(memberships)
+            memberships, error = GsmbManagmentService._fetch_all(
+                REDMINE_URL, headers, "projects/mmpro-gsmb/memberships.json", key="memberships"
+            )
+            if error:
+                return None, error
 
-            counts["total_count"] = sum(counts.values())
-            return counts, None
+            return GsmbManagmentService.summarize_roles(memberships), None
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
 
     @staticmethod
+    def _license_status_counts(redmine_url, headers):
+        """Mining licenses per status, open and closed alike; shared by the chart and the snapshot."""
+        counts, error = GsmbManagmentService._count_by_status(
+            redmine_url, headers, GsmbManagmentService.ML_PARAMS, ["Valid", "Expired", "Rejected"]
+        )
+        if error:
+            return None, error
+        return {
+            "valid": counts["Valid"],
+            "expired": counts["Expired"],
+            "rejected": counts["Rejected"],
+            "total": counts["total"]
+        }, None
+
+    @staticmethod
+    @dashboard_cached
     def mining_license_count(token):
         try:
             REDMINE_URL = os.getenv("REDMINE_URL")
@@ -574,60 +517,74 @@ class GsmbManagmentService:
             if not api_key:
                 return None, API_KEY_MISSING_ERROR
 
-            params = {
-                "project_id": 1,
-                "tracker_id": 4,
-                "include": "custom_fields"
-            }
-
             headers = {
                 "X-Redmine-API-Key": api_key,
                 "Content-Type": CONTENT_TYPE_JSON
             }
 
-            counts = {
-                "valid": 0,
-                "expired": 0,
-                "rejected": 0,
-                "total": 0
-            }
-
-            offset = 0
-            has_more_issues = True
-
-            while has_more_issues:
-                params["offset"] = offset
-                response = requests.get(
-                    f"{REDMINE_URL}/issues.json",
-                    headers=headers,
-                    params=params
-                )
+            return GsmbManagmentService._license_status_counts(REDMINE_URL, headers)
 
-                if response.status_code != 200:
-                    return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
+        except Exception as e:
+            return None, f"Server error: {str(e)}"
 
-                data = response.json()
-                issues = data.get("issues", [])
+    @staticmethod
+    @dashboard_cached
+    def dashboard_snapshot(token):
+        """Every dashboard metric from one fetch of each tracker and the memberships list.
 
-                if not issues:
-                    has_more_issues = False
-                    break
+        Complaint and license status counts use the same ``limit=1`` buckets as
+        their own endpoints, so both report closed issues the same way.
+        """
+        try:
+            REDMINE_URL = os.getenv("REDMINE_URL")
+            api_key = JWTUtils.get_api_key_from_token(token)
 
-                for issue in issues:
-                    status = issue.get("status", {}).get("name", "")
-                    
-                    
-                    if status == "Valid":
-                        counts["valid"] += 1
-                    elif status == "Expired":
-                        counts["expired"] += 1
-                    elif status == "Rejected":
-                        counts["rejected"] += 1
+            if not REDMINE_URL:
+                return None, REDMINE_API_ERROR_MSG
+            if not api_key:
+                return None, API_KEY_MISSING_ERROR
 
-                counts["total"] += len(issues)
-                offset += len(issues)
+            headers = {
+                "X-Redmine-API-Key": api_key,
+                "Content-Type": CONTENT_TYPE_JSON
+            }
+            sources = {
+                "ml": ("issues.json", "issues", GsmbManagmentService.ML_PARAMS),
+                "tpl": ("issues.json", "issues", GsmbManagmentService.TPL_PARAMS),
+                "memberships": ("projects/mmpro-gsmb/memberships.json", "memberships", None),
+            }
+            counters = {
+                "complaint_counts": GsmbManagmentService._complaint_status_counts,
+                "mining_license_count": GsmbManagmentService._license_status_counts,
+            }
 
-            return counts, None
+            results = redmine_client.gather(
+                *(
+                    lambda path=path, key=key, params=params:
+                        GsmbManagmentService._fetch_all(REDMINE_URL, headers, path, key, params)
+                    for path, key, params in sources.values()
+                ),
+                *(lambda counter=counter: counter(REDMINE_URL, headers) for counter in counters.values()),
+            )
+            data = {}
+            for name, (items, error) in zip([*sources, *counters], results):
+                if error:
+                    return None, error
+                data[name] = items
+
+            # Parsed once so every summary below reads custom fields from the same maps
+            ml, tpl = parse_issues(data["ml"]), parse_issues(data["tpl"])
+            return {
+                "monthly_total_sand_cubes": GsmbManagmentService.summarize_monthly_sand_cubes(tpl),
+                "top_mining_holders": GsmbManagmentService.summarize_top_mining_holders(ml),
+                "royalty_counts": GsmbManagmentService.summarize_royalty(ml),
+                "monthly_mining_license_count": GsmbManagmentService.summarize_monthly_license_count(ml),
+                "transport_license_destination": GsmbManagmentService.summarize_transport_destinations(tpl),
+                "total_location_ml": GsmbManagmentService.summarize_ml_locations(ml),
+                "complaint_counts": data["complaint_counts"],
+                "role_counts": GsmbManagmentService.summarize_roles(data["memberships"]),
+                "mining_license_count": data["mining_license_count"],
+            }, None
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
@@ -669,7 +626,7 @@ class GsmbManagmentService:
 
             params = {"status": 3, "include": "custom_fields"}
     
-            response = requests.get(
+            response = redmine_client.get(
                 f"{REDMINE_URL}/users.json",
                 headers=headers,
                 params=params,
@@ -752,7 +709,7 @@ class GsmbManagmentService:
                     "limit": limit
                 }
                 
-                response = requests.get(
+                response = redmine_client.get(
                     f"{REDMINE_URL}/users.json",
                     headers=headers,
                     params=params,
@@ -830,7 +787,7 @@ class GsmbManagmentService:
                     "offset": offset
                 }
 
-                response = requests.get(
+                response = redmine_client.get(
                     f"{REDMINE_URL}/users.json",
                     headers=headers,
                     params=params,
@@ -901,13 +858,14 @@ class GsmbManagmentService:
             "X-Redmine-API-Key": API_KEY
             }
 
-            response = requests.put(
+            response = redmine_client.put(
             f"{REDMINE_URL}/users/{id}.json",
             json=payload,
             headers=headers
             )
 
             if response.status_code == 204:
+               JWTUtils.invalidate_api_key(id)
                return {"status": "success", "message": "User activated successfully"}, None
             else:
                 error_msg = f"Failed to User Active. Status: {response.status_code}"
@@ -955,11 +913,4 @@ class GsmbManagmentService:
             print(f"[ERROR] Failed to get attachment IDs: {str(e)}")
             return {}
     
-    @staticmethod
-    def get_custom_field_value(custom_fields, field_name):
-        """Helper method to get value from custom fields"""
-        for field in custom_fields:
-            if field.get("name") == field_name:
-                return field.get("value")
-        return None
             
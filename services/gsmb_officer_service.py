@@ -1,4 +1,6 @@
 import requests
+from utils import redmine_client
+from utils.issue_model import Issue
 import os
 from dotenv import load_dotenv
 import json
@@ -8,6 +10,7 @@ from utils.MLOUtils import MLOUtils
 from flask import request
 from utils.constants import REDMINE_API_ERROR_MSG
 from utils.limit_utils import LimitUtils
+from utils.pagination import PageRequest
 
 load_dotenv()
 
@@ -33,6 +36,24 @@ LICENSE_BOUNDARY_SURVEY = "License Boundary Survey"
 class GsmbOfficerService:
 
     ORS_API_KEY = os.getenv("ORS_API_KEY")
+
+    @staticmethod
+    def _fetch_issue_page(redmine_url, api_key, params, page):
+        """One ``page`` of ``/issues.json`` as ``((issues, total), None)``, or ``(None, response)`` on failure.
+
+        Always read from Redmine with the caller's own API key, never from the
+        admin-synced replica, so Redmine decides which issues the officer sees.
+        """
+        response = redmine_client.get(
+            f"{redmine_url}/issues.json",
+            params={**params, "limit": page.limit, "offset": page.offset},
+            headers={"X-Redmine-API-Key": api_key, "Content-Type": JSON_CONTENT_TYPE}
+        )
+        if response.status_code != 200:
+            return None, response
+        data = response.json()
+        issues = data.get("issues", [])
+        return (issues, data.get("total_count", page.offset + len(issues))), None
     
     @staticmethod
     def get_mlowners(token):
@@ -46,18 +67,17 @@ class GsmbOfficerService:
             REDMINE_URL = os.getenv("REDMINE_URL")
             
 
-            # 1️⃣ Fetch all users with admin API key
-            users_url = f"{REDMINE_URL}/users.json?status=1&limit=100"
-            users_response = requests.get(
-                users_url,
+            # 1️⃣ Fetch all active users with admin API key; Redmine cannot filter users by custom field
+            all_users, users_response = redmine_client.get_all_pages(
+                f"{REDMINE_URL}/users.json",
+                key="users",
+                params={"status": 1},
                 headers={"X-Redmine-API-Key": admin_api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
 
-            if users_response.status_code != 200:
+            if users_response is not None:
                 return None, f"Failed to fetch user details: {users_response.status_code} - {users_response.text}"
 
-            all_users = users_response.json().get("users", [])
-
             # 2️⃣ Filter users by custom field "User Type" == "mlOwner"
             ml_owners_details = [
                 user for user in all_users
@@ -97,8 +117,9 @@ class GsmbOfficerService:
 
         
     @staticmethod
-    def get_tpls(token):
+    def get_tpls(token, page=None):
         try:
+            page = page or PageRequest()
             # 🔑 Extract user's API key from token
             user_api_key = JWTUtils.get_api_key_from_token(token)
             if not user_api_key:
@@ -107,20 +128,19 @@ class GsmbOfficerService:
             REDMINE_URL = os.getenv("REDMINE_URL")
 
 
-            # 🚀 Fetch TPL issues from Redmine
-            tpl_issues_url = f"{REDMINE_URL}/issues.json?tracker_id=5&project_id=1"
-            response = requests.get(
-                tpl_issues_url,
-                headers={"X-Redmine-API-Key": user_api_key, "Content-Type": JSON_CONTENT_TYPE}
+            # 🚀 Fetch one page of TPL issues
+            result, response = GsmbOfficerService._fetch_issue_page(
+                REDMINE_URL, user_api_key, {"tracker_id": 5, "project_id": 1}, page
             )
 
-            if response.status_code != 200:
+            if response is not None:
                 return None, f"Failed to fetch TPL issues: {response.status_code} - {response.text}"
 
-            issues = response.json().get("issues", [])
+            issues, total = result
             formatted_tpls = []
 
             for issue in issues:
+                tpl = Issue.parse(issue)
                 formatted_tpl = {
                     "id": issue.get("id"),
                     "subject": issue.get("subject"),
@@ -130,25 +150,26 @@ class GsmbOfficerService:
                     "assigned_to": issue.get("assigned_to", {}).get("name") if issue.get("assigned_to") else None,
                     "start_date": issue.get("start_date"),
                     "due_date": issue.get("due_date"),
-                    "lorry_number": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Lorry Number"),
-                    "driver_contact": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Driver Contact"),
-                    "cubes": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Cubes"),
-                    "mining_license_number": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Mining issue id"),
-                    "destination": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Destination"),
+                    "lorry_number": tpl.field("Lorry Number"),
+                    "driver_contact": tpl.field("Driver Contact"),
+                    "cubes": tpl.field("Cubes"),
+                    "mining_license_number": tpl.field("Mining issue id"),
+                    "destination": tpl.field("Destination"),
                     # "lorry_driver_name": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Lorry Driver Name"),
                 
                 }
                 formatted_tpls.append(formatted_tpl)
 
-            return formatted_tpls, None
+            return page.page(formatted_tpls, total), None
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
         
   
     @staticmethod
-    def get_mining_licenses(token):
+    def get_mining_licenses(token, page=None):
         try:
+            page = page or PageRequest()
             # 🔑 Extract user's API key from token
             user_api_key = JWTUtils.get_api_key_from_token(token)
             if not user_api_key:
@@ -158,17 +179,15 @@ class GsmbOfficerService:
             REDMINE_URL = os.getenv("REDMINE_URL")
 
 
-            # 🚀 Fetch all ML issues from Redmine
-            ml_issues_url = f"{REDMINE_URL}/issues.json?tracker_id=4&project_id=1&status_id=7"
-            response = requests.get(
-                ml_issues_url,
-                headers={"X-Redmine-API-Key": user_api_key, "Content-Type": JSON_CONTENT_TYPE}
+            # 🚀 Fetch one page of ML issues
+            result, response = GsmbOfficerService._fetch_issue_page(
+                REDMINE_URL, user_api_key, {"tracker_id": 4, "project_id": 1, "status_id": 7}, page
             )
 
-            if response.status_code != 200:
+            if response is not None:
                 return None, f"Failed to fetch ML issues: {response.status_code} - {response.text}"
 
-            issues = response.json().get("issues", [])
+            issues, total = result
             formatted_mls = []
 
             for issue in issues:
@@ -177,7 +196,7 @@ class GsmbOfficerService:
                 # Fetching attachments separately
                 custom_fields = issue.get("custom_fields", [])  # Extract custom fields
                 GsmbOfficerService.get_attachment_urls(user_api_key, REDMINE_URL, custom_fields)
-
+                ml = Issue.parse(issue)
 
                 formatted_ml = {
                     "id": issue_id,
@@ -187,20 +206,20 @@ class GsmbOfficerService:
                     "assigned_to": issue.get("assigned_to", {}).get("name") if issue.get("assigned_to") else None,
                     "start_date": issue.get("start_date"),
                     "due_date": issue.get("due_date"),
-                    "divisional_secretary_division": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), DIVISIONAL_SECRETARY_DIVISION),
+                    "divisional_secretary_division": ml.field(DIVISIONAL_SECRETARY_DIVISION),
                     # "administrative_district": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), ADMINISTRATIVE_DISTRICT),
-                    "capacity": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Capacity"),
-                    "used": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Used"),
-                    "remaining": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Remaining"),
-                    "royalty": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Royalty"),
+                    "capacity": ml.field("Capacity"),
+                    "used": ml.field("Used"),
+                    "remaining": ml.field("Remaining"),
+                    "royalty": ml.field("Royalty"),
                     # "license_number": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), "Mining License Number"),
-                    "mining_license_number": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), MINING_LICENSE_NUMBER),
-                    "mobile_number": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), MOBILE_NUMBER),
+                    "mining_license_number": ml.field(MINING_LICENSE_NUMBER),
+                    "mobile_number": ml.field(MOBILE_NUMBER),
                 }
 
                 formatted_mls.append(formatted_ml)
  
-            return formatted_mls, None
+            return page.page(formatted_mls, total), None
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
@@ -219,7 +238,7 @@ class GsmbOfficerService:
 
             # 🔗 Fetch issue details
             issue_url = f"{REDMINE_URL}/issues/{issue_id}.json?include=attachments"
-            response = requests.get(
+            response = redmine_client.get(
                 issue_url,
                 headers={"X-Redmine-API-Key": api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
@@ -278,23 +297,22 @@ class GsmbOfficerService:
             return None, f"Server error: {str(e)}"
 
     @staticmethod
-    def get_complaints(token):
+    def get_complaints(token, page=None):
         try:
+            page = page or PageRequest()
             user_api_key = JWTUtils.get_api_key_from_token(token)
             if not user_api_key:
                 return None, INVALID_API_KEY_IN_TOKEN
 
             REDMINE_URL = os.getenv("REDMINE_URL")
-            complaints_url = f"{REDMINE_URL}/issues.json?tracker_id=6&project_id=1"
-            response = requests.get(
-                complaints_url,
-                headers={"X-Redmine-API-Key": user_api_key, "Content-Type": JSON_CONTENT_TYPE}
+            result, response = GsmbOfficerService._fetch_issue_page(
+                REDMINE_URL, user_api_key, {"tracker_id": 6, "project_id": 1}, page
             )
 
-            if response.status_code != 200:
+            if response is not None:
                 return None, f"Failed to fetch complaint issues: {response.status_code} - {response.text}"
 
-            issues = response.json().get("issues", [])
+            issues, total = result
             formatted_complaints = []
 
             for issue in issues:
@@ -316,7 +334,7 @@ class GsmbOfficerService:
                     "resolved": field_map.get("Resolved")
                 })
 
-            return formatted_complaints, None
+            return page.page(formatted_complaints, total), None
 
         except Exception as e:
             return None, str(e)
@@ -358,14 +376,6 @@ class GsmbOfficerService:
             return {}
 
 
-    @staticmethod
-    def get_custom_field_value(custom_fields, field_name):
-        """Helper function to extract custom field value by name."""
-        for field in custom_fields:
-            if field.get("name") == field_name:
-                return field.get("value")
-        return None
-    
     @staticmethod
     def get_mining_license_counts(token):
         try:
@@ -378,18 +388,17 @@ class GsmbOfficerService:
             REDMINE_URL = os.getenv("REDMINE_URL")
 
 
-            # 🚀 Fetch ML issues from Redmine
-            ml_issues_url = f"{REDMINE_URL}/issues.json?tracker_id=4&project_id=1"
-            response = requests.get(
-                ml_issues_url,
+            # 🚀 Fetch every ML issue; Redmine has no per-assignee count to ask for instead
+            issues, response = redmine_client.get_all_pages(
+                f"{REDMINE_URL}/issues.json",
+                params=redmine_client.issue_params(tracker_id=4, project_id=1),
                 headers={"X-Redmine-API-Key": user_api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
 
-            if response.status_code != 200:
+            if response is not None:
                 return None, f"Failed to fetch ML issues: {response.status_code} - {response.text}"
 
             # 🛠️ Process the response
-            issues = response.json().get("issues", [])
             license_counts = {}
 
             for issue in issues:
@@ -419,7 +428,7 @@ class GsmbOfficerService:
         }
 
 
-        response = requests.post(url, headers=headers, data=file.stream)
+        response = redmine_client.post(url, headers=headers, data=file.stream)
 
         if response.status_code == 201:
              return response.json().get("upload", {}).get("id")   # Attachment ID
@@ -493,7 +502,7 @@ class GsmbOfficerService:
 
             REDMINE_URL = os.getenv("REDMINE_URL")
             
-            response = requests.post(
+            response = redmine_client.post(
                 f"{REDMINE_URL}/issues.json",  # Use formatted string
                 headers=headers,
                 json=issue_payload
@@ -514,7 +523,7 @@ class GsmbOfficerService:
                     }
                 }
 
-                update_response = requests.put(
+                update_response = redmine_client.put(
                     f"{REDMINE_URL}/issues/{issue_id}.json",
                     headers=headers,
                     json=update_payload
@@ -569,7 +578,7 @@ class GsmbOfficerService:
                 "Content-Type": JSON_CONTENT_TYPE
             }
 
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{mining_request_id}.json",
                 headers=headers,
                 json=update_payload
@@ -609,7 +618,7 @@ class GsmbOfficerService:
                 "Content-Type": JSON_CONTENT_TYPE
             }
 
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{mining_request_id}.json",
                 headers=headers,
                 json=update_payload
@@ -640,7 +649,7 @@ class GsmbOfficerService:
 
 
             memberships_url = f"{REDMINE_URL}/projects/mmpro-gsmb/memberships.json"
-            memberships_response = requests.get(
+            memberships_response = redmine_client.get(
                 memberships_url,
                 headers={"X-Redmine-API-Key": user_api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
@@ -658,7 +667,7 @@ class GsmbOfficerService:
                 return [], None
 
             users_url = f"{REDMINE_URL}/users.json?status=1&limit=100"
-            users_response = requests.get(
+            users_response = redmine_client.get(
                 users_url,
                 headers={"X-Redmine-API-Key": admin_api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
@@ -695,8 +704,9 @@ class GsmbOfficerService:
             return None, f"Server error: {str(e)}"
 
     @staticmethod
-    def get_appointments(token):
+    def get_appointments(token, page=None):
         try:
+            page = page or PageRequest()
             user_api_key = JWTUtils.get_api_key_from_token(token)
             if not user_api_key:
                 return None, INVALID_API_KEY_IN_TOKEN
@@ -705,16 +715,14 @@ class GsmbOfficerService:
 
 
             # 🔁 Tracker ID for Appointment = 11
-            appointment_issues_url = f"{REDMINE_URL}/issues.json?tracker_id=11&project_id=1"
-            response = requests.get(
-                appointment_issues_url,
-                headers={"X-Redmine-API-Key": user_api_key, "Content-Type": JSON_CONTENT_TYPE}
+            result, response = GsmbOfficerService._fetch_issue_page(
+                REDMINE_URL, user_api_key, {"tracker_id": 11, "project_id": 1}, page
             )
 
-            if response.status_code != 200:
+            if response is not None:
                 return None, f"Failed to fetch appointment issues: {response.status_code} - {response.text}"
 
-            issues = response.json().get("issues", [])
+            issues, total = result
             formatted_appointments = []
 
             for issue in issues:
@@ -728,11 +736,11 @@ class GsmbOfficerService:
                     "start_date": issue.get("start_date"),
                     "due_date": issue.get("due_date"),
                     "description": issue.get("description"),
-                    "mining_license_number": GsmbOfficerService.get_custom_field_value(issue.get("custom_fields", []), MINING_LICENSE_NUMBER)
+                    "mining_license_number": Issue.parse(issue).license_number
                 }
                 formatted_appointments.append(formatted_appointment)
 
-            return formatted_appointments, None
+            return page.page(formatted_appointments, total), None
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
@@ -774,7 +782,7 @@ class GsmbOfficerService:
                 }
             }
 
-            response = requests.post(
+            response = redmine_client.post(
                 f"{REDMINE_URL}/issues.json",
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -795,7 +803,7 @@ class GsmbOfficerService:
                 }
             }
 
-            update_response = requests.put(
+            update_response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{mining_request_id}.json",
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -847,7 +855,7 @@ class GsmbOfficerService:
             }
 
             # 4. Send update
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{issue_id}.json",
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -885,7 +893,7 @@ class GsmbOfficerService:
                 }
             }
 
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{issue_id}.json",
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -924,7 +932,7 @@ class GsmbOfficerService:
                 }
             }
 
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{issue_id}.json",
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -953,7 +961,7 @@ class GsmbOfficerService:
 
 
             url = f"{REDMINE_URL}/issues.json?tracker_id=4&project_id=1&status_id=!7"
-            response = requests.get(
+            response = redmine_client.get(
                 url,
                 headers={"X-Redmine-API-Key": user_api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
@@ -965,7 +973,7 @@ class GsmbOfficerService:
             summary_list = []
 
             for issue in issues:
-                custom_fields = issue.get("custom_fields", [])
+                ml = Issue.parse(issue)
                 assigned_to = issue.get("assigned_to", {})
 
                 summary_list.append({
@@ -973,8 +981,8 @@ class GsmbOfficerService:
                     "subject": issue.get("subject"),
                     "assigned_to": assigned_to.get("name"),
                     "assigned_to_id": assigned_to.get("id"),
-                    "mobile": GsmbOfficerService.get_custom_field_value(custom_fields, MOBILE_NUMBER),
-                    "district": GsmbOfficerService.get_custom_field_value(custom_fields, ADMINISTRATIVE_DISTRICT),
+                    "mobile": ml.field(MOBILE_NUMBER),
+                    "district": ml.field(ADMINISTRATIVE_DISTRICT),
                     "date_created": issue.get("created_on"),
                     "status": issue.get("status", {}).get("name")
                 })
@@ -996,7 +1004,7 @@ class GsmbOfficerService:
 
 
             issue_url = f"{REDMINE_URL}/issues/{issue_id}.json?include=attachments"
-            response = requests.get(
+            response = redmine_client.get(
                 issue_url,
                 headers={"X-Redmine-API-Key": api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
@@ -1052,7 +1060,7 @@ class GsmbOfficerService:
 
 
             issue_url = f"{REDMINE_URL}/issues/{issue_id}.json?include=attachments"
-            response = requests.get(
+            response = redmine_client.get(
                 issue_url,
                 headers={"X-Redmine-API-Key": api_key, "Content-Type": JSON_CONTENT_TYPE}
             )
@@ -1,9 +1,13 @@
 import os
 from dotenv import load_dotenv
 import requests
+from utils import redmine_client
 from utils.MLOUtils import MLOUtils
 from utils.jwt_utils import JWTUtils
 from utils.limit_utils import LimitUtils
+from utils.license_index import me_appointment_index, normalize_license_number
+from utils.issue_index import first_visible
+from utils.issue_model import Issue
 from utils.jwt_utils import JWTUtils
 from werkzeug.utils import secure_filename 
 import json
@@ -46,7 +50,7 @@ class MiningEnginerService:
             "X-Redmine-API-Key": API_KEY
             }
 
-            response = requests.put(
+            response = redmine_client.put(
             f"{REDMINE_URL}/issues/{issue_id}.json",
             json=payload,
             headers=headers
@@ -97,7 +101,7 @@ class MiningEnginerService:
                     "limit": LIMIT
                 }
 
-                response = requests.get(
+                response = redmine_client.get(
                     f"{REDMINE_URL}/projects/mmpro-gsmb/issues.json",
                     params=params,
                     headers=headers
@@ -224,7 +228,7 @@ class MiningEnginerService:
                 }
             }
 
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{ml_id}.json",
                 json=payload,
                 headers=headers
@@ -240,7 +244,7 @@ class MiningEnginerService:
                 }
             }
 
-            me_response = requests.put(
+            me_response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{me_appointment_id}.json",
                 json=me_payload,
                 headers=headers
@@ -293,7 +297,7 @@ class MiningEnginerService:
             }
 
             # Send update to Redmine
-            ml_response = requests.put(
+            ml_response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{ml_id}.json",
                 json=payload,
                 headers=headers
@@ -308,7 +312,7 @@ class MiningEnginerService:
                 }
             }
 
-            me_response = requests.put(
+            me_response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{me_appointment_id}.json",
                 json=me_payload,
                 headers=headers
@@ -390,7 +394,7 @@ class MiningEnginerService:
             }
 
             # Create the appointment
-            response = requests.post(
+            response = redmine_client.post(
                 f"{REDMINE_URL}/issues.json",
                 headers={
                     "X-Redmine-API-Key": api_key,
@@ -441,7 +445,7 @@ class MiningEnginerService:
                 }
             }
 
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{issue_id}.json",
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -503,56 +507,30 @@ class MiningEnginerService:
 
 
 
-            params = {
-                "project_id": 1,
-                "tracker_id": 12,  # ME Appointment tracker
-                # "assigned_to_id": user_info["user_id"],
-
-                "status_id": "open",  # Only show open appointments
-                "limit": 100
-
-            }
+            issues, failed = redmine_client.get_all_pages(
+                f"{REDMINE_URL}/issues.json",
+                params={
+                    "project_id": 1,
+                    "tracker_id": 12,  # ME Appointment tracker
+                    "status_id": "open",  # Only show open appointments
+                },
+                headers={"X-Redmine-API-Key": api_key}
+            )
+            if failed is not None:
+                return {"error": f"Redmine API error: {failed.status_code}"}
 
             appointments = []
-            while True:
-                response = requests.get(
-                    f"{REDMINE_URL}/issues.json",
-                    headers={"X-Redmine-API-Key": api_key},
-                    params=params
-                )
-
-                if response.status_code != 200:
-                    return {"error": f"Redmine API error: {response.status_code}"}
-
-                data = response.json()
-                issues = data.get("issues", [])
-                
-                for issue in issues:
-                    appointments.append({
-                        "id": issue.get("id"),
-                        "subject": issue.get("subject"),
-                        "start_date": issue.get("start_date"),
-                        "status": issue.get("status", {}).get("name"),
-                        "assigned_to": issue.get("assigned_to", {}).get("name"),
-                        "google_location": next(
-                            (cf["value"] for cf in issue.get("custom_fields", []) 
-                            if cf.get("id") == 92),
-                            None
-                        ),
-                        "mining_number": next(
-                            (cf["value"] for cf in issue.get("custom_fields", []) 
-                            if cf.get("id") == 101),
-                            None
-                        )
-                    })
-
-                # Check if we've fetched all issues
-                total_count = data.get("total_count", 0)
-                if len(appointments) >= total_count:
-                    break
-                
-                # Move to the next page
-                params["offset"] += len(issues)  # Use actual number of issues returned
+            for issue in issues:
+                appointment = Issue.parse(issue)
+                appointments.append({
+                    "id": issue.get("id"),
+                    "subject": issue.get("subject"),
+                    "start_date": issue.get("start_date"),
+                    "status": issue.get("status", {}).get("name"),
+                    "assigned_to": issue.get("assigned_to", {}).get("name"),
+                    "google_location": appointment.field(92),
+                    "mining_number": appointment.field(101)
+                })
 
             return {"appointments": appointments}
 
@@ -569,7 +547,7 @@ class MiningEnginerService:
             "status_id": 32,
             "offset": offset,
         }
-        resp = requests.get(f"{redmine_url}/projects/mmpro-gsmb/issues.json", params=params, headers=headers)
+        resp = redmine_client.get(f"{redmine_url}/projects/mmpro-gsmb/issues.json", params=params, headers=headers)
         if resp.status_code != 200:
             msg = f"Redmine API error: {resp.status_code}"
             if resp.text:
@@ -664,7 +642,7 @@ class MiningEnginerService:
             }
 
 
-            response = requests.get(
+            response = redmine_client.get(
                 f"{REDMINE_URL}/issues/{issue_id}.json",
                 headers=headers
             )
@@ -733,46 +711,6 @@ class MiningEnginerService:
             if not user_id:
                 return None, error
 
-            # Step 2: Define query parameters for project_id=1 and tracker_id=4 (ML)
-            params = {
-                "project_id": 1,
-                "tracker_id": 4,  # ML tracker ID
-            }
-
-            headers = {
-                "X-Redmine-API-Key": API_KEY
-            }
-
-            # Pagination variables
-            offset = 0
-            limit = 100
-            all_issues = []
-
-            while True:
-                paged_params = params.copy()
-                paged_params.update({"offset": offset, "limit": limit})
-
-                response = requests.get(
-                    f"{REDMINE_URL}/projects/mmpro-gsmb/issues.json",
-                    params=paged_params,
-                    headers=headers
-                )
-
-                if response.status_code != 200:
-                    error_msg = f"Redmine API error: {response.status_code}"
-                    if response.text:
-                        error_msg += f" - {response.text[:200]}"
-                    return None, error_msg
-
-                data = response.json()
-                issues = data.get("issues", [])
-                all_issues.extend(issues)
-
-                if len(issues) < limit:
-                    break
-
-                offset += limit
-
             # Status ID to Name mapping
             status_map = {
                 6: "Rejected",
@@ -780,13 +718,26 @@ class MiningEnginerService:
                 31: "ME Appointment Scheduled",
                 32: "ME Approved"
             }
-            valid_status_ids = set(status_map.keys())
-            status_counts = {status_map[status_id]: 0 for status_id in valid_status_ids}
+            headers = {
+                "X-Redmine-API-Key": API_KEY
+            }
 
-            for issue in all_issues:
-                status_id = issue.get("status", {}).get("id")
-                if status_id in valid_status_ids:
-                    status_counts[status_map[status_id]] += 1
+            # Step 2: One limit=1 count per status of project_id=1 / tracker_id=4 (ML)
+            buckets = {
+                name: redmine_client.issue_params(project_id=1, tracker_id=4, status_id=status_id)
+                for status_id, name in status_map.items()
+            }
+            status_counts, response = redmine_client.count_buckets(
+                f"{REDMINE_URL}/projects/mmpro-gsmb/issues.json",
+                buckets,
+                headers=headers
+            )
+
+            if response is not None:
+                error_msg = f"Redmine API error: {response.status_code}"
+                if response.text:
+                    error_msg += f" - {response.text[:200]}"
+                return None, error_msg
 
             return status_counts, None
 
@@ -822,7 +773,7 @@ class MiningEnginerService:
                 }
             }
 
-            response = requests.put(
+            response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{issue_id}.json",
                 json=update_payload,
                 headers={"X-Redmine-API-Key": user_api_key, "Content-Type": CONTENT_TYPE_JSON}
@@ -834,31 +785,31 @@ class MiningEnginerService:
             # 2. Construct the matching value used in MeAppointment
             license_ref_string = f"ML Request LLL/100/{issue_id}"
 
-            # 3. Search MeAppointment issues with custom field "Mining License Number" = license_ref_string
-            search_params = {
-                "project_id": 1,
-                "tracker_id": 12,  # MeAppointment tracker ID
-                "status_id": 31,  # Get all statuses
-                "cf_101": license_ref_string  # Custom field ID 101 = "Mining License Number"
-            }
-
-            search_response = requests.get(
-                f"{REDMINE_URL}/issues.json",
-                params=search_params,
-                headers={"X-Redmine-API-Key": user_api_key}
+            # 3. Find the scheduled MeAppointment for this license
+            me_issues, error = me_appointment_index.lookup_fresh(
+                normalize_license_number(license_ref_string),
+                predicate=lambda issue: issue.get("status", {}).get("id") == 31
             )
+            if error:
+                return False, f"Failed to search MeAppointment: {error}"
+
+            # The index is synced with the admin key; only close an appointment the engineer can read.
+            me_issue, error = first_visible(
+                [issue["id"] for issue in me_issues],
+                REDMINE_URL,
+                {"X-Redmine-API-Key": user_api_key},
+                predicate=lambda issue: issue.get("status", {}).get("id") == 31
+            )
+            if error:
+                return False, f"Failed to search MeAppointment: {error}"
 
-            if search_response.status_code != 200:
-                return False, f"Failed to search MeAppointment: {search_response.status_code} - {search_response.text}"
-
-            me_issues = search_response.json().get("issues", [])
-            if not me_issues:
+            if not me_issue:
                 return False, f"No MeAppointment issue found for license {license_ref_string}"
 
             # 4. Close the first matched MeAppointment (assumes one-to-one)
 
             print("me issues", me_issues)
-            me_appointment_id = me_issues[0]["id"]
+            me_appointment_id = me_issue["id"]
 
             print("me appointment id", me_appointment_id)
 
@@ -868,7 +819,7 @@ class MiningEnginerService:
                 }
             }
 
-            close_response = requests.put(
+            close_response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{me_appointment_id}.json",
                 json=close_payload,
                 headers={"X-Redmine-API-Key": user_api_key, "Content-Type": CONTENT_TYPE_JSON}
@@ -877,6 +828,8 @@ class MiningEnginerService:
             if close_response.status_code not in [200, 204]:
                 return False, f"Failed to close MeAppointment: {close_response.status_code} - {close_response.text}"
 
+            me_appointment_index.mark_stale()
+
             return True, None
 
         except Exception as e:
@@ -902,50 +855,25 @@ class MiningEnginerService:
 
     @staticmethod
     def _fetch_hold_licenses(headers, redmine_url):
-        offset = 0
-        processed_issues = []
-        total_count = None
-
-        while True:
-            issues_data, error, total = MiningEnginerService._get_issues(headers, redmine_url, offset)
-            if error:
-                return None, error
-
-            if total_count is None:
-                total_count = total
-
-            for issue in issues_data:
-                processed_issues.append(MiningEnginerService._process_issue(issue))
-
-            offset += len(issues_data)
-            if offset >= total_count or not issues_data:
-                break
-
-        return processed_issues, None
-
-    @staticmethod
-    def _get_issues(headers, redmine_url, offset):
         params = {
             "project_id": 1,
             "tracker_id": 4,
-            "status_id": 39,
-            "offset": offset
+            "status_id": 39
         }
 
-        response = requests.get(
+        issues, response = redmine_client.get_all_pages(
             f"{redmine_url}/projects/mmpro-gsmb/issues.json",
             params=params,
             headers=headers
         )
 
-        if response.status_code != 200:
+        if response is not None:
             error_msg = f"Redmine API error: {response.status_code}"
             if response.text:
                 error_msg += f" - {response.text[:200]}"
-            return None, error_msg, None
+            return None, error_msg
 
-        data = response.json()
-        return data.get("issues", []), None, data.get("total_count", 0)
+        return [MiningEnginerService._process_issue(issue) for issue in issues], None
 
     @staticmethod
     def _process_issue(issue):
@@ -993,7 +921,7 @@ class MiningEnginerService:
 
 
             issue_url = f"{REDMINE_URL}/issues/{issue_id}.json?include=attachments"
-            response = requests.get(
+            response = redmine_client.get(
                 issue_url,
                 headers={"X-Redmine-API-Key": api_key, "Content-Type": CONTENT_TYPE_JSON}
             )
@@ -1056,33 +984,16 @@ class MiningEnginerService:
                 return None, REDMINE_API_ERROR_MSG
 
             headers = {"X-Redmine-API-Key": API_KEY}
-            params = {"project_id": 1, "tracker_id": 4, "offset": 0, "limit": 100}
-            all_issues = []
-
-            while True:
-                response = requests.get(
-                    f"{REDMINE_URL}/projects/mmpro-gsmb/issues.json",
-                    params=params,
-                    headers=headers
-                )
-
-                if response.status_code != 200:
-                    return None, f"Redmine API error: {response.status_code} - {response.text[:200]}"
-
-                data = response.json()
-                issues = data.get("issues", [])
-                all_issues.extend(issues)
-
-                if len(issues) < params["limit"]:
-                    break
-
-                params["offset"] += params["limit"]
+            all_issues, response = redmine_client.get_all_pages(
+                f"{REDMINE_URL}/projects/mmpro-gsmb/issues.json",
+                params=redmine_client.issue_params(project_id=1, tracker_id=4, status_id=6),  # Rejected
+                headers=headers
+            )
+            if response is not None:
+                return None, f"Redmine API error: {response.status_code} - {response.text[:200]}"
 
             processed_issues = []
             for issue in all_issues:
-                if issue.get("status", {}).get("id") != 6:
-                    continue
-
                 custom_fields = {
                     field['id']: field['value']
                     for field in issue.get('custom_fields', [])
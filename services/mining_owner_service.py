@@ -1,16 +1,24 @@
 from typing import Dict, List, Optional, Tuple
 import requests
+from utils import redmine_client
 import os
 from dotenv import load_dotenv
 import json
 from datetime import date, timedelta , datetime 
 from services.general_public_service import GeneralPublicService
 from utils.jwt_utils import JWTUtils
+from utils.user_utils import UserUtils
+from utils.geo_cache import geo_cache, nominatim_throttle
+from utils.deferred_queue import DeferredQueue
+from utils.tpl_index import tpl_index
+from config import Config
 from utils.MLOUtils import MLOUtils
 from flask import request
 from utils.limit_utils import LimitUtils
+from utils.license_index import license_indexes, ml_license_index, normalize_license_number
+from utils.issue_model import Issue, parse_issues
+from utils.attachment_cache import attachment_id_of, remember_issue_attachments, resolve_content_urls
 from werkzeug.utils import secure_filename
-import time
 from hashlib import md5
 from utils.constants import REDMINE_API_ERROR_MSG,CONTENT_TYPE_JSON
 
@@ -39,6 +47,8 @@ class MLOwnerService:
 
     ORS_API_KEY = os.getenv("ORS_API_KEY")
     INVALID_API_KEY_MSG = "Invalid or missing API key in the token"
+    # ML status -> tracker holding its meeting: ME Appointment Scheduled (31) and Appointment Scheduled (34)
+    MEETING_TRACKERS = {31: 12, 34: 11}
     
 
     @staticmethod
@@ -71,49 +81,28 @@ class MLOwnerService:
 
     @staticmethod
     def _fetch_all_issues(url, headers, user_id):
-        offset = 0
-        all_issues = []
-        total_count = None
-
-        while True:
-            params = {
-                "project_id": 1,
-                "tracker_id": 4,
-                "status_id": 7,
-                "assigned_to_id": user_id,
-                "offset": offset
-            }
-            response = requests.get(f"{url}/issues.json", headers=headers, params=params)
-            if response.status_code != 200:
-                return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
-
-            data = response.json()
-            issues = data.get("issues", [])
-            if total_count is None:
-                total_count = data.get("total_count", 0)
-
-            all_issues.extend(issues)
-            offset += len(issues)
-            if offset >= total_count or not issues:
-                break
+        params = redmine_client.issue_params(project_id=1, tracker_id=4, status_id=7, assigned_to_id=user_id)
+        all_issues, response = redmine_client.get_all_pages(f"{url}/issues.json", params=params, headers=headers)
+        if response is not None:
+            return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
 
         return all_issues, None
 
     @staticmethod
     def _parse_issue(issue):
         assigned_to = issue.get("assigned_to", {})
-        custom_fields = {field["name"]: field["value"] for field in issue.get("custom_fields", [])}
+        ml = Issue.parse(issue)
 
         owner_name = assigned_to.get("name", "N/A")
-        license_number = custom_fields.get(MINING_LICENSE_NUMBER, "N/A")
-        divisional_secretary = custom_fields.get(DIVISIONAL_SECRETARY, "N/A")
-        location = custom_fields.get(NAME_VILLAGE, "N/A")
+        license_number = ml.field(MINING_LICENSE_NUMBER, "N/A")
+        divisional_secretary = ml.field(DIVISIONAL_SECRETARY, "N/A")
+        location = ml.field(NAME_VILLAGE, "N/A")
         start_date = issue.get("start_date", "N/A")
         due_date = issue.get("due_date", "N/A")
-        royalty = custom_fields.get("Royalty", "N/A")
+        royalty = ml.field("Royalty", "N/A")
         status = issue.get("status", {}).get("name", "Unknown")
 
-        remaining_cubes = MLOwnerService._safe_int(custom_fields.get("Remaining", "0"))
+        remaining_cubes = MLOwnerService._safe_int(ml.field("Remaining", "0"))
         status = MLOwnerService._update_status_if_expired(due_date, status)
 
         return {
@@ -175,7 +164,7 @@ class MLOwnerService:
 
             filtered = [
                 MLOwnerService._parse_mining_home_issue(issue)
-                for issue in issues
+                for issue in parse_issues(issues)
                 if MLOwnerService._is_valid_home_license(issue)
             ]
 
@@ -188,31 +177,17 @@ class MLOwnerService:
 
     @staticmethod
     def _fetch_all_issues_with_status(url, headers, user_id, status_id):
-        offset = 0
-        all_issues = []
-        total_count = None
-
-        while True:
-            params = {
-                "project_id": 1,
-                "tracker_id": 4,
-                "status_id": status_id,
-                "assigned_to_id": user_id,
-                "offset": offset
-            }
-            response = requests.get(f"{url}/issues.json", headers=headers, params=params)
-            if response.status_code != 200:
-                return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
-
-            data = response.json()
-            issues = data.get("issues", [])
-            if total_count is None:
-                total_count = data.get("total_count", 0)
-
-            all_issues.extend(issues)
-            offset += len(issues)
-            if offset >= total_count or not issues:
-                break
+        # Home licenses must still be running, so leave expired ones on Redmine.
+        params = redmine_client.issue_params(
+            project_id=1,
+            tracker_id=4,
+            status_id=status_id,
+            assigned_to_id=user_id,
+            due_date=(date.today() + timedelta(days=1), None),
+        )
+        all_issues, response = redmine_client.get_all_pages(f"{url}/issues.json", params=params, headers=headers)
+        if response is not None:
+            return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
 
         return all_issues, None
 
@@ -228,8 +203,7 @@ class MLOwnerService:
         except ValueError:
             return False
 
-        custom_fields = {f["name"]: f["value"] for f in issue.get("custom_fields", [])}
-        remaining_str = custom_fields.get("Remaining", "0")
+        remaining_str = Issue.parse(issue).field("Remaining", "0")
         try:
             return int(remaining_str.strip()) > 0
         except (ValueError, AttributeError):
@@ -237,7 +211,7 @@ class MLOwnerService:
 
     @staticmethod
     def _parse_mining_home_issue(issue):
-        custom_fields = {f["name"]: f["value"] for f in issue.get("custom_fields", [])}
+        ml = Issue.parse(issue)
         assigned_to = issue.get("assigned_to", {})
 
         def safe_int(value):
@@ -248,14 +222,14 @@ class MLOwnerService:
 
         return {
             "Issue ID": issue.get("id", "N/A"),
-            "License Number": custom_fields.get(MINING_LICENSE_NUMBER, "N/A"),
-            DIVISIONAL_SECRETARY: custom_fields.get(DIVISIONAL_SECRETARY, "N/A"),
+            "License Number": ml.field(MINING_LICENSE_NUMBER, "N/A"),
+            DIVISIONAL_SECRETARY: ml.field(DIVISIONAL_SECRETARY, "N/A"),
             "Owner Name": assigned_to.get("name", "N/A"),
-            "Location": custom_fields.get(NAME_VILLAGE, "N/A"),
+            "Location": ml.field(NAME_VILLAGE, "N/A"),
             "Start Date": issue.get("start_date", "N/A"),
             "Due Date": issue.get("due_date", "N/A"),
-            "Remaining Cubes": safe_int(custom_fields.get("Remaining", "0")),
-            "Royalty": custom_fields.get("Royalty", "N/A")
+            "Remaining Cubes": safe_int(ml.field("Remaining", "0")),
+            "Royalty": ml.field("Royalty", "N/A")
         }
 
 
@@ -273,7 +247,7 @@ class MLOwnerService:
             "Content-Type": CONTENT_TYPE_JSON,
             "X-Redmine-API-Key": api_key
         }
-        response = requests.get(url, headers=headers)
+        response = redmine_client.get(url, headers=headers)
         if response.status_code != 200:
             return None, f"Failed to fetch mining license issue: {response.status_code} - {response.text}"
         data = response.json()
@@ -289,7 +263,7 @@ class MLOwnerService:
             "Content-Type": CONTENT_TYPE_JSON,
             "X-Redmine-API-Key": api_key
         }
-        response = requests.put(url, json=payload, headers=headers)
+        response = redmine_client.put(url, json=payload, headers=headers)
         if response.status_code != 204:
             return f"Failed to update mining license issue"
         return None
@@ -301,7 +275,7 @@ class MLOwnerService:
             "Content-Type": CONTENT_TYPE_JSON,
             "X-Redmine-API-Key": api_key
         }
-        response = requests.post(url, json=payload, headers=headers)
+        response = redmine_client.post(url, json=payload, headers=headers)
         if response.status_code == 201:
             if response.text.strip():
                 return response.json(), None
@@ -334,16 +308,13 @@ class MLOwnerService:
             if err:
                 return None, err
 
-            custom_fields = mining_issue.get("custom_fields", [])
-            used_field = next((f for f in custom_fields if f.get("name") == "Used"), None)
-            remaining_field = next((f for f in custom_fields if f.get("name") == "Remaining"), None)
-            royalty_field = next((f for f in custom_fields if f.get("name") == "Royalty"), None)
-            if not used_field or not remaining_field or not royalty_field:
+            ml = Issue.parse(mining_issue)
+            if not all(ml.has_field(name) for name in ("Used", "Remaining", "Royalty")):
                 return None, "Required fields (Used, Remaining, or Royalty) not found in the mining license issue"
 
-            current_used = MLOwnerService._safe_int(used_field.get("value"))
-            current_remaining = MLOwnerService._safe_int(remaining_field.get("value"))
-            current_royalty = MLOwnerService._safe_int(royalty_field.get("value"))
+            current_used = int(ml.used or 0)
+            current_remaining = int(ml.remaining or 0)
+            current_royalty = int(ml.royalty or 0)
             cubes = MLOwnerService._safe_int(data.get("cubes"))
 
             tpl_cost = cubes * 500
@@ -359,24 +330,28 @@ class MLOwnerService:
             update_payload = {
                 "issue": {
                     "custom_fields": [
-                        {"id": used_field.get("id"), "value": str(new_used)},
-                        {"id": remaining_field.get("id"), "value": str(new_remaining)},
-                        {"id": royalty_field.get("id"), "value": str(new_royalty)}
+                        {"id": ml.field_id("Used"), "value": str(new_used)},
+                        {"id": ml.field_id("Remaining"), "value": str(new_remaining)},
+                        {"id": ml.field_id("Royalty"), "value": str(new_royalty)}
                     ]
                 }
             }
 
-            err = MLOwnerService._update_mining_issue(REDMINE_URL, API_KEY, mining_issue_id, update_payload)
-            if err:
-                return None, err
-
+            # Route before debiting the license so a routing failure leaves its counters untouched.
             route_01 = data.get("route_01", "")
             destination = data.get("destination", "")
-            time_result = MLOwnerService.calculate_time(route_01, destination)
-            if not time_result.get("success"):
-                return None, time_result.get("error")
+            defer_travel_time = Config.TPL_DEFER_TRAVEL_TIME
+            if defer_travel_time:
+                time_hours = Config.TPL_DEFAULT_VALIDITY_HOURS
+            else:
+                time_result = MLOwnerService.calculate_time(route_01, destination)
+                if not time_result.get("success"):
+                    return None, time_result.get("error")
+                time_hours = time_result.get("time_hours", 0)
 
-            time_hours = time_result.get("time_hours", 0)
+            err = MLOwnerService._update_mining_issue(REDMINE_URL, API_KEY, mining_issue_id, update_payload)
+            if err:
+                return None, err
 
             result = JWTUtils.decode_jwt_and_get_user_id(token)
             user_id = result['user_id']
@@ -404,11 +379,91 @@ class MLOwnerService:
                 }
             }
 
-            return MLOwnerService._create_tpl_issue(REDMINE_URL, API_KEY, payload)
+            issue, error = MLOwnerService._create_tpl_issue(REDMINE_URL, API_KEY, payload)
+            if error or not defer_travel_time:
+                return issue, error
+
+            tpl_id = (issue.get("issue") or {}).get("id")
+            if tpl_id:
+                status = tpl_travel_time_queue.enqueue(tpl_id, {
+                    "issue_id": tpl_id,
+                    "user_id": user_id,
+                    "route_01": route_01,
+                    "destination": destination,
+                })
+                tpl_travel_time_queue.start()
+                issue["travel_time"] = MLOwnerService._travel_time_view(status)
+            return issue, None
 
         except Exception as e:
             return None, str(e)
 
+    @staticmethod
+    def _report_travel_time_failure(job, error):
+        """Queue failure hook: leave a note on the TPL that it still carries the default validity."""
+        redmine_url = os.getenv("REDMINE_URL")
+        admin_key = os.getenv("REDMINE_ADMIN_API_KEY")
+        notes = (
+            f"Travel time could not be calculated ({error}). Estimated time is still the default of "
+            f"{Config.TPL_DEFAULT_VALIDITY_HOURS} hours; set it manually for the route "
+            f"{job['route_01']} -> {job['destination']}."
+        )
+        response = redmine_client.put(
+            f"{redmine_url}/issues/{job['issue_id']}.json",
+            json={"issue": {"notes": notes}},
+            headers={"X-Redmine-API-Key": admin_key, "Content-Type": CONTENT_TYPE_JSON}
+        )
+        if response.status_code != 204:
+            raise ValueError(f"Failed to note travel time failure on TPL: {response.status_code} - {response.text}")
+
+    @staticmethod
+    def _apply_travel_time(job):
+        """Queue handler: route the TPL and patch its ``estimated_hours``."""
+        time_result = MLOwnerService.calculate_time(job["route_01"], job["destination"])
+        if not time_result.get("success"):
+            raise ValueError(time_result.get("error"))
+
+        redmine_url = os.getenv("REDMINE_URL")
+        admin_key = os.getenv("REDMINE_ADMIN_API_KEY")
+        time_hours = time_result.get("time_hours", 0)
+        response = redmine_client.put(
+            f"{redmine_url}/issues/{job['issue_id']}.json",
+            json={"issue": {"estimated_hours": time_hours}},
+            headers={"X-Redmine-API-Key": admin_key, "Content-Type": CONTENT_TYPE_JSON}
+        )
+        if response.status_code != 204:
+            raise ValueError(f"Failed to update TPL issue: {response.status_code} - {response.text}")
+        tpl_index.mark_stale()
+        return {"estimated_hours": time_hours}
+
+    @staticmethod
+    def _travel_time_view(status):
+        return {
+            "status": status["status"],
+            "estimated_hours": (status.get("result") or {}).get("estimated_hours"),
+            "attempts": status.get("attempts", 0),
+            "error": status.get("error"),
+            "updated_at": status.get("updated_at"),
+        }
+
+    @staticmethod
+    def get_tpl_travel_time(token, tpl_id):
+        """Status of a deferred TPL travel-time calculation, for the TPL's owner only."""
+        try:
+            user_response = JWTUtils.decode_jwt_and_get_user_id(token)
+            user_id = user_response.get("user_id")
+            if not user_id:
+                return None, "Failed to extract user info"
+
+            status = tpl_travel_time_queue.status(tpl_id)
+            if not status or status["job"]["payload"].get("user_id") != user_id:
+                return None, "No travel time calculation found for this TPL"
+
+            return MLOwnerService._travel_time_view(status), None
+
+        except Exception as e:
+            return None, f"Server error: {str(e)}"
+
         
     @staticmethod
     def calculate_time(city1, city2):
@@ -423,8 +478,13 @@ class MLOwnerService:
             dict: A dictionary containing the time in hours or an error message.
         """
         try:
-            # Step 1: Geocode cities to get coordinates
-            def geocode_location(city_name): 
+            # Step 1: Geocode cities to get coordinates (cache / gazetteer first)
+            def geocode_location(city_name):
+                cached = geo_cache.coordinates(city_name)
+                if cached:
+                    return cached
+
+                nominatim_throttle.wait()
                 url = f"https://nominatim.openstreetmap.org/search?q={city_name}&format=json"
                 headers = {
                     "User-Agent": "MiningLicenseTPL/1.0 (it-support@miningcompany.com)"  # <-- important for Nominatim usage policy
@@ -442,30 +502,31 @@ class MLOwnerService:
                 if response:
                     lat = float(response[0]['lat'])
                     lon = float(response[0]['lon'])
+                    geo_cache.set_coordinates(city_name, (lon, lat))
                     return lon, lat  # Return as [longitude, latitude]
                 else:
                     raise ValueError(f"Location '{city_name}' not found")
 
-            # Geocode both cities
-            coord1 = geocode_location(city1)
-            time.sleep(1)
-            coord2 = geocode_location(city2)
+            # Step 2: Road distance, cached per origin/destination pair
+            distance_km = geo_cache.distance_km(city1, city2)
+            if distance_km is None:
+                coord1 = geocode_location(city1)
+                coord2 = geocode_location(city2)
 
+                url = "https://api.openrouteservice.org/v2/directions/driving-car"
+                headers = {
+                    "Authorization": MLOwnerService.ORS_API_KEY,
+                    "Content-Type": CONTENT_TYPE_JSON
+                }
+                body = {
+                    "coordinates": [list(coord1), list(coord2)],
+                    "units": "km"
+                }
+                response = requests.post(url, headers=headers, json=body, timeout=10).json()
 
-            # Step 2: Calculate distance using OpenRouteService
-            url = "https://api.openrouteservice.org/v2/directions/driving-car"
-            headers = {
-                "Authorization": MLOwnerService.ORS_API_KEY,
-                "Content-Type": CONTENT_TYPE_JSON
-            }
-            body = {
-                "coordinates": [coord1, coord2],
-                "units": "km"
-            }
-            response = requests.post(url, headers=headers, json=body).json()
-
-            # Extract distance from the response
-            distance_km = response['routes'][0]['summary']['distance']
+                # Extract distance from the response
+                distance_km = response['routes'][0]['summary']['distance']
+                geo_cache.set_distance_km(city1, city2, distance_km)
 
             # Calculate the time in hours: (distance / 30 km/h) + 2 hours
             time_hours = (distance_km / 30) + 2
@@ -497,7 +558,7 @@ class MLOwnerService:
 
             url = f"{REDMINE_URL}/issues/{issue_id}.json"
            
-            response = requests.put(
+            response = redmine_client.put(
                 url,
                 json = data,  # Ensure correct JSON structure
                 headers=headers
@@ -538,36 +599,11 @@ class MLOwnerService:
             return None, result['message']
         return result['user_id'], None
 
-    @staticmethod
-    def _find_issue_with_l_number(issues: list, l_number: str) -> Optional[int]:
-        l_number_lower = l_number.strip().lower()
-        for issue in issues:
-            for cf in issue.get("custom_fields", []):
-                if cf.get("id") == 101 and str(cf.get("value", "")).strip().lower() == l_number_lower:
-                    return issue["id"]
-        return None
-
-    @staticmethod
-    def _fetch_issues_page(redmine_url: str, headers: dict, user_id: int, offset: int, limit: int) -> Tuple[Optional[list], Optional[str]]:
-        issues_url = (
-            f"{redmine_url}/issues.json?"
-            f"project_id=1&tracker_id=4&status_id=7"
-            f"&assigned_to_id={user_id}"
-            f"&limit={limit}&offset={offset}"
-        )
-        try:
-            resp = requests.get(issues_url, headers=headers, timeout=30)
-            if resp.status_code != 200:
-                return None, f"Failed to fetch issues: {resp.status_code} - {resp.text}"
-            return resp.json().get("issues", []), None
-        except requests.exceptions.RequestException as e:
-            return None, f"Network error connecting to Redmine: {str(e)}"
-
     @staticmethod
     def _fetch_issue_detail(redmine_url: str, headers: dict, issue_id: int) -> Tuple[Optional[dict], Optional[str]]:
         detail_url = f"{redmine_url}/issues/{issue_id}.json"
         try:
-            resp = requests.get(detail_url, headers=headers, timeout=30)
+            resp = redmine_client.get(detail_url, headers=headers, timeout=30)
             if resp.status_code != 200:
                 return None, f"Failed to fetch issue details: {resp.status_code} - {resp.text}"
             return resp.json().get("issue", {}), None
@@ -589,66 +625,57 @@ class MLOwnerService:
             "Content-Type": CONTENT_TYPE_JSON
         }
 
-        default_limit = 100
-        offset = 0
-        found_issue = None
-        done = False
-
-        while not done:
-            issues, error = MLOwnerService._fetch_issues_page(REDMINE_URL, headers, user_id, offset, default_limit)
-            if error:
-                return None, error
-            if not issues or len(issues) < default_limit:
-                done = True
-
-            issue_id = MLOwnerService._find_issue_with_l_number(issues, l_number)
-            if not issue_id:
-                offset += default_limit
-                continue
+        issues, error = ml_license_index.lookup_fresh(
+            normalize_license_number(l_number),
+            predicate=lambda issue: (
+                issue.get("assigned_to", {}).get("id") == user_id
+                and issue.get("status", {}).get("id") == 7
+            )
+        )
+        if error:
+            return None, error
+        if not issues:
+            return None, "No mining license found for the given number."
 
-            issue_data, error = MLOwnerService._fetch_issue_detail(REDMINE_URL, headers, issue_id)
-            if error:
-                return None, error
+        issue_data, error = MLOwnerService._fetch_issue_detail(REDMINE_URL, headers, issues[0]["id"])
+        if error:
+            return None, error
 
-            cf_dict = {f["name"]: f.get("value") for f in issue_data.get("custom_fields", [])}
-            found_issue = {
-                "id": issue_data.get("id"),
-                "subject": issue_data.get("subject"),
-                "status": issue_data.get("status", {}).get("name"),
-                "author": issue_data.get("author", {}).get("name"),
-                "assigned_to": issue_data.get("assigned_to", {}).get("name"),
-                "start_date": issue_data.get("start_date"),
-                "due_date": issue_data.get("due_date"),
-                "created_on": issue_data.get("created_on"),
-                "updated_on": issue_data.get("updated_on"),
-                # Add your custom fields here:
-                "royalty": cf_dict.get("Royalty"),
-                "exploration_licence_no": cf_dict.get(EXPLORATION_LICENSE_NO),
-                "land_name": cf_dict.get(LAND_NAME_LICENCE_DETAILS),
-                "land_owner_name": cf_dict.get(LAND_OWNER_NAME),
-                "village_name": cf_dict.get(NAME_VILLAGE),
-                "grama_niladhari_division": cf_dict.get(GRAMA_NILADHARI),
-                "divisional_secretary_division": cf_dict.get(DIVISIONAL_SECRETARY),
-                "administrative_district": cf_dict.get(ADMINISTRATIVE_DISTRICT),
-                "capacity": cf_dict.get("Capacity"),
-                "used": cf_dict.get("Used"),
-                "remaining": cf_dict.get("Remaining"),
-                "mobile_number": cf_dict.get(MOBILE_NUMBER),
-                "google_location": cf_dict.get("Google location "),
-                "reason_for_hold": cf_dict.get("Reason For Hold"),
-                "economic_viability_report": cf_dict.get(ECONOMIC_VIABILITY_REPORT),
-                "detailed_mine_restoration_plan": cf_dict.get(DETAILED_MINE_RESTORATION_PLAN),
-                "deed_and_survey_plan": cf_dict.get(DEED_AND_SURVEY_PLAN),
-                "payment_receipt": cf_dict.get(PAYMENT_RECEIPT),
-                "license_boundary_survey": cf_dict.get(LICENSE_BOUNDARY_SURVEY),
-                "mining_license_number": cf_dict.get(MINING_LICENSE_NUMBER),
-            }
-            break  # Found issue, exit loop
+        ml = Issue.parse(issue_data)
+        found_issue = {
+            "id": issue_data.get("id"),
+            "subject": issue_data.get("subject"),
+            "status": issue_data.get("status", {}).get("name"),
+            "author": issue_data.get("author", {}).get("name"),
+            "assigned_to": issue_data.get("assigned_to", {}).get("name"),
+            "start_date": issue_data.get("start_date"),
+            "due_date": issue_data.get("due_date"),
+            "created_on": issue_data.get("created_on"),
+            "updated_on": issue_data.get("updated_on"),
+            # Add your custom fields here:
+            "royalty": ml.field("Royalty"),
+            "exploration_licence_no": ml.field(EXPLORATION_LICENSE_NO),
+            "land_name": ml.field(LAND_NAME_LICENCE_DETAILS),
+            "land_owner_name": ml.field(LAND_OWNER_NAME),
+            "village_name": ml.field(NAME_VILLAGE),
+            "grama_niladhari_division": ml.field(GRAMA_NILADHARI),
+            "divisional_secretary_division": ml.field(DIVISIONAL_SECRETARY),
+            "administrative_district": ml.field(ADMINISTRATIVE_DISTRICT),
+            "capacity": ml.field("Capacity"),
+            "used": ml.field("Used"),
+            "remaining": ml.field("Remaining"),
+            "mobile_number": ml.field(MOBILE_NUMBER),
+            "google_location": ml.field("Google location "),
+            "reason_for_hold": ml.field("Reason For Hold"),
+            "economic_viability_report": ml.field(ECONOMIC_VIABILITY_REPORT),
+            "detailed_mine_restoration_plan": ml.field(DETAILED_MINE_RESTORATION_PLAN),
+            "deed_and_survey_plan": ml.field(DEED_AND_SURVEY_PLAN),
+            "payment_receipt": ml.field(PAYMENT_RECEIPT),
+            "license_boundary_survey": ml.field(LICENSE_BOUNDARY_SURVEY),
+            "mining_license_number": ml.field(MINING_LICENSE_NUMBER),
+        }
 
-        if found_issue:
-            return found_issue, None
-        else:
-            return None, "No mining license found for the given number."
+        return found_issue, None
 
 
 
@@ -662,21 +689,9 @@ class MLOwnerService:
 
             if not REDMINE_URL or not api_key:
                 return None, REDMINE_API_ERROR_MSG
-            headers = {
-                "X-Redmine-API-Key": api_key,  # Include the token for authorization
-                "Content-Type": CONTENT_TYPE_JSON
-            }
-            url = f"{REDMINE_URL}/users/{user_id}.json"
-           
-            response = requests.get(
-                url,  # Ensure correct JSON structure
-                headers=headers
-            )
-
-            if response.status_code != 200:
-                return None, f"Failed to fetch issue: {response.status_code} - {response.text}"
-
-            user_detail = response.json().get("user", {})
+            user_detail, failed = UserUtils.get_user(user_id, api_key)
+            if failed is not None:
+                return None, f"Failed to fetch issue: {failed.status_code} - {failed.text}"
 
 
             return user_detail, None  # Returning filtered issues and no error
@@ -736,7 +751,7 @@ class MLOwnerService:
             f"{redmine_url}/issues.json?"
             f"project_id=1&tracker_id=5&assigned_to_id={user_id}&limit=100&offset=0"
         )
-        response = requests.get(tpl_url, headers=headers, timeout=30)
+        response = redmine_client.get(tpl_url, headers=headers, timeout=30)
         if response.status_code != 200:
             return None, f"Redmine API error ({response.status_code}): {response.text}"
         
@@ -752,12 +767,12 @@ class MLOwnerService:
 
         for issue in issues:
             try:
-                custom_fields = issue.get("custom_fields", [])
-                mln = next((f.get("value") for f in custom_fields if f.get("id") == 59), None)
-                if mln != mining_license_number:
+                tpl = Issue.parse(issue)
+                # Malformed TPLs without a lorry number are left out of the list
+                if tpl.field(59) != mining_license_number or not tpl.field("Lorry Number"):
                     continue
 
-                tpl_list.append(MLOwnerService._build_tpl_record(issue, custom_fields, mining_license_number, now))
+                tpl_list.append(MLOwnerService._build_tpl_record(tpl, mining_license_number, now))
             except Exception as e:
                 print(f"Error processing issue {issue.get('id', 'N/A')}: {str(e)}")
                 continue
@@ -765,8 +780,7 @@ class MLOwnerService:
         return tpl_list
 
     @staticmethod
-    def _build_tpl_record(issue: Dict, custom_fields: List[Dict], mln: str, now: datetime) -> Dict:
-        cf_dict = {field["name"]: field["value"] for field in custom_fields}
+    def _build_tpl_record(issue: Issue, mln: str, now: datetime) -> Dict:
         created_on = issue.get("created_on")
         est_hours = issue.get("estimated_hours")
         status = "Undetermined"
@@ -784,13 +798,13 @@ class MLOwnerService:
             "license_number": mln,
             "subject": issue.get("subject", ""),
             "status": status,
-            "lorry_number": cf_dict.get("Lorry Number"),
-            "driver_contact": cf_dict.get("Driver Contact"),
-            "destination": cf_dict.get("Destination"),
-            "Route_01": cf_dict.get("Route 01"),
-            "Route_02": cf_dict.get("Route 02"),
-            "Route_03": cf_dict.get("Route 03"),
-            "cubes": cf_dict.get("Cubes"),
+            "lorry_number": issue.field("Lorry Number"),
+            "driver_contact": issue.field("Driver Contact"),
+            "destination": issue.field("Destination"),
+            "Route_01": issue.field("Route 01"),
+            "Route_02": issue.field("Route 02"),
+            "Route_03": issue.field("Route 03"),
+            "cubes": issue.field("Cubes"),
             "Create_Date": created_on,
             "Estimated Hours": est_hours,
         }
@@ -841,7 +855,7 @@ class MLOwnerService:
             }
 
             # First create the issue
-            response = requests.post(f"{REDMINE_URL}/issues.json", json=payload, headers=headers)
+            response = redmine_client.post(f"{REDMINE_URL}/issues.json", json=payload, headers=headers)
             
             if response.status_code != 201:
                 return None, f"Failed to create issue: {response.text}"
@@ -861,7 +875,7 @@ class MLOwnerService:
                 }
             }
 
-            update_response = requests.put(
+            update_response = redmine_client.put(
                 f"{REDMINE_URL}/issues/{issue_id}.json",
                 headers=headers,
                 json=update_payload
@@ -898,39 +912,33 @@ class MLOwnerService:
             if not REDMINE_URL:
                 return None, REDMINE_URL_NOT_SET
 
-            ml_issues_url = f"{REDMINE_URL}/issues.json?tracker_id=4&project_id=1&status_id=!7"
-            response = requests.get(
-                ml_issues_url,
-                headers={"X-Redmine-API-Key": user_api_key, "Content-Type": CONTENT_TYPE_JSON}
+            # ✅ Let Redmine filter to issues assigned to the current user. Every issue has
+            # that same assignee, so their profile is fetched once, alongside the issues.
+            (issues, failed), (owner_profile, _) = redmine_client.gather(
+                lambda: redmine_client.get_all_pages(
+                    f"{REDMINE_URL}/issues.json",
+                    params=redmine_client.issue_params(tracker_id=4, project_id=1, status_id="!7", assigned_to_id=user_id),
+                    headers={"X-Redmine-API-Key": user_api_key, "Content-Type": CONTENT_TYPE_JSON}
+                ),
+                lambda: UserUtils.get_user(user_id, user_api_key),
             )
 
-            if response.status_code != 200:
-                return None, f"Failed to fetch ML issues: {response.status_code} - {response.text}"
+            if failed is not None:
+                return None, f"Failed to fetch ML issues: {failed.status_code} - {failed.text}"
 
-            issues = response.json().get("issues", [])
+            issues = [issue for issue in issues if issue.get("assigned_to", {}).get("id") == user_id]
+            MLOwnerService.prefetch_attachment_urls(user_api_key, REDMINE_URL, issues)
+            assigned_to_details = owner_profile if issues else None
 
             formatted_mls = []
 
             for issue in issues:
                 assigned_to = issue.get("assigned_to", {})
-                assigned_to_id = assigned_to.get("id")
-
-                # ✅ Filter: only include issues assigned to current user
-                if assigned_to_id != user_id:
-                    continue
 
                 custom_fields = issue.get("custom_fields", [])
+                ml = Issue.parse(issue)
                 attachment_urls = MLOwnerService.get_attachment_urls(user_api_key, REDMINE_URL, custom_fields)
 
-                assigned_to_details = None
-                if assigned_to_id:
-                    user_response = requests.get(
-                        f"{REDMINE_URL}/users/{assigned_to_id}.json",
-                        headers={"X-Redmine-API-Key": user_api_key, "Content-Type": CONTENT_TYPE_JSON}
-                    )
-                    if user_response.status_code == 200:
-                        assigned_to_details = user_response.json().get("user", {})
-
                 ml_data = {
                     "id": issue.get("id"),
                     "subject": issue.get("subject"),
@@ -944,15 +952,15 @@ class MLOwnerService:
                         "email": assigned_to_details.get("mail"),
                         "custom_fields": assigned_to_details.get("custom_fields", [])
                     } if assigned_to_details else None,
-                    "exploration_licence_no": MLOwnerService.get_custom_field_value(custom_fields, EXPLORATION_LICENSE_NO),
-                    "land_name": MLOwnerService.get_custom_field_value(custom_fields, LAND_NAME_LICENCE_DETAILS),
-                    "land_owner_name": MLOwnerService.get_custom_field_value(custom_fields, LAND_OWNER_NAME),
-                    "village_name": MLOwnerService.get_custom_field_value(custom_fields, NAME_VILLAGE),
-                    "grama_niladhari_division": MLOwnerService.get_custom_field_value(custom_fields, GRAMA_NILADHARI),
-                    "divisional_secretary_division": MLOwnerService.get_custom_field_value(custom_fields, DIVISIONAL_SECRETARY),
-                    "administrative_district": MLOwnerService.get_custom_field_value(custom_fields, ADMINISTRATIVE_DISTRICT),
-                    "google_location": MLOwnerService.get_custom_field_value(custom_fields, "Google location "),
-                    "mobile_number": MLOwnerService.get_custom_field_value(custom_fields, MOBILE_NUMBER),
+                    "exploration_licence_no": ml.field(EXPLORATION_LICENSE_NO),
+                    "land_name": ml.field(LAND_NAME_LICENCE_DETAILS),
+                    "land_owner_name": ml.field(LAND_OWNER_NAME),
+                    "village_name": ml.field(NAME_VILLAGE),
+                    "grama_niladhari_division": ml.field(GRAMA_NILADHARI),
+                    "divisional_secretary_division": ml.field(DIVISIONAL_SECRETARY),
+                    "administrative_district": ml.field(ADMINISTRATIVE_DISTRICT),
+                    "google_location": ml.field("Google location "),
+                    "mobile_number": ml.field(MOBILE_NUMBER),
                     "detailed_mine_restoration_plan": attachment_urls.get(DETAILED_MINE_RESTORATION_PLAN),
                     "economic_viability_report": attachment_urls.get(ECONOMIC_VIABILITY_REPORT),
                     "license_boundary_survey": attachment_urls.get(LICENSE_BOUNDARY_SURVEY),
@@ -971,52 +979,48 @@ class MLOwnerService:
     @staticmethod
     def get_attachment_urls(api_key, redmine_url, custom_fields):
         try:
-            # Define the mapping of custom field names to their attachment IDs
-            file_fields = {
-                ECONOMIC_VIABILITY_REPORT: None,
-                LICENSE_FEE_RECEIPT: None,
-                DETAILED_MINE_RESTORATION_PLAN: None,
-                "Professional": None,
-                DEED_AND_SURVEY_PLAN: None,
-                PAYMENT_RECEIPT: None
-            }
-
-            # Extract attachment IDs from custom fields
-            for field in custom_fields:
-                field_name = field.get("name")
-                attachment_id = field.get("value")
-
-                if field_name in file_fields and attachment_id.isdigit():
-                    file_fields[field_name] = attachment_id
-
-            # Fetch URLs for valid attachment IDs
-            file_urls = {}
-            for field_name, attachment_id in file_fields.items():
-                if attachment_id:
-                    attachment_url = f"{redmine_url}/attachments/{attachment_id}.json"
-                    response = requests.get(
-                        attachment_url,
-                        headers={"X-Redmine-API-Key": api_key, "Content-Type": CONTENT_TYPE_JSON}
-                    )
+            file_fields = MLOwnerService._attachment_ids(custom_fields)
 
-                    if response.status_code == 200:
-                        attachment_data = response.json().get("attachment", {})
-                        file_urls[field_name] = attachment_data.get("content_url", "")
-
-            return file_urls
+            # Resolve URLs for valid attachment IDs (cached, fetched concurrently)
+            content_urls = resolve_content_urls(redmine_url, api_key, file_fields.values())
+            return {
+                field_name: content_urls[attachment_id]
+                for field_name, attachment_id in file_fields.items()
+                if attachment_id in content_urls
+            }
 
         except Exception:
             return {}
 
-
     @staticmethod
-    def get_custom_field_value(custom_fields, field_name):
-        """Helper function to extract custom field value by name."""
+    def _attachment_ids(custom_fields):
+        # Define the mapping of custom field names to their attachment IDs
+        file_fields = {
+            ECONOMIC_VIABILITY_REPORT: None,
+            LICENSE_FEE_RECEIPT: None,
+            DETAILED_MINE_RESTORATION_PLAN: None,
+            "Professional": None,
+            DEED_AND_SURVEY_PLAN: None,
+            PAYMENT_RECEIPT: None
+        }
+
+        # Extract attachment IDs from custom fields
         for field in custom_fields:
-            if field.get("name") == field_name:
-                return field.get("value")
-        return None
-    
+            field_name = field.get("name")
+            if field_name in file_fields:
+                file_fields[field_name] = attachment_id_of(field.get("value"))
+        return file_fields
+
+    @staticmethod
+    def prefetch_attachment_urls(api_key, redmine_url, issues):
+        """Warm the attachment cache for every file field across ``issues`` in one batch."""
+        resolve_content_urls(redmine_url, api_key, [
+            attachment_id
+            for issue in issues
+            for attachment_id in MLOwnerService._attachment_ids(issue.get("custom_fields", [])).values()
+        ])
+
+
 
     @staticmethod
     def get_pending_mining_license_details(token):
@@ -1025,17 +1029,26 @@ class MLOwnerService:
             if err:
                 return None, err
 
-            issues = MLOwnerService._fetch_issues(
-                f"{redmine_url}/issues.json?tracker_id=4&project_id=1&status_id=!7", user_api_key)
-            
-            summaries = [
-                MLOwnerService._process_issue(issue, user_id, redmine_url, user_api_key)
-                for issue in issues
-                if issue.get("assigned_to", {}).get("id") == user_id
-            ]
+            # The owner's ML issues and the Appointment/MeAppointment indexes the
+            # summaries read from are independent, so load them side by side.
+            (issues, failed), _, _ = redmine_client.gather(
+                lambda: redmine_client.get_all_pages(
+                    f"{redmine_url}/issues.json",
+                    params=redmine_client.issue_params(tracker_id=4, project_id=1, status_id="!7", assigned_to_id=user_id),
+                    headers={"X-Redmine-API-Key": user_api_key, "Content-Type": CONTENT_TYPE_JSON}
+                ),
+                license_indexes[11].ensure_fresh,
+                license_indexes[12].ensure_fresh,
+            )
+            if failed is not None:
+                return None, f"Failed to fetch ML issues: {failed.status_code} - {failed.text}"
 
-            summaries = [s for s in summaries if s]  # filter out None
-            return summaries, None
+            pending = [issue for issue in issues if issue.get("assigned_to", {}).get("id") == user_id]
+            meetings, error = MLOwnerService._meetings_by_license(pending)
+            if error:
+                return None, error
+
+            return [MLOwnerService._process_issue(issue, meetings) for issue in pending], None
 
         except Exception as e:
             return None, f"Server error: {str(e)}"
@@ -1060,20 +1073,31 @@ class MLOwnerService:
 
 
     @staticmethod
-    def _fetch_issues(url, api_key):
-        response = requests.get(url, headers={
-            "X-Redmine-API-Key": api_key,
-            "Content-Type": CONTENT_TYPE_JSON
-        })
-        if response.status_code != 200:
-            raise requests.exceptions.HTTPError(f"Failed to fetch issues: {response.status_code} - {response.text}")
-        return response.json().get("issues", [])
+    def _meetings_by_license(issues):
+        """Join pending MLs to their open meeting issues: ``({(tracker_id, license): meeting}, error)``.
 
+        Each meeting tracker is looked up once for the whole batch through its
+        shared index rather than once per license.
+        """
+        wanted = {}
+        for issue in issues:
+            tracker_id = MLOwnerService.MEETING_TRACKERS.get(issue.get("status", {}).get("id"))
+            license_no = Issue.parse(issue).license_number
+            if tracker_id and license_no:
+                wanted.setdefault(tracker_id, set()).add(normalize_license_number(license_no))
+
+        meetings = {}
+        for tracker_id, keys in wanted.items():
+            index = license_indexes[tracker_id]
+            found, error = index.lookup_many_fresh(keys, predicate=lambda issue: not index.is_closed(issue))
+            if error:
+                return None, error
+            meetings.update(((tracker_id, key), entries[0]) for key, entries in found.items() if entries)
+        return meetings, None
 
     @staticmethod
-    def _process_issue(issue, user_id, base_url, api_key):
-        custom_fields = issue.get("custom_fields", [])
-        license_no = MLOwnerService.get_custom_field_value(custom_fields, MINING_LICENSE_NUMBER)
+    def _process_issue(issue, meetings):
+        license_no = Issue.parse(issue).license_number
 
         summary = {
             "mining_license_number": license_no,
@@ -1082,33 +1106,15 @@ class MLOwnerService:
             "status": issue.get("status", {}).get("name")
         }
 
-        status_id = issue.get("status", {}).get("id")
-        if status_id in (31, 34) and license_no:
-            tracker_id = 12 if status_id == 31 else 11
-            additional = MLOwnerService._get_tracker_match_data(base_url, tracker_id, api_key, license_no)
-            if additional:
-                summary.update(additional)
+        tracker_id = MLOwnerService.MEETING_TRACKERS.get(issue.get("status", {}).get("id"))
+        meeting = meetings.get((tracker_id, normalize_license_number(license_no))) if tracker_id and license_no else None
+        if meeting:
+            summary["start_date"] = meeting.get("start_date")
+            if tracker_id == 11:
+                summary["GSMB_physical_meetinglocation"] = Issue.parse(meeting).field("GSMB physical meeting location")
 
         return summary
 
-
-    @staticmethod
-    def _get_tracker_match_data(base_url, tracker_id, api_key, license_no):
-        url = f"{base_url}/issues.json?tracker_id={tracker_id}&project_id=1"
-        issues = MLOwnerService._fetch_issues(url, api_key)
-
-        for issue in issues:
-            fields = issue.get("custom_fields", [])
-            matched_no = MLOwnerService.get_custom_field_value(fields, MINING_LICENSE_NUMBER)
-            if matched_no == license_no:
-                result = {"start_date": issue.get("start_date")}
-                if tracker_id == 11:
-                    result["GSMB_physical_meetinglocation"] = MLOwnerService.get_custom_field_value(
-                        fields, "GSMB physical meeting location")
-                return result
-
-        return None
-
         
     @staticmethod
     def get_mining_license_by_id(token, issue_id):
@@ -1125,7 +1131,7 @@ class MLOwnerService:
 
             # 🔗 Fetch issue details
             issue_url = f"{REDMINE_URL}/issues/{issue_id}.json?include=attachments"
-            response = requests.get(
+            response = redmine_client.get(
                 issue_url,
                 headers={"X-Redmine-API-Key": api_key, "Content-Type": CONTENT_TYPE_JSON}
             )
@@ -1136,6 +1142,7 @@ class MLOwnerService:
             issue = response.json().get("issue")
             if not issue:
                 return None, "Issue data not found"
+            remember_issue_attachments(api_key, issue)
 
             # 🗂️ Extract and map custom fields to a dictionary
             custom_fields = issue.get("custom_fields", [])
@@ -1200,7 +1207,7 @@ class MLOwnerService:
                 return None, REDMINE_URL_NOT_SET
 
             ml_issues_url = f"{REDMINE_URL}/issues.json?tracker_id=4&project_id=1&status_id=!7"
-            response = requests.get(
+            response = redmine_client.get(
                 ml_issues_url,
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -1222,14 +1229,14 @@ class MLOwnerService:
                 if assigned_to_id != user_id:
                     continue
 
-                custom_fields = issue.get("custom_fields", [])
+                ml = Issue.parse(issue)
 
                 summary = {
                     "id": issue.get("id"),
                     "subject": issue.get("subject"),
                     "assigned_to": assigned_to.get("name"),
-                    "mobile": MLOwnerService.get_custom_field_value(custom_fields, MOBILE_NUMBER),
-                    "district": MLOwnerService.get_custom_field_value(custom_fields, ADMINISTRATIVE_DISTRICT),
+                    "mobile": ml.field(MOBILE_NUMBER),
+                    "district": ml.field(ADMINISTRATIVE_DISTRICT),
                     "date_created": issue.get("created_on"),
                     "status": issue.get("status", {}).get("name"),
                 }
@@ -1255,7 +1262,7 @@ class MLOwnerService:
             issue_url = f"{REDMINE_URL}/issues/{issue_id}.json"
 
             # Step 1: Fetch current issue to read existing royalty value
-            get_response = requests.get(
+            get_response = redmine_client.get(
                 issue_url,
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -1294,7 +1301,7 @@ class MLOwnerService:
                 }
             }
 
-            update_response = requests.put(
+            update_response = redmine_client.put(
                 issue_url,
                 headers={
                     "X-Redmine-API-Key": user_api_key,
@@ -1312,3 +1319,11 @@ class MLOwnerService:
             return False, f"Server error: {str(e)}"
 
 
+tpl_travel_time_queue = DeferredQueue(
+    Config.TPL_TRAVEL_TIME_QUEUE_DIR,
+    "tpl-travel-time",
+    handler=MLOwnerService._apply_travel_time,
+    max_attempts=Config.TPL_TRAVEL_TIME_MAX_ATTEMPTS,
+    retry_delay=Config.TPL_TRAVEL_TIME_RETRY_SECONDS,
+    on_failure=MLOwnerService._report_travel_time_failure,
+)
@@ -1,9 +1,13 @@
 from datetime import datetime, timedelta, timezone
 import os
-import requests
+from utils import redmine_client
 from dotenv import load_dotenv
 from utils.jwt_utils import JWTUtils
 from utils.user_utils import UserUtils
+from utils.tpl_index import tpl_index
+from utils.issue_index import first_visible
+from utils.license_index import ml_license_index, normalize_license_number
+from utils.issue_model import Issue
 from utils.constants import CONTENT_TYPE_JSON, REDMINE_API_ERROR_MSG
 
 load_dotenv()
@@ -22,9 +26,11 @@ class PoliceOfficerService:
             headers = {"X-Redmine-API-Key": api_key}
             current_time = datetime.now(timezone.utc)
 
-            tpl_issue, is_valid, created_on, estimated_hours = (
-                PoliceOfficerService._get_valid_tpl_issue(lorry_number.lower(), headers, current_time)
+            tpl_issue, is_valid, created_on, estimated_hours, error = (
+                PoliceOfficerService._get_valid_tpl_issue(lorry_number, headers, current_time)
             )
+            if error:
+                return None, error
 
             if not tpl_issue:
                 return None, "No valid (non-expired) TPL with this lorry number"
@@ -44,77 +50,55 @@ class PoliceOfficerService:
 
     @staticmethod
     def _get_valid_tpl_issue(lorry_number, headers, now_utc):
-        tpl_params = {"tracker_id": 5}
-        response = requests.get(f"{REDMINE_URL}/issues.json", params=tpl_params, headers=headers)
-        if response.status_code != 200:
-            return None, None, None, None
-
-        for issue in response.json().get("issues", []):
-            if not PoliceOfficerService._lorry_number_matches(issue, lorry_number):
-                continue
-
-            created_str = issue.get("created_on")
-            if not created_str:
-                continue
-
-            try:
-                created_on = datetime.strptime(created_str, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-                estimated_hours = float(issue.get("estimated_hours", 0))
-                expires_at = created_on + timedelta(hours=estimated_hours)
-                is_valid = now_utc < expires_at
-                return issue, is_valid, created_on, estimated_hours
-            except Exception as e:
-                print(f"Error parsing issue {issue.get('id')}: {e}")
-                continue
-
-        return None, None, None, None
+        entries, error = tpl_index.candidates(lorry_number, now_utc)
+        if error or not entries:
+            return None, None, None, None, error
 
-    @staticmethod
-    def _lorry_number_matches(issue, lorry_number):
-        return any(
-            cf["id"] == 53 and cf.get("value") and str(cf["value"]).lower() == lorry_number
-            for cf in issue.get("custom_fields", [])
-        )
+        # The index is synced with the admin key; only return a TPL the officer's own key can read.
+        issue, error = first_visible([e.issue["id"] for e in entries], REDMINE_URL, headers)
+        indexed = tpl_index.index_entry(issue) if issue else None
+        if error or not indexed:
+            return None, None, None, None, error
+
+        entry = indexed[1]
+        return entry.issue, now_utc < entry.expires_at, entry.created_on, entry.estimated_hours, None
 
     @staticmethod
     def _extract_tpl_data(issue, is_valid, created_on, estimated_hours):
-        cf = issue.get("custom_fields", [])
+        tpl = Issue.parse(issue)
         offset = timedelta(hours=5, minutes=30)
         created_sl = created_on + offset
 
-        def get_cf(id_):
-            return next((c["value"] for c in cf if c["id"] == id_), None)
-
         return {
-            "LicenseNumber": get_cf(59),
-            "Cubes": get_cf(58),
-            "Destination": get_cf(68),
+            "LicenseNumber": tpl.field(59),
+            "Cubes": tpl.field(58),
+            "Destination": tpl.field(68),
             "ValidUntil": (created_sl + timedelta(hours=estimated_hours)).strftime("%A, %B %d, %Y at %I:%M %p"),
-            "Route_01": get_cf(55),
-            "Route_02": get_cf(56),
-            "Route_03": get_cf(57),
+            "Route_01": tpl.field(55),
+            "Route_02": tpl.field(56),
+            "Route_03": tpl.field(57),
             "IsValid": is_valid,
             "Assignee": issue["assigned_to"]["name"] if isinstance(issue.get("assigned_to"), dict) else str(issue.get("assigned_to")),
         }
 
     @staticmethod
     def _get_mining_license_data(license_number, headers):
-        ml_params = {"tracker_id": 4, "status_id": "*"}
-        response = requests.get(f"{REDMINE_URL}/issues.json", params=ml_params, headers=headers)
-        if response.status_code != 200:
+        issues, error = ml_license_index.lookup_fresh(normalize_license_number(license_number))
+        if error or not issues:
             return None
 
-        for issue in response.json().get("issues", []):
-            for cf in issue.get("custom_fields", []):
-                if cf.get("id") == 101 and str(cf.get("value")) == str(license_number):
-                    return {
-                        "owner": issue["assigned_to"]["name"] if isinstance(issue["assigned_to"], dict) else str(issue["assigned_to"]),
-                        "License Start Date": issue.get("start_date"),
-                        "License End Date": issue.get("due_date"),
-                        "License Owner Contact Number": next((cf["value"] for cf in issue["custom_fields"] if cf.get("id") == 66), None),
-                        "Grama Niladhari Division": next((cf["value"] for cf in issue["custom_fields"] if cf.get("id") == 31), None),
-                    }
-        return None
+        issue, error = first_visible([i["id"] for i in issues], REDMINE_URL, headers)
+        if error or not issue:
+            return None
+
+        ml = Issue.parse(issue)
+        return {
+            "owner": issue["assigned_to"]["name"] if isinstance(issue.get("assigned_to"), dict) else str(issue.get("assigned_to")),
+            "License Start Date": issue.get("start_date"),
+            "License End Date": issue.get("due_date"),
+            "License Owner Contact Number": ml.field(66),
+            "Grama Niladhari Division": ml.field(31),
+        }
 
     @staticmethod
     def create_complaint(vehicle_number, user_id, token):
@@ -137,7 +121,7 @@ class PoliceOfficerService:
         }
 
         api_key = JWTUtils.get_api_key_from_token(token)
-        response = requests.post(
+        response = redmine_client.post(
             f'{REDMINE_URL}/issues.json',
             json=issue_data,
             headers={'X-Redmine-API-Key': api_key, 'Content-Type': CONTENT_TYPE_JSON}
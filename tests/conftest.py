@@ -24,4 +24,41 @@ def runner(app):
 @pytest.fixture
 def mock_env(monkeypatch):
     monkeypatch.setenv("REDMINE_URL", "https://fake-redmine")
-    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "fake-api-key")
\ No newline at end of file
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "fake-api-key")
+@pytest.fixture(autouse=True)
+def clear_api_key_cache():
+    from utils.jwt_utils import JWTUtils
+    JWTUtils._api_key_cache.clear()
+    yield
+
+@pytest.fixture(autouse=True)
+def clear_dashboard_cache():
+    from utils.dashboard_cache import clear_dashboard_cache
+    clear_dashboard_cache()
+    yield
+
+@pytest.fixture(autouse=True)
+def clear_issue_indexes():
+    from utils.tpl_index import tpl_index
+    from utils.license_index import license_indexes
+    for index in (tpl_index, *license_indexes.values()):
+        index.clear()
+    yield
+
+@pytest.fixture(autouse=True)
+def clear_attachment_cache():
+    from utils.attachment_cache import clear_attachment_cache
+    clear_attachment_cache()
+    yield
+
+@pytest.fixture(autouse=True)
+def clear_user_profile_cache():
+    from utils.user_utils import UserUtils
+    UserUtils._profile_cache.clear()
+    yield
+
+@pytest.fixture(autouse=True)
+def clear_issue_status_cache():
+    from services.gsmb_managemnt_service import GsmbManagmentService
+    GsmbManagmentService._status_ids_cache.clear()
+    yield
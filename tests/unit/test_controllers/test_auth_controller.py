@@ -396,3 +396,15 @@ def test_mobile_reset_password_success(client):
                 mock_cache_delete.assert_called_once_with(f'otp_verified:{email}')
 
 
+
+def test_ready_when_redmine_answers(client):
+    with patch('services.auth_service.AuthService.check_readiness', return_value=(True, None)):
+        response = client.get('/auth/ready')
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'ready'
+
+def test_ready_unavailable(client):
+    with patch('services.auth_service.AuthService.check_readiness', return_value=(False, 'Redmine returned 502')):
+        response = client.get('/auth/ready')
+    assert response.status_code == 503
+    assert response.get_json()['error'] == 'Redmine returned 502'
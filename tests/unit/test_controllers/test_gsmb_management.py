@@ -371,6 +371,61 @@ def test_mining_license_count_empty(client, valid_token):
         assert response.status_code == 200
         assert response.json["issues"] == []
 
+def test_dashboard_snapshot_success(client, valid_token, mock_license_counts):
+    snapshot = {"mining_license_count": mock_license_counts, "complaint_counts": {"total": 0}}
+    with patch('services.gsmb_managemnt_service.GsmbManagmentService.dashboard_snapshot') as mock_service:
+        mock_service.return_value = (snapshot, None)
+
+        response = client.get('/gsmb-management/dashboard-snapshot',
+                            headers={"Authorization": valid_token})
+
+        assert response.status_code == 200
+        assert response.json == snapshot
+        mock_service.assert_called_once_with(valid_token)
+
+def test_dashboard_snapshot_error(client, valid_token):
+    with patch('services.gsmb_managemnt_service.GsmbManagmentService.dashboard_snapshot') as mock_service:
+        mock_service.return_value = (None, "Failed to fetch issues: 500 - boom")
+
+        response = client.get('/gsmb-management/dashboard-snapshot',
+                            headers={"Authorization": valid_token})
+
+        assert response.status_code == 500
+        assert response.json["error"] == "Failed to fetch issues: 500 - boom"
+
+def test_dashboard_snapshot_answers_304_while_unchanged(client, valid_token, mock_license_counts):
+    snapshot = {"mining_license_count": mock_license_counts, "complaint_counts": {"total": 0}}
+    with patch('services.gsmb_managemnt_service.GsmbManagmentService.dashboard_snapshot') as mock_service:
+        mock_service.return_value = (snapshot, None)
+
+        first = client.get('/gsmb-management/dashboard-snapshot', headers={"Authorization": valid_token})
+        etag = first.headers['ETag']
+        repeat = client.get('/gsmb-management/dashboard-snapshot',
+                            headers={"Authorization": valid_token, "If-None-Match": etag})
+
+        mock_service.return_value = ({**snapshot, "complaint_counts": {"total": 1}}, None)
+        changed = client.get('/gsmb-management/dashboard-snapshot',
+                             headers={"Authorization": valid_token, "If-None-Match": etag})
+
+    assert not etag.startswith('W/')
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert 'Authorization' in first.headers['Vary']
+    assert repeat.status_code == 304
+    assert repeat.get_data() == b''
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.json["complaint_counts"] == {"total": 1}
+
+def test_errors_carry_no_etag(client, valid_token):
+    with patch('services.gsmb_managemnt_service.GsmbManagmentService.dashboard_snapshot') as mock_service:
+        mock_service.return_value = (None, "Failed to fetch issues: 500 - boom")
+
+        response = client.get('/gsmb-management/dashboard-snapshot',
+                            headers={"Authorization": valid_token, "If-None-Match": "*"})
+
+    assert response.status_code == 500
+    assert 'ETag' not in response.headers
+
 def test_unactive_officers_success(client, valid_token, mock_inactive_officers):
     with patch('services.gsmb_managemnt_service.GsmbManagmentService.unactive_gsmb_officers') as mock_service:
         mock_service.return_value = (mock_inactive_officers, None)
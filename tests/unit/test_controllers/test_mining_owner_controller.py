@@ -383,3 +383,22 @@ def test_ml_detail_unexpected_error(client, valid_token):
         )
         assert response.status_code == 500
         assert "Unexpected error" in response.get_json()['error']
+
+
+def test_get_tpl_travel_time(client, valid_token):
+    status = {"status": "done", "estimated_hours": 5, "attempts": 1, "error": None, "updated_at": "2025-01-01T00:00:00Z"}
+    with patch('services.mining_owner_service.MLOwnerService.get_tpl_travel_time',
+               return_value=(status, None)):
+        response = client.get('mining-owner/tpl/900/travel-time', headers={"Authorization": valid_token})
+
+    assert response.status_code == 200
+    assert response.get_json()["data"]["estimated_hours"] == 5
+
+
+def test_get_tpl_travel_time_not_found(client, valid_token):
+    with patch('services.mining_owner_service.MLOwnerService.get_tpl_travel_time',
+               return_value=(None, "No travel time calculation found for this TPL")):
+        response = client.get('mining-owner/tpl/900/travel-time', headers={"Authorization": valid_token})
+
+    assert response.status_code == 404
+
@@ -29,7 +29,7 @@ def test_authenticate_user_success():
         }
     }
     
-    with patch('services.auth_service.requests.get', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.get', return_value=mock_response):
         user_data, role, api_key = AuthService.authenticate_user('testuser', 'testpass')
         
         assert user_data['id'] == 1
@@ -39,7 +39,7 @@ def test_authenticate_user_success():
 def test_authenticate_user_invalid_credentials():
     mock_response = Mock()
     mock_response.status_code = 401
-    with patch('services.auth_service.requests.get', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.get', return_value=mock_response):
         user_data, role, api_key = AuthService.authenticate_user('invaliduser', 'invalidpass')
         assert user_data is None
         assert role is None
@@ -58,7 +58,7 @@ def test_authenticate_user_no_role():
         }
     }
     
-    with patch('services.auth_service.requests.get', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.get', return_value=mock_response):
         user_data, role, api_key = AuthService.authenticate_user('user', 'pass')
         assert user_data is None
         assert role is None
@@ -91,7 +91,7 @@ def test_authenticate_google_token_success():
     }
     
     with patch('services.auth_service.id_token.verify_oauth2_token', return_value=mock_id_info) as mock_verify:
-        with patch('services.auth_service.requests.get') as mock_get:
+        with patch('services.auth_service.redmine_client.get') as mock_get:
             # Mock sequence of requests.get calls:
             # 1. users.json call
             # 2. user details call
@@ -125,7 +125,7 @@ def test_authenticate_google_token_missing_email():
 
 def test_authenticate_google_token_user_not_found():
     with patch('services.auth_service.id_token.verify_oauth2_token', return_value={'email': 'test@example.com'}):
-        with patch('services.auth_service.requests.get') as mock_get:
+        with patch('services.auth_service.redmine_client.get') as mock_get:
             # Simulate user not found (empty users list)
             mock_get.return_value = MagicMock(status_code=200, json=lambda: {'users': []})
             
@@ -136,7 +136,7 @@ def test_authenticate_google_token_user_not_found():
 
 def test_authenticate_google_token_role_not_found():
     with patch('services.auth_service.id_token.verify_oauth2_token', return_value={'email': 'test@example.com'}):
-        with patch('services.auth_service.requests.get') as mock_get:
+        with patch('services.auth_service.redmine_client.get') as mock_get:
             mock_get.side_effect = [
                 MagicMock(status_code=200, json=lambda: {'users': [{'id': 123}]}),
                 MagicMock(status_code=200, json=lambda: {'user': {'api_key': 'key'}}),
@@ -171,7 +171,7 @@ def test_check_user_by_email_exists():
     }
     mock_response.raise_for_status.return_value = None
 
-    with patch('services.auth_service.requests.get', return_value=mock_response) as mock_get:
+    with patch('services.auth_service.redmine_client.get', return_value=mock_response) as mock_get:
         assert AuthService.check_user_by_email('test@example.com') is True
         mock_get.assert_called_once()
 
@@ -182,14 +182,14 @@ def test_check_user_by_email_not_exists():
     mock_response.json.return_value = {'users': []}
     mock_response.raise_for_status.return_value = None
 
-    with patch('services.auth_service.requests.get', return_value=mock_response) as mock_get:
+    with patch('services.auth_service.redmine_client.get', return_value=mock_response) as mock_get:
         assert AuthService.check_user_by_email('nonexistent@example.com') is False
         mock_get.assert_called_once()
 
 
 def test_check_user_by_email_api_error():
     """Test when Redmine API returns an error"""
-    with patch('services.auth_service.requests.get') as mock_get:
+    with patch('services.auth_service.redmine_client.get') as mock_get:
         mock_get.side_effect = requests.exceptions.RequestException("API Error")
         
         assert AuthService.check_user_by_email('test@example.com') is False
@@ -239,8 +239,8 @@ def test_initiate_password_reset_custom_redirect():
 def test_reset_password_success():
     """Test successful password reset"""
     with patch('services.auth_service.cache.get') as mock_cache_get, \
-         patch('services.auth_service.requests.get') as mock_get, \
-         patch('services.auth_service.requests.put') as mock_put, \
+         patch('services.auth_service.redmine_client.get') as mock_get, \
+         patch('services.auth_service.redmine_client.put') as mock_put, \
          patch('services.auth_service.cache.delete') as mock_cache_del:
         
         # Mock cache lookup
@@ -265,6 +265,54 @@ def test_reset_password_success():
         mock_put.assert_called_once()
         mock_cache_del.assert_called_once_with('reset_token:valid_token')
 
+def test_reset_password_invalidates_cached_api_key():
+    """A password reset drops the user's cached Redmine API key"""
+    with patch('services.auth_service.cache.get', return_value='test@example.com'), \
+         patch('services.auth_service.cache.delete'), \
+         patch('services.auth_service.redmine_client.get') as mock_get, \
+         patch('services.auth_service.redmine_client.put'), \
+         patch('services.auth_service.JWTUtils.invalidate_api_key') as mock_invalidate:
+
+        mock_get.return_value.json.return_value = {'users': [{'id': 123}]}
+
+        result = AuthService.reset_password('valid_token', 'new_password123')
+
+        assert result == {'success': True}
+        mock_invalidate.assert_called_once_with(123)
+
+def test_api_key_lookup_is_cached_per_user():
+    """Repeated token lookups for the same user hit Redmine once"""
+    from utils.jwt_utils import JWTUtils
+
+    JWTUtils.invalidate_api_key(42)
+    with patch('utils.jwt_utils.jwt.decode', return_value={'user_id': 42}), \
+         patch('utils.jwt_utils.UserUtils.get_user_api_key', return_value='user_key') as mock_lookup:
+
+        assert JWTUtils.get_api_key_from_token('Bearer token') == 'user_key'
+        assert JWTUtils.get_api_key_from_token('Bearer token') == 'user_key'
+        mock_lookup.assert_called_once_with(42)
+
+        JWTUtils.invalidate_api_key(42)
+        assert JWTUtils.get_api_key_from_token('Bearer token') == 'user_key'
+        assert mock_lookup.call_count == 2
+
+def test_api_key_invalidation_reaches_other_workers(tmp_path):
+    """A reset handled by another worker bumps the shared generation this worker checks"""
+    from utils.jwt_utils import JWTUtils
+    from utils.user_generations import UserGenerations
+
+    this_worker = UserGenerations(str(tmp_path / "generations"))
+    other_worker = UserGenerations(str(tmp_path / "generations"))
+    with patch('utils.jwt_utils.user_generations', this_worker), \
+         patch('utils.jwt_utils.jwt.decode', return_value={'user_id': 42}), \
+         patch('utils.jwt_utils.UserUtils.get_user_api_key', side_effect=['old_key', 'new_key']):
+
+        assert JWTUtils.get_api_key_from_token('Bearer token') == 'old_key'
+        assert JWTUtils.get_api_key_from_token('Bearer token') == 'old_key'
+
+        other_worker.bump(42)
+        assert JWTUtils.get_api_key_from_token('Bearer token') == 'new_key'
+
 def test_reset_password_invalid_token():
     """Test with invalid/expired token"""
     with patch('services.auth_service.cache.get') as mock_cache_get:
@@ -278,7 +326,7 @@ def test_reset_password_invalid_token():
 def test_reset_password_user_not_found():
     """Test when user not found in Redmine"""
     with patch('services.auth_service.cache.get') as mock_cache_get, \
-         patch('services.auth_service.requests.get') as mock_get:
+         patch('services.auth_service.redmine_client.get') as mock_get:
         
         mock_cache_get.return_value = 'test@example.com'
         mock_get.return_value.json.return_value = {'users': []}
@@ -291,8 +339,8 @@ def test_reset_password_user_not_found():
 def test_reset_password_update_failure():
     """Test when password update fails"""
     with patch('services.auth_service.cache.get') as mock_cache_get, \
-         patch('services.auth_service.requests.get') as mock_get, \
-         patch('services.auth_service.requests.put') as mock_put:
+         patch('services.auth_service.redmine_client.get') as mock_get, \
+         patch('services.auth_service.redmine_client.put') as mock_put:
         
         mock_cache_get.return_value = 'test@example.com'
         mock_get.return_value.json.return_value = {'users': [{'id': 123}]}
@@ -342,7 +390,7 @@ def test_register_police_officer_success(mock_env):
         }
     }
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result, error = AuthService.register_police_officer(
             "police1", "John", "Doe", "john@example.com", "password", []
         )
@@ -357,7 +405,7 @@ def test_register_police_officer_failure(mock_env):
         "errors": ["Login already taken"]
     }
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result, error = AuthService.register_police_officer(
             "police1", "John", "Doe", "john@example.com", "password", []
         )
@@ -376,7 +424,7 @@ def test_register_gsmb_officer_success(mock_env):
         }
     }
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result, error = AuthService.register_gsmb_officer(
             "gsmb1", "Jane", "Smith", "jane@example.com", "password", []
         )
@@ -395,7 +443,7 @@ def test_register_mining_engineer_success(mock_env):
         }
     }
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result, error = AuthService.register_mining_engineer(
             "engineer1", "Bob", "Builder", "bob@example.com", "password", []
         )
@@ -414,7 +462,7 @@ def test_assign_role_success(mock_env):
         }
     }
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result, error = AuthService.assign_role(1, "PoliceOfficer")
         
         assert result["membership"]["id"] == 1
@@ -433,7 +481,7 @@ def test_assign_role_failure(mock_env):
         "errors": ["Project not found"]
     }
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result, error = AuthService.assign_role(1, "PoliceOfficer")
         
         assert result is None
@@ -450,7 +498,7 @@ def test_register_mlowner_success(mock_env):
         }
     }
     
-    with patch('services.auth_service.requests.post', return_value=mock_user_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_user_response):
         result, error = AuthService.register_mlowner(
             "mlowner1", "Mike", "Owner", "mike@example.com", "password", [], None
         )
@@ -480,8 +528,8 @@ def test_register_mlowner_with_attachments(mock_env):  # mock_env fixture applie
     mock_file = io.BytesIO(b"test content")
     mock_file.name = "testfile.txt"
 
-    with patch('services.auth_service.requests.post') as mock_post, \
-         patch('services.auth_service.requests.put') as mock_put, \
+    with patch('services.auth_service.redmine_client.post') as mock_post, \
+         patch('services.auth_service.redmine_client.put') as mock_put, \
          patch('services.auth_service.open', return_value=mock_file, create=True):
 
         def post_side_effect(url, **kwargs):
@@ -513,7 +561,7 @@ def test_upload_file_to_redmine_success(mock_env):
     mock_file.filename = "test.txt"
     mock_file.stream = b"test content"
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result = AuthService.upload_file_to_redmine(mock_file)
         
         assert result == 123
@@ -526,7 +574,7 @@ def test_upload_file_to_redmine_failure(mock_env):
     mock_file.filename = "test.txt"
     mock_file.stream = b"test content"
     
-    with patch('services.auth_service.requests.post', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.post', return_value=mock_response):
         result = AuthService.upload_file_to_redmine(mock_file)
         
         assert result is None
@@ -541,8 +589,8 @@ def test_reset_password_with_email_success(mock_env):
     mock_update_response = Mock()
     mock_update_response.status_code = 200
     
-    with patch('services.auth_service.requests.get', return_value=mock_users_response):
-        with patch('services.auth_service.requests.put', return_value=mock_update_response):
+    with patch('services.auth_service.redmine_client.get', return_value=mock_users_response):
+        with patch('services.auth_service.redmine_client.put', return_value=mock_update_response):
             result = AuthService.reset_password_with_email("user@example.com", "newpass")
             
             assert result['success'] is True
@@ -554,7 +602,7 @@ def test_reset_password_with_email_user_not_found(mock_env):
         "users": []
     }
     
-    with patch('services.auth_service.requests.get', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.get', return_value=mock_response):
         result = AuthService.reset_password_with_email("nonexistent@example.com", "newpass")
         
         assert result['success'] is False
@@ -568,8 +616,25 @@ def test_reset_password_with_email_failure(mock_env):
     }
     mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("Server error")
 
-    with patch('services.auth_service.requests.get', return_value=mock_response):
+    with patch('services.auth_service.redmine_client.get', return_value=mock_response):
         result = AuthService.reset_password_with_email("user@example.com", "newpass")
         
         assert result['success'] is False
-        assert 'Failed to fetch user details' in result['error']
\ No newline at end of file
+        assert 'Failed to fetch user details' in result['error']
+def test_check_readiness_probes_redmine_once_per_window(mock_env, monkeypatch):
+    monkeypatch.setattr('services.auth_service.Config.SECRET_KEY', 'secret')
+    AuthService._readiness_cache.clear()
+    with patch('services.auth_service.redmine_client.get', return_value=Mock(status_code=200)) as mock_get:
+        assert AuthService.check_readiness() == (True, None)
+        assert AuthService.check_readiness() == (True, None)
+    mock_get.assert_called_once()
+    AuthService._readiness_cache.clear()
+
+def test_check_readiness_reports_redmine_failure(mock_env, monkeypatch):
+    monkeypatch.setattr('services.auth_service.Config.SECRET_KEY', 'secret')
+    AuthService._readiness_cache.clear()
+    with patch('services.auth_service.redmine_client.get', return_value=Mock(status_code=502)):
+        ready, reason = AuthService.check_readiness()
+    assert ready is False
+    assert "502" in reason
+    AuthService._readiness_cache.clear()
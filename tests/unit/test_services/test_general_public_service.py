@@ -22,7 +22,7 @@ def test_is_lorry_number_valid_success():
     mock_response = MagicMock(status_code=200)
     mock_response.json.return_value = {"issues": mock_issues}
 
-    with patch('services.general_public_service.requests.get', return_value=mock_response):
+    with patch('services.general_public_service.redmine_client.get', return_value=mock_response):
         result, error = GeneralPublicService.is_lorry_number_valid("AB1234")
         assert result is True
         assert error is None
@@ -40,14 +40,14 @@ def test_is_lorry_number_valid_expired():
     mock_response = MagicMock(status_code=200)
     mock_response.json.return_value = {"issues": mock_issues}
 
-    with patch('services.general_public_service.requests.get', return_value=mock_response):
+    with patch('services.general_public_service.redmine_client.get', return_value=mock_response):
         result, error = GeneralPublicService.is_lorry_number_valid("AB1234")
         assert result is False
         assert error is None
 
 def test_is_lorry_number_valid_failure():
     mock_response = MagicMock(status_code=500, text="Server error")
-    with patch('services.general_public_service.requests.get', return_value=mock_response):
+    with patch('services.general_public_service.redmine_client.get', return_value=mock_response):
         result, error = GeneralPublicService.is_lorry_number_valid("AB1234")
         assert result is None
         assert "Failed to fetch" in error
@@ -110,7 +110,7 @@ def test_verify_code_expired(mock_get):
 # create_complaint
 
 
-@patch('services.general_public_service.requests.post')
+@patch('services.general_public_service.redmine_client.post')
 def test_create_complaint_success(mock_post):
     mock_response = MagicMock(status_code=201)
     mock_response.json.return_value = {'issue': {'id': 99}}
@@ -120,7 +120,7 @@ def test_create_complaint_success(mock_post):
     assert result is True
     assert issue_id == 99
 
-@patch('services.general_public_service.requests.post')
+@patch('services.general_public_service.redmine_client.post')
 def test_create_complaint_failure(mock_post):
     mock_post.return_value = MagicMock(status_code=400, text="Bad Request")
     result, msg = GeneralPublicService.create_complaint("0771234567", "AB1234")
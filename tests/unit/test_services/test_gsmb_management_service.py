@@ -26,7 +26,7 @@ def test_monthly_total_sand_cubes():
     mock_issues_page2 = {"issues": []}  # End of pagination
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
         mock_get.side_effect = [
             Mock(status_code=200, json=Mock(return_value=mock_issues_page1)),
@@ -74,7 +74,7 @@ def test_fetch_top_mining_holders():
     mock_issues_page2 = {"issues": []}  # End of pagination
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
         # Simulate paginated API response
         mock_get.side_effect = [
@@ -120,7 +120,7 @@ def test_fetch_royalty_counts_success(app):
 
     with app.app_context(), \
          patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
         mock_get.side_effect = [
             Mock(status_code=200, json=Mock(return_value=mock_issues_page1)),
@@ -180,7 +180,7 @@ def test_monthly_mining_license_count_success():
     mock_issues_page2 = {"issues": []}  # End of pagination
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
         # Set up mock responses
         mock_get.side_effect = [
@@ -227,7 +227,7 @@ def test_transport_license_destination_success():
     mock_issues_page2 = {"issues": []}  # Simulate end of pagination
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
         # Mocking paginated response
         mock_get.side_effect = [
@@ -267,7 +267,7 @@ def test_total_location_ml_success():
     mock_issues_page2 = {"issues": []}  # End of pagination
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
         # Simulate paginated Redmine responses
         mock_get.side_effect = [
@@ -287,28 +287,29 @@ def test_total_location_ml_success():
             {"name": "Galle", "value": 1}
         ]
 
-@pytest.mark.usefixtures("mock_env")
-def test_complaint_counts_success():
+def _counting_get(status_totals):
+    """Fake ``redmine_client.get`` answering the status lookup and limit=1 count requests."""
+    statuses = {"issue_statuses": [
+        {"id": 1, "name": "New"}, {"id": 2, "name": "In Progress"}, {"id": 3, "name": "Executed"},
+        {"id": 6, "name": "Rejected"}, {"id": 7, "name": "Valid"}, {"id": 9, "name": "Expired"},
+    ]}
 
-    mock_page1 = {
-        "issues": [
-            {"status": {"name": "New"}},
-            {"status": {"name": "Rejected"}},
-            {"status": {"name": "In Progress"}},
-            {"status": {"name": "Executed"}},
-            {"status": {"name": "New"}}
-        ]
-    }
+    def fake_get(url, **kwargs):
+        if url.endswith("issue_statuses.json"):
+            return Mock(status_code=200, json=Mock(return_value=statuses))
+        params = kwargs["params"]
+        assert params["limit"] == 1
+        return Mock(status_code=200, json=Mock(return_value={"issues": [], "total_count": status_totals[params["status_id"]]}))
+    return fake_get
 
-    mock_page2 = {"issues": []}  # End of pagination
+
+@pytest.mark.usefixtures("mock_env")
+def test_complaint_counts_success():
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
-        mock_get.side_effect = [
-            Mock(status_code=200, json=Mock(return_value=mock_page1)),
-            Mock(status_code=200, json=Mock(return_value=mock_page2))
-        ]
+        mock_get.side_effect = _counting_get({1: 2, 6: 1, 2: 1, 3: 1, "*": 5})
 
         result, error = GsmbManagmentService.complaint_counts("fake-token")
 
@@ -339,7 +340,7 @@ def test_role_counts_success(monkeypatch):
     mock_page2 = {"memberships": []}  # End of pagination
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
         mock_get.side_effect = [
             Mock(status_code=200, json=Mock(return_value=mock_page1)),
@@ -360,24 +361,10 @@ def test_role_counts_success(monkeypatch):
 @pytest.mark.usefixtures("mock_env")
 def test_mining_license_count_success():
 
-    mock_page1 = {
-        "issues": [
-            {"status": {"name": "Valid"}},
-            {"status": {"name": "Expired"}},
-            {"status": {"name": "Rejected"}},
-            {"status": {"name": "Valid"}}
-        ]
-    }
-
-    mock_page2 = {"issues": []}  # End of pagination
-
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get") as mock_get:
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
 
-        mock_get.side_effect = [
-            Mock(status_code=200, json=Mock(return_value=mock_page1)),
-            Mock(status_code=200, json=Mock(return_value=mock_page2))
-        ]
+        mock_get.side_effect = _counting_get({7: 2, 9: 1, 6: 1, "*": 4})
 
         result, error = GsmbManagmentService.mining_license_count("fake-token")
 
@@ -388,6 +375,8 @@ def test_mining_license_count_success():
             "rejected": 1,
             "total": 4
         }
+        # One status lookup, then one count per status plus the total
+        assert mock_get.call_count == 5
 
 def test_unactive_gsmb_officers_success():
 
@@ -420,7 +409,7 @@ def test_unactive_gsmb_officers_success():
     }
 
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.get", return_value=Mock(status_code=200, json=lambda: mock_users_response)), \
+         patch("services.gsmb_managemnt_service.redmine_client.get", return_value=Mock(status_code=200, json=lambda: mock_users_response)), \
          patch("services.gsmb_managemnt_service.GsmbManagmentService.get_attachment_urls", return_value=mock_attachment_urls):
 
         result, error = GsmbManagmentService.unactive_gsmb_officers("fake-token")
@@ -456,7 +445,7 @@ def test_activate_gsmb_officer_success():
 
     # Patch JWTUtils.get_api_key_from_token
     with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_managemnt_service.requests.put") as mock_put:
+         patch("services.gsmb_managemnt_service.redmine_client.put") as mock_put:
 
         mock_put.return_value = Mock(status_code=204)
 
@@ -465,18 +454,298 @@ def test_activate_gsmb_officer_success():
         assert error is None
         assert result == {"status": "success", "message": "User activated successfully"}
 
-def test_get_custom_field_value_found():
-    custom_fields = [
-        {"name": "Designation", "value": "Officer"},
-        {"name": "Mobile Number", "value": "123456789"}
-    ]
-    value = GsmbManagmentService.get_custom_field_value(custom_fields, "Designation")
-    assert value == "Officer"
+def test_fetch_all_issues_fans_out_using_total_count():
+    def page(*args, **kwargs):
+        offset = kwargs["params"]["offset"]
+        assert kwargs["params"]["limit"] == 100
+        issues = [{"id": i} for i in range(offset, min(offset + 100, 250))]
+        return Mock(status_code=200, json=Mock(return_value={"issues": issues, "total_count": 250}))
+
+    with patch("services.gsmb_managemnt_service.redmine_client.get", side_effect=page) as mock_get:
+        issues, error = GsmbManagmentService.fetch_all_issues("https://fake-redmine.com", {}, {"tracker_id": 5})
+
+    assert error is None
+    assert [issue["id"] for issue in issues] == list(range(250))
+    assert sorted(call.kwargs["params"]["offset"] for call in mock_get.call_args_list) == [0, 100, 200]
+
+
+def test_fetch_all_issues_page_failure():
+    def page(*args, **kwargs):
+        if kwargs["params"]["offset"] == 0:
+            return Mock(status_code=200, json=Mock(return_value={"issues": [{"id": 1}] * 100, "total_count": 300}))
+        return Mock(status_code=500, text="boom")
+
+    with patch("services.gsmb_managemnt_service.redmine_client.get", side_effect=page):
+        issues, error = GsmbManagmentService.fetch_all_issues("https://fake-redmine.com", {}, {})
+
+    assert issues is None
+    assert error == "Issue fetch failed: 500 - boom"
+
+
+def test_stream_pages_holds_a_bounded_window_of_pages():
+    from utils import redmine_client
+
+    requested = []
+
+    def page(*args, **kwargs):
+        offset = kwargs["params"]["offset"]
+        requested.append(offset)
+        issues = [{"id": i} for i in range(offset, min(offset + 100, 1000))]
+        return Mock(status_code=200, json=Mock(return_value={"issues": issues, "total_count": 1000}))
+
+    with patch("services.gsmb_managemnt_service.redmine_client.get", side_effect=page):
+        issues, response = redmine_client.stream_pages("https://fake-redmine.com/issues.json", max_workers=2)
+        assert response is None
+        first_two_pages = [next(issues)["id"] for _ in range(200)]
+        # The first two pages are consumed; at most two more are in flight.
+        assert len(requested) <= 4
+        rest = [issue["id"] for issue in issues]
+
+    assert first_two_pages + rest == list(range(1000))
+
 
-def test_get_custom_field_value_not_found():
-    custom_fields = [
-        {"name": "Designation", "value": "Officer"},
-        {"name": "Mobile Number", "value": "123456789"}
+@pytest.mark.usefixtures("mock_env")
+def test_streamed_summary_reports_a_failed_later_page():
+    def page(*args, **kwargs):
+        if kwargs["params"]["offset"] == 0:
+            return Mock(status_code=200, json=Mock(return_value={"issues": [{"id": 1}] * 100, "total_count": 300}))
+        return Mock(status_code=500, text="boom")
+
+    with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
+         patch("services.gsmb_managemnt_service.redmine_client.get", side_effect=page):
+        result, error = GsmbManagmentService.transport_license_destination("fake-token")
+
+    assert result is None
+    assert error == "Failed to fetch issues: 500 - boom"
+
+
+@pytest.mark.usefixtures("mock_env")
+def test_dashboard_results_are_cached_per_role():
+    from utils.jwt_utils import JWTUtils
+
+    token = "Bearer " + JWTUtils.create_access_token(1, "GSMBManagement")
+    page = {"issues": [{"created_on": "2025-01-15T12:34:56Z",
+                        "custom_fields": [{"id": 58, "name": "Cubes", "value": "2.5"}]}]}
+
+    with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
+         patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
+
+        mock_get.return_value = Mock(status_code=200, json=Mock(return_value=page))
+
+        first, error = GsmbManagmentService.monthly_total_sand_cubes(token)
+        second, _ = GsmbManagmentService.monthly_total_sand_cubes(token)
+
+        assert error is None
+        assert first == second
+        assert first[0] == {"month": "Jan", "totalCubes": 2.5}
+        assert mock_get.call_count == 1
+
+
+def test_stale_dashboard_value_is_served_while_refreshing():
+    from utils.ttl_cache import StaleWhileRevalidateCache
+    import threading
+
+    cache = StaleWhileRevalidateCache(ttl=0, stale_ttl=60)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(1)
+        return len(calls)
+
+    # Expired immediately (ttl=0), so the stale value is returned while a reload runs
+    assert cache.get_or_load("key", loader) == 1
+    assert cache.get_or_load("key", loader) == 1
+    release.set()
+
+
+@pytest.mark.usefixtures("mock_env")
+def _redmine_dataset_get(pages, memberships):
+    """Fake ``redmine_client.get`` over one dataset: full reads see open issues, counts see what they ask for."""
+    statuses = {"issue_statuses": [
+        {"id": 1, "name": "New"}, {"id": 2, "name": "In Progress"}, {"id": 3, "name": "Executed"},
+        {"id": 6, "name": "Rejected"}, {"id": 7, "name": "Valid"}, {"id": 9, "name": "Expired"},
+    ]}
+
+    def fake_get(url, **kwargs):
+        if url.endswith("issue_statuses.json"):
+            return Mock(status_code=200, json=Mock(return_value=statuses))
+        if url.endswith("memberships.json"):
+            return Mock(status_code=200, json=Mock(return_value=memberships))
+        params = kwargs["params"]
+        issues = pages[params["tracker_id"]]
+        status_id = params.get("status_id")
+        if status_id is None:
+            issues = [i for i in issues if not i["status"].get("is_closed")]
+        elif status_id != "*":
+            issues = [i for i in issues if i["status"]["id"] == status_id]
+        if params.get("limit") == 1:
+            return Mock(status_code=200, json=Mock(return_value={"issues": issues[:1], "total_count": len(issues)}))
+        return Mock(status_code=200, json=Mock(return_value={"issues": issues, "total_count": len(issues)}))
+    return fake_get
+
+
+SNAPSHOT_PAGES = {
+    4: [
+        {"tracker": {"id": 4, "name": "ML"}, "status": {"id": 7, "name": "Valid"},
+         "created_on": "2025-03-01T00:00:00Z", "assigned_to": {"name": "Owner A"},
+         "custom_fields": [{"name": "Royalty", "value": "500"},
+                           {"name": "Administrative District", "value": "Galle"},
+                           {"name": "Capacity", "value": "100"}, {"name": "Used", "value": "25"}]},
+        {"tracker": {"id": 4, "name": "ML"}, "status": {"id": 9, "name": "Expired"},
+         "created_on": "2025-03-09T00:00:00Z", "custom_fields": []},
+        {"tracker": {"id": 4, "name": "ML"}, "status": {"id": 6, "name": "Rejected", "is_closed": True},
+         "created_on": "2025-04-02T00:00:00Z", "custom_fields": []},
+    ],
+    5: [
+        {"status": {"id": 1, "name": "New"}, "created_on": "2025-02-10T09:00:00Z",
+         "custom_fields": [{"id": 58, "name": "Cubes", "value": "3"},
+                           {"name": "Destination", "value": "Colombo"}]},
+    ],
+    6: [
+        {"status": {"id": 1, "name": "New"}},
+        {"status": {"id": 3, "name": "Executed", "is_closed": True}},
+    ],
+}
+SNAPSHOT_MEMBERSHIPS = {"memberships": [{"roles": [{"name": "MLOwner"}]}], "total_count": 1}
+
+
+@pytest.mark.usefixtures("mock_env")
+def test_dashboard_snapshot_fetches_each_source_once():
+    with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
+         patch("services.gsmb_managemnt_service.redmine_client.get",
+               side_effect=_redmine_dataset_get(SNAPSHOT_PAGES, SNAPSHOT_MEMBERSHIPS)) as mock_get:
+
+        snapshot, error = GsmbManagmentService.dashboard_snapshot("fake-token")
+
+    assert error is None
+    full_reads = [c for c in mock_get.call_args_list if c.kwargs.get("params", {}).get("limit") not in (None, 1)]
+    assert len(full_reads) == 3
+    assert snapshot["mining_license_count"] == {"valid": 1, "expired": 1, "rejected": 1, "total": 3}
+    assert snapshot["royalty_counts"]["total_royalty"] == 500
+    assert snapshot["top_mining_holders"] == [{"label": "Owner A", "value": 25.0, "capacity": 100.0}]
+    assert snapshot["total_location_ml"] == [{"name": "Galle", "value": 1}]
+    assert snapshot["transport_license_destination"] == [{"name": "Colombo", "value": 1}]
+    assert snapshot["monthly_total_sand_cubes"][1] == {"month": "Feb", "totalCubes": 3.0}
+    assert snapshot["monthly_mining_license_count"][2] == {"month": "Mar", "miningLicense": 2}
+    assert snapshot["complaint_counts"]["New"] == 1
+    assert snapshot["role_counts"]["licenceOwner"] == 1
+
+
+@pytest.mark.usefixtures("mock_env")
+def test_dashboard_snapshot_counts_agree_with_chart_endpoints():
+    with patch("utils.jwt_utils.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
+         patch("services.gsmb_managemnt_service.redmine_client.get",
+               side_effect=_redmine_dataset_get(SNAPSHOT_PAGES, SNAPSHOT_MEMBERSHIPS)):
+        snapshot, error = GsmbManagmentService.dashboard_snapshot("fake-token")
+        complaints, complaints_error = GsmbManagmentService.complaint_counts("fake-token")
+        licenses, licenses_error = GsmbManagmentService.mining_license_count("fake-token")
+
+    assert error is complaints_error is licenses_error is None
+    assert snapshot["complaint_counts"] == complaints == {
+        "New": 1, "Rejected": 0, "InProgress": 0, "Executed": 1, "total": 2
+    }
+    assert snapshot["mining_license_count"] == licenses
+
+
+def _replica_get(*pages):
+    """Fake ``redmine_client.get`` for replica syncs: the status list, then each issue page in turn."""
+    statuses = {"issue_statuses": [{"id": 1, "name": "New"}, {"id": 3, "name": "Closed", "is_closed": True}]}
+    pages = iter(pages)
+
+    def fake_get(url, **kwargs):
+        if url.endswith("issue_statuses.json"):
+            return Mock(status_code=200, json=Mock(return_value=statuses))
+        return Mock(status_code=200, json=Mock(return_value=next(pages)))
+    return fake_get
+
+
+def test_issue_replica_syncs_incrementally_from_cursor(tmp_path, monkeypatch):
+    monkeypatch.setenv("REDMINE_URL", "https://fake-redmine")
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "fake-api-key")
+    from utils.issue_replica import IssueReplica
+
+    replica = IssueReplica(str(tmp_path / "replica.sqlite3"), tracker_ids=(5,))
+    first = {"issues": [
+        {"id": 1, "project": {"id": 1}, "status": {"id": 1}, "updated_on": "2025-01-01T00:00:00Z"},
+        # Redmine before 5.1 sends no status.is_closed; the status list says 3 is closed
+        {"id": 2, "project": {"id": 1}, "status": {"id": 3}, "updated_on": "2025-01-02T00:00:00Z"},
+    ], "total_count": 2}
+    second = {"issues": [
+        {"id": 3, "project": {"id": 1}, "status": {"id": 1}, "updated_on": "2025-01-03T00:00:00Z"},
+    ], "total_count": 1}
+
+    with patch("utils.issue_replica.redmine_client.get", side_effect=_replica_get(first, second)) as mock_get:
+        assert replica.sync() is None
+        assert replica.sync() is None
+
+    issue_calls = [c for c in mock_get.call_args_list if c.args[0].endswith("issues.json")]
+    assert "updated_on" not in issue_calls[0].kwargs["params"]
+    assert issue_calls[1].kwargs["params"]["updated_on"] == ">=2025-01-02T00:00:00Z"
+    assert all(c.kwargs["params"]["sort"] == "id" for c in issue_calls)
+    assert replica.cursor(5) == "2025-01-03T00:00:00Z"
+    assert replica.is_ready(5)
+    assert [i["id"] for i in replica.issues(5, project_id=1)] == [3, 1]
+    assert [i["id"] for i in replica.issues(5, include_closed=True)] == [3, 2, 1]
+    assert replica.get(2)["status"] == {"id": 3}
+
+
+def test_fetch_all_reads_ready_replica(tmp_path, monkeypatch):
+    monkeypatch.setenv("REDMINE_URL", "https://fake-redmine")
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "fake-api-key")
+    from utils.issue_replica import IssueReplica
+
+    replica = IssueReplica(str(tmp_path / "replica.sqlite3"), tracker_ids=(6,))
+    page = {"issues": [{"id": 9, "project": {"id": 1}, "status": {"id": 1}}], "total_count": 1}
+    with patch("utils.issue_replica.redmine_client.get", side_effect=_replica_get(page)):
+        assert replica.resync() is None
+
+    monkeypatch.setattr("services.gsmb_managemnt_service.Config.ISSUE_REPLICA_ENABLED", True)
+    monkeypatch.setattr("services.gsmb_managemnt_service.issue_replica", replica)
+    with patch("services.gsmb_managemnt_service.redmine_client.get") as mock_get:
+        issues, error = GsmbManagmentService._fetch_all(
+            "https://fake-redmine", {}, "issues.json", params=GsmbManagmentService.COMPLAINT_PARAMS
+        )
+
+    assert error is None
+    assert [i["id"] for i in issues] == [9]
+    mock_get.assert_not_called()
+
+
+def test_issue_model_maps_custom_fields_by_id_and_name():
+    from utils.issue_model import Issue
+
+    issue = Issue.parse({
+        "id": 7,
+        "assigned_to": {"id": 3, "name": "Owner A"},
+        "custom_fields": [
+            {"id": 58, "name": "Cubes", "value": " 2.5 "},
+            {"id": 18, "name": "Royalty", "value": ""},
+            {"id": 34, "name": "Capacity", "value": "nan"},
+            {"id": 101, "name": "Mining License Number", "value": "LLL/100/7"},
+        ],
+    })
+
+    assert Issue.parse(issue) is issue
+    assert issue.field(58) == issue.field("Cubes") == " 2.5 "
+    assert issue.field("Missing", "N/A") == "N/A"
+    assert issue.cubes == 2.5
+    assert issue.royalty is None
+    assert issue.capacity is None
+    assert issue.license_number == "LLL/100/7"
+    assert issue.field_id("Royalty") == 18
+    assert issue.field_id("Missing") is None
+    assert issue.assigned_to_name == "Owner A"
+
+
+def test_monthly_sand_cubes_skips_non_numeric_cubes():
+    tpl_issues = [
+        {"created_on": "2025-01-05T00:00:00Z", "custom_fields": [{"id": 58, "name": "Cubes", "value": "3"}]},
+        {"created_on": "2025-01-06T00:00:00Z", "custom_fields": [{"id": 58, "name": "Cubes", "value": "three"}]},
     ]
-    value = GsmbManagmentService.get_custom_field_value(custom_fields, "NonExistentField")
-    assert value is None
\ No newline at end of file
+
+    summary = GsmbManagmentService.summarize_monthly_sand_cubes(tpl_issues)
+
+    assert summary[0] == {"month": "Jan", "totalCubes": 3.0}
@@ -44,7 +44,7 @@ def test_get_mlowners():
         "John Doe": 3
     }
 
-    with patch("services.gsmb_officer_service.requests.get") as mock_get, \
+    with patch("services.gsmb_officer_service.redmine_client.get") as mock_get, \
          patch.object(GsmbOfficerService, "get_mining_license_counts", return_value=(mock_license_counts, None)) as mock_license_counts_fn:
 
         # Mock Redmine users API call
@@ -99,17 +99,7 @@ def test_get_tpls():
 
     # Mock the API key extracted from JWT
     with patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_officer_service.requests.get") as mock_get, \
-         patch.object(GsmbOfficerService, "get_custom_field_value") as mock_get_custom_field:
-
-        # Setup get_custom_field_value to simulate correct field retrieval
-        def side_effect(custom_fields, field_name):
-            for field in custom_fields:
-                if field["name"] == field_name:
-                    return field["value"]
-            return None
-
-        mock_get_custom_field.side_effect = side_effect
+         patch("services.gsmb_officer_service.redmine_client.get") as mock_get:
 
         # Mock Redmine API response
         mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value=mock_issues_response))
@@ -120,10 +110,11 @@ def test_get_tpls():
         # Assertions
         assert error is None
         assert result is not None
-        assert isinstance(result, list)
-        assert len(result) == 1
+        assert result["total"] == 1
+        assert result["next_cursor"] is None
+        assert len(result["data"]) == 1
 
-        tpl = result[0]
+        tpl = result["data"][0]
         assert tpl["id"] == 1
         assert tpl["subject"] == "TPL Issue 1"
         assert tpl["status"] == "Open"
@@ -138,16 +129,6 @@ def test_get_tpls():
         assert tpl["mining_license_number"] == "ML-2025-001"
         assert tpl["destination"] == "Colombo"
 
-        # Confirm that get_custom_field_value was called for each custom field
-        expected_fields = [
-            "Lorry Number",
-            "Driver Contact",
-            "Cubes",
-            "Mining issue id",
-            "Destination"
-        ]
-        for field_name in expected_fields:
-            mock_get_custom_field.assert_any_call(mock_issues_response["issues"][0]["custom_fields"], field_name)
 
 @pytest.mark.usefixtures("mock_env")
 def test_get_mining_licenses():
@@ -174,20 +155,10 @@ def test_get_mining_licenses():
     }
 
     with patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_officer_service.requests.get") as mock_get, \
-         patch.object(GsmbOfficerService, "get_custom_field_value") as mock_get_custom_field, \
+         patch("services.gsmb_officer_service.redmine_client.get") as mock_get, \
          patch.object(GsmbOfficerService, "get_attachment_urls", return_value={}) as mock_get_attachments, \
          patch.dict("os.environ", {"REDMINE_URL": "https://redmine.example.com"}):
 
-        # Setup get_custom_field_value to simulate correct field retrieval
-        def side_effect(custom_fields, field_name):
-            for field in custom_fields:
-                if field["name"] == field_name:
-                    return field["value"]
-            return None
-
-        mock_get_custom_field.side_effect = side_effect
-
         # Mock Redmine API response
         mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value=mock_issues_response))
 
@@ -197,10 +168,10 @@ def test_get_mining_licenses():
         # Assertions
         assert error is None
         assert result is not None
-        assert isinstance(result, list)
-        assert len(result) == 1
+        assert isinstance(result["data"], list)
+        assert len(result["data"]) == 1
 
-        ml = result[0]
+        ml = result["data"][0]
         assert ml["id"] == 1
         assert ml["status"] == "Active"
         assert ml["assigned_to"] == "Inspector John"
@@ -214,18 +185,6 @@ def test_get_mining_licenses():
         assert ml["mining_license_number"] == "ML-2025-001"
         assert ml["mobile_number"] == "0712345678"
 
-        # Confirm that get_custom_field_value was called for each field
-        expected_fields = [
-            "Divisional Secretary Division",
-            "Capacity",
-            "Used",
-            "Remaining",
-            "Royalty",
-            "Mining License Number",
-            "Mobile Number"
-        ]
-        for field_name in expected_fields:
-            mock_get_custom_field.assert_any_call(mock_issues_response["issues"][0]["custom_fields"], field_name)
 
         # Confirm that get_attachment_urls was called
         mock_get_attachments.assert_called_once_with(
@@ -275,7 +234,7 @@ def test_get_mining_license_by_id_success():
     }
 
     with patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_officer_service.requests.get") as mock_get, \
+         patch("services.gsmb_officer_service.redmine_client.get") as mock_get, \
          patch.object(GsmbOfficerService, "get_attachment_urls", return_value=mock_attachments), \
          patch.dict("os.environ", {"REDMINE_URL": "https://redmine.example.com"}):
 
@@ -355,7 +314,7 @@ def test_get_complaints():
     }
 
     with patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_officer_service.requests.get") as mock_get, \
+         patch("services.gsmb_officer_service.redmine_client.get") as mock_get, \
          patch.dict("os.environ", {"REDMINE_URL": "https://redmine.example.com"}):
 
         mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value=mock_issues_response))
@@ -364,9 +323,9 @@ def test_get_complaints():
 
         assert error is None
         assert complaints is not None
-        assert len(complaints) == 1
+        assert len(complaints["data"]) == 1
 
-        complaint = complaints[0]
+        complaint = complaints["data"][0]
         assert complaint["id"] == 123
         assert complaint["lorry_number"] == "NB-1234"
         assert complaint["mobile_number"] == "0771234567"
@@ -374,6 +333,57 @@ def test_get_complaints():
         assert complaint["resolved"] == "Yes"
         assert complaint["complaint_date"] == "2025-06-01 10:00:00"
 
+@pytest.mark.usefixtures("mock_env")
+def test_get_complaints_maps_cursor_onto_redmine_offset():
+    from utils.pagination import PageRequest, decode_cursor, encode_cursor
+
+    page, error = PageRequest.from_args({"limit": "2", "cursor": encode_cursor(4)})
+    assert error is None
+    issues = [{"id": 20, "custom_fields": []}, {"id": 19, "custom_fields": []}]
+
+    with patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
+         patch("services.gsmb_officer_service.redmine_client.get") as mock_get:
+        mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value={"issues": issues, "total_count": 9}))
+        complaints, error = GsmbOfficerService.get_complaints("fake-token", page)
+
+    assert error is None
+    params = mock_get.call_args.kwargs["params"]
+    assert (params["tracker_id"], params["limit"], params["offset"]) == (6, 2, 4)
+    assert [c["id"] for c in complaints["data"]] == [20, 19]
+    assert complaints["total"] == 9
+    assert decode_cursor(complaints["next_cursor"]) == 6
+
+@pytest.mark.usefixtures("mock_env")
+def test_officer_pages_ignore_the_admin_synced_replica(monkeypatch):
+    from utils.pagination import PageRequest
+
+    replica = MagicMock()
+    monkeypatch.setattr("utils.issue_replica.issue_replica", replica)
+    monkeypatch.setattr("config.Config.ISSUE_REPLICA_ENABLED", True)
+
+    with patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token", return_value="officer-key"), \
+         patch("services.gsmb_officer_service.redmine_client.get") as mock_get:
+        mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value={"issues": [], "total_count": 0}))
+        result, error = GsmbOfficerService.get_tpls("fake-jwt-token", PageRequest(limit=2, offset=2))
+
+    assert error is None
+    assert mock_get.call_args.kwargs["headers"]["X-Redmine-API-Key"] == "officer-key"
+    replica.issues.assert_not_called()
+    assert result == {"data": [], "next_cursor": None, "total": 0}
+
+@pytest.mark.parametrize("args, message", [
+    ({"limit": "0"}, "limit must be between 1 and 100"),
+    ({"limit": "101"}, "limit must be between 1 and 100"),
+    ({"limit": "ten"}, "limit must be between 1 and 100"),
+    ({"cursor": "not-a-cursor"}, "Invalid cursor"),
+])
+def test_page_request_rejects_bad_args(args, message):
+    from utils.pagination import PageRequest
+
+    page, error = PageRequest.from_args(args)
+    assert page is None
+    assert error == message
+
 def test_get_attachment_urls():
     custom_fields = [
         {"name": "Economic Viability Report", "value": "101"},
@@ -395,22 +405,6 @@ def test_get_attachment_urls():
     # Also check that irrelevant fields are not included
     assert "Some Irrelevant Field" not in urls
 
-def test_get_custom_field_value():
-    custom_fields = [
-        {"name": "Mobile Number", "value": "0711111111"},
-        {"name": "License Number", "value": "LIC-123"}
-    ]
-
-    value = GsmbOfficerService.get_custom_field_value(custom_fields, "Mobile Number")
-    assert value == "0711111111"
-
-    value = GsmbOfficerService.get_custom_field_value(custom_fields, "License Number")
-    assert value == "LIC-123"
-
-    value = GsmbOfficerService.get_custom_field_value(custom_fields, "Non-Existent Field")
-    assert value is None
-
-
 @pytest.mark.usefixtures("mock_env")
 def test_get_mining_license_counts():
     mock_issues_response = {
@@ -423,7 +417,7 @@ def test_get_mining_license_counts():
     }
 
     with patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token", return_value="fake-api-key"), \
-         patch("services.gsmb_officer_service.requests.get") as mock_get, \
+         patch("services.gsmb_officer_service.redmine_client.get") as mock_get, \
          patch.dict("os.environ", {"REDMINE_URL": "https://redmine.example.com"}):
 
         mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value=mock_issues_response))
@@ -443,7 +437,7 @@ class TestUploadFileToRedmine:
         "REDMINE_URL": "https://test.redmine.com",
         "REDMINE_ADMIN_API_KEY": "admin_key"
     })
-    @patch("services.gsmb_officer_service.requests.post")  # ✅ correct path
+    @patch("services.gsmb_officer_service.redmine_client.post")  # ✅ correct path
     def test_successful_upload(self, mock_post):
         test_file = MockFile("test.pdf", b"dummy content")
 
@@ -464,7 +458,7 @@ class TestUploadFileToRedmine:
         "REDMINE_URL": "https://test.redmine.com",
         "REDMINE_ADMIN_API_KEY": "admin_key"
     })
-    @patch("services.gsmb_officer_service.requests.post")
+    @patch("services.gsmb_officer_service.redmine_client.post")
     def test_failed_upload(self, mock_post):
         test_file = MockFile("test.pdf", b"dummy content")
 
@@ -475,7 +469,7 @@ class TestUploadFileToRedmine:
         result = GsmbOfficerService.upload_file_to_redmine(test_file)
         assert result is None
 
-    @patch("services.gsmb_officer_service.requests.post")
+    @patch("services.gsmb_officer_service.redmine_client.post")
     def test_missing_env_variables(self, mock_post):
         with patch.dict(os.environ, {}, clear=True):
             test_file = MockFile("test.pdf", b"dummy content")
@@ -516,8 +510,8 @@ def mock_data():
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
-@patch("services.gsmb_officer_service.requests.post")
+@patch("services.gsmb_officer_service.redmine_client.put")
+@patch("services.gsmb_officer_service.redmine_client.post")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_successful_upload(mock_api_key, mock_post, mock_put, mock_data):
     mock_api_key.return_value = "valid_api_key"
@@ -541,7 +535,7 @@ def test_successful_upload(mock_api_key, mock_post, mock_put, mock_data):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.post")
+@patch("services.gsmb_officer_service.redmine_client.post")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_issue_creation_failed(mock_api_key, mock_post, mock_data):
     mock_api_key.return_value = "valid_api_key"
@@ -557,8 +551,8 @@ def test_issue_creation_failed(mock_api_key, mock_post, mock_data):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
-@patch("services.gsmb_officer_service.requests.post")
+@patch("services.gsmb_officer_service.redmine_client.put")
+@patch("services.gsmb_officer_service.redmine_client.post")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_license_number_update_failed(mock_api_key, mock_post, mock_put, mock_data):
     mock_api_key.return_value = "valid_api_key"
@@ -584,13 +578,13 @@ def test_license_number_update_failed(mock_api_key, mock_post, mock_put, mock_da
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_missing_api_key(mock_api_key, mock_data):
     mock_api_key.return_value = None
-    with patch("services.gsmb_officer_service.requests.post") as mock_post:
+    with patch("services.gsmb_officer_service.redmine_client.post") as mock_post:
         success, error = GsmbOfficerService.upload_mining_license("token", mock_data)
         assert success is False
         assert "None" not in error  # Ensure error is readable
 
 
-@patch("services.gsmb_officer_service.requests.post")
+@patch("services.gsmb_officer_service.redmine_client.post")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_missing_redmine_url(mock_api_key, mock_post, mock_data):
     mock_api_key.return_value = "valid_api_key"
@@ -618,7 +612,7 @@ def valid_data():
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
+@patch("services.gsmb_officer_service.redmine_client.put")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_successful_upload(mock_api_key, mock_put):
     mock_api_key.return_value = "valid_api_key"
@@ -665,7 +659,7 @@ def test_missing_env_variable(mock_api_key, valid_data):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
+@patch("services.gsmb_officer_service.redmine_client.put")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_failed_api_call(mock_api_key, mock_put, valid_data):
     mock_api_key.return_value = "valid_api_key"
@@ -699,7 +693,7 @@ def valid_data():
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
+@patch("services.gsmb_officer_service.redmine_client.put")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_successful_rejection(mock_api_key, mock_put, valid_data):
     mock_api_key.return_value = "valid_api_key"
@@ -737,7 +731,7 @@ def test_missing_redmine_url(mock_api_key, valid_data):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
+@patch("services.gsmb_officer_service.redmine_client.put")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_failed_api_call(mock_api_key, mock_put, valid_data):
     mock_api_key.return_value = "valid_api_key"
@@ -767,7 +761,7 @@ def test_exception_handling(mock_api_key, valid_data):
     "REDMINE_URL": "https://test.redmine.com",
     "REDMINE_ADMIN_API_KEY": "admin_key"
 })
-@patch("services.gsmb_officer_service.requests.get")
+@patch("services.gsmb_officer_service.redmine_client.get")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_successful_fetch(mock_get_api_key, mock_requests_get):
     mock_get_api_key.return_value = "user_api_key"
@@ -842,7 +836,7 @@ def test_missing_env_vars(mock_get_api_key):
     "REDMINE_URL": "https://test.redmine.com",
     "REDMINE_ADMIN_API_KEY": "admin_key"
 })
-@patch("services.gsmb_officer_service.requests.get")
+@patch("services.gsmb_officer_service.redmine_client.get")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_membership_api_failure(mock_get_api_key, mock_requests_get):
     mock_get_api_key.return_value = "valid_key"
@@ -861,7 +855,7 @@ def test_membership_api_failure(mock_get_api_key, mock_requests_get):
     "REDMINE_URL": "https://test.redmine.com",
     "REDMINE_ADMIN_API_KEY": "admin_key"
 })
-@patch("services.gsmb_officer_service.requests.get")
+@patch("services.gsmb_officer_service.redmine_client.get")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_users_api_failure(mock_get_api_key, mock_requests_get):
     mock_get_api_key.return_value = "valid_key"
@@ -901,12 +895,10 @@ def test_exception_handling(mock_get_api_key):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.GsmbOfficerService.get_custom_field_value")
-@patch("services.gsmb_officer_service.requests.get")
+@patch("services.gsmb_officer_service.redmine_client.get")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
-def test_successful_get_appointments(mock_get_api_key, mock_requests_get, mock_custom_field):
+def test_successful_get_appointments(mock_get_api_key, mock_requests_get):
     mock_get_api_key.return_value = "valid_api_key"
-    mock_custom_field.return_value = "ML/2024/001"
 
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -931,9 +923,9 @@ def test_successful_get_appointments(mock_get_api_key, mock_requests_get, mock_c
     result, error = GsmbOfficerService.get_appointments("valid_token")
 
     assert error is None
-    assert isinstance(result, list)
-    assert result[0]["subject"] == "Site Visit Appointment"
-    assert result[0]["mining_license_number"] == "ML/2024/001"
+    assert isinstance(result["data"], list)
+    assert result["data"][0]["subject"] == "Site Visit Appointment"
+    assert result["data"][0]["mining_license_number"] == "ML/2024/001"
 
 
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
@@ -954,7 +946,7 @@ def test_missing_redmine_url(mock_get_api_key):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.get")
+@patch("services.gsmb_officer_service.redmine_client.get")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_api_failure(mock_get_api_key, mock_requests_get):
     mock_get_api_key.return_value = "valid_api_key"
@@ -987,8 +979,8 @@ from services.gsmb_officer_service import GsmbOfficerService
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
-@patch("services.gsmb_officer_service.requests.post")
+@patch("services.gsmb_officer_service.redmine_client.put")
+@patch("services.gsmb_officer_service.redmine_client.post")
 @patch("services.gsmb_officer_service.JWTUtils.decode_jwt_and_get_user_id")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_create_appointment_success(
@@ -1044,7 +1036,7 @@ def test_missing_redmine_url(mock_user_id, mock_api_key):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.post")
+@patch("services.gsmb_officer_service.redmine_client.post")
 @patch("services.gsmb_officer_service.JWTUtils.decode_jwt_and_get_user_id")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_create_appointment_failure_on_post(mock_api_key, mock_user_id, mock_post):
@@ -1064,8 +1056,8 @@ def test_create_appointment_failure_on_post(mock_api_key, mock_user_id, mock_pos
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
-@patch("services.gsmb_officer_service.requests.post")
+@patch("services.gsmb_officer_service.redmine_client.put")
+@patch("services.gsmb_officer_service.redmine_client.post")
 @patch("services.gsmb_officer_service.JWTUtils.decode_jwt_and_get_user_id")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_create_appointment_failure_on_put(mock_api_key, mock_user_id, mock_post, mock_put):
@@ -1105,7 +1097,7 @@ def test_exception_handling(mock_user_id, mock_api_key):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
+@patch("services.gsmb_officer_service.redmine_client.put")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_approve_mining_license_success(mock_api_key, mock_put):
     mock_api_key.return_value = "valid_api_key"
@@ -1141,7 +1133,7 @@ def test_missing_redmine_url(mock_api_key):
 
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-@patch("services.gsmb_officer_service.requests.put")
+@patch("services.gsmb_officer_service.redmine_client.put")
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
 def test_redmine_update_failure(mock_api_key, mock_put):
     mock_api_key.return_value = "valid_key"
@@ -1159,7 +1151,7 @@ def test_redmine_update_failure(mock_api_key, mock_put):
 
 @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
 @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
-@patch("services.gsmb_officer_service.requests.put")
+@patch("services.gsmb_officer_service.redmine_client.put")
 def test_network_exception(mock_put, mock_api_key):
     mock_api_key.return_value = "valid_key"
     mock_put.side_effect = Exception("Simulated network failure")
@@ -1171,7 +1163,7 @@ def test_network_exception(mock_put, mock_api_key):
 class TestChangeIssueStatus:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.put")
+    @patch("services.gsmb_officer_service.redmine_client.put")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_change_issue_status_success(self, mock_get_api_key, mock_put):
         mock_get_api_key.return_value = "valid_api_key"
@@ -1203,7 +1195,7 @@ class TestChangeIssueStatus:
             assert "Invalid URL" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.put")
+    @patch("services.gsmb_officer_service.redmine_client.put")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_redmine_update_failure(self, mock_get_api_key, mock_put):
         mock_get_api_key.return_value = "valid_api_key"
@@ -1220,7 +1212,7 @@ class TestChangeIssueStatus:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
-    @patch("services.gsmb_officer_service.requests.put")
+    @patch("services.gsmb_officer_service.redmine_client.put")
     def test_exception_handling(self, mock_put, mock_get_api_key):
         mock_get_api_key.return_value = "valid_api_key"
         mock_put.side_effect = Exception("Something went wrong")
@@ -1234,7 +1226,7 @@ class TestChangeIssueStatus:
 class TestMarkComplaintResolved:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.put")
+    @patch("services.gsmb_officer_service.redmine_client.put")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_mark_resolved_success(self, mock_api_key, mock_put):
         mock_api_key.return_value = "valid_api_key"
@@ -1268,7 +1260,7 @@ class TestMarkComplaintResolved:
             assert "Invalid URL" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.put")
+    @patch("services.gsmb_officer_service.redmine_client.put")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_redmine_failure(self, mock_api_key, mock_put):
         mock_api_key.return_value = "valid_api_key"
@@ -1286,7 +1278,7 @@ class TestMarkComplaintResolved:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
-    @patch("services.gsmb_officer_service.requests.put")
+    @patch("services.gsmb_officer_service.redmine_client.put")
     def test_exception_handling(self, mock_put, mock_api_key):
         mock_api_key.return_value = "valid_api_key"
         mock_put.side_effect = Exception("Unexpected failure")
@@ -1301,12 +1293,10 @@ class TestMarkComplaintResolved:
 class TestGetMiningLicenseRequest:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
-    @patch("services.gsmb_officer_service.GsmbOfficerService.get_custom_field_value")
-    def test_successful_request(self, mock_get_field, mock_api_key, mock_get):
+    def test_successful_request(self, mock_api_key, mock_get):
         mock_api_key.return_value = "valid_api_key"
-        mock_get_field.side_effect = lambda fields, name: f"mock_{name.lower().replace(' ', '_')}"
 
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -1316,7 +1306,10 @@ class TestGetMiningLicenseRequest:
                     "id": 1,
                     "subject": "Request 1",
                     "assigned_to": {"name": "Officer A", "id": 10},
-                    "custom_fields": [],
+                    "custom_fields": [
+                        {"id": 66, "name": "Mobile Number", "value": "0711111111"},
+                        {"id": 31, "name": "Administrative District", "value": "Kandy"}
+                    ],
                     "created_on": "2025-06-01T10:00:00Z",
                     "status": {"name": "Pending"}
                 }
@@ -1329,8 +1322,8 @@ class TestGetMiningLicenseRequest:
         assert error is None
         assert len(result) == 1
         assert result[0]["subject"] == "Request 1"
-        assert result[0]["mobile"] == "mock_mobile_number"
-        assert result[0]["district"] == "mock_administrative_district"
+        assert result[0]["mobile"] == "0711111111"
+        assert result[0]["district"] == "Kandy"
         mock_get.assert_called_once()
 
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
@@ -1349,7 +1342,7 @@ class TestGetMiningLicenseRequest:
             assert "Invalid URL" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_redmine_api_failure(self, mock_api_key, mock_get):
         mock_api_key.return_value = "valid_api_key"
@@ -1367,7 +1360,7 @@ class TestGetMiningLicenseRequest:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     def test_unexpected_exception(self, mock_get, mock_api_key):
         mock_api_key.return_value = "valid_api_key"
         mock_get.side_effect = Exception("Unexpected failure")
@@ -1383,7 +1376,7 @@ class TestGetMiningRequestViewButton:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
     @patch("services.gsmb_officer_service.GsmbOfficerService.get_attachment_urls")
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_successful_fetch(self, mock_api_key, mock_get, mock_attachments):
         mock_api_key.return_value = "valid_key"
@@ -1438,7 +1431,7 @@ class TestGetMiningRequestViewButton:
             assert "Invalid URL" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_redmine_fetch_failure(self, mock_api_key, mock_get):
         mock_api_key.return_value = "valid_key"
@@ -1451,7 +1444,7 @@ class TestGetMiningRequestViewButton:
         assert "404" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_no_issue_in_response(self, mock_api_key, mock_get):
         mock_api_key.return_value = "valid_key"
@@ -1468,7 +1461,7 @@ class TestGetMiningLicenseViewButton:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
     @patch("services.gsmb_officer_service.GsmbOfficerService.get_attachment_urls")
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_successful_view_button(self, mock_get_token, mock_get_request, mock_get_attachments):
         mock_get_token.return_value = "valid_api_key"
@@ -1527,7 +1520,7 @@ class TestGetMiningLicenseViewButton:
                 assert "Invalid URL" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_redmine_issue_not_found(self, mock_get_token, mock_get):
         mock_get_token.return_value = "valid_api_key"
@@ -1539,7 +1532,7 @@ class TestGetMiningLicenseViewButton:
         assert "Failed to fetch issue" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.gsmb_officer_service.requests.get")
+    @patch("services.gsmb_officer_service.redmine_client.get")
     @patch("services.gsmb_officer_service.JWTUtils.get_api_key_from_token")
     def test_redmine_response_no_issue_data(self, mock_get_token, mock_get):
         mock_get_token.return_value = "valid_api_key"
@@ -25,6 +25,7 @@ def make_token():
 @pytest.fixture(autouse=True)
 def set_env_vars(monkeypatch):
     monkeypatch.setenv("REDMINE_URL", "https://fake-redmine.com")
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "fake_admin_key")
     monkeypatch.setenv("ORS_API_KEY", "fake_ors_key")
     yield
 
@@ -41,7 +42,7 @@ def mock_mloutils_user_info():
         yield
 
 
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_update_mining_owner_appointment_success(mock_put):
     mock_resp = MagicMock()
     mock_resp.status_code = 201
@@ -53,7 +54,7 @@ def test_update_mining_owner_appointment_success(mock_put):
     assert result == {"issue": {"id": 1}}
     mock_put.assert_called_once()
 
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_update_mining_owner_appointment_fail_status_code(mock_put):
     mock_resp = MagicMock()
     mock_resp.status_code = 400
@@ -65,7 +66,7 @@ def test_update_mining_owner_appointment_fail_status_code(mock_put):
     assert "Failed to create appointment" in err
 
 
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_pending_licenses_success(mock_get):
     # Mock Redmine API paginated response
     issues_page_1 = {
@@ -137,7 +138,7 @@ def test_get_attachment_urls_success():
     assert urls["Payment Receipt"] == 30
 
 
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_mining_engineer_approve_success(mock_put):
     # First put call - update ML issue
     mock_resp1 = MagicMock()
@@ -158,7 +159,7 @@ def test_mining_engineer_approve_success(mock_put):
     assert mock_put.call_count == 2
 
 
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_mining_engineer_approve_fail_close_me(mock_put):
     # First put call success
     mock_resp1 = MagicMock()
@@ -179,7 +180,7 @@ def test_mining_engineer_approve_fail_close_me(mock_put):
     assert "Failed to close ME Appointment" in err
 
 
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_mining_engineer_reject_success(mock_put):
     # ML issue update success
     mock_ml_resp = MagicMock()
@@ -199,7 +200,7 @@ def test_mining_engineer_reject_success(mock_put):
     assert result == {"issue": {"id": 1}}
     assert mock_put.call_count == 2
 
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_mining_engineer_reject_fail_ml_update(mock_put):
     mock_ml_resp = MagicMock()
     mock_ml_resp.status_code = 400
@@ -213,7 +214,7 @@ def test_mining_engineer_reject_fail_ml_update(mock_put):
     assert "Redmine API error" in err
 
 @patch("services.mining_engineer_service.MiningEnginerService.change_issue_status")
-@patch("services.mining_engineer_service.requests.post")
+@patch("services.mining_engineer_service.redmine_client.post")
 @patch("services.mining_engineer_service.MLOUtils.get_user_info_from_token")
 @patch("services.mining_engineer_service.JWTUtils.decode_jwt_and_get_user_id")
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
@@ -269,7 +270,7 @@ def test_create_ml_appointment_invalid_license_format(mock_get_user_info, mock_g
 
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_change_issue_status_success(mock_put, mock_get_api_key):
     mock_get_api_key.return_value = make_api_key()
 
@@ -282,7 +283,7 @@ def test_change_issue_status_success(mock_put, mock_get_api_key):
     assert error is None
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_change_issue_status_failure(mock_put, mock_get_api_key):
     mock_get_api_key.return_value = make_api_key()
 
@@ -295,7 +296,7 @@ def test_change_issue_status_failure(mock_put, mock_get_api_key):
     assert success is None
     assert "Failed to update issue status" in error
 
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_change_issue_status_invalid_api_key(mock_put):
     mock_response = MagicMock()
     mock_response.status_code = 401
@@ -311,7 +312,7 @@ def test_change_issue_status_invalid_api_key(mock_put):
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
 @patch("services.mining_engineer_service.MLOUtils.get_user_info_from_token")
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 @patch("services.mining_engineer_service.MiningEnginerService.get_attachment_urls")
 @patch("services.mining_engineer_service.LimitUtils.get_limit")
 def test_get_me_meeting_schedule_licenses_success(mock_get_limit, mock_get_attachment_urls, mock_requests_get, mock_get_user_info, mock_get_api_key):
@@ -362,7 +363,7 @@ def test_get_me_meeting_schedule_licenses_success(mock_get_limit, mock_get_attac
     assert results[0]["Detailed_Plan"] == "https://example.com/plan.pdf"
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_appointments_success(mock_requests_get, mock_get_api_key):
     mock_get_api_key.return_value = make_api_key()
     issues_data = {
@@ -399,7 +400,7 @@ def test_get_me_appointments_invalid_token(mock_get_api_key):
     assert "Invalid API token" in result["error"]
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_appointments_api_error(mock_requests_get, mock_get_api_key):
     mock_get_api_key.return_value = make_api_key()
     mock_response = MagicMock()
@@ -412,7 +413,7 @@ def test_get_me_appointments_api_error(mock_requests_get, mock_get_api_key):
     assert "Redmine API error" in result["error"]
 
     
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_approve_license_success(mock_get):
     # Mock Redmine API response
     mock_response = MagicMock()
@@ -443,7 +444,7 @@ def test_get_me_approve_license_success(mock_get):
         assert issues[0]["Land_Name"] == "Land A"
 
 
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_approve_license_api_error(mock_get):
     mock_response = MagicMock(status_code=500, text="Internal Server Error")
     mock_get.return_value = mock_response
@@ -453,7 +454,7 @@ def test_get_me_approve_license_api_error(mock_get):
     assert "Redmine API error" in error
 
 
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_approve_single_license_success(mock_get):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -480,7 +481,7 @@ def test_get_me_approve_single_license_success(mock_get):
         assert result["Land_Name"] == "Land B"
 
 
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_approve_single_license_not_found(mock_get):
     mock_response = MagicMock()
     mock_response.status_code = 404
@@ -492,62 +493,56 @@ def test_get_me_approve_single_license_not_found(mock_get):
     assert "Redmine API error" in result["error"]
 
 
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 @patch("services.mining_engineer_service.MLOUtils.get_user_info_from_token")
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
 def test_get_me_licenses_count_success(mock_get_api_key, mock_get_user_info, mock_requests_get):
      
     mock_get_api_key.return_value = "fake_api_key"  
     mock_get_user_info.return_value = ("fake_user_id", None)
-    # Prepare paginated issues data
-    issues_page1 = (
-        [{"status": {"id": 6}}] * 50 +     # 50 Rejected
-        [{"status": {"id": 26}}] * 50      # 50 Awaiting ME Scheduling
-)
-    issues_page2 = [
-        {"status": {"id": 31}}, # ME Appointment Scheduled
-        {"status": {"id": 32}}, # ME Approved
-    ]
+    totals = {6: 50, 26: 50, 31: 1, 32: 1}
 
     def side_effect(*args, **kwargs):
         params = kwargs.get("params", {})
-        offset = params.get("offset", 0)
+        assert params["limit"] == 1
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        if offset == 0:
-            mock_resp.json.return_value = {"issues": issues_page1}
-        elif offset == 100:
-            mock_resp.json.return_value = {"issues": issues_page2}
-        else:
-            mock_resp.json.return_value = {"issues": []}
+        mock_resp.json.return_value = {"issues": [{}], "total_count": totals[params["status_id"]]}
         return mock_resp
 
     mock_requests_get.side_effect = side_effect
 
     counts, error = MiningEnginerService.get_me_licenses_count(MOCK_TOKEN)
 
-    print("DEBUG counts:", counts) 
-    
     assert error is None
+    assert mock_requests_get.call_count == 4
     assert counts["Rejected"] == 50
     assert counts["Awaiting ME Scheduling"] == 50
     assert counts["ME Appointment Scheduled"] == 1
     assert counts["ME Approved"] == 1
 
 
-@patch("services.mining_engineer_service.requests.put")
-@patch("services.mining_engineer_service.requests.get")
-@patch("services.mining_engineer_service.requests.put")
+@patch("services.mining_engineer_service.redmine_client.put")
+@patch("services.mining_engineer_service.redmine_client.get")
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_set_license_hold_success(mock_put_close, mock_get, mock_put_hold):
     # 1. Mock first PUT to set status to Hold
     mock_put_hold.return_value = MagicMock(status_code=200)
 
-    # 2. Mock GET to return one MeAppointment issue
-    mock_get_response = MagicMock(status_code=200)
-    mock_get_response.json.return_value = {
-        "issues": [{"id": 9999}]
+    # 2. Mock GETs: the MeAppointment index sync finds one scheduled appointment for the license
+    appointment = {
+        "id": 9999,
+        "status": {"id": 31},
+        "custom_fields": [{"id": 101, "value": f"ML Request LLL/100/{MOCK_ISSUE_ID}"}]
     }
-    mock_get.return_value = mock_get_response
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/issue_statuses.json"):
+            return MagicMock(status_code=200, json=lambda: {"issue_statuses": [{"id": 5, "is_closed": True}]})
+        if url.endswith("/issues/9999.json"):
+            return MagicMock(status_code=200, json=lambda: {"issue": appointment})
+        return MagicMock(status_code=200, json=lambda: {"issues": [appointment]})
+    mock_get.side_effect = fake_get
 
     # 3. Mock second PUT to close MeAppointment
     mock_put_close.return_value = MagicMock(status_code=200)
@@ -555,10 +550,39 @@ def test_set_license_hold_success(mock_put_close, mock_get, mock_put_hold):
     success, error = MiningEnginerService.set_license_hold(MOCK_ISSUE_ID, "Reason for hold", MOCK_TOKEN)
     assert success is True
     assert error is None
+    assert [c.args[0].rsplit("/", 1)[-1] for c in mock_get.call_args_list] == [
+        "issue_statuses.json", "issues.json", "9999.json"]
+    # The index hit is re-read with the engineer's key before it is closed
+    assert mock_get.call_args.kwargs["headers"] == {"X-Redmine-API-Key": "fake_api_key"}
+
+
+@patch("services.mining_engineer_service.redmine_client.put")
+@patch("services.mining_engineer_service.redmine_client.get")
+def test_set_license_hold_leaves_appointments_the_engineer_cannot_read(mock_get, mock_put):
+    mock_put.return_value = MagicMock(status_code=200)
+    appointment = {
+        "id": 9999,
+        "status": {"id": 31},
+        "custom_fields": [{"id": 101, "value": f"ML Request LLL/100/{MOCK_ISSUE_ID}"}]
+    }
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/issue_statuses.json"):
+            return MagicMock(status_code=200, json=lambda: {"issue_statuses": [{"id": 5, "is_closed": True}]})
+        if url.endswith("/issues/9999.json"):
+            return MagicMock(status_code=403, text="Forbidden")
+        return MagicMock(status_code=200, json=lambda: {"issues": [appointment]})
+    mock_get.side_effect = fake_get
 
+    success, error = MiningEnginerService.set_license_hold(MOCK_ISSUE_ID, "Reason for hold", MOCK_TOKEN)
 
+    assert success is False
+    assert error == f"No MeAppointment issue found for license ML Request LLL/100/{MOCK_ISSUE_ID}"
+    assert [c.args[0] for c in mock_put.call_args_list] == [f"https://fake-redmine.com/issues/{MOCK_ISSUE_ID}.json"]
 
-@patch("services.mining_engineer_service.requests.put")
+
+
+@patch("services.mining_engineer_service.redmine_client.put")
 def test_set_license_hold_fail(mock_put):
     # First PUT fails with 400
     mock_response = MagicMock(status_code=400)
@@ -570,7 +594,7 @@ def test_set_license_hold_fail(mock_put):
     assert "Failed to update license issue" in error
 
 
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 def test_get_me_hold_licenses_success(mock_get):
     mock_response = MagicMock()
     mock_response.status_code = 200
@@ -598,7 +622,7 @@ def test_get_me_hold_licenses_success(mock_get):
 
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token")
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 @patch("services.mining_engineer_service.os.getenv")
 def test_get_mining_license_view_button_success(mock_getenv, mock_requests_get, mock_get_api_key):
     # Arrange
@@ -646,7 +670,7 @@ def test_get_mining_licensee_view_button_invalid_token(mock_get_api_key):
 
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token", return_value=MOCK_API_KEY)
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 @patch("services.mining_engineer_service.os.getenv", return_value=MOCK_REDMINE_URL)
 def test_get_mining_license_view_button_api_error(mock_getenv, mock_requests_get, mock_get_api_key):
     mock_response = MagicMock()
@@ -660,7 +684,7 @@ def test_get_mining_license_view_button_api_error(mock_getenv, mock_requests_get
 
 
 @patch("services.mining_engineer_service.JWTUtils.get_api_key_from_token", return_value=MOCK_API_KEY)
-@patch("services.mining_engineer_service.requests.get")
+@patch("services.mining_engineer_service.redmine_client.get")
 @patch("services.mining_engineer_service.os.getenv", return_value=MOCK_REDMINE_URL)
 def test_get_mining_license_view_button_missing_issue(mock_getenv, mock_requests_get, mock_get_api_key):
     mock_response = MagicMock()
@@ -670,4 +694,25 @@ def test_get_mining_license_view_button_missing_issue(mock_getenv, mock_requests
 
     result, error = MiningEnginerService.get_mining_license_view_button(MOCK_TOKEN, MOCK_ISSUE_ID)
     assert result is None
-    assert "Issue data not found" in error
\ No newline at end of file
+    assert "Issue data not found" in error
+
+@patch("services.mining_engineer_service.redmine_client.get")
+def test_get_me_reject_licenses_filters_status_on_redmine(mock_get):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = {
+        "issues": [{
+            "id": 7,
+            "status": {"id": 6, "name": "Rejected"},
+            "assigned_to": {"name": "Owner"},
+            "custom_fields": [{"id": 101, "value": "ML-7"}],
+        }],
+        "total_count": 1,
+    }
+    mock_get.return_value = mock_resp
+
+    issues, error = MiningEnginerService.get_me_reject_licenses(MOCK_TOKEN)
+
+    assert error is None
+    assert [i["mining_number"] for i in issues] == ["ML-7"]
+    assert mock_get.call_args.kwargs["params"]["status_id"] == 6
@@ -1,4 +1,4 @@
-
+from datetime import date, datetime, timedelta
 from datetime import datetime, timedelta
 import pytest
 from unittest.mock import patch, MagicMock
@@ -8,12 +8,18 @@ from services.mining_owner_service import MLOwnerService
 from typing import Tuple, List, Dict, Optional
 from datetime import datetime as real_datetime
 
+
+def _statuses_response():
+    """``/issue_statuses.json`` as the shared issue indexes read it on their first sync."""
+    return MagicMock(status_code=200, json=MagicMock(return_value={"issue_statuses": [
+        {"id": 1, "name": "New"}, {"id": 5, "name": "Closed", "is_closed": True}]}))
+
 class TestMiningLicenses:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_mining_licenses_success(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
@@ -78,7 +84,7 @@ class TestMiningLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_mining_licenses_api_failure(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_user_info.return_value = {
@@ -100,7 +106,7 @@ class TestMiningLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_mining_licenses_no_assigned_licenses(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_user_info.return_value = {
@@ -126,7 +132,7 @@ class TestMiningLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_mining_licenses_invalid_remaining_cubes(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_user_info.return_value = {
@@ -167,7 +173,7 @@ class TestMiningLicenses:
         }
 
         
-        with patch('services.mining_owner_service.requests.get', side_effect=Exception("Test exception")):
+        with patch('services.mining_owner_service.redmine_client.get', side_effect=Exception("Test exception")):
             result, error = MLOwnerService.mining_licenses("valid_token")
             assert result is None
             assert "Server error: Test exception" in error
@@ -176,7 +182,7 @@ class TestMiningLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_mining_licenses_missing_fields(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_user_info.return_value = {
@@ -218,7 +224,7 @@ class TestMiningHomeLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     @patch('services.mining_owner_service.datetime')
     def test_mining_home_licenses_success(self, mock_datetime, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
@@ -268,7 +274,7 @@ class TestMiningHomeLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     @patch('services.mining_owner_service.datetime')
     def test_mining_home_licenses_past_due_date(self, mock_datetime, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
@@ -306,7 +312,7 @@ class TestMiningHomeLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     @patch('services.mining_owner_service.datetime')
     def test_mining_home_licenses_invalid_remaining_cubes(self, mock_datetime, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
@@ -381,7 +387,7 @@ class TestMiningHomeLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_mining_home_licenses_api_failure(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_user_info.return_value = {
@@ -403,7 +409,7 @@ class TestMiningHomeLicenses:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     @patch('services.mining_owner_service.datetime')
     def test_mining_home_licenses_missing_fields(self, mock_datetime, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
@@ -452,19 +458,41 @@ class TestMiningHomeLicenses:
             "user_id": 123
         }
 
-        with patch('services.mining_owner_service.requests.get', side_effect=Exception("Test exception")):
+        with patch('services.mining_owner_service.redmine_client.get', side_effect=Exception("Test exception")):
             result, error = MLOwnerService.mining_licenses("valid_token")
             assert result is None
             assert "Server error: Test exception" in error
 
+    @patch.dict(os.environ, {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
+    @patch('services.mining_owner_service.redmine_client.get')
+    def test_home_licenses_filtered_on_redmine(self, mock_get, mock_user_info, mock_api_key):
+        mock_api_key.return_value = 'test_api_key'
+        mock_user_info.return_value = {"success": True, "user_id": 123}
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"issues": [], "total_count": 0}
+        mock_get.return_value = mock_response
+
+        result, error = MLOwnerService.get_mining_home_licenses("valid_token")
+
+        assert error is None
+        assert result == []
+        params = mock_get.call_args.kwargs["params"]
+        assert params["assigned_to_id"] == 123
+        assert params["status_id"] == 7
+        assert params["due_date"] == f">={(date.today() + timedelta(days=1)).isoformat()}"
+
 class TestCreateTPL:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
-    @patch('services.mining_owner_service.requests.put')
-    @patch('services.mining_owner_service.requests.post')
+    @patch('services.mining_owner_service.redmine_client.get')
+    @patch('services.mining_owner_service.redmine_client.put')
+    @patch('services.mining_owner_service.redmine_client.post')
     @patch('services.mining_owner_service.MLOwnerService.calculate_time')
     def test_create_tpl_success(self, mock_calculate_time, mock_post, mock_put, mock_get, 
                               mock_decode_jwt, mock_api_key):
@@ -569,7 +597,7 @@ class TestCreateTPL:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_create_tpl_failed_to_fetch_license(self, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
@@ -584,7 +612,7 @@ class TestCreateTPL:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_create_tpl_missing_required_fields(self, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
@@ -603,7 +631,7 @@ class TestCreateTPL:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_create_tpl_insufficient_royalty(self, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
@@ -629,7 +657,7 @@ class TestCreateTPL:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_create_tpl_insufficient_cubes(self, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
@@ -655,9 +683,11 @@ class TestCreateTPL:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
-    @patch('services.mining_owner_service.requests.put')
-    def test_create_tpl_failed_to_update_license(self, mock_put, mock_get, mock_api_key):
+    @patch('services.mining_owner_service.redmine_client.get')
+    @patch('services.mining_owner_service.redmine_client.put')
+    @patch('services.mining_owner_service.MLOwnerService.calculate_time',
+           return_value={"success": True, "time_hours": 4})
+    def test_create_tpl_failed_to_update_license(self, mock_calculate_time, mock_put, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
         # Mock mining license fetch
@@ -688,9 +718,9 @@ class TestCreateTPL:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
-    @patch('services.mining_owner_service.requests.put')
-    @patch('services.mining_owner_service.requests.post')
+    @patch('services.mining_owner_service.redmine_client.get')
+    @patch('services.mining_owner_service.redmine_client.put')
+    @patch('services.mining_owner_service.redmine_client.post')
     def test_create_tpl_failed_to_create_tpl(self, mock_post, mock_put, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
 
@@ -715,13 +745,192 @@ class TestCreateTPL:
         assert result is None
         assert "Test exception" in error
 
+class TestDeferredTplTravelTime:
+
+    LICENSE = {"issue": {"custom_fields": [
+        {"id": 1, "name": "Used", "value": "100"},
+        {"id": 2, "name": "Remaining", "value": "500"},
+        {"id": 3, "name": "Royalty", "value": "25000"},
+    ]}}
+
+    @pytest.fixture
+    def queue(self, tmp_path, monkeypatch):
+        from utils.deferred_queue import DeferredQueue
+        monkeypatch.setenv("REDMINE_URL", "https://test.redmine.com")
+        monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "admin-key")
+        monkeypatch.setattr("services.mining_owner_service.Config.TPL_DEFER_TRAVEL_TIME", True)
+        queue = DeferredQueue(str(tmp_path / "queue"), "tpl-travel-time",
+                              handler=MLOwnerService._apply_travel_time, retry_delay=0, max_attempts=2,
+                              on_failure=MLOwnerService._report_travel_time_failure)
+        queue.start = MagicMock()
+        with patch("services.mining_owner_service.tpl_travel_time_queue", queue):
+            yield queue
+
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id',
+           return_value={"success": True, "user_id": 7})
+    @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token', return_value='user-key')
+    @patch('services.mining_owner_service.redmine_client.post')
+    @patch('services.mining_owner_service.redmine_client.put')
+    @patch('services.mining_owner_service.redmine_client.get')
+    @patch('services.mining_owner_service.MLOwnerService.calculate_time')
+    def test_tpl_is_issued_first_and_patched_by_worker(self, mock_calculate_time, mock_get, mock_put,
+                                                       mock_post, mock_api_key, mock_decode, queue):
+        mock_get.return_value = MagicMock(status_code=200, json=MagicMock(return_value=self.LICENSE))
+        mock_put.return_value = MagicMock(status_code=204)
+        mock_post.return_value = MagicMock(status_code=201, text="{...}",
+                                           json=MagicMock(return_value={"issue": {"id": 900}}))
+
+        issue, error = MLOwnerService.create_tpl(
+            {"mining_license_number": "LLL/100/456", "cubes": "2", "route_01": "Kandy", "destination": "Galle"},
+            "token"
+        )
+
+        assert error is None
+        mock_calculate_time.assert_not_called()
+        assert mock_post.call_args.kwargs["json"]["issue"]["estimated_hours"] == 16
+        assert issue["travel_time"]["status"] == "pending"
+        queue.start.assert_called_once()
+
+        mock_calculate_time.side_effect = [{"success": False, "error": "ORS down"},
+                                           {"success": True, "time_hours": 5}]
+        assert queue.run_once()
+        assert MLOwnerService.get_tpl_travel_time("token", 900)[0]["status"] == "pending"
+        assert queue.run_once()
+
+        status, error = MLOwnerService.get_tpl_travel_time("token", 900)
+        assert error is None
+        assert status["status"] == "done"
+        assert status["estimated_hours"] == 5
+        assert status["attempts"] == 2
+        assert mock_put.call_args.args[0] == "https://test.redmine.com/issues/900.json"
+        assert mock_put.call_args.kwargs["json"] == {"issue": {"estimated_hours": 5}}
+
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id',
+           return_value={"success": True, "user_id": 7})
+    @patch('services.mining_owner_service.redmine_client.put')
+    @patch('services.mining_owner_service.MLOwnerService.calculate_time',
+           return_value={"success": False, "error": "ORS down"})
+    def test_dead_job_is_noted_on_the_tpl(self, mock_calculate_time, mock_put, mock_decode, queue):
+        mock_put.return_value = MagicMock(status_code=204)
+        queue.enqueue(900, {"issue_id": 900, "user_id": 7, "route_01": "Kandy", "destination": "Galle"})
+
+        assert queue.run_once()
+        mock_put.assert_not_called()
+        assert queue.run_once()
+
+        status, _ = MLOwnerService.get_tpl_travel_time("token", 900)
+        assert status["status"] == "failed"
+        mock_put.assert_called_once()
+        assert mock_put.call_args.args[0] == "https://test.redmine.com/issues/900.json"
+        notes = mock_put.call_args.kwargs["json"]["issue"]["notes"]
+        assert "ORS down" in notes and "16 hours" in notes
+        assert "estimated_hours" not in mock_put.call_args.kwargs["json"]["issue"]
+
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id',
+           return_value={"success": True, "user_id": 8})
+    def test_status_hidden_from_other_owners(self, mock_decode, queue):
+        queue.enqueue(900, {"issue_id": 900, "user_id": 7, "route_01": "Kandy", "destination": "Galle"})
+
+        status, error = MLOwnerService.get_tpl_travel_time("token", 900)
+
+        assert status is None
+        assert "No travel time calculation" in error
+
+    def test_worker_keeps_recovering_jobs_of_recycled_workers(self, tmp_path):
+        import threading
+        import time
+        from utils.deferred_queue import DeferredQueue
+        handled = threading.Event()
+        queue = DeferredQueue(str(tmp_path / "queue"), "jobs", handler=lambda payload: handled.set(),
+                              poll_interval=0.01, recover_interval=0.01)
+        queue.start()
+        try:
+            # Another worker takes the job after this one started, then is recycled mid-run.
+            queue.enqueue("a", {})
+            store = queue._store()
+            with store.transact():
+                _, job = store.pull(prefix="jobs")
+                queue._set_status("a", "running", attempts=1, lease_until=time.time() - 1, job=job)
+            assert handled.wait(5)
+        finally:
+            queue.stop()
+        deadline = time.time() + 5
+        while queue.status("a")["status"] != "done" and time.time() < deadline:
+            time.sleep(0.01)
+        assert queue.status("a")["status"] == "done"
+
+    def test_job_not_yet_due_survives_a_crash_while_requeued(self, tmp_path):
+        from utils.deferred_queue import DeferredQueue
+        queue = DeferredQueue(str(tmp_path / "queue"), "jobs", handler=MagicMock(side_effect=ValueError("down")),
+                              retry_delay=60)
+        queue.enqueue("a", {})
+        assert queue.run_once()
+
+        with patch.object(queue._store(), "push", side_effect=SystemExit("worker killed")):
+            with pytest.raises(SystemExit):
+                queue.run_once()
+
+        assert queue._store().peek(prefix="jobs")[1]["job_id"] == "a"
+        assert queue.status("a")["status"] == "pending"
+
+
+class TestCalculateTime:
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        from utils.geo_cache import GeoCache
+        cache = GeoCache(str(tmp_path / "geo"))
+        with patch("services.mining_owner_service.geo_cache", cache):
+            yield cache
+
+    @patch("services.mining_owner_service.requests.post")
+    @patch("services.mining_owner_service.requests.get")
+    def test_gazetteer_towns_skip_geocoding_and_routes_are_cached(self, mock_get, mock_post, cache):
+        mock_post.return_value.json.return_value = {"routes": [{"summary": {"distance": 120.0}}]}
+
+        first = MLOwnerService.calculate_time("Kandy", "Colombo")
+        second = MLOwnerService.calculate_time(" kandy ", "COLOMBO, Sri Lanka")
+
+        assert first["success"] and second["success"]
+        assert first["time_hours"] == second["time_hours"] == 6
+        mock_get.assert_not_called()
+        mock_post.assert_called_once()
+        assert mock_post.call_args.kwargs["json"]["coordinates"][0] == [80.6337, 7.2906]
+
+    @patch("services.mining_owner_service.nominatim_throttle")
+    @patch("services.mining_owner_service.requests.post")
+    @patch("services.mining_owner_service.requests.get")
+    def test_unknown_place_is_geocoded_once(self, mock_get, mock_post, mock_throttle, cache):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = [{"lat": "7.1", "lon": "80.1"}]
+        mock_post.return_value.json.return_value = {"routes": [{"summary": {"distance": 30.0}}]}
+
+        assert MLOwnerService.calculate_time("Pitabeddara", "Galle")["success"]
+        assert MLOwnerService.calculate_time("Pitabeddara", "Matara")["success"]
+
+        mock_get.assert_called_once()
+        assert mock_post.call_count == 2
+        assert cache.coordinates("pitabeddara") == (80.1, 7.1)
+
+    def test_throttle_is_shared_by_workers_on_the_same_directory(self, tmp_path):
+        from utils.geo_cache import Throttle
+        workers = [Throttle(1.0, str(tmp_path / "geo")) for _ in range(3)]
+
+        with patch("utils.geo_cache.time.time", return_value=1000.0), \
+             patch("utils.geo_cache.time.sleep") as mock_sleep:
+            for throttle in workers:
+                throttle.wait()
+
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1.0, 2.0]
+
+
 class TestMLDetail:
 
-    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_ml_detail_success(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_limit.return_value = 100
@@ -734,6 +943,8 @@ class TestMLDetail:
             "issues": [
                 {
                     "id": 123,
+                    "assigned_to": {"id": 123},
+                    "status": {"id": 7},
                     "custom_fields": [
                         {"id": 101, "value": "ML-001"}
                     ]
@@ -780,7 +991,7 @@ class TestMLDetail:
             }
         }
 
-        mock_get.side_effect = [mock_search_response, mock_detail_response]
+        mock_get.side_effect = [_statuses_response(), mock_search_response, mock_detail_response]
 
         result, error = MLOwnerService.ml_detail("ML-001", "valid_token")
 
@@ -790,15 +1001,11 @@ class TestMLDetail:
         assert result["royalty"] == "1000"
         assert result["remaining"] == "500"
 
-        # Verify API calls with correct URLs and timeout
-        mock_get.assert_any_call(
-            "https://test.redmine.com/issues.json?project_id=1&tracker_id=4&status_id=7&assigned_to_id=123&limit=100&offset=0",
-            headers={
-                "X-Redmine-API-Key": "test_api_key",
-                "Content-Type": "application/json"
-            },
-            timeout=30
-        )
+        # License lookup comes from the ML index (admin key); detail uses the owner's key
+        index_call = mock_get.call_args_list[1]
+        assert index_call.args[0] == "https://test.redmine.com/issues.json"
+        assert index_call.kwargs["params"]["tracker_id"] == 4
+        assert index_call.kwargs["headers"] == {"X-Redmine-API-Key": "admin_key"}
         mock_get.assert_any_call(
             "https://test.redmine.com/issues/123.json",
             headers={
@@ -817,7 +1024,7 @@ class TestMLDetail:
         assert result is None
         assert "Redmine URL or API Key is missing" in error
 
-    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     def test_ml_detail_missing_api_key(self, mock_api_key):
         mock_api_key.return_value = None
@@ -826,11 +1033,11 @@ class TestMLDetail:
         assert "Redmine URL or API Key is missing" in error
 
 
-    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_ml_detail_search_failure(self, mock_get, mock_limit, mock_decode_user_id, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_decode_user_id.return_value = {"success": True, "user_id": 123}  # Mock successful decode
@@ -839,20 +1046,21 @@ class TestMLDetail:
         mock_response = MagicMock()
         mock_response.status_code = 500
         mock_response.text = "Server error"
-        mock_get.return_value = mock_response
+        mock_get.side_effect = [_statuses_response(), mock_response]
 
         result, error = MLOwnerService.ml_detail("ML-001", "valid_token")
         assert result is None
-        assert "Failed to fetch issues" in error
+        assert "Failed to fetch ML issues" in error
 
 
-    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_ml_detail_detail_failure(self, mock_get, mock_limit, mock_decode_user_id, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
+        mock_decode_user_id.return_value = {"success": True, "user_id": 123}
         mock_limit.return_value = 100
 
         # First call (search) succeeds
@@ -862,6 +1070,8 @@ class TestMLDetail:
             "issues": [
                 {
                     "id": 123,
+                    "assigned_to": {"id": 123},
+                    "status": {"id": 7},
                     "custom_fields": [
                         {"id": 101, "value": "ML-001"}
                     ]
@@ -874,17 +1084,17 @@ class TestMLDetail:
         mock_detail_response.status_code = 404
         mock_detail_response.text = "Not found"
 
-        mock_get.side_effect = [mock_search_response, mock_detail_response]
+        mock_get.side_effect = [_statuses_response(), mock_search_response, mock_detail_response]
 
         result, error = MLOwnerService.ml_detail("ML-001", "valid_token")
         assert result is None
         assert "Failed to fetch issue details" in error
 
-    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_ml_detail_not_found(self, mock_get, mock_limit, mock_decode_user_id, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_decode_user_id.return_value = {"success": True, "user_id": 123}  # mock success for decoding token
@@ -900,10 +1110,10 @@ class TestMLDetail:
         assert "No mining license found" in error
 
 
-    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_ml_detail_pagination(self, mock_get, mock_decode_jwt, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_decode_jwt.return_value = {"success": True, "user_id": 123}
@@ -931,6 +1141,8 @@ class TestMLDetail:
             "issues": [
                 {
                     "id": 101,
+                    "assigned_to": {"id": 123},
+                    "status": {"id": 7},
                     "custom_fields": [
                         {"id": 101, "name": "Mining License Number", "value": "ML-001"}
                     ]
@@ -960,10 +1172,11 @@ class TestMLDetail:
         }
 
         # The sequence of requests.get calls:
-        # 1) fetch page 1 (100 issues)
-        # 2) fetch page 2 (matching issue)
-        # 3) fetch detail for id=101
-        mock_get.side_effect = [mock_page1, mock_page2, mock_detail]
+        # 1) index sync, closed status ids
+        # 2) index sync, page 1 (100 issues)
+        # 3) index sync, page 2 (matching issue)
+        # 4) fetch detail for id=101
+        mock_get.side_effect = [_statuses_response(), mock_page1, mock_page2, mock_detail]
 
         result, error = MLOwnerService.ml_detail("ML-001", "valid_token")
 
@@ -972,10 +1185,33 @@ class TestMLDetail:
         assert result.get("mining_license_number") == "ML-001"
         assert result.get("royalty") == "1000"
 
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
+    @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
+    @patch('services.mining_owner_service.redmine_client.get')
+    def test_ml_detail_ignores_other_owners_license(self, mock_get, mock_decode_jwt, mock_api_key):
+        mock_api_key.return_value = 'test_api_key'
+        mock_decode_jwt.return_value = {"success": True, "user_id": 123}
+
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = {
+            "issues": [{
+                "id": 55,
+                "assigned_to": {"id": 999},
+                "status": {"id": 7},
+                "custom_fields": [{"id": 101, "value": "LLL/100/55"}]
+            }]
+        }
+        mock_get.return_value = mock_response
+
+        result, error = MLOwnerService.ml_detail("lll/100/55", "valid_token")
+        assert result is None
+        assert "No mining license found" in error
 
 
 
-    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     def test_ml_detail_exception_handling(self, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
@@ -989,7 +1225,7 @@ class TestUserDetail:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_user_detail_success(self, mock_get, mock_api_key):
         # Setup mocks
         mock_api_key.return_value = 'test_api_key'
@@ -1046,7 +1282,7 @@ class TestUserDetail:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_user_detail_api_failure(self, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
@@ -1061,7 +1297,7 @@ class TestUserDetail:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_user_detail_invalid_response(self, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
@@ -1076,7 +1312,7 @@ class TestUserDetail:
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_user_detail_partial_data(self, mock_get, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         
@@ -1103,7 +1339,7 @@ class TestViewTpls:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_view_tpls_success(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         # Setup mocks
         mock_api_key.return_value = 'test_api_key'
@@ -1146,7 +1382,7 @@ class TestViewTpls:
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_view_tpls_expired_status(self, mock_get, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_api_key'
         mock_user_info.return_value = {"success": True, "user_id": 123}
@@ -1210,7 +1446,7 @@ class TestViewTpls:
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_view_tpls_api_error(self, mock_get,mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_key'
         mock_user_info.return_value = {'success': True, 'user_id': 'user123'}
@@ -1229,7 +1465,7 @@ class TestViewTpls:
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_view_tpls_invalid_json(self, mock_get,mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_key'
         mock_user_info.return_value = {"success": True, "user_id": 'user123'}
@@ -1257,7 +1493,7 @@ class TestViewTpls:
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
     @patch('services.mining_owner_service.LimitUtils.get_limit')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_view_tpls_skip_invalid_issues(self, mock_get, mock_limit, mock_user_info, mock_api_key):
         mock_api_key.return_value = 'test_key'
         mock_user_info.return_value = {"success": True, "user_id": 'user123'}
@@ -1300,8 +1536,8 @@ class TestMLRequest():
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.post')
-    @patch('services.mining_owner_service.requests.put')
+    @patch('services.mining_owner_service.redmine_client.post')
+    @patch('services.mining_owner_service.redmine_client.put')
     def test_ml_request_success(self, mock_put, mock_post, mock_api_key):
         # Setup mocks
         mock_api_key.return_value = 'test_key'
@@ -1358,7 +1594,7 @@ class TestMLRequest():
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.post')
+    @patch('services.mining_owner_service.redmine_client.post')
     def test_ml_request_create_failure(self, mock_post, mock_api_key):
         mock_api_key.return_value = 'test_key'
         mock_response = MagicMock()
@@ -1372,8 +1608,8 @@ class TestMLRequest():
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.post')
-    @patch('services.mining_owner_service.requests.put')
+    @patch('services.mining_owner_service.redmine_client.post')
+    @patch('services.mining_owner_service.redmine_client.put')
     def test_ml_request_update_failure(self, mock_put, mock_post, mock_api_key):
         # Setup create success
         mock_api_key.return_value = 'test_key'
@@ -1394,7 +1630,7 @@ class TestMLRequest():
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.post')
+    @patch('services.mining_owner_service.redmine_client.post')
     def test_ml_request_network_error(self, mock_post, mock_api_key):
         mock_api_key.return_value = 'test_key'
         mock_post.side_effect = requests.exceptions.RequestException("Network error")
@@ -1413,7 +1649,7 @@ class TestMLRequest():
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
-    @patch('services.mining_owner_service.requests.post')
+    @patch('services.mining_owner_service.redmine_client.post')
     def test_ml_request_missing_required_fields(self, mock_post, mock_api_key):
         mock_api_key.return_value = 'test_key'
 
@@ -1434,7 +1670,7 @@ class TestMLRequest():
             "subject": "Minimal Request"
         }
 
-        with patch('services.mining_owner_service.requests.put') as mock_put:
+        with patch('services.mining_owner_service.redmine_client.put') as mock_put:
             mock_put.return_value.status_code = 204
 
             # Pass the required third arg `user_mobile`
@@ -1453,10 +1689,9 @@ class TestGetMiningLicenseRequests():
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     @patch('services.mining_owner_service.MLOwnerService.get_attachment_urls')
-    @patch('services.mining_owner_service.MLOwnerService.get_custom_field_value')
-    def test_successful_request(self, mock_custom_field, mock_attachments, mock_get, mock_decode, mock_api_key):
+    def test_successful_request(self, mock_attachments, mock_get, mock_decode, mock_api_key):
         # Setup mocks
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
@@ -1472,7 +1707,7 @@ class TestGetMiningLicenseRequests():
                 "assigned_to": {"id": 123, "name": "Test User"},
                 "created_on": "2023-01-01T00:00:00Z",
                 "updated_on": "2023-01-02T00:00:00Z",
-                "custom_fields": []
+                "custom_fields": [{"id": 19, "name": "Exploration Licence No", "value": "EL-001"}]
             }]
         }
         
@@ -1490,12 +1725,12 @@ class TestGetMiningLicenseRequests():
         }
         
         # Configure mock side effects
-        mock_get.side_effect = [mock_issues_response, mock_user_response]
+        # Issues and the owner's profile are fetched concurrently, so answer by URL
+        mock_get.side_effect = lambda url, **kwargs: mock_user_response if "/users/" in url else mock_issues_response
         mock_attachments.return_value = {
             "Detailed Mine Restoration Plan": "https://attachment1.url",
             "Payment Receipt": "https://payment.url"
         }
-        mock_custom_field.side_effect = lambda fields, name: f"Mock {name}"
         
         # Call method
         result, error = MLOwnerService.get_mining_license_requests("valid_token")
@@ -1508,7 +1743,8 @@ class TestGetMiningLicenseRequests():
         assert result[0]["status"] == "Pending"
         assert result[0]["assigned_to_details"]["email"] == "test@example.com"
         assert "https://attachment1.url" in result[0]["detailed_mine_restoration_plan"]
-        assert "Mock Exploration Licence No" in result[0]["exploration_licence_no"]
+        assert result[0]["exploration_licence_no"] == "EL-001"
+        assert result[0]["land_name"] is None
 
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     def test_invalid_token(self, mock_api_key):
@@ -1546,7 +1782,7 @@ class TestGetMiningLicenseRequests():
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_redmine_api_error(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
@@ -1565,7 +1801,7 @@ class TestGetMiningLicenseRequests():
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_user_assignment_filter(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
@@ -1589,7 +1825,7 @@ class TestGetMiningLicenseRequests():
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_user_details_failure(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
@@ -1610,7 +1846,8 @@ class TestGetMiningLicenseRequests():
         mock_user_response = MagicMock()
         mock_user_response.status_code = 404
         
-        mock_get.side_effect = [mock_issues_response, mock_user_response]
+        # Issues and the owner's profile are fetched concurrently, so answer by URL
+        mock_get.side_effect = lambda url, **kwargs: mock_user_response if "/users/" in url else mock_issues_response
         
         result, error = MLOwnerService.get_mining_license_requests("valid_token")
         assert error is None
@@ -1619,7 +1856,7 @@ class TestGetMiningLicenseRequests():
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_exception_handling(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
@@ -1630,20 +1867,63 @@ class TestGetMiningLicenseRequests():
         assert result is None
         assert "Server error" in error   
 
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
+    @patch('services.mining_owner_service.redmine_client.get')
+    def test_owner_profile_fetched_once(self, mock_get, mock_decode, mock_api_key):
+        mock_api_key.return_value = 'valid_api_key'
+        mock_decode.return_value = {'success': True, 'user_id': 123}
+
+        mock_issues_response = MagicMock(status_code=200)
+        mock_issues_response.json.return_value = {
+            "issues": [{"id": i, "assigned_to": {"id": 123}, "custom_fields": []} for i in range(3)],
+            "total_count": 3
+        }
+        mock_user_response = MagicMock(status_code=200)
+        mock_user_response.json.return_value = {"user": {"id": 123, "mail": "owner@example.com"}}
+        # Issues and the owner's profile are fetched concurrently, so answer by URL
+        mock_get.side_effect = lambda url, **kwargs: mock_user_response if "/users/" in url else mock_issues_response
+
+        result, error = MLOwnerService.get_mining_license_requests("valid_token")
+        again, _ = MLOwnerService.user_detail(123, "valid_token")
+
+        assert error is None
+        assert [r["assigned_to_details"]["email"] for r in result] == ["owner@example.com"] * 3
+        assert again["mail"] == "owner@example.com"
+        assert mock_get.call_count == 2
+        assert mock_get.call_args_list[0].kwargs["params"]["assigned_to_id"] == 123
+
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token', return_value='valid_api_key')
+    @patch('utils.user_utils.redmine_client.get')
+    def test_cached_profiles_drop_api_keys_and_follow_shared_invalidation(self, mock_get, mock_api_key, tmp_path):
+        from utils.user_generations import UserGenerations
+        mock_get.return_value = MagicMock(status_code=200, json=MagicMock(
+            return_value={"user": {"id": 123, "mail": "owner@example.com", "api_key": "s3cret"}}))
+        generations = UserGenerations(str(tmp_path / "generations"))
+
+        with patch('utils.user_utils.user_generations', generations):
+            first, _ = MLOwnerService.user_detail(123, "valid_token")
+            MLOwnerService.user_detail(123, "valid_token")
+            # Another worker handled a password reset for this user
+            UserGenerations(str(tmp_path / "generations")).bump(123)
+            MLOwnerService.user_detail(123, "valid_token")
+
+        assert first == {"id": 123, "mail": "owner@example.com"}
+        assert mock_get.call_count == 2
+
 
 class TestGetPendingMiningLicenseDetails():
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
-    @patch('services.mining_owner_service.MLOwnerService.get_custom_field_value')
-    def test_successful_request(self, mock_custom_field, mock_get, mock_decode, mock_api_key):
+    @patch('services.mining_owner_service.redmine_client.get')
+    def test_successful_request(self, mock_get, mock_decode, mock_api_key):
         # Setup mocks
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
-
-        mock_custom_field.return_value = "ML-00123"
         
         # Mock Redmine API response
         mock_response = MagicMock()
@@ -1655,7 +1935,7 @@ class TestGetPendingMiningLicenseDetails():
                 "assigned_to": {"id": 123, "name": "Test User"},
                 "created_on": "2023-01-01T00:00:00Z",
                 "updated_on": "2023-01-02T00:00:00Z",
-                "custom_fields": []
+                "custom_fields": [{"id": 101, "name": "Mining License Number", "value": "ML-00123"}]
             }]
         }
         mock_get.return_value = mock_response
@@ -1701,7 +1981,7 @@ class TestGetPendingMiningLicenseDetails():
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_redmine_api_error(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
@@ -1720,13 +2000,10 @@ class TestGetPendingMiningLicenseDetails():
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
-    @patch('services.mining_owner_service.MLOwnerService.get_custom_field_value')
-    def test_user_assignment_filter(self, mock_custom_field, mock_get, mock_decode, mock_api_key):
+    @patch('services.mining_owner_service.redmine_client.get')
+    def test_user_assignment_filter(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
-
-        mock_custom_field.return_value = "ML-001" 
         
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -1738,7 +2015,7 @@ class TestGetPendingMiningLicenseDetails():
                 "status": {"name": "Pending"},
                 "created_on": "2023-01-01T00:00:00Z",
                 "updated_on": "2023-01-02T00:00:00Z",
-                "custom_fields": []
+                "custom_fields": [{"id": 101, "name": "Mining License Number", "value": "ML-001"}]
                 },
                 {
                 "id": 2, 
@@ -1746,7 +2023,7 @@ class TestGetPendingMiningLicenseDetails():
                 "status": {"name": "Pending"},
                 "created_on": "2023-01-03T00:00:00Z",
                 "updated_on": "2023-01-04T00:00:00Z",
-                "custom_fields": []
+                "custom_fields": [{"id": 101, "name": "Mining License Number", "value": "ML-002"}]
                 }
             ]
         }
@@ -1755,22 +2032,97 @@ class TestGetPendingMiningLicenseDetails():
         result, error = MLOwnerService.get_pending_mining_license_details("valid_token")
         assert error is None
         assert len(result) == 1  # Should only include the issue assigned to our user
-        assert result[0]["mining_license_number"] == "ML-001"  # Verify we got the mocked license number
+        assert result[0]["mining_license_number"] == "ML-001"
         assert result[0]["status"] == "Pending"
 
     @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
     @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
     @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
-    @patch('services.mining_owner_service.requests.get')
+    @patch('services.mining_owner_service.redmine_client.get')
     def test_exception_handling(self, mock_get, mock_decode, mock_api_key):
         mock_api_key.return_value = 'valid_api_key'
         mock_decode.return_value = {'success': True, 'user_id': 123}
 
         mock_get.side_effect = Exception("Test exception")
-        
+
         result, error = MLOwnerService.get_pending_mining_license_details("valid_token")
         assert result is None
-        assert "Server error" in error                 
+        assert "Server error" in error
+
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com'})
+    @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
+    @patch('services.mining_owner_service.redmine_client.get')
+    def test_filters_by_assignee_on_redmine(self, mock_get, mock_decode, mock_api_key):
+        mock_api_key.return_value = 'valid_api_key'
+        mock_decode.return_value = {'success': True, 'user_id': 123}
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"issues": [], "total_count": 0}
+        mock_get.return_value = mock_response
+
+        result, error = MLOwnerService.get_pending_mining_license_details("valid_token")
+        assert error is None
+        assert result == []
+        ml_calls = [c for c in mock_get.call_args_list if c.kwargs.get("headers", {}).get("X-Redmine-API-Key") == 'valid_api_key']
+        assert len(ml_calls) == 1
+        assert ml_calls[0].kwargs["params"]["assigned_to_id"] == 123
+        assert ml_calls[0].kwargs["params"]["tracker_id"] == 4
+
+    @patch.dict('os.environ', {'REDMINE_URL': 'https://test.redmine.com', 'REDMINE_ADMIN_API_KEY': 'admin_key'})
+    @patch('services.mining_owner_service.JWTUtils.get_api_key_from_token')
+    @patch('services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id')
+    @patch('services.mining_owner_service.redmine_client.get')
+    def test_meetings_joined_with_one_read_per_tracker(self, mock_get, mock_decode, mock_api_key):
+        mock_api_key.return_value = 'valid_api_key'
+        mock_decode.return_value = {'success': True, 'user_id': 123}
+
+        def license_field(n):
+            return [{"id": 101, "name": "Mining License Number", "value": f"LLL/100/{n}"}]
+
+        mls = [{
+            "id": n,
+            "assigned_to": {"id": 123},
+            "status": {"id": 31 if n % 2 else 34, "name": "Scheduled"},
+            "custom_fields": license_field(n),
+        } for n in range(1, 11)]
+        meetings = {
+            tracker_id: [{
+                "id": 100 + n,
+                "status": {"id": 1},
+                "start_date": f"2025-01-{n:02d}",
+                "updated_on": "2025-01-01T00:00:00Z",
+                "custom_fields": license_field(n) + [
+                    {"id": 200, "name": "GSMB physical meeting location", "value": f"Office {n}"}],
+            } for n in range(1, 11) if (tracker_id == 12) == bool(n % 2)]
+            for tracker_id in (11, 12)
+        }
+        # A newer but closed meeting for license 2; the status list, not status.is_closed, marks it closed
+        meetings[11].append({
+            "id": 150,
+            "status": {"id": 5},
+            "start_date": "2024-12-01",
+            "updated_on": "2025-01-01T00:00:00Z",
+            "custom_fields": license_field(2),
+        })
+
+        def fake_get(url, **kwargs):
+            if url.endswith("/issue_statuses.json"):
+                return _statuses_response()
+            tracker_id = kwargs["params"]["tracker_id"]
+            issues = mls if tracker_id == 4 else meetings[tracker_id]
+            return MagicMock(status_code=200, json=MagicMock(return_value={"issues": issues, "total_count": len(issues)}))
+        mock_get.side_effect = fake_get
+
+        result, error = MLOwnerService.get_pending_mining_license_details("valid_token")
+
+        assert error is None
+        assert [r["start_date"] for r in result] == [f"2025-01-{n:02d}" for n in range(1, 11)]
+        assert result[1]["GSMB_physical_meetinglocation"] == "Office 2"
+        assert "GSMB_physical_meetinglocation" not in result[0]
+        tracker_reads = [c.kwargs["params"]["tracker_id"] for c in mock_get.call_args_list if "params" in c.kwargs]
+        assert sorted(tracker_reads) == [4, 11, 12]
 
 import os
 import pytest
@@ -1781,7 +2133,7 @@ class TestGetMiningLicenseById:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
     @patch("services.mining_owner_service.MLOwnerService.get_attachment_urls")
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_successful_response(self, mock_get_api_key, mock_requests_get, mock_get_attachments):
         # Setup
@@ -1837,7 +2189,7 @@ class TestGetMiningLicenseById:
             assert error == "REDMINE_URL environment variable not set"
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_redmine_http_error(self, mock_get_api_key, mock_requests_get):
         mock_get_api_key.return_value = "valid_api_key"
@@ -1852,7 +2204,7 @@ class TestGetMiningLicenseById:
         assert "404" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_no_issue_data(self, mock_get_api_key, mock_requests_get):
         mock_get_api_key.return_value = "valid_api_key"
@@ -1866,7 +2218,7 @@ class TestGetMiningLicenseById:
         assert error == "Issue data not found"
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_exception_handling(self, mock_get_api_key, mock_requests_get):
         mock_get_api_key.return_value = "valid_api_key"
@@ -1877,25 +2229,81 @@ class TestGetMiningLicenseById:
         assert "Server error" in error
         assert "Simulated Failure" in error
 
+class TestGetAttachmentUrls:
+
+    @patch("services.mining_owner_service.redmine_client.get")
+    def test_shared_ids_are_fetched_once_and_cached(self, mock_get):
+        def fake_get(url, **kwargs):
+            attachment_id = url.rsplit("/", 1)[1].split(".")[0]
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"attachment": {"content_url": f"https://files/{attachment_id}"}}
+            return response
+        mock_get.side_effect = fake_get
+
+        custom_fields = [
+            {"name": "Payment Receipt", "value": "11"},
+            {"name": "Deed and Survey Plan", "value": "12"},
+            {"name": "Economic Viability Report", "value": "11"},
+            {"name": "Capacity", "value": "500"},
+        ]
+
+        urls = MLOwnerService.get_attachment_urls("key", "https://redmine", custom_fields)
+        again = MLOwnerService.get_attachment_urls("key", "https://redmine", custom_fields)
+
+        assert urls == again == {
+            "Payment Receipt": "https://files/11",
+            "Deed and Survey Plan": "https://files/12",
+            "Economic Viability Report": "https://files/11",
+        }
+        assert mock_get.call_count == 2
+
+    @patch("services.mining_owner_service.redmine_client.get")
+    def test_cached_urls_are_not_shared_between_keys(self, mock_get):
+        def fake_get(url, headers=None, **kwargs):
+            if headers["X-Redmine-API-Key"] != "owner-key":
+                return MagicMock(status_code=403)
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"attachment": {"content_url": "https://files/11"}}
+            return response
+        mock_get.side_effect = fake_get
+        custom_fields = [{"name": "Payment Receipt", "value": "11"}]
+
+        owner = MLOwnerService.get_attachment_urls("owner-key", "https://redmine", custom_fields)
+        other = MLOwnerService.get_attachment_urls("other-key", "https://redmine", custom_fields)
+
+        assert owner == {"Payment Receipt": "https://files/11"}
+        assert other == {}
+        assert mock_get.call_count == 2
+
+    @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
+    @patch("services.mining_owner_service.redmine_client.get")
+    @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token", return_value="key")
+    def test_included_attachments_need_no_lookup(self, mock_get_api_key, mock_get):
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = {"issue": {
+            "id": 101,
+            "custom_fields": [{"name": "Payment Receipt", "value": "11"}],
+            "attachments": [{"id": 11, "content_url": "https://files/receipt.pdf"}],
+        }}
+        mock_get.return_value = mock_response
+
+        result, error = MLOwnerService.get_mining_license_by_id("token", 101)
+
+        assert error is None
+        assert result["payment_receipt"] == "https://files/receipt.pdf"
+        mock_get.assert_called_once()
+
+
 class TestGetMiningLicenseSummary:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.MLOwnerService.get_custom_field_value")
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
-    def test_successful_summary(self, mock_get_api_key, mock_decode, mock_requests_get, mock_get_field):
+    def test_successful_summary(self, mock_get_api_key, mock_decode, mock_requests_get):
         mock_get_api_key.return_value = "valid_key"
         mock_decode.return_value = {"user_id": 123}
 
-        # Mock custom field extraction
-        def side_effect(fields, field_name):
-            return {
-                "Mobile Number": "0771234567",
-                "Administrative District": "Colombo"
-            }.get(field_name, None)
-        mock_get_field.side_effect = side_effect
-
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
@@ -1904,7 +2312,10 @@ class TestGetMiningLicenseSummary:
                     "id": 1,
                     "subject": "ML License A",
                     "assigned_to": {"id": 123, "name": "User A"},
-                    "custom_fields": [],
+                    "custom_fields": [
+                        {"id": 66, "name": "Mobile Number", "value": "0771234567"},
+                        {"id": 31, "name": "Administrative District", "value": "Colombo"}
+                    ],
                     "created_on": "2023-01-01T00:00:00Z",
                     "status": {"name": "In Progress"}
                 },
@@ -1955,7 +2366,7 @@ class TestGetMiningLicenseSummary:
             assert "Environment variable 'REDMINE_URL'" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_redmine_api_failure(self, mock_get_api_key, mock_decode, mock_requests_get):
@@ -1973,7 +2384,7 @@ class TestGetMiningLicenseSummary:
         assert "500" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.decode_jwt_and_get_user_id")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_exception_handling(self, mock_get_api_key, mock_decode, mock_requests_get):
@@ -1990,8 +2401,8 @@ class TestGetMiningLicenseSummary:
 class TestUpdateRoyaltyField:
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.put")
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.put")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_successful_update(self, mock_api_key, mock_get, mock_put):
         mock_api_key.return_value = "valid_api_key"
@@ -2034,7 +2445,7 @@ class TestUpdateRoyaltyField:
             assert "REDMINE_URL" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_failed_get_request(self, mock_api_key, mock_get):
         mock_api_key.return_value = "valid_key"
@@ -2050,8 +2461,8 @@ class TestUpdateRoyaltyField:
         assert "404" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.put")
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.put")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_failed_put_request(self, mock_api_key, mock_get, mock_put):
         mock_api_key.return_value = "valid_key"
@@ -2076,8 +2487,8 @@ class TestUpdateRoyaltyField:
         assert "400" in error
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.put")
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.put")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_non_integer_existing_royalty(self, mock_api_key, mock_get, mock_put):
         mock_api_key.return_value = "valid_key"
@@ -2100,7 +2511,7 @@ class TestUpdateRoyaltyField:
         assert error is None
 
     @patch.dict(os.environ, {"REDMINE_URL": "https://test.redmine.com"})
-    @patch("services.mining_owner_service.requests.get")
+    @patch("services.mining_owner_service.redmine_client.get")
     @patch("services.mining_owner_service.JWTUtils.get_api_key_from_token")
     def test_exception_handling(self, mock_api_key, mock_get):
         mock_api_key.return_value = "valid_key"
@@ -12,7 +12,7 @@ def set_env(monkeypatch):
 
 
 @patch('services.police_officer_service.JWTUtils.get_api_key_from_token')
-@patch('services.police_officer_service.requests.get')
+@patch('services.police_officer_service.redmine_client.get')
 def test_check_lorry_number_success_valid_license(mock_get, mock_get_api_key):
     mock_get_api_key.return_value = 'mock_api_key'
 
@@ -88,7 +88,7 @@ def test_check_lorry_number_missing_redmine_url_or_api_key(mock_get_api_key, mon
 
 
 @patch('services.police_officer_service.JWTUtils.get_api_key_from_token')
-@patch('services.police_officer_service.requests.get')
+@patch('services.police_officer_service.redmine_client.get')
 def test_check_lorry_number_tpl_issues_fetch_fail(mock_get, mock_get_api_key):
     mock_get_api_key.return_value = "mock_api_key"
     mock_get.return_value = MagicMock(status_code=500, text="Server Error")
@@ -98,7 +98,7 @@ def test_check_lorry_number_tpl_issues_fetch_fail(mock_get, mock_get_api_key):
 
 
 @patch('services.police_officer_service.JWTUtils.get_api_key_from_token')
-@patch('services.police_officer_service.requests.get')
+@patch('services.police_officer_service.redmine_client.get')
 def test_check_lorry_number_no_valid_tpl_license(mock_get, mock_get_api_key):
     mock_get_api_key.return_value = "mock_api_key"
     # Issues that either do not match or expired
@@ -124,7 +124,7 @@ def test_check_lorry_number_no_valid_tpl_license(mock_get, mock_get_api_key):
 
 @patch('services.police_officer_service.UserUtils.get_user_phone')
 @patch('services.police_officer_service.JWTUtils.get_api_key_from_token')
-@patch('services.police_officer_service.requests.post')
+@patch('services.police_officer_service.redmine_client.post')
 def test_create_complaint_success(mock_post, mock_get_api_key, mock_get_user_phone):
     mock_get_api_key.return_value = "mock_api_key"
     mock_get_user_phone.return_value = "0712345678"
@@ -143,7 +143,7 @@ def test_create_complaint_success(mock_post, mock_get_api_key, mock_get_user_pho
 
 @patch('services.police_officer_service.UserUtils.get_user_phone')
 @patch('services.police_officer_service.JWTUtils.get_api_key_from_token')
-@patch('services.police_officer_service.requests.post')
+@patch('services.police_officer_service.redmine_client.post')
 def test_create_complaint_failure(mock_post, mock_get_api_key, mock_get_user_phone):
     mock_get_api_key.return_value = "mock_api_key"
     mock_get_user_phone.return_value = "0712345678"
@@ -154,3 +154,146 @@ def test_create_complaint_failure(mock_post, mock_get_api_key, mock_get_user_pho
 
     assert success is False
     assert error_msg == "Failed to create complaint"
+
+
+def _index_get(*pages):
+    """``redmine_client.get`` for an index sync: the status list, then one issues page per sync."""
+    statuses = {"issue_statuses": [{"id": 1, "name": "New"}, {"id": 5, "name": "Closed", "is_closed": True}]}
+    pages = iter(pages)
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/issue_statuses.json"):
+            return MagicMock(status_code=200, json=lambda: statuses)
+        page = next(pages)
+        return MagicMock(status_code=200, json=lambda: page)
+    return fake_get
+
+
+def _tpl(issue_id, lorry, updated_on, status_id=1, created=None):
+    created = created or (datetime.now(timezone.utc) - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {"id": issue_id, "created_on": created, "estimated_hours": 5, "updated_on": updated_on,
+            "status": {"id": status_id, "name": "Closed" if status_id == 5 else "New"},
+            "custom_fields": [{"id": 53, "value": lorry}]}
+
+
+def test_tpl_index_incremental_sync_and_normalized_lookup(monkeypatch):
+    from utils.tpl_index import TplIndex
+
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "admin_key")
+    pages = [
+        {"issues": [_tpl(1, "WP CAB-1234", "2025-01-01T00:00:00Z"), _tpl(2, "NC-9999", "2025-01-02T00:00:00Z")],
+         "total_count": 2},
+        {"issues": [_tpl(2, "SP-0001", "2025-01-03T00:00:00Z")], "total_count": 1},
+    ]
+    index = TplIndex(refresh_interval=0)
+
+    with patch('utils.issue_index.redmine_client.get', side_effect=_index_get(*pages)) as mock_get:
+        assert index.ensure_fresh() is None
+        assert index.lookup("wpcab1234")[0].issue["id"] == 1
+        assert index.lookup("nc9999")[0].issue["id"] == 2
+
+        assert index.ensure_fresh() is None
+        assert mock_get.call_args.kwargs["params"]["updated_on"] == ">=2025-01-02T00:00:00Z"
+        assert mock_get.call_args.kwargs["params"]["sort"] == "id"
+        assert index.lookup("nc9999") == []
+        assert index.lookup("sp0001")[0].issue["id"] == 2
+
+    # The status list is read on the full sync only; the incremental one reuses it.
+    status_reads = [c for c in mock_get.call_args_list if c.args[0].endswith("/issue_statuses.json")]
+    assert len(status_reads) == 1
+
+
+def test_tpl_index_drops_tpls_moved_to_a_closed_status(monkeypatch):
+    from utils.tpl_index import TplIndex
+
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "admin_key")
+    # Issue JSON from Redmine before 5.1 has no status.is_closed; the status list decides.
+    pages = [
+        {"issues": [_tpl(1, "WP CAB-1234", "2025-01-01T00:00:00Z"), _tpl(2, "WP CAB-1234", "2025-01-02T00:00:00Z"),
+                    _tpl(3, "NC-9999", "2025-01-02T00:00:00Z", status_id=5)], "total_count": 3},
+        {"issues": [_tpl(2, "WP CAB-1234", "2025-01-04T00:00:00Z", status_id=5)], "total_count": 1},
+    ]
+    index = TplIndex(refresh_interval=0)
+
+    with patch('utils.issue_index.redmine_client.get', side_effect=_index_get(*pages)):
+        assert index.ensure_fresh() is None
+        assert [e.issue["id"] for e in index.lookup("wpcab1234")] == [2, 1]
+        assert index.lookup("nc9999") == []
+
+        assert index.ensure_fresh() is None
+        assert [e.issue["id"] for e in index.lookup("wpcab1234")] == [1]
+
+
+@patch('services.police_officer_service.REDMINE_URL', REDMINE_URL)
+@patch('services.police_officer_service.JWTUtils.get_api_key_from_token', return_value="officer_key")
+def test_check_lorry_number_only_returns_tpls_the_officer_can_read(mock_get_api_key, monkeypatch):
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "admin_key")
+    hidden = _tpl(2, "ABC123", "2025-01-02T00:00:00Z")
+    visible = _tpl(1, "ABC123", "2025-01-01T00:00:00Z")
+    visible["custom_fields"].append({"id": 58, "value": "4"})
+    index_get = _index_get({"issues": [visible, hidden], "total_count": 2})
+
+    def fake_get(url, **kwargs):
+        if url == f"{REDMINE_URL}/issues/2.json":
+            return MagicMock(status_code=403, text="Forbidden")
+        if url == f"{REDMINE_URL}/issues/1.json":
+            return MagicMock(status_code=200, json=lambda: {"issue": visible})
+        return index_get(url, **kwargs)
+
+    with patch('utils.redmine_client.get', side_effect=fake_get) as mock_get:
+        result, error = PoliceOfficerService.check_lorry_number("ABC 123", "mock_token")
+
+    assert error is None
+    assert result["Cubes"] == "4"
+    assert result["IsValid"] is True
+    reads = {c.args[0]: c.kwargs["headers"] for c in mock_get.call_args_list if "/issues/" in c.args[0]}
+    assert reads == {f"{REDMINE_URL}/issues/2.json": {"X-Redmine-API-Key": "officer_key"},
+                     f"{REDMINE_URL}/issues/1.json": {"X-Redmine-API-Key": "officer_key"}}
+
+
+@patch('services.police_officer_service.REDMINE_URL', REDMINE_URL)
+@patch('services.police_officer_service.JWTUtils.get_api_key_from_token', return_value="officer_key")
+def test_check_lorry_number_hides_tpls_outside_the_officers_visibility(mock_get_api_key, monkeypatch):
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "admin_key")
+    index_get = _index_get({"issues": [_tpl(1, "ABC123", "2025-01-01T00:00:00Z")], "total_count": 1})
+
+    def fake_get(url, **kwargs):
+        if url == f"{REDMINE_URL}/issues/1.json":
+            return MagicMock(status_code=404, text="Not Found")
+        return index_get(url, **kwargs)
+
+    with patch('utils.redmine_client.get', side_effect=fake_get):
+        result, error = PoliceOfficerService.check_lorry_number("ABC123", "mock_token")
+
+    assert result is None
+    assert error == "No valid (non-expired) TPL with this lorry number"
+
+
+@patch('services.police_officer_service.REDMINE_URL', REDMINE_URL)
+def test_license_data_is_read_with_the_officers_key(monkeypatch):
+    monkeypatch.setenv("REDMINE_URL", REDMINE_URL)
+    monkeypatch.setenv("REDMINE_ADMIN_API_KEY", "admin_key")
+    ml = {"id": 109, "assigned_to": {"name": "Owner A"}, "start_date": "2023-01-01", "status": {"id": 1},
+          "custom_fields": [{"id": 101, "value": "LLL/100/109"}, {"id": 66, "value": "0712345678"}]}
+    statuses = {"issue_statuses": [{"id": 5, "is_closed": True}]}
+    officer_can_read = {"ml": True}
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/issue_statuses.json"):
+            return MagicMock(status_code=200, json=lambda: statuses)
+        if url == f"{REDMINE_URL}/issues/109.json":
+            assert kwargs["headers"] == {"X-Redmine-API-Key": "officer_key"}
+            if not officer_can_read["ml"]:
+                return MagicMock(status_code=403, text="Forbidden")
+            return MagicMock(status_code=200, json=lambda: {"issue": ml})
+        return MagicMock(status_code=200, json=lambda: {"issues": [ml], "total_count": 1})
+
+    headers = {"X-Redmine-API-Key": "officer_key"}
+    with patch('utils.redmine_client.get', side_effect=fake_get):
+        data = PoliceOfficerService._get_mining_license_data("LLL/100/109", headers)
+        officer_can_read["ml"] = False
+        hidden = PoliceOfficerService._get_mining_license_data("LLL/100/109", headers)
+
+    assert data["owner"] == "Owner A"
+    assert data["License Owner Contact Number"] == "0712345678"
+    assert hidden is None
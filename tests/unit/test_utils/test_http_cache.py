@@ -0,0 +1,119 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from utils import redmine_client
+from utils.http_cache import ConditionalCache
+
+USER_URL = "https://fake-redmine/users/42.json"
+ISSUE_URL = "https://fake-redmine/issues/7.json"
+ISSUES_URL = "https://fake-redmine/issues.json"
+HEADERS = {"X-Redmine-API-Key": "officer-key"}
+BODY = b'{"user": {"id": 42, "firstname": "Nimal"}}'
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    cache = ConditionalCache(str(tmp_path / "http"), memory_size=2)
+    with patch("utils.redmine_client.redmine_http_cache", cache):
+        yield cache
+
+
+def _response(status_code, body=b"", etag=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = body
+    response.headers = CaseInsensitiveDict({"ETag": etag, "Content-Type": "application/json"} if etag else {})
+    return response
+
+
+def _session(*responses):
+    session = MagicMock()
+    session.request.side_effect = list(responses)
+    return session
+
+
+def _sent_etag(call):
+    return (call.kwargs.get("headers") or {}).get("If-None-Match")
+
+
+def test_unchanged_resource_is_replayed_from_a_304(http_cache):
+    session = _session(_response(200, BODY, etag='W/"v1"'), _response(304))
+    with patch("utils.redmine_client.get_session", return_value=session):
+        first = redmine_client.get(USER_URL, headers=HEADERS)
+        second = redmine_client.get(USER_URL, headers=HEADERS)
+
+    first_call, second_call = session.request.call_args_list
+    assert _sent_etag(first_call) is None
+    assert _sent_etag(second_call) == 'W/"v1"'
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.json() == {"user": {"id": 42, "firstname": "Nimal"}}
+    assert HEADERS == {"X-Redmine-API-Key": "officer-key"}
+
+
+def test_changed_resource_replaces_the_cached_body(http_cache):
+    session = _session(
+        _response(200, BODY, etag='"v1"'),
+        _response(200, b'{"user": {"id": 42}}', etag='"v2"'),
+        _response(304),
+    )
+    with patch("utils.redmine_client.get_session", return_value=session):
+        redmine_client.get(USER_URL, headers=HEADERS)
+        redmine_client.get(USER_URL, headers=HEADERS)
+        third = redmine_client.get(USER_URL, headers=HEADERS)
+
+    assert _sent_etag(session.request.call_args_list[2]) == '"v2"'
+    assert third.json() == {"user": {"id": 42}}
+
+
+def test_entries_survive_memory_eviction_on_disk(http_cache):
+    session = _session(_response(200, BODY, etag='"v1"'), _response(304))
+    with patch("utils.redmine_client.get_session", return_value=session):
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        http_cache._memory.clear()
+        replayed = redmine_client.get(ISSUE_URL, headers=HEADERS)
+
+    assert replayed.content == BODY
+
+
+def test_cache_is_keyed_by_api_key(http_cache):
+    session = _session(_response(200, BODY, etag='"v1"'), _response(200, BODY, etag='"v1"'))
+    with patch("utils.redmine_client.get_session", return_value=session):
+        redmine_client.get(USER_URL, headers=HEADERS)
+        redmine_client.get(USER_URL, headers={"X-Redmine-API-Key": "other-key"})
+
+    assert _sent_etag(session.request.call_args_list[1]) is None
+
+
+def test_oversized_bodies_and_collections_are_not_kept(http_cache):
+    http_cache.max_body = 8
+    session = _session(
+        _response(200, BODY, etag='"v1"'), _response(200, BODY, etag='"v1"'),
+        _response(200, b'{"issues": []}', etag='"l1"'), _response(200, b'{"issues": []}', etag='"l1"'),
+    )
+    with patch("utils.redmine_client.get_session", return_value=session):
+        for url in (USER_URL, USER_URL, ISSUES_URL, ISSUES_URL):
+            redmine_client.get(url, headers=HEADERS)
+
+    assert [_sent_etag(c) for c in session.request.call_args_list] == [None] * 4
+
+
+def test_user_records_with_api_keys_never_reach_the_disk(http_cache):
+    body = b'{"user": {"id": 42, "api_key": "s3cret-redmine-key"}}'
+    session = _session(
+        _response(200, body, etag='"u1"'),
+        _response(200, b'{"issue": {"id": 7}}', etag='"i1"'),
+        _response(304),
+    )
+    with patch("utils.redmine_client.get_session", return_value=session):
+        redmine_client.get(USER_URL, headers={"X-Redmine-API-Key": "admin-key"})
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        replayed = redmine_client.get(USER_URL, headers={"X-Redmine-API-Key": "admin-key"})
+
+    disk = http_cache._store()
+    stored = [disk[key] for key in disk.iterkeys()]
+    assert len(stored) == 1
+    assert all(b"s3cret-redmine-key" not in entry[1] for entry in stored)
+    assert replayed.content == body
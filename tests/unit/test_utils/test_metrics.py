@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utils import redmine_client
+from utils.upstream_metrics import path_template, upstream_metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_upstream_metrics():
+    upstream_metrics.clear()
+    yield
+
+
+def _session_returning(body=b'{"user": {}}', status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = body
+    session = MagicMock()
+    session.request.return_value = response
+    return session
+
+
+def _ready_after_two_calls():
+    redmine_client.get("https://fake-redmine/users/42.json")
+    redmine_client.gather(
+        lambda: redmine_client.get("https://fake-redmine/issues/7.json"),
+        lambda: redmine_client.get("https://fake-redmine/issues/8.json"),
+    )
+    return True, None
+
+
+def test_server_timing_counts_upstream_calls(client):
+    with patch('utils.redmine_client.get_session', return_value=_session_returning()), \
+         patch('services.auth_service.AuthService.check_readiness', side_effect=_ready_after_two_calls):
+        response = client.get('/auth/ready')
+
+    assert response.status_code == 200
+    assert 'redmine;dur=' in response.headers['Server-Timing']
+    assert 'desc="3 calls, 36 bytes"' in response.headers['Server-Timing']
+
+
+def test_metrics_split_by_endpoint_and_path_template(app, client):
+    app.config['METRICS_TOKEN'] = 'scrape-token'
+    with patch('utils.redmine_client.get_session', return_value=_session_returning()), \
+         patch('services.auth_service.AuthService.check_readiness', side_effect=_ready_after_two_calls):
+        client.get('/auth/ready')
+
+    body = client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'}).get_data(as_text=True)
+    assert 'mmpro_upstream_requests_total{endpoint="/auth/ready",method="GET",path="/issues/:id.json"} 2' in body
+    assert 'mmpro_upstream_requests_total{endpoint="/auth/ready",method="GET",path="/users/:id.json"} 1' in body
+    assert 'mmpro_http_upstream_calls_total{endpoint="/auth/ready"} 3' in body
+
+
+def test_metrics_need_the_configured_token(app, client):
+    app.config['METRICS_TOKEN'] = ''
+    assert client.get('/metrics').status_code == 404
+
+    app.config['METRICS_TOKEN'] = 'scrape-token'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+
+
+def test_metrics_are_summed_over_workers_sharing_a_directory(tmp_path):
+    from utils.upstream_metrics import UpstreamMetrics
+    workers = [UpstreamMetrics(str(tmp_path / "metrics"), flush_interval=60) for _ in range(2)]
+    for worker in workers:
+        worker.record_call("/auth/ready", "GET", "/users/:id.json", 0.5, 10, failed=False)
+    workers[1].record_call("/auth/ready", "GET", "/users/:id.json", 0.5, 10, failed=True)
+    workers[1].flush()
+
+    body = workers[0].render()
+    assert 'mmpro_upstream_requests_total{endpoint="/auth/ready",method="GET",path="/users/:id.json"} 3' in body
+    assert 'mmpro_upstream_errors_total{endpoint="/auth/ready",method="GET",path="/users/:id.json"} 1' in body
+
+    # A recycled worker starts from empty memory; the shared totals do not reset.
+    recycled = UpstreamMetrics(str(tmp_path / "metrics"))
+    assert 'path="/users/:id.json"} 3' in recycled.render()
+
+
+def test_path_template_folds_ids_and_download_names():
+    assert path_template("https://fake-redmine/issues/12.json?include=attachments") == "/issues/:id.json"
+    assert path_template("https://fake-redmine/attachments/download/5/deed.pdf") == "/attachments/download/:id/:filename"
+    assert path_template("https://fake-redmine/projects/mmpro-gsmb/issues.json") == "/projects/mmpro-gsmb/issues.json"
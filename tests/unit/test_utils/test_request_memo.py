@@ -0,0 +1,104 @@
+from unittest.mock import MagicMock, patch
+
+from utils import redmine_client
+
+ISSUE_URL = "https://fake-redmine/issues/7.json"
+ISSUES_URL = "https://fake-redmine/issues.json"
+USER_URL = "https://fake-redmine/users/42.json"
+HEADERS = {"X-Redmine-API-Key": "owner-key"}
+
+
+def _session_returning(status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = b'{}'
+    session = MagicMock()
+    session.request.return_value = response
+    return session
+
+
+def _fetched(session):
+    return [(c.args[0], c.args[1]) for c in session.request.call_args_list]
+
+
+def _serve(client, session, view):
+    with patch('utils.redmine_client.get_session', return_value=session), \
+         patch('services.auth_service.AuthService.check_readiness', side_effect=view):
+        return client.get('/auth/ready')
+
+
+def test_repeated_gets_in_one_request_reach_redmine_once(client):
+    def view():
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        redmine_client.gather(
+            lambda: redmine_client.get(ISSUE_URL, headers=HEADERS),
+            lambda: redmine_client.get(USER_URL, headers=HEADERS),
+        )
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        return True, None
+
+    session = _session_returning()
+    assert _serve(client, session, view).status_code == 200
+    assert sorted(_fetched(session)) == [("GET", ISSUE_URL), ("GET", USER_URL)]
+
+
+def test_memo_does_not_outlive_the_request(client):
+    def view():
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        return True, None
+
+    session = _session_returning()
+    _serve(client, session, view)
+    _serve(client, session, view)
+    assert _fetched(session) == [("GET", ISSUE_URL)] * 2
+
+
+def test_write_forgets_gets_of_the_same_resource(client):
+    def view():
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        redmine_client.get(ISSUES_URL, params={"tracker_id": 4}, headers=HEADERS)
+        redmine_client.get(USER_URL, headers=HEADERS)
+        redmine_client.put(ISSUE_URL, json={"issue": {}}, headers=HEADERS)
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        redmine_client.get(ISSUES_URL, params={"tracker_id": 4}, headers=HEADERS)
+        redmine_client.get(USER_URL, headers=HEADERS)
+        return True, None
+
+    session = _session_returning()
+    _serve(client, session, view)
+    assert _fetched(session) == [
+        ("GET", ISSUE_URL), ("GET", ISSUES_URL), ("GET", USER_URL),
+        ("PUT", ISSUE_URL),
+        ("GET", ISSUE_URL), ("GET", ISSUES_URL),
+    ]
+
+
+def test_memo_is_keyed_by_params_and_api_key(client):
+    def view():
+        redmine_client.get(ISSUES_URL, params={"tracker_id": 4}, headers=HEADERS)
+        redmine_client.get(ISSUES_URL, params={"tracker_id": 5}, headers=HEADERS)
+        redmine_client.get(ISSUES_URL, params={"tracker_id": 4}, headers={"X-Redmine-API-Key": "admin-key"})
+        return True, None
+
+    session = _session_returning()
+    _serve(client, session, view)
+    assert len(session.request.call_args_list) == 3
+
+
+def test_failed_gets_are_not_memoized(client):
+    def view():
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        return True, None
+
+    session = _session_returning(status_code=503)
+    _serve(client, session, view)
+    assert len(session.request.call_args_list) == 2
+
+
+def test_calls_outside_a_request_are_not_memoized():
+    session = _session_returning()
+    with patch('utils.redmine_client.get_session', return_value=session):
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+        redmine_client.get(ISSUE_URL, headers=HEADERS)
+    assert len(session.request.call_args_list) == 2
@@ -0,0 +1,67 @@
+import hashlib
+
+from config import Config
+from utils import redmine_client
+from utils.constants import CONTENT_TYPE_JSON
+from utils.ttl_cache import TTLCache
+
+# Attachments never change once uploaded, so their content_url can be kept for a long time.
+# Entries are filed under a digest of the API key that read them, so one user's
+# lookups are never served to another.
+_content_urls = TTLCache(maxsize=Config.ATTACHMENT_CACHE_SIZE, ttl=Config.ATTACHMENT_CACHE_TTL)
+
+
+def attachment_id_of(value):
+    """Return the attachment id held in a file custom field value, or None."""
+    value = str(value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def _key(api_key, attachment_id):
+    return hashlib.sha256(str(api_key).encode()).hexdigest(), attachment_id
+
+
+def remember_issue_attachments(api_key, issue):
+    """Cache the content_url of every attachment on an issue fetched with ``include=attachments``."""
+    for attachment in issue.get("attachments") or []:
+        if attachment.get("id") is not None and attachment.get("content_url"):
+            _content_urls.set(_key(api_key, int(attachment["id"])), attachment["content_url"])
+
+
+def resolve_content_urls(redmine_url, api_key, attachment_ids):
+    """Map attachment ids to their content_url.
+
+    Ids are de-duplicated, cached ones are answered locally and the rest
+    are fetched concurrently. Ids Redmine cannot resolve are left out.
+    """
+    wanted = {attachment_id_of(i) for i in attachment_ids} - {None}
+    urls = {}
+    missing = []
+    for attachment_id in wanted:
+        content_url = _content_urls.get(_key(api_key, attachment_id))
+        if content_url:
+            urls[attachment_id] = content_url
+        else:
+            missing.append(attachment_id)
+    if not missing:
+        return urls
+
+    headers = {"X-Redmine-API-Key": api_key, "Content-Type": CONTENT_TYPE_JSON}
+
+    def fetch(attachment_id):
+        response = redmine_client.get(f"{redmine_url}/attachments/{attachment_id}.json", headers=headers)
+        if response.status_code != 200:
+            return attachment_id, None
+        return attachment_id, response.json().get("attachment", {}).get("content_url")
+
+    results = redmine_client.gather(*(lambda i=i: fetch(i) for i in missing))
+
+    for attachment_id, content_url in results:
+        if content_url:
+            _content_urls.set(_key(api_key, attachment_id), content_url)
+            urls[attachment_id] = content_url
+    return urls
+
+
+def clear_attachment_cache():
+    _content_urls.clear()
@@ -0,0 +1,34 @@
+from functools import wraps
+
+from config import Config
+from utils.jwt_utils import JWTUtils
+from utils.ttl_cache import StaleWhileRevalidateCache
+
+_dashboard_cache = StaleWhileRevalidateCache(
+    maxsize=Config.DASHBOARD_CACHE_SIZE,
+    ttl=Config.DASHBOARD_CACHE_TTL,
+    stale_ttl=Config.DASHBOARD_CACHE_STALE_TTL,
+)
+
+
+def dashboard_cached(func):
+    """Cache a ``(data, error)`` service result per endpoint and Redmine role.
+
+    Only successful results are stored. Tokens without a readable role bypass
+    the cache, so callers never share data across an unknown scope.
+    """
+    @wraps(func)
+    def wrapper(token):
+        role = JWTUtils.get_role_from_token(token)
+        if not role:
+            return func(token)
+        return _dashboard_cache.get_or_load(
+            (func.__name__, role),
+            lambda: func(token),
+            should_cache=lambda result: result[1] is None,
+        )
+    return wrapper
+
+
+def clear_dashboard_cache():
+    _dashboard_cache.clear()
@@ -0,0 +1,159 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+from diskcache import Cache
+
+logger = logging.getLogger(__name__)
+
+
+class DeferredQueue:
+    """Disk-backed FIFO of jobs worked off by a background thread, with per-job status.
+
+    Jobs and their status live in a diskcache directory, so queued work
+    survives restarts and any worker process sharing the directory can pick
+    it up. ``handler(payload)`` returns the job result or raises; failures
+    are retried ``retry_delay`` seconds later until ``max_attempts`` is hit,
+    after which ``on_failure(payload, error)`` is called so the job's owner
+    can record it somewhere people look.
+    A job left ``running`` by a process that died (a crash, or gunicorn
+    recycling the worker) is re-queued once its ``lease_seconds`` run out;
+    every worker looks for such jobs each ``recover_interval`` seconds.
+    Moving a job between the queue and its status record happens inside one
+    diskcache transaction, so a crash never leaves it in neither.
+    """
+
+    def __init__(self, directory, name, handler, max_attempts=5, retry_delay=30,
+                 lease_seconds=300, poll_interval=1.0, status_ttl=7 * 86400, on_failure=None,
+                 recover_interval=60):
+        self.directory = directory
+        self.name = name
+        self.handler = handler
+        self.on_failure = on_failure
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.recover_interval = recover_interval
+        self.status_ttl = status_ttl
+        self._cache = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._stop = threading.Event()
+
+    def enqueue(self, job_id, payload):
+        """Queue ``payload`` under ``job_id`` and return its initial status."""
+        job = {"job_id": job_id, "payload": payload, "attempts": 0, "not_before": 0}
+        with self._store().transact():
+            status = self._set_status(job_id, "pending", attempts=0, job=job)
+            self._store().push(job, prefix=self.name)
+        return status
+
+    def status(self, job_id):
+        """Latest status record for ``job_id`` (``status``, ``attempts``, ``result``/``error``, ``job``), or None."""
+        return self._store().get(self._status_key(job_id))
+
+    def start(self):
+        """Start the worker thread for this process (no-op if already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._thread_pid == os.getpid():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-worker", daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        """Process at most one due job; returns True if one was handled."""
+        store = self._store()
+        with store.transact():
+            _, job = store.pull(prefix=self.name)
+            if job is None:
+                return False
+            if job["not_before"] > time.time():
+                store.push(job, prefix=self.name)
+                return False
+
+            job_id = job["job_id"]
+            job["attempts"] += 1
+            self._set_status(job_id, "running", attempts=job["attempts"],
+                             lease_until=time.time() + self.lease_seconds, job=job)
+        try:
+            result = self.handler(job["payload"])
+        except Exception as e:
+            if job["attempts"] < self.max_attempts:
+                job["not_before"] = time.time() + self.retry_delay
+                with store.transact():
+                    store.push(job, prefix=self.name)
+                    self._set_status(job_id, "pending", attempts=job["attempts"], error=str(e), job=job)
+            else:
+                logger.warning("%s job %s failed after %s attempts: %s", self.name, job_id, job["attempts"], e)
+                self._set_status(job_id, "failed", attempts=job["attempts"], error=str(e), job=job)
+                if self.on_failure is not None:
+                    try:
+                        self.on_failure(job["payload"], str(e))
+                    except Exception:
+                        logger.exception("%s failure hook for job %s failed", self.name, job_id)
+            return True
+
+        self._set_status(job_id, "done", attempts=job["attempts"], result=result, job=job)
+        return True
+
+    def recover(self):
+        """Re-queue jobs whose worker died mid-run."""
+        store = self._store()
+        prefix = f"{self.name}:status:"
+        for key in list(store.iterkeys()):
+            if not (isinstance(key, str) and key.startswith(prefix)):
+                continue
+            with store.transact():
+                status = store.get(key)
+                if status and status["status"] == "running" and status.get("lease_until", 0) < time.time():
+                    store.push(status["job"], prefix=self.name)
+                    self._set_status(status["job"]["job_id"], "pending", attempts=status["attempts"], job=status["job"])
+
+    def clear(self):
+        self._store().clear()
+
+    def _run(self):
+        next_recover = 0.0
+        while not self._stop.is_set():
+            if time.monotonic() >= next_recover:
+                try:
+                    self.recover()
+                except Exception:
+                    logger.exception("%s recovery failed", self.name)
+                next_recover = time.monotonic() + self.recover_interval
+            try:
+                handled = self.run_once()
+            except Exception:
+                logger.exception("%s worker error", self.name)
+                handled = False
+            if not handled:
+                self._stop.wait(self.poll_interval)
+
+    def _set_status(self, job_id, status, **fields):
+        record = {
+            "job_id": job_id,
+            "status": status,
+            "updated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            **fields,
+        }
+        self._store().set(self._status_key(job_id), record, expire=self.status_ttl)
+        return record
+
+    def _status_key(self, job_id):
+        return f"{self.name}:status:{job_id}"
+
+    def _store(self):
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = Cache(self.directory)
+        return self._cache
@@ -0,0 +1,118 @@
+import json
+import os
+import re
+import threading
+import time
+
+from diskcache import Cache
+
+from config import Config
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "sri_lanka_gazetteer.json")
+
+
+def normalize_place(name):
+    """Lower-case, collapse whitespace and drop a trailing ', Sri Lanka'."""
+    name = re.sub(r"\s+", " ", str(name or "")).strip().lower()
+    return re.sub(r",?\s*sri lanka$", "", name).strip(" ,")
+
+
+class GeoCache:
+    """Disk-backed cache of place coordinates and route distances for TPL travel times.
+
+    Coordinates are looked up in the cache, then in an offline gazetteer of
+    Sri Lankan towns (``GAZETTEER_PATH`` plus any extra file given), and only
+    then geocoded live. Route distances are cached per normalized
+    origin/destination pair. Both outlive restarts and are shared by every
+    worker using the same directory.
+    """
+
+    def __init__(self, directory, ttl=30 * 86400, gazetteer_paths=(GAZETTEER_PATH,)):
+        self.directory = directory
+        self.ttl = ttl
+        self.gazetteer_paths = tuple(p for p in gazetteer_paths if p)
+        self._cache = None
+        self._gazetteer = None
+        self._lock = threading.Lock()
+
+    def coordinates(self, name):
+        """Cached or gazetteer ``(lon, lat)`` for a place, or None."""
+        key = normalize_place(name)
+        cached = self._store().get(("geocode", key))
+        if cached is not None:
+            return tuple(cached)
+        coord = self.gazetteer().get(key)
+        return tuple(coord) if coord else None
+
+    def set_coordinates(self, name, coord):
+        self._store().set(("geocode", normalize_place(name)), list(coord), expire=self.ttl)
+
+    def distance_km(self, origin, destination):
+        return self._store().get(("route", normalize_place(origin), normalize_place(destination)))
+
+    def set_distance_km(self, origin, destination, distance_km):
+        self._store().set(
+            ("route", normalize_place(origin), normalize_place(destination)), distance_km, expire=self.ttl
+        )
+
+    def gazetteer(self):
+        if self._gazetteer is None:
+            with self._lock:
+                if self._gazetteer is None:
+                    places = {}
+                    for path in self.gazetteer_paths:
+                        with open(path, encoding="utf-8") as f:
+                            places.update({normalize_place(k): v for k, v in json.load(f).items()})
+                    self._gazetteer = places
+        return self._gazetteer
+
+    def clear(self):
+        self._store().clear()
+
+    def _store(self):
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = Cache(self.directory)
+        return self._cache
+
+
+class Throttle:
+    """Keep successive calls at least ``interval`` seconds apart (Nominatim allows 1 req/s).
+
+    The time of the last granted call lives under ``key`` in the diskcache at
+    ``directory``, so every worker pointed at the same directory shares one
+    budget. Each call reserves the next free slot in a transaction and sleeps
+    until it afterwards, so no lock is held while waiting.
+    """
+
+    def __init__(self, interval, directory, key="throttle"):
+        self.interval = interval
+        self.directory = directory
+        self.key = key
+        self._cache = None
+        self._lock = threading.Lock()
+
+    def wait(self):
+        cache = self._store()
+        with cache.transact():
+            slot = max(time.time(), cache.get(self.key, 0.0) + self.interval)
+            cache.set(self.key, slot)
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _store(self):
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = Cache(self.directory)
+        return self._cache
+
+
+geo_cache = GeoCache(
+    Config.GEO_CACHE_DIR,
+    ttl=Config.GEO_CACHE_TTL,
+    gazetteer_paths=(GAZETTEER_PATH, Config.GAZETTEER_PATH),
+)
+nominatim_throttle = Throttle(1.0, Config.GEO_CACHE_DIR, key="throttle:nominatim")
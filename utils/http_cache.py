@@ -0,0 +1,120 @@
+import hashlib
+import re
+import threading
+from urllib.parse import urlsplit
+
+from diskcache import Cache
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from config import Config
+from utils.ttl_cache import TTLCache
+
+# Single resources that are read far more often than they change.
+CACHEABLE_PATHS = re.compile(
+    r"/(users|issues|attachments)/\d+\.json$"
+    r"|/memberships\.json$"
+)
+# User records read with the admin key carry the user's ``api_key``; they are
+# only ever held in process memory, never written to the shared disk tier.
+MEMORY_ONLY_PATHS = re.compile(r"/users/\d+\.json$")
+_CREDENTIAL_HEADERS = ("X-Redmine-API-Key", "Authorization")
+
+
+def cache_key(url, params=None, headers=None):
+    """Digest of the URL, query params and credentials, so the caller's API key is not part of the stored key."""
+    headers = headers or {}
+    items = sorted((str(k), str(v)) for k, v in (params.items() if isinstance(params, dict) else params or ()))
+    credentials = [headers.get(name) for name in _CREDENTIAL_HEADERS]
+    return hashlib.sha256(repr((url, items, credentials)).encode()).hexdigest()
+
+
+class ConditionalCache:
+    """Redmine response bodies kept with their ETags for ``If-None-Match`` revalidation.
+
+    Every use still asks Redmine, so a cached body is never served after it
+    changed; an unchanged resource costs a 304 with no body instead of the
+    full payload. Recently used entries are held in memory (``memory_size``
+    entries); they also live on disk in ``directory``, which is shared by
+    the workers and evicted least-recently-used past ``disk_size`` bytes.
+    User records (``MEMORY_ONLY_PATHS``) contain API keys and skip the disk.
+    Bodies larger than ``max_body`` bytes are not kept.
+    """
+
+    def __init__(self, directory, memory_size=1024, disk_size=256 * 2**20, max_body=2**20, ttl=7 * 86400):
+        self.directory = directory
+        self.disk_size = disk_size
+        self.max_body = max_body
+        self.ttl = ttl
+        self._memory = TTLCache(maxsize=memory_size, ttl=ttl)
+        self._cache = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cacheable(url):
+        return bool(CACHEABLE_PATHS.search(urlsplit(url).path))
+
+    @staticmethod
+    def persistent(url):
+        return not MEMORY_ONLY_PATHS.search(urlsplit(url).path)
+
+    def lookup(self, key):
+        """``(etag, body, content_type)`` stored for ``key``, or None."""
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = self._store().get(key)
+            if entry is not None:
+                self._memory.set(key, entry)
+        return entry
+
+    def store(self, key, response, persist=True):
+        """Keep a 200 response if it carries an ETag and a small enough body; ``persist=False`` keeps it in memory only."""
+        etag = response.headers.get("ETag")
+        body = response.content
+        if not isinstance(etag, str) or not isinstance(body, bytes) or len(body) > self.max_body:
+            return
+        entry = (etag, body, response.headers.get("Content-Type"))
+        self._memory.set(key, entry)
+        if persist:
+            self._store().set(key, entry, expire=self.ttl)
+
+    def invalidate(self, key):
+        self._memory.invalidate(key)
+        self._store().delete(key)
+
+    def clear(self):
+        self._memory.clear()
+        self._store().clear()
+
+    def _store(self):
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = Cache(
+                        self.directory,
+                        size_limit=self.disk_size,
+                        eviction_policy="least-recently-used",
+                    )
+        return self._cache
+
+
+def replay(entry, url):
+    """A 200 ``Response`` rebuilt from a cached entry after Redmine answered 304."""
+    etag, body, content_type = entry
+    response = Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.encoding = "utf-8"
+    response.headers = CaseInsensitiveDict({"ETag": etag, "Content-Length": str(len(body))})
+    if content_type:
+        response.headers["Content-Type"] = content_type
+    return response
+
+
+redmine_http_cache = ConditionalCache(
+    Config.REDMINE_HTTP_CACHE_DIR,
+    memory_size=Config.REDMINE_HTTP_CACHE_MEMORY_ENTRIES,
+    disk_size=Config.REDMINE_HTTP_CACHE_DISK_BYTES,
+    max_body=Config.REDMINE_HTTP_CACHE_MAX_BODY_BYTES,
+)
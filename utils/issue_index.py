@@ -0,0 +1,223 @@
+import logging
+import os
+import threading
+import time
+
+from utils import redmine_client
+from utils.constants import REDMINE_API_ERROR_MSG
+
+logger = logging.getLogger(__name__)
+
+
+def first_visible(issue_ids, redmine_url, headers, predicate=None):
+    """Return ``(issue, error)``: the first of ``issue_ids`` the caller can read, re-read with their key.
+
+    Index entries come from a sync made with the admin key, so a hit says
+    nothing about the caller's own Redmine permissions. Each candidate is
+    fetched from ``/issues/{id}.json`` with the caller's ``headers``; a 403
+    or 404 skips it, and so does a fresh copy failing ``predicate``. The
+    issue is None when the caller can see none of them.
+    """
+    for issue_id in issue_ids:
+        response = redmine_client.get(f"{redmine_url}/issues/{issue_id}.json", headers=headers)
+        if response.status_code in (403, 404):
+            continue
+        if response.status_code != 200:
+            return None, f"Failed to fetch issue {issue_id}: {response.status_code} - {response.text}"
+        issue = response.json().get("issue")
+        if issue and (predicate is None or predicate(issue)):
+            return issue, None
+    return None, None
+
+
+class IssueIndex:
+    """In-process lookup table over one Redmine tracker.
+
+    The index is shared by every caller, so it is synced with the admin API
+    key; callers apply their own access checks to the issues it returns.
+    The first sync pulls the whole tracker; later syncs only ask for issues
+    with ``updated_on`` at or after the newest timestamp already seen. A full
+    rebuild runs every ``full_sync_interval`` seconds so deleted issues drop
+    out, and reloads the closed status ids from ``/issue_statuses.json``.
+    Subclasses decide which keys an issue is filed under and what is stored
+    for it by overriding ``index_entry``.
+    """
+
+    tracker_id = None
+    label = "tracker"
+    include_closed = False
+
+    def __init__(self, refresh_interval=30, full_sync_interval=3600, miss_refresh_interval=2):
+        self.refresh_interval = refresh_interval
+        self.full_sync_interval = full_sync_interval
+        self.miss_refresh_interval = miss_refresh_interval
+        self._by_key = {}
+        self._by_issue = {}
+        self._watermark = None
+        self._closed_status_ids = None
+        self._synced_at = None
+        self._full_synced_at = None
+        self._stale = False
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def index_entry(self, issue):
+        """Return ``(keys, entry)`` for an issue, or None to leave it out of the index."""
+        raise NotImplementedError
+
+    def ensure_fresh(self, max_age=None):
+        """Sync with Redmine if the index is older than ``max_age`` (default ``refresh_interval``).
+
+        Returns an error message only when the index has never been loaded;
+        once it has data a failed refresh is logged and the old data served.
+        """
+        max_age = self.refresh_interval if max_age is None else max_age
+        if self._is_fresh(max_age):
+            return None
+
+        with self._sync_lock:
+            if self._is_fresh(max_age):
+                return None
+
+            now = time.monotonic()
+            full = self._full_synced_at is None or now - self._full_synced_at >= self.full_sync_interval
+            error = self._sync(full)
+            if error:
+                if self._synced_at is None:
+                    return error
+                logger.warning("%s index refresh failed, serving cached data: %s", self.label, error)
+                self._synced_at = now
+                self._stale = False
+        return None
+
+    def lookup(self, key):
+        """Entries filed under ``key``, newest issue first."""
+        with self._lock:
+            entries = self._by_key.get(key, {})
+            return [entries[issue_id] for issue_id in sorted(entries, key=lambda i: i or 0, reverse=True)]
+
+    def lookup_fresh(self, key, predicate=None):
+        """Return ``(entries, error)`` for ``key``, filtered by ``predicate``.
+
+        A miss triggers one early incremental sync (rate-limited by
+        ``miss_refresh_interval``) so issues created or changed moments ago
+        are still found.
+        """
+        found, error = self.lookup_many_fresh([key], predicate)
+        if error:
+            return None, error
+        return found[key], None
+
+    def lookup_many_fresh(self, keys, predicate=None):
+        """Return ``({key: entries}, error)`` for several keys, as ``lookup_fresh`` does for one.
+
+        Keys that miss share a single early sync, so joining a batch against
+        the index costs at most two syncs however many keys it holds.
+        """
+        error = self.ensure_fresh()
+        if error:
+            return None, error
+
+        def find(key):
+            return [e for e in self.lookup(key) if predicate is None or predicate(e)]
+
+        found = {key: find(key) for key in keys}
+        missing = [key for key, entries in found.items() if not entries]
+        if missing:
+            error = self.ensure_fresh(max_age=self.miss_refresh_interval)
+            if error:
+                return None, error
+            found.update((key, find(key)) for key in missing)
+        return found, None
+
+    def is_closed(self, issue):
+        """True if the issue's status is one of the closed statuses seen at the last full sync."""
+        return issue.get("status", {}).get("id") in (self._closed_status_ids or ())
+
+    def mark_stale(self):
+        """Force the next lookup to sync, e.g. after this process wrote to the tracker."""
+        self._stale = True
+
+    def clear(self):
+        with self._sync_lock, self._lock:
+            self._by_key = {}
+            self._by_issue = {}
+            self._watermark = None
+            self._closed_status_ids = None
+            self._synced_at = None
+            self._full_synced_at = None
+            self._stale = False
+
+    def _is_fresh(self, max_age):
+        return (
+            not self._stale
+            and self._synced_at is not None
+            and time.monotonic() - self._synced_at < max_age
+        )
+
+    def _sync(self, full):
+        redmine_url = os.getenv("REDMINE_URL")
+        api_key = os.getenv("REDMINE_ADMIN_API_KEY")
+        if not redmine_url or not api_key:
+            return REDMINE_API_ERROR_MSG
+
+        headers = {"X-Redmine-API-Key": api_key}
+        closed_status_ids = self._closed_status_ids
+        if full or closed_status_ids is None:
+            closed_status_ids, response = redmine_client.closed_status_ids(redmine_url, headers=headers)
+            if response is not None:
+                return f"Failed to fetch issue statuses: {response.status_code} - {response.text}"
+
+        # Pages are fetched concurrently by offset; sorting by id keeps an issue
+        # edited mid-sync in place instead of shifting the pages after it.
+        params = redmine_client.issue_params(
+            tracker_id=self.tracker_id,
+            status_id="*",
+            updated_on=(self._watermark, None) if not full and self._watermark else None,
+            sort="id",
+        )
+
+        issues, response = redmine_client.get_all_pages(
+            f"{redmine_url}/issues.json", params=params, headers=headers
+        )
+        if response is not None:
+            return f"Failed to fetch {self.label} issues: {response.status_code} - {response.text}"
+
+        with self._lock:
+            self._closed_status_ids = closed_status_ids
+            if full:
+                self._by_key = {}
+                self._by_issue = {}
+                self._watermark = None
+            for issue in issues:
+                self._upsert(issue)
+                updated_on = issue.get("updated_on")
+                if updated_on and (self._watermark is None or updated_on > self._watermark):
+                    self._watermark = updated_on
+
+            self._synced_at = time.monotonic()
+            self._stale = False
+            if full:
+                self._full_synced_at = self._synced_at
+        return None
+
+    def _upsert(self, issue):
+        issue_id = issue.get("id")
+        for key in self._by_issue.pop(issue_id, ()):
+            bucket = self._by_key.get(key)
+            if bucket is not None:
+                bucket.pop(issue_id, None)
+                if not bucket:
+                    del self._by_key[key]
+
+        if not self.include_closed and self.is_closed(issue):
+            return
+
+        indexed = self.index_entry(issue)
+        if not indexed:
+            return
+        keys, entry = indexed
+        keys = tuple(k for k in keys if k)
+        for key in keys:
+            self._by_key.setdefault(key, {})[issue_id] = entry
+        self._by_issue[issue_id] = keys
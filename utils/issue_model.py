@@ -0,0 +1,120 @@
+import math
+
+MINING_LICENSE_NUMBER = "Mining License Number"
+
+_MISSING = object()
+
+
+def to_number(value):
+    """Float of a custom field value; None when blank, non-numeric, NaN or infinite."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+class Issue:
+    """A Redmine issue with its custom fields mapped by id and by name.
+
+    Redmine sends custom fields as a list, so every lookup by name walks it;
+    parsing builds both maps once so each read afterwards is a dict hit. The
+    issue as received stays available as ``raw`` for building responses.
+    When a name repeats, the first field wins, as with a linear search.
+    """
+
+    __slots__ = (
+        "raw", "id", "subject", "tracker_id", "status_id", "status_name",
+        "assigned_to_id", "assigned_to_name", "created_on", "_by_id", "_by_name", "_ids",
+    )
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.id = raw.get("id")
+        self.subject = raw.get("subject")
+        tracker = raw.get("tracker") or {}
+        status = raw.get("status") or {}
+        assigned_to = raw.get("assigned_to")
+        self.tracker_id = tracker.get("id")
+        self.status_id = status.get("id")
+        self.status_name = status.get("name")
+        self.assigned_to_id = assigned_to.get("id") if isinstance(assigned_to, dict) else None
+        self.assigned_to_name = assigned_to.get("name") if isinstance(assigned_to, dict) else None
+        self.created_on = raw.get("created_on")
+
+        by_id = {}
+        by_name = {}
+        ids = {}
+        for field in raw.get("custom_fields") or ():
+            value = field.get("value")
+            if "id" in field:
+                by_id.setdefault(field["id"], value)
+            if "name" in field:
+                by_name.setdefault(field["name"], value)
+                ids.setdefault(field["name"], field.get("id"))
+        self._by_id = by_id
+        self._by_name = by_name
+        self._ids = ids
+
+    @classmethod
+    def parse(cls, raw):
+        """``Issue`` for a raw issue dict; an ``Issue`` is returned unchanged."""
+        return raw if isinstance(raw, cls) else cls(raw)
+
+    def __repr__(self):
+        return f"Issue(id={self.id!r}, tracker_id={self.tracker_id!r}, status={self.status_name!r})"
+
+    def get(self, key, default=None):
+        """Top-level attribute of the raw issue, like ``dict.get``."""
+        return self.raw.get(key, default)
+
+    def field(self, key, default=None):
+        """Custom field value by id (int) or by name (str)."""
+        fields = self._by_id if isinstance(key, int) else self._by_name
+        value = fields.get(key, _MISSING)
+        return default if value is _MISSING else value
+
+    def has_field(self, key):
+        return key in (self._by_id if isinstance(key, int) else self._by_name)
+
+    def field_id(self, name):
+        """Id of the custom field called ``name``, for building update payloads; None when absent."""
+        return self._ids.get(name)
+
+    def number(self, key):
+        """Custom field value as a float, or None; see ``to_number``."""
+        return to_number(self.field(key))
+
+    @property
+    def cubes(self):
+        return self.number("Cubes")
+
+    @property
+    def royalty(self):
+        return self.number("Royalty")
+
+    @property
+    def used(self):
+        return self.number("Used")
+
+    @property
+    def remaining(self):
+        return self.number("Remaining")
+
+    @property
+    def capacity(self):
+        return self.number("Capacity")
+
+    @property
+    def license_number(self):
+        return self.field(MINING_LICENSE_NUMBER)
+
+
+def parse_issues(raw_issues):
+    return [Issue(raw) for raw in raw_issues]
@@ -0,0 +1,286 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config import Config
+from utils import redmine_client
+from utils.constants import REDMINE_API_ERROR_MSG
+
+logger = logging.getLogger(__name__)
+
+# ML, TPL, Complaint, Appointment and MeAppointment trackers
+REPLICA_TRACKER_IDS = (4, 5, 6, 11, 12)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    tracker_id INTEGER NOT NULL,
+    project_id INTEGER,
+    status_id INTEGER,
+    is_closed INTEGER NOT NULL DEFAULT 0,
+    assigned_to_id INTEGER,
+    author_id INTEGER,
+    updated_on TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_tracker_status ON issues (tracker_id, status_id);
+CREATE INDEX IF NOT EXISTS issues_assigned_to ON issues (assigned_to_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    tracker_id INTEGER PRIMARY KEY,
+    cursor TEXT,
+    synced_at REAL,
+    full_synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS sync_lease (
+    name TEXT PRIMARY KEY,
+    owner TEXT,
+    expires_at REAL
+);
+"""
+
+
+class IssueReplica:
+    """Local SQLite copy of the busiest Redmine trackers, kept current by ``updated_on``.
+
+    Each tracker has its own cursor (the newest ``updated_on`` seen), stored
+    next to the issues so it survives restarts. A poll only asks Redmine for
+    issues changed at or after the cursor; a full resync, run on demand or
+    every ``full_sync_interval`` seconds, replaces the tracker's rows so
+    deleted issues drop out. Syncs use the admin API key, so callers must
+    apply their own access checks to what they read back.
+
+    Several worker processes can share one database file: only the process
+    holding the poller lease talks to Redmine, the rest just read.
+    """
+
+    def __init__(self, path, tracker_ids=REPLICA_TRACKER_IDS, poll_interval=60,
+                 full_sync_interval=3600, max_age=300):
+        self.path = path
+        self.tracker_ids = tuple(tracker_ids)
+        self.poll_interval = poll_interval
+        self.full_sync_interval = full_sync_interval
+        self.max_age = max_age
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._stop = threading.Event()
+
+    # -- reads -----------------------------------------------------------
+
+    def is_ready(self, tracker_id, max_age=None):
+        """True if ``tracker_id`` has been synced within ``max_age`` seconds."""
+        max_age = self.max_age if max_age is None else max_age
+        row = self._query_one("SELECT synced_at FROM sync_state WHERE tracker_id = ?", (tracker_id,))
+        return bool(row and row[0] is not None and time.time() - row[0] < max_age)
+
+    def cursor(self, tracker_id):
+        row = self._query_one("SELECT cursor FROM sync_state WHERE tracker_id = ?", (tracker_id,))
+        return row[0] if row else None
+
+    def get(self, issue_id):
+        row = self._query_one("SELECT data FROM issues WHERE id = ?", (issue_id,))
+        return json.loads(row[0]) if row else None
+
+    def issues(self, tracker_id, project_id=None, status_id=None, assigned_to_id=None,
+               include_closed=False):
+        """Issues of one tracker, newest first, filtered like ``/issues.json``.
+
+        Closed issues are left out unless ``include_closed`` is set, matching
+        Redmine's default ``status_id=open``.
+        """
+        clauses = ["tracker_id = ?"]
+        args = [tracker_id]
+        for column, value in (("project_id", project_id), ("status_id", status_id),
+                              ("assigned_to_id", assigned_to_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if not include_closed:
+            clauses.append("is_closed = 0")
+
+        sql = f"SELECT data FROM issues WHERE {' AND '.join(clauses)} ORDER BY id DESC"
+        with self._lock:
+            rows = self._connection().execute(sql, args).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    # -- syncing ---------------------------------------------------------
+
+    def sync(self, full=False, tracker_ids=None):
+        """Pull changes for each tracker; returns the first error message, or None.
+
+        Trackers due a periodic full resync get one even when ``full`` is False.
+        """
+        first_error = None
+        with self._sync_lock:
+            closed_status_ids, error = self._closed_status_ids()
+            if error:
+                logger.warning("Issue replica sync failed: %s", error)
+                return error
+            for tracker_id in tracker_ids or self.tracker_ids:
+                error = self._sync_tracker(tracker_id, full, closed_status_ids)
+                if error:
+                    logger.warning("Issue replica sync failed for tracker %s: %s", tracker_id, error)
+                    first_error = first_error or error
+        return first_error
+
+    def resync(self, tracker_ids=None):
+        """Rebuild the given trackers (default: all) from scratch."""
+        return self.sync(full=True, tracker_ids=tracker_ids)
+
+    def start(self):
+        """Start the background poller for this process (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive() and self._thread_pid == os.getpid():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="issue-replica-sync", daemon=True)
+        self._thread_pid = os.getpid()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def clear(self):
+        with self._sync_lock, self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM issues")
+                conn.execute("DELETE FROM sync_state")
+                conn.execute("DELETE FROM sync_lease")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self._acquire_lease():
+                    self.sync()
+            except Exception:
+                logger.exception("Issue replica poll failed")
+            self._stop.wait(self.poll_interval)
+
+    def _acquire_lease(self):
+        owner = str(os.getpid())
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO sync_lease (name, owner, expires_at) VALUES ('poller', NULL, 0)"
+                )
+                taken = conn.execute(
+                    "UPDATE sync_lease SET owner = ?, expires_at = ? "
+                    "WHERE name = 'poller' AND (owner = ? OR expires_at < ?)",
+                    (owner, now + 3 * self.poll_interval, owner, now),
+                ).rowcount
+        return taken == 1
+
+    @staticmethod
+    def _closed_status_ids():
+        redmine_url = os.getenv("REDMINE_URL")
+        api_key = os.getenv("REDMINE_ADMIN_API_KEY")
+        if not redmine_url or not api_key:
+            return None, REDMINE_API_ERROR_MSG
+        closed, response = redmine_client.closed_status_ids(redmine_url, headers={"X-Redmine-API-Key": api_key})
+        if response is not None:
+            return None, f"Failed to fetch issue statuses: {response.status_code} - {response.text}"
+        return closed, None
+
+    def _sync_tracker(self, tracker_id, full, closed_status_ids):
+        redmine_url = os.getenv("REDMINE_URL")
+        api_key = os.getenv("REDMINE_ADMIN_API_KEY")
+        if not redmine_url or not api_key:
+            return REDMINE_API_ERROR_MSG
+
+        row = self._query_one(
+            "SELECT cursor, full_synced_at FROM sync_state WHERE tracker_id = ?", (tracker_id,)
+        )
+        cursor, full_synced_at = row if row else (None, None)
+        full = full or not cursor or full_synced_at is None \
+            or time.time() - full_synced_at >= self.full_sync_interval
+
+        # Pages are fetched concurrently by offset, so the order must not change
+        # while they are read: an issue edited mid-sync keeps its place by id,
+        # where under updated_on it would jump to the end and shift a page.
+        params = redmine_client.issue_params(
+            tracker_id=tracker_id,
+            status_id="*",
+            updated_on=None if full else (cursor, None),
+            sort="id",
+        )
+
+        issues, response = redmine_client.get_all_pages(
+            f"{redmine_url}/issues.json", params=params, headers={"X-Redmine-API-Key": api_key}
+        )
+        if response is not None:
+            return f"Failed to sync tracker {tracker_id}: {response.status_code} - {response.text}"
+
+        new_cursor = None if full else cursor
+        for issue in issues:
+            updated_on = issue.get("updated_on")
+            if updated_on and (new_cursor is None or updated_on > new_cursor):
+                new_cursor = updated_on
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if full:
+                    conn.execute("DELETE FROM issues WHERE tracker_id = ?", (tracker_id,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO issues "
+                    "(id, tracker_id, project_id, status_id, is_closed, assigned_to_id, author_id, updated_on, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._row(tracker_id, issue, closed_status_ids) for issue in issues if issue.get("id") is not None],
+                )
+                conn.execute(
+                    "INSERT INTO sync_state (tracker_id, cursor, synced_at, full_synced_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(tracker_id) DO UPDATE SET cursor = excluded.cursor, "
+                    "synced_at = excluded.synced_at, "
+                    "full_synced_at = COALESCE(excluded.full_synced_at, sync_state.full_synced_at)",
+                    (tracker_id, new_cursor, now, now if full else None),
+                )
+        return None
+
+    @staticmethod
+    def _row(tracker_id, issue, closed_status_ids):
+        status = issue.get("status") or {}
+        return (
+            issue["id"],
+            tracker_id,
+            (issue.get("project") or {}).get("id"),
+            status.get("id"),
+            1 if status.get("id") in closed_status_ids else 0,
+            (issue.get("assigned_to") or {}).get("id"),
+            (issue.get("author") or {}).get("id"),
+            issue.get("updated_on"),
+            json.dumps(issue),
+        )
+
+    def _query_one(self, sql, args):
+        with self._lock:
+            return self._connection().execute(sql, args).fetchone()
+
+    def _connection(self):
+        # A connection must not cross a fork; reopen in each worker process.
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+
+issue_replica = IssueReplica(
+    path=Config.ISSUE_REPLICA_PATH,
+    poll_interval=Config.ISSUE_REPLICA_POLL_SECONDS,
+    full_sync_interval=Config.ISSUE_REPLICA_FULL_SYNC_SECONDS,
+    max_age=Config.ISSUE_REPLICA_MAX_AGE,
+)
@@ -3,6 +3,8 @@ import datetime
 from cryptography.fernet import Fernet
 from config import Config
 from utils.user_utils import UserUtils
+from utils.ttl_cache import TTLCache
+from utils.user_generations import user_generations
 
 
 class JWTUtils:
@@ -12,7 +14,9 @@ class JWTUtils:
     key = Fernet.generate_key()
     cipher = Fernet(key)
 
-    
+    # (user_id, generation) -> Redmine API key, so authenticated requests don't each hit /users/{id}.json
+    _api_key_cache = TTLCache(maxsize=Config.API_KEY_CACHE_SIZE, ttl=Config.API_KEY_CACHE_TTL)
+
     
     @staticmethod
     def create_jwt_token(user_id, user_role):
@@ -150,8 +154,11 @@ class JWTUtils:
             if not user_id:
                 raise ValueError("User ID is missing from the token")
             
-            # 🔥 Now call your UserUtils function to get fresh API key
-            api_key = UserUtils.get_user_api_key(user_id)
+            api_key = JWTUtils._api_key_cache.get_or_load(
+                (user_id, user_generations.current(user_id)),
+                lambda: UserUtils.get_user_api_key(user_id),
+                should_cache=lambda key: bool(key) and key != "N/A"
+            )
             
             if not api_key or api_key == "N/A":
                 raise ValueError("API key not found for the user")
@@ -164,3 +171,26 @@ class JWTUtils:
             raise ValueError("Invalid token")
         except Exception as e:
             raise ValueError(f"Error decoding token: {str(e)}")
+
+    @staticmethod
+    def invalidate_api_key(user_id):
+        """Drop the cached API key and profile for a user (password reset, role or status change).
+
+        Bumping the user's shared generation makes every worker miss on its
+        next lookup, not just the one handling this request.
+        """
+        user_generations.bump(user_id)
+        for key in JWTUtils._api_key_cache.keys():
+            if str(key[0]) == str(user_id):
+                JWTUtils._api_key_cache.invalidate(key)
+        UserUtils.invalidate_user(user_id)
+
+    @staticmethod
+    def get_role_from_token(token):
+        """Return the role claim of a valid token, or None if it cannot be decoded."""
+        try:
+            token = token.split(" ")[1] if " " in token else token
+            payload = jwt.decode(token, Config.SECRET_KEY, algorithms=[Config.JWT_ALGORITHM])
+            return payload.get('role')
+        except Exception:
+            return None
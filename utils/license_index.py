@@ -0,0 +1,56 @@
+import re
+
+from config import Config
+from utils.issue_index import IssueIndex
+from utils.issue_model import Issue
+
+ML_TRACKER_ID = 4
+APPOINTMENT_TRACKER_ID = 11
+ME_APPOINTMENT_TRACKER_ID = 12
+LICENSE_NUMBER_FIELD_ID = 101
+
+_LICENSE_NUMBER_RE = re.compile(r"LLL/100/(\d+)", re.IGNORECASE)
+
+
+def normalize_license_number(value):
+    """Canonical ``LLL/100/{id}`` key, so 'ML Request LLL/100/7' and 'lll/100/7' match."""
+    value = str(value).strip()
+    match = _LICENSE_NUMBER_RE.search(value)
+    return f"LLL/100/{match.group(1)}" if match else value.upper()
+
+
+class LicenseNumberIndex(IssueIndex):
+    """Issues of one tracker by their Mining License Number custom field (id 101)."""
+
+    include_closed = True
+
+    def __init__(self, tracker_id, label, **kwargs):
+        super().__init__(**kwargs)
+        self.tracker_id = tracker_id
+        self.label = label
+
+    def index_entry(self, issue):
+        value = Issue.parse(issue).field(LICENSE_NUMBER_FIELD_ID)
+        if not value:
+            return None
+        return [normalize_license_number(value)], issue
+
+
+def _license_index(tracker_id, label):
+    return LicenseNumberIndex(
+        tracker_id,
+        label,
+        refresh_interval=Config.LICENSE_INDEX_REFRESH_SECONDS,
+        full_sync_interval=Config.ISSUE_INDEX_FULL_SYNC_SECONDS,
+    )
+
+
+ml_license_index = _license_index(ML_TRACKER_ID, "ML")
+appointment_index = _license_index(APPOINTMENT_TRACKER_ID, "Appointment")
+me_appointment_index = _license_index(ME_APPOINTMENT_TRACKER_ID, "MeAppointment")
+
+license_indexes = {
+    ML_TRACKER_ID: ml_license_index,
+    APPOINTMENT_TRACKER_ID: appointment_index,
+    ME_APPOINTMENT_TRACKER_ID: me_appointment_index,
+}
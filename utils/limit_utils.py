@@ -1,5 +1,5 @@
 import os
-import requests
+from utils import redmine_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,7 +23,7 @@ class LimitUtils:
             url = f"{REDMINE_URL}/projects/gsmb/issues.json"
             print(f"Requesting: {url}")
 
-            response = requests.get(url, headers=headers)
+            response = redmine_client.get(url, headers=headers)
 
             if response.status_code != 200:
                 return None, f"Failed to fetch issues: {response.status_code} - {response.text}"
@@ -0,0 +1,62 @@
+import base64
+import binascii
+
+from config import Config
+
+_CURSOR_PREFIX = "o:"
+
+
+def encode_cursor(offset):
+    """Opaque cursor for the row at ``offset``; clients pass it back unchanged."""
+    return base64.urlsafe_b64encode(f"{_CURSOR_PREFIX}{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Offset encoded in ``cursor``; raises ValueError for anything ``encode_cursor`` did not make."""
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    offset = text[len(_CURSOR_PREFIX):]
+    if not text.startswith(_CURSOR_PREFIX) or not offset.isdigit():
+        raise ValueError("Invalid cursor")
+    return int(offset)
+
+
+class PageRequest:
+    """A client's ``limit``/``cursor`` query parameters, resolved to a row offset."""
+
+    __slots__ = ("limit", "offset")
+
+    def __init__(self, limit=None, offset=0):
+        self.limit = Config.LIST_PAGE_DEFAULT_LIMIT if limit is None else limit
+        self.offset = offset
+
+    @classmethod
+    def from_args(cls, args):
+        """``(PageRequest, None)`` from request args, or ``(None, error)`` for a bad limit or cursor."""
+        limit = args.get("limit")
+        if limit is not None:
+            if not limit.isdigit() or not 1 <= int(limit) <= Config.LIST_PAGE_MAX_LIMIT:
+                return None, f"limit must be between 1 and {Config.LIST_PAGE_MAX_LIMIT}"
+            limit = int(limit)
+
+        cursor = args.get("cursor")
+        try:
+            offset = decode_cursor(cursor) if cursor else 0
+        except ValueError as e:
+            return None, str(e)
+        return cls(limit, offset), None
+
+    def page(self, items, total):
+        """Response body for ``items`` found at this offset out of ``total``."""
+        end = self.offset + len(items)
+        return {
+            "data": items,
+            "next_cursor": encode_cursor(end) if items and end < total else None,
+            "total": total,
+        }
+
+    def slice(self, items):
+        """``page`` over an already complete list."""
+        return self.page(items[self.offset:self.offset + self.limit], len(items))
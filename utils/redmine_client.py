@@ -0,0 +1,348 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from http.cookiejar import DefaultCookiePolicy
+from itertools import islice
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+from utils import request_memo, upstream_metrics
+from utils.http_cache import cache_key, redmine_http_cache, replay
+
+RETRY_STATUS_CODES = (502, 503, 504)
+PAGE_LIMIT = 100  # Redmine's max per page
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    """Create a keep-alive session with a bounded pool and retry/backoff on gateway errors."""
+    retry = Retry(
+        total=Config.REDMINE_MAX_RETRIES,
+        connect=Config.REDMINE_MAX_RETRIES,
+        read=0,
+        status=Config.REDMINE_MAX_RETRIES,
+        backoff_factor=Config.REDMINE_RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=Config.REDMINE_POOL_SIZE,
+        pool_maxsize=Config.REDMINE_POOL_SIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Requests are authenticated per user via API key; never carry a Redmine
+    # session cookie from one user's response into another user's request.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session():
+    """Return the pooled session for this worker process, creating it on first use."""
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def request(method, url, **kwargs):
+    memo = request_memo.current()
+    if method != "GET":
+        if memo is not None:
+            memo.invalidate(url)
+        return _send(method, url, **kwargs)
+    if kwargs.get("stream"):
+        return _send(method, url, **kwargs)
+    if memo is None:
+        return _conditional_get(url, **kwargs)
+
+    # The same GET repeated within one inbound request is answered from the memo.
+    key = memo.key(url, kwargs.get("params"), kwargs.get("headers"))
+    response = memo.get(key)
+    if response is None:
+        response = _conditional_get(url, **kwargs)
+        if response.status_code == 200:
+            memo.put(key, response)
+    return response
+
+
+def _conditional_get(url, **kwargs):
+    """GET that revalidates a cached body with ``If-None-Match`` and replays it on 304."""
+    if not Config.REDMINE_HTTP_CACHE_ENABLED or not redmine_http_cache.cacheable(url):
+        return _send("GET", url, **kwargs)
+
+    key = cache_key(url, kwargs.get("params"), kwargs.get("headers"))
+    entry = redmine_http_cache.lookup(key)
+    if entry is not None:
+        kwargs["headers"] = {**(kwargs.get("headers") or {}), "If-None-Match": entry[0]}
+
+    response = _send("GET", url, **kwargs)
+    if response.status_code == 304 and entry is not None:
+        return replay(entry, url)
+    if response.status_code == 200:
+        redmine_http_cache.store(key, response, persist=redmine_http_cache.persistent(url))
+    elif response.status_code == 404 and entry is not None:
+        redmine_http_cache.invalidate(key)
+    return response
+
+
+def _send(method, url, **kwargs):
+    kwargs.setdefault("timeout", (Config.REDMINE_CONNECT_TIMEOUT, Config.REDMINE_READ_TIMEOUT))
+    started = time.perf_counter()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        upstream_metrics.record(method, url, time.perf_counter() - started, 0, failed=True)
+        raise
+    upstream_metrics.record(method, url, time.perf_counter() - started, _body_size(response, kwargs.get("stream")),
+                            failed=response.status_code >= 500)
+    return response
+
+
+def _body_size(response, streamed):
+    # A streamed body has not been read yet; trust Content-Length rather than consuming it.
+    if streamed:
+        length = response.headers.get("Content-Length", "")
+        return int(length) if length.isdigit() else 0
+    return len(response.content)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
+
+
+def issue_params(tracker_id=None, project_id=None, status_id=None, assigned_to_id=None,
+                 custom_fields=None, created_on=None, updated_on=None, due_date=None, **extra):
+    """Build ``/issues.json`` query params so Redmine filters instead of the caller.
+
+    ``status_id`` takes an id, ``"open"``/``"closed"``/``"*"``, a negation such
+    as ``"!7"`` or a list of ids. ``assigned_to_id`` takes an id, ``"me"`` or a
+    list. ``custom_fields`` maps a field id to a value (or list of values) and
+    becomes ``cf_<id>=``. ``created_on``/``updated_on``/``due_date`` take a
+    ``(start, end)`` pair of dates, datetimes or strings, either end may be None. Anything
+    else (``sort``, ``include``, ...) is passed through unchanged.
+    """
+    params = {}
+    for name, value in (("tracker_id", tracker_id), ("project_id", project_id),
+                        ("status_id", status_id), ("assigned_to_id", assigned_to_id)):
+        if value is not None:
+            params[name] = _any_of(value)
+    for field_id, value in (custom_fields or {}).items():
+        params[f"cf_{field_id}"] = _any_of(value)
+    for name, value in (("created_on", created_on), ("updated_on", updated_on), ("due_date", due_date)):
+        if value is not None:
+            params[name] = _date_filter(value)
+    params.update({name: value for name, value in extra.items() if value is not None})
+    return params
+
+
+def _any_of(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return "|".join(str(v) for v in value)
+    return value
+
+
+def _redmine_time(value):
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def _date_filter(value):
+    if not isinstance(value, tuple):
+        return value
+    start, end = value
+    if start is not None and end is not None:
+        return f"><{_redmine_time(start)}|{_redmine_time(end)}"
+    if start is not None:
+        return f">={_redmine_time(start)}"
+    return f"<={_redmine_time(end)}"
+
+
+class PageFetchError(Exception):
+    """A page after the first failed while a collection was being streamed."""
+
+    def __init__(self, response, offset):
+        super().__init__(f"Page at offset {offset} failed: {response.status_code}")
+        self.response = response
+        self.offset = offset
+
+
+def stream_pages(url, key="issues", params=None, headers=None, limit=PAGE_LIMIT, max_workers=None):
+    """Iterate over every item of a Redmine collection endpoint, one page at a time.
+
+    The first page is fetched before returning, so a failing endpoint is
+    reported as ``(None, response)``; otherwise ``(items, None)`` where
+    ``items`` is an iterator. When Redmine reports ``total_count`` the later
+    pages are fetched ahead on a pool of at most ``max_workers`` requests and
+    handed out in offset order, so no more than that many pages are held at
+    once however large the collection. Endpoints without ``total_count`` are
+    walked sequentially until a short page comes back. A later page failing
+    raises ``PageFetchError`` from the iterator.
+    """
+    base_params = {**(params or {}), "limit": limit}
+
+    def fetch(offset):
+        return get(url, params={**base_params, "offset": offset}, headers=headers)
+
+    response = fetch(0)
+    if response.status_code != 200:
+        return None, response
+
+    data = response.json()
+    return _stream_rest(fetch, key, data.get(key, []), data.get("total_count"), limit, max_workers), None
+
+
+def _stream_rest(fetch, key, first_page, total, limit, max_workers):
+    yield from first_page
+    step = len(first_page)
+
+    if total is None:
+        offset, batch = step, first_page
+        while len(batch) >= limit:
+            response = fetch(offset)
+            if response.status_code != 200:
+                raise PageFetchError(response, offset)
+            batch = response.json().get(key, [])
+            offset += len(batch)
+            yield from batch
+        return
+
+    # Redmine may cap the page size below what was asked for.
+    if not step or step >= total:
+        return
+
+    offsets = iter(range(step, total, step))
+    workers = max_workers or Config.REDMINE_PAGE_WORKERS
+    fetch = _bind(fetch)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque((offset, executor.submit(fetch, offset)) for offset in islice(offsets, workers))
+        while pending:
+            offset, future = pending.popleft()
+            response = future.result()
+            if response.status_code != 200:
+                for _, other in pending:
+                    other.cancel()
+                raise PageFetchError(response, offset)
+            # Keep the window full before handing this page out.
+            for next_offset in islice(offsets, 1):
+                pending.append((next_offset, executor.submit(fetch, next_offset)))
+            yield from response.json().get(key, [])
+
+
+def get_all_pages(url, key="issues", params=None, headers=None, limit=PAGE_LIMIT, max_workers=None):
+    """Fetch every page of a Redmine collection endpoint into one list.
+
+    Pages are fetched as in ``stream_pages``. Returns ``(items, None)`` on
+    success, or ``(None, response)`` with the first non-200 response so
+    callers can build their own error message.
+    """
+    items, response = stream_pages(url, key, params, headers, limit, max_workers)
+    if response is not None:
+        return None, response
+    try:
+        return list(items), None
+    except PageFetchError as e:
+        return None, e.response
+
+
+def count(url, params=None, headers=None, key="issues"):
+    """Size of a Redmine collection from a single ``limit=1`` page.
+
+    Returns ``(n, None)`` on success, or ``(None, response)`` with the non-200
+    response. Endpoints that omit ``total_count`` fall back to the page length.
+    """
+    response = get(url, params={**(params or {}), "limit": 1}, headers=headers)
+    if response.status_code != 200:
+        return None, response
+    data = response.json()
+    total = data.get("total_count")
+    return (len(data.get(key, [])) if total is None else total), None
+
+
+def closed_status_ids(redmine_url, headers=None):
+    """Ids of closed issue statuses, from ``/issue_statuses.json``.
+
+    Issue JSON only carries ``status.is_closed`` from Redmine 5.1 on, so the
+    status list is the one source that works on every server. Returns
+    ``(frozenset, None)``, or ``(None, response)`` with the non-200 response.
+    """
+    response = get(f"{redmine_url}/issue_statuses.json", headers=headers)
+    if response.status_code != 200:
+        return None, response
+    statuses = response.json().get("issue_statuses", [])
+    return frozenset(s["id"] for s in statuses if s.get("is_closed")), None
+
+
+def count_buckets(url, buckets, headers=None, key="issues", max_workers=None):
+    """``count`` every ``{name: params}`` bucket concurrently.
+
+    Returns ``({name: n}, None)``, or ``(None, response)`` with the first
+    failing bucket's response.
+    """
+    names = list(buckets)
+    results = gather(*(
+        lambda params=buckets[name]: count(url, params=params, headers=headers, key=key)
+        for name in names
+    ), max_workers=max_workers)
+
+    counts = {}
+    for name, (n, response) in zip(names, results):
+        if response is not None:
+            return None, response
+        counts[name] = n
+    return counts, None
+
+
+def gather(*calls, max_workers=None):
+    """Run independent zero-argument callables concurrently; return their results in order.
+
+    Every call shares the pooled session, so an endpoint that needs several
+    unrelated Redmine reads waits for the slowest one instead of their sum.
+    An exception from any call is re-raised once all calls have finished.
+    """
+    if len(calls) <= 1:
+        return [call() for call in calls]
+
+    workers = min(max_workers or Config.REDMINE_PAGE_WORKERS, len(calls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_bind(call)) for call in calls]
+    return [future.result() for future in futures]
+
+
+def _bind(fn):
+    # Worker threads lose the caller's context; carry its metrics and memo across.
+    return upstream_metrics.bind(request_memo.bind(fn))
@@ -1,6 +1,6 @@
 # utils/redmine_utils.py
 import os
-import requests
+from utils import redmine_client
 from flask import jsonify, Response, request
 from utils.jwt_utils import JWTUtils  # adjust this import according to your project
 
@@ -12,7 +12,7 @@ def download_attachment_by_id(attachment_id):
         REDMINE_URL = os.getenv("REDMINE_URL")
         attachment_url = f"{REDMINE_URL}/attachments/download/{attachment_id}"
         
-        response = requests.get(
+        response = redmine_client.get(
             attachment_url,
             headers={"X-Redmine-API-Key": api_key},
             stream=True
@@ -0,0 +1,104 @@
+import threading
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from flask import g, has_app_context
+
+from config import Config
+
+_MEMO_HEADERS = ("X-Redmine-API-Key", "Authorization")
+
+# Worker threads started by redmine_client.gather have no app context; ``bind``
+# hands them the caller's memo through this variable instead.
+_worker_memo = ContextVar("redmine_request_memo", default=None)
+
+
+def _resources(url):
+    """Named path segments of a Redmine URL, e.g. ``/projects/x/issues.json`` -> {projects, x, issues}."""
+    path = urlsplit(url).path
+    base_path = urlsplit(Config.REDMINE_URL or "").path.rstrip("/")
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    segments = (segment.removesuffix(".json") for segment in path.split("/"))
+    return frozenset(segment for segment in segments if segment and not segment.isdigit())
+
+
+def _freeze(params):
+    if params is None:
+        return ()
+    items = params.items() if isinstance(params, dict) else params
+    return tuple(sorted((str(name), str(value)) for name, value in items))
+
+
+class RequestMemo:
+    """Successful Redmine GET responses seen while serving one inbound request.
+
+    Entries are keyed by URL, query params and the caller's credentials, so
+    two users served by the same request never share a response. A write
+    drops every entry that shares a named path segment with it: a PUT to
+    ``/issues/5.json`` forgets ``/issues/5.json`` and any ``issues.json``
+    listing, but keeps ``/users/42.json``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (resources, response)
+        self.hits = 0
+
+    @staticmethod
+    def key(url, params=None, headers=None):
+        headers = headers or {}
+        return url, _freeze(params), tuple(headers.get(name) for name in _MEMO_HEADERS)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries[key] = (_resources(key[0]), response)
+
+    def invalidate(self, url):
+        written = _resources(url)
+        with self._lock:
+            self._entries = {
+                key: entry for key, entry in self._entries.items()
+                if not entry[0] & written
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def begin():
+    """Attach an empty memo to ``g`` for the current inbound request."""
+    memo = RequestMemo()
+    g.redmine_memo = memo
+    return memo
+
+
+def current():
+    """The memo of the request being served, or None outside one."""
+    memo = _worker_memo.get()
+    if memo is None and has_app_context():
+        memo = g.get("redmine_memo")
+    return memo
+
+
+def bind(fn):
+    """Wrap ``fn`` so calls it makes on a worker thread share the caller's memo."""
+    memo = current()
+    if memo is None:
+        return fn
+
+    def run(*args, **kwargs):
+        token = _worker_memo.set(memo)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _worker_memo.reset(token)
+    return run
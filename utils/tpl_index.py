@@ -0,0 +1,62 @@
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from config import Config
+from utils.issue_index import IssueIndex
+from utils.issue_model import Issue
+
+TPL_TRACKER_ID = 5
+LORRY_NUMBER_FIELD_ID = 53
+
+TplEntry = namedtuple("TplEntry", ["issue", "created_on", "estimated_hours", "expires_at"])
+
+
+def normalize_lorry_number(value):
+    """Lower-case and drop spaces/dashes so 'WP CAB-1234' and 'wpcab1234' match."""
+    return re.sub(r"[^0-9a-z]", "", str(value).lower())
+
+
+class TplIndex(IssueIndex):
+    """TPL issues by normalized lorry number, with the expiry time precomputed."""
+
+    tracker_id = TPL_TRACKER_ID
+    label = "TPL"
+
+    def index_entry(self, issue):
+        lorry_number = Issue.parse(issue).field(LORRY_NUMBER_FIELD_ID)
+        if not lorry_number:
+            return None
+
+        try:
+            created_on = datetime.strptime(issue["created_on"], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            estimated_hours = float(issue["estimated_hours"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        expires_at = created_on + timedelta(hours=estimated_hours)
+        return [normalize_lorry_number(lorry_number)], TplEntry(issue, created_on, estimated_hours, expires_at)
+
+    def candidates(self, lorry_number, now_utc):
+        """Return ``(entries, error)``: the lorry's TPLs, still-valid ones first, newest first within each."""
+        key = normalize_lorry_number(lorry_number)
+        valid, error = self.lookup_fresh(key, predicate=lambda e: now_utc < e.expires_at)
+        if error:
+            return None, error
+        valid_ids = {e.issue.get("id") for e in valid}
+        return valid + [e for e in self.lookup(key) if e.issue.get("id") not in valid_ids], None
+
+    def has_valid(self, lorry_number, now_utc):
+        """Return ``(is_valid, error)`` for the lorry's TPLs at ``now_utc``."""
+        valid, error = self.lookup_fresh(
+            normalize_lorry_number(lorry_number), predicate=lambda e: now_utc < e.expires_at
+        )
+        if error:
+            return None, error
+        return bool(valid), None
+
+
+tpl_index = TplIndex(
+    refresh_interval=Config.TPL_INDEX_REFRESH_SECONDS,
+    full_sync_interval=Config.ISSUE_INDEX_FULL_SYNC_SECONDS,
+)
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """Bounded, thread-safe in-process cache with per-entry expiry.
+
+    Entries are evicted least-recently-used once ``maxsize`` is reached.
+    ``get_or_load`` de-duplicates concurrent misses for the same key so only
+    one caller runs the loader while the others wait for its result.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._get_locked(key)
+        return default if value is self._MISSING else value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._set_locked(key, value, ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            # A load already in flight must not repopulate the entry afterwards.
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._inflight.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def keys(self):
+        """Snapshot of the keys currently stored (expired entries included until touched)."""
+        with self._lock:
+            return list(self._data)
+
+    def get_or_load(self, key, loader, should_cache=None, ttl=None):
+        """Return the cached value for ``key``, calling ``loader()`` once on a miss.
+
+        ``should_cache(value)`` decides whether a loaded value is stored; by
+        default ``None`` results are returned but not cached.
+        """
+        with self._lock:
+            value = self._get_locked(key)
+            if value is not self._MISSING:
+                return value
+
+            call = self._inflight.get(key)
+            owner = call is None
+            if owner:
+                call = _InFlight()
+                self._inflight[key] = call
+
+        if not owner:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = loader()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is call:
+                    del self._inflight[key]
+                    cacheable = call.error is None and (
+                        should_cache(call.value) if should_cache else call.value is not None
+                    )
+                    if cacheable:
+                        self._set_locked(key, call.value, ttl)
+            call.event.set()
+
+        return call.value
+
+    def _get_locked(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return self._MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return self._MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def _set_locked(self, key, value, ttl):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class StaleWhileRevalidateCache:
+    """TTL cache that keeps serving an expired value while it is refreshed.
+
+    Values younger than ``ttl`` are returned as-is. Between ``ttl`` and
+    ``ttl + stale_ttl`` the cached value is still returned immediately and a
+    single background thread reloads it. Older entries are reloaded inline.
+    """
+
+    def __init__(self, maxsize=256, ttl=300, stale_ttl=1800):
+        self.ttl = ttl
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl + stale_ttl)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader, should_cache=None):
+        should_cache = should_cache or (lambda value: value is not None)
+        fresh_until, value = self._entries.get_or_load(
+            key,
+            lambda: (time.monotonic() + self.ttl, loader()),
+            should_cache=lambda entry: should_cache(entry[1]),
+        )
+        if fresh_until <= time.monotonic():
+            self._refresh_in_background(key, loader, should_cache)
+        return value
+
+    def invalidate(self, key):
+        self._entries.invalidate(key)
+
+    def clear(self):
+        self._entries.clear()
+
+    def _refresh_in_background(self, key, loader, should_cache):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                if should_cache(value):
+                    self._entries.set(key, (time.monotonic() + self.ttl, value))
+            except Exception:
+                logger.exception("Background refresh failed for %r", key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
@@ -0,0 +1,228 @@
+import re
+import threading
+import time
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+from diskcache import Cache
+
+from config import Config
+
+BACKGROUND_ENDPOINT = "background"
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|\.json$|$)")
+_DOWNLOAD_FILENAME = re.compile(r"(/attachments/download/:id)/.+$")
+
+_current = ContextVar("upstream_stats", default=None)
+
+
+def path_template(url):
+    """Redmine path with ids folded, e.g. ``.../issues/42.json?include=x`` -> ``/issues/:id.json``."""
+    path = urlsplit(url).path
+    base_path = urlsplit(Config.REDMINE_URL or "").path.rstrip("/")
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    path = _NUMERIC_SEGMENT.sub("/:id", path)
+    return _DOWNLOAD_FILENAME.sub(r"\1/:filename", path) or "/"
+
+
+class UpstreamStats:
+    """Redmine calls made while serving one inbound request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds, nbytes):
+        with self._lock:
+            self.calls += 1
+            self.seconds += seconds
+            self.bytes += nbytes
+
+    def server_timing(self):
+        total_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'redmine;dur={self.seconds * 1000:.1f};desc="{self.calls} calls, {self.bytes} bytes", '
+            f"total;dur={total_ms:.1f}"
+        )
+
+
+class UpstreamMetrics:
+    """Counters of Redmine traffic, split by inbound endpoint and Redmine path template.
+
+    Every gunicorn worker adds its counts into one diskcache in ``directory``,
+    so a scrape sees the whole server whichever worker answers it, and the
+    totals survive worker recycling. Workers collect in memory and fold their
+    deltas into the shared totals at most every ``flush_interval`` seconds,
+    on ``render`` and on ``flush``.
+    """
+
+    def __init__(self, directory, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._upstream = {}   # (endpoint, method, path) -> [calls, seconds, bytes, errors]
+        self._endpoints = {}  # endpoint -> [requests, upstream calls, upstream seconds, seconds]
+        self._flushed_at = time.monotonic()
+        self._cache = None
+        self._cache_lock = threading.Lock()
+
+    def record_call(self, endpoint, method, path, seconds, nbytes, failed):
+        with self._lock:
+            totals = self._upstream.setdefault((endpoint, method, path), [0, 0.0, 0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += nbytes
+            totals[3] += int(failed)
+        self._maybe_flush()
+
+    def record_request(self, endpoint, stats):
+        with self._lock:
+            totals = self._endpoints.setdefault(endpoint, [0, 0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += stats.calls
+            totals[2] += stats.seconds
+            totals[3] += time.perf_counter() - stats.started
+        self._maybe_flush()
+
+    def flush(self):
+        """Add this worker's counts since the last flush to the shared totals."""
+        with self._lock:
+            deltas = [(("upstream", *k), v) for k, v in self._upstream.items()]
+            deltas += [(("endpoint", k), v) for k, v in self._endpoints.items()]
+            self._upstream = {}
+            self._endpoints = {}
+            self._flushed_at = time.monotonic()
+        if not deltas:
+            return
+        store = self._store()
+        with store.transact(retry=True):
+            for key, delta in deltas:
+                totals = store.get(key)
+                store.set(key, delta if totals is None else [a + b for a, b in zip(totals, delta)])
+
+    def totals(self):
+        """``(upstream, endpoints)``: the shared counters of every worker, after flushing this one."""
+        self.flush()
+        store = self._store()
+        upstream = {}
+        endpoints = {}
+        for key in store.iterkeys():
+            totals = store.get(key)
+            if totals is None:
+                continue
+            if key[0] == "upstream":
+                upstream[key[1:]] = totals
+            else:
+                endpoints[key[1]] = totals
+        return upstream, endpoints
+
+    def render(self):
+        """Prometheus text exposition of every counter, summed over the workers."""
+        upstream, endpoints = self.totals()
+        upstream = sorted(upstream.items())
+        endpoints = sorted(endpoints.items())
+
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in samples)
+
+        def upstream_labels(key):
+            endpoint, method, path = key
+            return f'endpoint="{_escape(endpoint)}",method="{method}",path="{_escape(path)}"'
+
+        def endpoint_labels(endpoint):
+            return f'endpoint="{_escape(endpoint)}"'
+
+        family("mmpro_upstream_requests_total", "counter", "Redmine requests made.",
+               [(upstream_labels(k), v[0]) for k, v in upstream])
+        family("mmpro_upstream_request_seconds_total", "counter", "Time spent waiting on Redmine.",
+               [(upstream_labels(k), round(v[1], 6)) for k, v in upstream])
+        family("mmpro_upstream_response_bytes_total", "counter", "Redmine response body bytes received.",
+               [(upstream_labels(k), v[2]) for k, v in upstream])
+        family("mmpro_upstream_errors_total", "counter", "Redmine requests that failed or returned 5xx.",
+               [(upstream_labels(k), v[3]) for k, v in upstream])
+        family("mmpro_http_requests_total", "counter", "Inbound requests served.",
+               [(endpoint_labels(k), v[0]) for k, v in endpoints])
+        family("mmpro_http_upstream_calls_total", "counter", "Redmine requests made while serving inbound requests.",
+               [(endpoint_labels(k), v[1]) for k, v in endpoints])
+        family("mmpro_http_upstream_seconds_total", "counter", "Redmine time summed over inbound requests.",
+               [(endpoint_labels(k), round(v[2], 6)) for k, v in endpoints])
+        family("mmpro_http_request_seconds_total", "counter", "Wall time spent serving inbound requests.",
+               [(endpoint_labels(k), round(v[3], 6)) for k, v in endpoints])
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._upstream = {}
+            self._endpoints = {}
+        self._store().clear()
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def _store(self):
+        if self._cache is None:
+            with self._cache_lock:
+                if self._cache is None:
+                    self._cache = Cache(self.directory)
+        return self._cache
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+upstream_metrics = UpstreamMetrics(Config.METRICS_DIR, flush_interval=Config.METRICS_FLUSH_SECONDS)
+
+
+def begin_request(endpoint):
+    """Start collecting Redmine calls for the current inbound request."""
+    stats = UpstreamStats()
+    stats.endpoint = endpoint
+    _current.set(stats)
+    return stats
+
+
+def end_request():
+    """Stop collecting and fold the request into the process counters; returns its stats or None."""
+    stats = _current.get()
+    if stats is None:
+        return None
+    _current.set(None)
+    upstream_metrics.record_request(stats.endpoint, stats)
+    return stats
+
+
+def current():
+    return _current.get()
+
+
+def bind(fn):
+    """Wrap ``fn`` so calls it makes on a worker thread count toward the caller's request."""
+    stats = _current.get()
+    if stats is None:
+        return fn
+
+    def run(*args, **kwargs):
+        token = _current.set(stats)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
+
+
+def record(method, url, seconds, nbytes, failed=False):
+    stats = _current.get()
+    if stats is not None:
+        stats.add(seconds, nbytes)
+    endpoint = stats.endpoint if stats is not None else BACKGROUND_ENDPOINT
+    upstream_metrics.record_call(endpoint, method, path_template(url), seconds, nbytes, failed)
@@ -0,0 +1,39 @@
+import threading
+
+from diskcache import Cache
+
+from config import Config
+
+
+class UserGenerations:
+    """Per-user change counters shared by every worker through a diskcache directory.
+
+    In-process caches of user data file their entries under the user's
+    current generation. ``bump`` after a password reset, membership change or
+    activation moves every worker to a new generation at once, so their old
+    entries are never read again and age out on their own.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._cache = None
+        self._lock = threading.Lock()
+
+    def current(self, user_id):
+        return self._store().get(str(user_id), 0)
+
+    def bump(self, user_id):
+        return self._store().incr(str(user_id), default=0, retry=True)
+
+    def clear(self):
+        self._store().clear()
+
+    def _store(self):
+        if self._cache is None:
+            with self._lock:
+                if self._cache is None:
+                    self._cache = Cache(self.directory)
+        return self._cache
+
+
+user_generations = UserGenerations(Config.USER_GENERATIONS_DIR)
@@ -1,26 +1,60 @@
 import os
 import requests
+from config import Config
+from utils import redmine_client
+from utils.ttl_cache import TTLCache
+from utils.user_generations import user_generations
 
 
 class UserUtils:
+    # (API key, user_id, generation) -> Redmine user record without its api_key. Keyed by the
+    # caller's key because what /users/{id}.json returns depends on who is asking.
+    _profile_cache = TTLCache(maxsize=Config.USER_PROFILE_CACHE_SIZE, ttl=Config.USER_PROFILE_CACHE_TTL)
+
     @staticmethod
-    def get_user_phone(user_id):
+    def get_user(user_id, api_key=None):
+        """Fetch ``/users/{user_id}.json`` as ``api_key`` (default: the admin key), cached.
 
+        The record's ``api_key`` is dropped before it is cached or returned;
+        ``get_user_api_key`` is the one place that reads it. Returns ``(user, None)``, or ``(None, response)`` with the failing
+        response so callers can build their own error message.
+        """
         REDMINE_URL = os.getenv("REDMINE_URL")
-        REDMINE_API_KEY = os.getenv("REDMINE_ADMIN_API_KEY")
-       
-        headers = {
-            "X-Redmine-API-Key": REDMINE_API_KEY,
-            "Content-Type": "application/json"
-        }
+        api_key = api_key or os.getenv("REDMINE_ADMIN_API_KEY")
+
+        def load():
+            response = redmine_client.get(
+                f"{REDMINE_URL}/users/{user_id}.json",
+                headers={"X-Redmine-API-Key": api_key, "Content-Type": "application/json"}
+            )
+            if response.status_code != 200:
+                return None, response
+            user = response.json().get("user", {})
+            return {k: v for k, v in user.items() if k != "api_key"}, None
+
+        return UserUtils._profile_cache.get_or_load(
+            (api_key, user_id, user_generations.current(user_id)), load,
+            should_cache=lambda result: result[0] is not None
+        )
 
-        url = f"{REDMINE_URL}/users/{user_id}.json"
+    @staticmethod
+    def invalidate_user(user_id):
+        """Drop every cached copy of a user's record in this worker, whichever key fetched it.
 
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status() 
+        Other workers are reached through ``user_generations``, which
+        ``JWTUtils.invalidate_api_key`` bumps.
+        """
+        for key in UserUtils._profile_cache.keys():
+            if str(key[1]) == str(user_id):
+                UserUtils._profile_cache.invalidate(key)
 
-            user_data = response.json().get("user", {})
+    @staticmethod
+    def get_user_phone(user_id):
+        try:
+            user_data, failed = UserUtils.get_user(user_id)
+            if failed is not None:
+                failed.raise_for_status()
+                user_data = {}
 
             custom_fields = user_data.get("custom_fields", [])
 
@@ -48,7 +82,7 @@ class UserUtils:
         url = f"{REDMINE_URL}/users/{user_id}.json"
 
         try:
-            response = requests.get(url, headers=headers)
+            response = redmine_client.get(url, headers=headers)
             response.raise_for_status()
 
             user_data = response.json().get("user", {})